@@ -0,0 +1,128 @@
+"""
+Operational commands for the MicroMatch backend.
+
+Usage (from backend/, with DATABASE_URL set):
+    python -m app.cli migrate [--status]
+    python -m app.cli rebuild-student-stats [--batch-size N]
+    python -m app.cli precompute-recommendations [--workers N] [--shard-size N] [--depth N]
+    python -m app.cli outbox-worker [--once] [--batch-size N] [--poll-seconds S]
+"""
+
+import argparse
+
+from app.database import SessionLocal, engine
+
+
+def migrate_command(args: argparse.Namespace) -> None:
+    """Applies pending schema migrations, or lists them with --status."""
+    from app.migrations import MIGRATIONS, applied_versions, run_migrations
+
+    if args.status:
+        with engine.begin() as connection:
+            applied = applied_versions(connection)
+        for migration in MIGRATIONS:
+            state = "applied" if migration.version in applied else "pending"
+            print(f"{migration.version:04d} {migration.name:<30} {state}")
+        return
+
+    applied = run_migrations(engine)
+    for migration in applied:
+        print(f"Applied {migration.version:04d} {migration.name}")
+    print(f"{len(applied)} migration(s) applied")
+
+
+def rebuild_student_stats_command(args: argparse.Namespace) -> None:
+    """Backfills the materialized student_stats table from history tables."""
+    from app.utils.student_metrics import rebuild_student_stats
+
+    db = SessionLocal()
+    try:
+        count = rebuild_student_stats(db, batch_size=args.batch_size)
+    finally:
+        db.close()
+    print(f"Rebuilt student_stats for {count} students")
+
+
+def precompute_recommendations_command(args: argparse.Namespace) -> None:
+    """Writes recommendation snapshots for every student."""
+    from app.services.recommendation_snapshots import precompute_recommendations
+
+    db = SessionLocal()
+    try:
+        count = precompute_recommendations(
+            db, workers=args.workers, shard_size=args.shard_size, depth=args.depth
+        )
+    finally:
+        db.close()
+    print(f"Precomputed recommendations for {count} students")
+
+
+def outbox_worker_command(args: argparse.Namespace) -> None:
+    """Carries out queued outbox events: once, or until interrupted."""
+    from app.services.outbox import OUTBOX_POLL_SECONDS, OutboxWorker
+
+    worker = OutboxWorker(SessionLocal)
+    if args.batch_size is not None:
+        worker.batch_size = args.batch_size
+    if args.once:
+        count = worker.run_once()
+        print(f"Processed {count} outbox event(s)")
+        return
+
+    print("Outbox worker running; Ctrl+C to stop")
+    try:
+        worker.run_forever(poll_seconds=args.poll_seconds or OUTBOX_POLL_SECONDS)
+    except KeyboardInterrupt:
+        pass
+    print(f"Processed {worker.processed}, retried {worker.retried}, failed {worker.failed}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="MicroMatch backend commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    migrate = commands.add_parser("migrate", help="Apply pending schema migrations")
+    migrate.add_argument("--status", action="store_true",
+                         help="List migrations and whether each is applied, without applying")
+    migrate.set_defaults(handler=migrate_command)
+
+    rebuild = commands.add_parser(
+        "rebuild-student-stats",
+        help="Recompute every student's materialized history counters",
+    )
+    rebuild.add_argument("--batch-size", type=int, default=500)
+    rebuild.set_defaults(handler=rebuild_student_stats_command)
+
+    precompute = commands.add_parser(
+        "precompute-recommendations",
+        help="Rank projects for every student and store recommendation snapshots",
+    )
+    precompute.add_argument("--workers", type=int, default=None,
+                            help="Scoring processes (default: CPU count)")
+    precompute.add_argument("--shard-size", type=int, default=500)
+    precompute.add_argument("--depth", type=int, default=100,
+                            help="Recommendations stored per student")
+    precompute.set_defaults(handler=precompute_recommendations_command)
+
+    outbox = commands.add_parser(
+        "outbox-worker",
+        help="Carry out queued side effects such as notification fan-out",
+    )
+    outbox.add_argument("--once", action="store_true",
+                        help="Handle the events due now (up to --batch-size) and exit")
+    outbox.add_argument("--batch-size", type=int, default=None,
+                        help="Events per pass (default: OUTBOX_BATCH_SIZE)")
+    outbox.add_argument("--poll-seconds", type=float, default=None,
+                        help="Wait when the queue is empty (default: OUTBOX_POLL_SECONDS)")
+    outbox.set_defaults(handler=outbox_worker_command)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = build_parser().parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,7 @@
+import os
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import jwt
@@ -8,6 +12,77 @@ SECRET_KEY = "your-super-secret-key"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# Verified tokens are remembered until they expire (at most the TTL), so a
+# client reusing its token skips the HMAC check and JSON parsing
+TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "10000"))
+TOKEN_CACHE_TTL_SECONDS = float(os.getenv("TOKEN_CACHE_TTL_SECONDS", "300"))
+
+
+class VerifiedTokenCache:
+    """
+    Thread-safe LRU of tokens whose signature has already been verified,
+    keyed by the full token string and mapped to their claims.
+
+    An entry never outlives the token's `exp` claim, so an expired token
+    is re-verified (and rejected) by jose rather than served from here.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = TOKEN_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = TOKEN_CACHE_TTL_SECONDS,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None or entry[0] <= time.time():
+                if entry is not None:
+                    del self._entries[token]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, token: str, claims: dict) -> None:
+        if self.max_entries <= 0:
+            return
+        expires_at = time.time() + self.ttl_seconds
+        exp = claims.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, exp)
+        with self._lock:
+            self._entries[token] = (expires_at, claims)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+verified_tokens = VerifiedTokenCache()
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """
     Creates a signed JWT access token.
@@ -34,15 +109,36 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
 
 def decode_access_token(token: str):
     """
-    Decodes and verifies a JWT.
+    Decodes and verifies a JWT, consulting verified_tokens first.
 
     Returns:
-        - payload dict if valid
+        - payload dict if valid (a copy; callers may modify it)
         - None if token is invalid or expired
     """
+    claims = verified_tokens.get(token)
+    if claims is not None:
+        return dict(claims)
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except JWTError:
         # Any decode/validation error results in None
-        return None
\ No newline at end of file
+        return None
+
+    verified_tokens.put(token, payload)
+    return dict(payload)
+
+
+# Key in the ASGI scope's "state" dict (what request.state wraps) holding the
+# decoded claims of the request's bearer token, None if it did not verify
+CLAIMS_STATE_KEY = "token_claims"
+
+
+def request_claims(state: dict, token: str) -> Optional[dict]:
+    """
+    Decodes a request's token once per request: get_current_user and the
+    logging middleware both go through here with the request's state.
+    """
+    if CLAIMS_STATE_KEY not in state:
+        state[CLAIMS_STATE_KEY] = decode_access_token(token)
+    return state[CLAIMS_STATE_KEY]
@@ -1,27 +1,23 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.database import get_db
-from app.models import User
-from app.core.auth import decode_access_token
+from app.database import get_async_db, get_db
+from app.models import Application, Project, User
+from app.core.auth import request_claims
+from app.services.principal_cache import Principal, principal_cache
 
 # OAuth2 scheme for token extraction from Authorization header
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login", auto_error=False)
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
-    """
-    Validates the JWT, extracts the user_id, and loads the user from the database.
-
-    Raises:
-        - 401 if token is invalid or missing required fields
-        - 404 if the user no longer exists
-    """
+def _token_user_id(request: Request, token: str) -> int:
+    """Verified user_id claim of the request's token (401 otherwise)."""
 
-    # Decode and validate the token, extracting the payload
-    payload = decode_access_token(token)
+    # Decode and validate the token, extracting the payload; the claims are
+    # kept on request.state so the logging middleware doesn't decode again
+    payload = request_claims(request.scope.setdefault("state", {}), token)
     if payload is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -36,16 +32,99 @@ def get_current_user(
             detail="Invalid token payload"
         )
 
-    # Look up the authenticated user in the database
-    user = db.query(User).filter(User.id == user_id).first()
+    return user_id
+
+
+def _cache_loaded_user(user: User | None, stamp: int) -> Principal:
+    """Principal of a user loaded after a cache miss (404 if gone)."""
     if not user:
         # Token is valid but user no longer exists (e.g., deleted account)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
+    principal = Principal.from_user(user)
+    principal_cache.put(principal, stamp)
+    return principal
+
+
+def _require_active(principal: Principal) -> Principal:
+    if not principal.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Account suspended"
+        )
+    return principal
 
-    return user
+
+def get_current_user(
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> Principal:
+    """
+    Validates the JWT, extracts the user_id, and resolves it to the user's
+    Principal (id, role, is_active).
+
+    Principals are served from principal_cache when possible, so role
+    checks on hot endpoints don't touch the database; on a miss the user
+    is loaded once and cached.
+
+    Raises:
+        - 401 if token is invalid or missing required fields
+        - 403 if the account has been suspended
+        - 404 if the user no longer exists
+    """
+    user_id = _token_user_id(request, token)
+
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        # Stamp before the SELECT so a concurrent invalidation isn't masked
+        stamp = principal_cache.stamp(user_id)
+        user = db.query(User).filter(User.id == user_id).first()
+        principal = _cache_loaded_user(user, stamp)
+
+    return _require_active(principal)
+
+
+def get_stream_user(
+    request: Request,
+    token: str | None = Depends(optional_oauth2_scheme),
+    access_token: str | None = None,
+    db: Session = Depends(get_db, scope="function")
+) -> Principal:
+    """
+    get_current_user for streaming endpoints.
+
+    Browsers' EventSource cannot set headers, so the token may also come
+    as the `access_token` query parameter. The session is closed as soon
+    as the endpoint function returns (scope="function") rather than being
+    held for the life of the stream.
+
+    Raises:
+        - 401 if no token was given, or as get_current_user
+    """
+    token = token or access_token
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return get_current_user(request, token, db)
+
+
+def _check_role(current_user: Principal, required_role: str) -> Principal:
+    # Handles Enum OR string roles safely
+    role_value = getattr(current_user.role, "value", current_user.role)
+
+    if role_value.lower() != required_role.lower():
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access forbidden"
+        )
+
+    return current_user
 
 
 def require_role(required_role: str):
@@ -55,35 +134,16 @@ def require_role(required_role: str):
         - Case-insensitive comparison. 
         
     """
-    def role_checker(current_user: User = Depends(get_current_user)) -> User:
-        
-        # Handles Enum OR string roles safely
-        role_value = getattr(current_user.role, "value", current_user.role)
-
-    
-        if role_value.lower() != required_role.lower():
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Access forbidden"
-            )
-
-        return current_user
+    def role_checker(current_user: Principal = Depends(get_current_user)) -> Principal:
+        return _check_role(current_user, required_role)
 
     return role_checker
 
-def require_project_participant(project_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)) -> User:
+def _is_participant(current_user: Principal, project, has_accepted_application) -> bool:
     """
-    Dependency that enforces project-scoped messaging access.
-    Grants access only if the current user is:
-      - The organization that owns the project, OR
-      - A student with an accepted application to the project
-    Raises:
-      - 404 if project not found
-      - 403 if user is not a participant
+    Owning organization, or a student for whom has_accepted_application()
+    (only called for students) is true.
     """
-    from app.models import Project, Application
-
-    project = db.query(Project).filter(Project.id == project_id).first()
     if not project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -94,23 +154,92 @@ def require_project_participant(project_id: int, db: Session = Depends(get_db),
 
     # Organization that owns the project
     if role_value == "organization" and project.organization_id == current_user.id:
-        return current_user
+        return True
 
     # Student with an accepted application
-    if role_value == "student":
-        accepted = (
-            db.query(Application)
-            .filter(
-                Application.project_id == project_id,
-                Application.student_id == current_user.id,
-                Application.status == "accepted"
-            )
-            .first()
-        )
-        if accepted:
-            return current_user
+    return role_value == "student" and has_accepted_application()
 
-    raise HTTPException(
+
+def _not_participant() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_403_FORBIDDEN,
         detail="You are not a participant in this project"
-    )
\ No newline at end of file
+    )
+
+
+def _accepted_application(project_id: int, student_id: int):
+    return select(Application.id).where(
+        Application.project_id == project_id,
+        Application.student_id == student_id,
+        Application.status == "accepted"
+    ).limit(1)
+
+
+def require_project_participant(project_id: int, db: Session = Depends(get_db), current_user: Principal = Depends(get_current_user)) -> Principal:
+    """
+    Dependency that enforces project-scoped messaging access.
+    Grants access only if the current user is:
+      - The organization that owns the project, OR
+      - A student with an accepted application to the project
+    Raises:
+      - 404 if project not found
+      - 403 if user is not a participant
+    """
+    project = db.query(Project).filter(Project.id == project_id).first()
+    accepted = lambda: db.execute(_accepted_application(project_id, current_user.id)).first() is not None
+
+    if _is_participant(current_user, project, accepted):
+        return current_user
+
+    raise _not_participant()
+
+
+# ── Async variants ────────────────────────────────────────────────────────
+# Same checks for endpoints on the async engine (routers/async_reads.py);
+# they load through AsyncSession so the request never needs a threadpool
+# thread.
+
+async def get_current_user_async(
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> Principal:
+    """get_current_user, loading the user through the async engine on a miss."""
+    user_id = _token_user_id(request, token)
+
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        stamp = principal_cache.stamp(user_id)
+        user = await db.get(User, user_id)
+        principal = _cache_loaded_user(user, stamp)
+
+    return _require_active(principal)
+
+
+def require_role_async(required_role: str):
+    """require_role on top of get_current_user_async."""
+    async def role_checker(current_user: Principal = Depends(get_current_user_async)) -> Principal:
+        return _check_role(current_user, required_role)
+
+    return role_checker
+
+
+async def require_project_participant_async(
+    project_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_async)
+) -> Principal:
+    """require_project_participant through the async engine."""
+    project = await db.get(Project, project_id)
+
+    # Only students need the application lookup; resolve it up front
+    # since the predicate passed to _is_participant is synchronous
+    accepted = False
+    role_value = getattr(current_user.role, "value", current_user.role).lower()
+    if project and role_value == "student":
+        accepted = (await db.execute(_accepted_application(project_id, current_user.id))).first() is not None
+
+    if _is_participant(current_user, project, lambda: accepted):
+        return current_user
+
+    raise _not_participant()
@@ -1,4 +1,6 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 import os
 
@@ -11,12 +13,88 @@ if not DATABASE_URL:
 
 if DATABASE_URL.startswith("postgres://"):
     DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql+psycopg2://")
-    
+
+# Optional read replica for read-only endpoints (see get_read_db)
+READ_DATABASE_URL = os.getenv("READ_DATABASE_URL")
+
+if READ_DATABASE_URL and READ_DATABASE_URL.startswith("postgres://"):
+    READ_DATABASE_URL = READ_DATABASE_URL.replace("postgres://", "postgresql+psycopg2://")
+
+# Connection pool, per engine and per worker process. Size the pool for the
+# threads (or concurrent async requests) that can hold a session at once;
+# recycle below the server's / proxy's idle timeout; pre-ping costs one
+# round trip per checkout but hides connections dropped by failovers.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+# Per-statement limit on PostgreSQL, in milliseconds (0 = none)
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+
+
+def engine_options(url: str) -> dict:
+    """create_engine / create_async_engine keyword arguments for `url`."""
+    parsed = make_url(url)
+    options = {"pool_pre_ping": DB_POOL_PRE_PING}
+
+    # In-memory SQLite lives in a single connection; there is no pool to size
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return options
+
+    options.update(
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+    )
+
+    if parsed.get_backend_name() == "postgresql" and DB_STATEMENT_TIMEOUT_MS > 0:
+        if parsed.get_driver_name() == "asyncpg":
+            connect_args = {"server_settings": {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}}
+        else:
+            connect_args = {"options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"}
+        options["connect_args"] = connect_args
+
+    return options
+
+
 # Create SQLAlchemy engine
-engine = create_engine(DATABASE_URL)
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL))
+
+# Replica engine; without READ_DATABASE_URL reads share the primary
+read_engine = (
+    create_engine(READ_DATABASE_URL, **engine_options(READ_DATABASE_URL))
+    if READ_DATABASE_URL else engine
+)
 
-# Configure session factory
+# Configure session factories
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+
+@event.listens_for(ReadSessionLocal, "before_flush")
+def _reject_writes(session, flush_context, instances):
+    raise RuntimeError("Read-only session: write through get_db")
+
+# Optional async engine (e.g. postgresql+asyncpg://..., sqlite+aiosqlite:///...)
+# for the async read endpoints in routers/async_reads.py; needs the async
+# driver installed. Must point at the same database as DATABASE_URL.
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
+
+if ASYNC_DATABASE_URL and ASYNC_DATABASE_URL.startswith("postgres://"):
+    ASYNC_DATABASE_URL = ASYNC_DATABASE_URL.replace("postgres://", "postgresql+asyncpg://")
+
+async_engine = (
+    create_async_engine(ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL))
+    if ASYNC_DATABASE_URL else None
+)
+
+# Loaded objects stay usable after commit without an implicit (awaitable) refresh
+AsyncSessionLocal = (
+    async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+    if async_engine is not None else None
+)
 
 # Base class for all ORM models
 Base = declarative_base()
@@ -30,4 +108,31 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+def get_read_db():
+    """
+    Session for read-only endpoints: bound to the replica when
+    READ_DATABASE_URL is set, otherwise to the primary.
+
+    Replicas lag the primary, so only endpoints that can serve slightly
+    stale data use it — never one that reads back a write the same user
+    just made. Flushing from this session is an error.
+    """
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db():
+    """
+    Async counterpart of get_db, for endpoints served on the async engine.
+    Only usable when ASYNC_DATABASE_URL is set.
+    """
+    if AsyncSessionLocal is None:
+        raise RuntimeError("ASYNC_DATABASE_URL is not set")
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,7 +1,9 @@
+from contextlib import asynccontextmanager
+
+from anyio import to_thread
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .database import engine
-from .models import Base
+from .database import async_engine, engine
 from app.routers import auth
 from app.routers import student_profile
 from app.routers import organization_profile
@@ -14,9 +16,31 @@ from app.routers import notifications
 from app.routers import recommendations
 from app.routers import messages
 from app.routers import analytics
-from .middleware.logging_middleware import LoggingMiddleware
+from app.routers import async_reads
+from .middleware.logging_middleware import LoggingMiddleware, log_writer
+from app.services.notification_broker import notification_broker
+from app.services.outbox import OUTBOX_WORKER_IN_APP, outbox_worker
+from app.services.password_hasher import password_hasher
+from app.migrations import run_migrations
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Carries out outbox events (notification fan-outs) unless a separate
+    # `python -m app.cli outbox-worker` process does
+    if OUTBOX_WORKER_IN_APP:
+        outbox_worker.start()
+    yield
+    await to_thread.run_sync(outbox_worker.stop)
+    # Write out request logs still queued before the worker exits
+    await to_thread.run_sync(log_writer.stop)
+    await to_thread.run_sync(password_hasher.shutdown)
+    await to_thread.run_sync(notification_broker.close)
+    if async_engine is not None:
+        await async_engine.dispose()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # Allow CORS for frontend
 origins = [
@@ -31,6 +55,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # allow POST, GET, OPTIONS, etc.
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # pagination token
 )
 
 app.add_middleware(LoggingMiddleware)
@@ -40,6 +65,9 @@ def health_check():
     return {"status": "ok"}
 
 # Register routers
+if async_engine is not None:
+    # Ahead of the sync routers: its endpoints take over the same paths
+    app.include_router(async_reads.router)
 app.include_router(auth.router)
 app.include_router(student_profile.router)
 app.include_router(organization_profile.router)
@@ -53,5 +81,5 @@ app.include_router(recommendations.router)
 app.include_router(messages.router)
 app.include_router(analytics.router)
 
-# Create tables
-Base.metadata.create_all(bind=engine)
\ No newline at end of file
+# Create / upgrade the schema
+run_migrations(engine)
\ No newline at end of file
@@ -1,42 +1,78 @@
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from sqlalchemy.orm import Session
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from ..database import SessionLocal
-from ..models import SystemLog
-from ..core.auth import decode_access_token
+from ..core.auth import request_claims
+from ..services.system_log_writer import SystemLogWriter
+
+
+# Rows are written by a background thread in batches; the lambda looks
+# SessionLocal up per batch so it can be swapped out (tests)
+log_writer = SystemLogWriter(lambda: SessionLocal())
+
+
+def _identity(scope: Scope) -> tuple[int | None, str | None]:
+    """
+    (user_id, role) from the request's Bearer token, if it decodes. Reuses
+    the claims get_current_user already decoded for this request.
+    """
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            auth_header = value.decode("latin-1")
+            if auth_header.startswith("Bearer "):
+                payload = request_claims(scope["state"], auth_header.split(" ", 1)[1])
+                if payload:
+                    return payload.get("user_id"), payload.get("role")
+            break
+    return None, None
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        user_id = None
-        role = None
+class LoggingMiddleware:
+    """
+    Pure ASGI request logger.
 
-        # Try to extract user info from JWT without blocking the request
-        auth_header = request.headers.get("Authorization")
-        if auth_header and auth_header.startswith("Bearer "):
-            token = auth_header.split(" ", 1)[1]
-            payload = decode_access_token(token)
-            if payload:
-                user_id = payload.get("user_id")
-                role = payload.get("role")
+    Watches the response messages on their way out — status from
+    http.response.start, byte counts from each http.response.body — and
+    passes every message through untouched, so nothing is buffered and
+    streaming responses stream. Once the last chunk has been sent the
+    entry, with duration and response size, goes to the log writer.
+    """
 
-        response = await call_next(request)
+    def __init__(self, app: ASGIApp, writer: SystemLogWriter | None = None):
+        self.app = app
+        self.writer = writer or log_writer
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Shared with the app (request.state), even if a layer copies the scope
+        scope.setdefault("state", {})
+        started = time.perf_counter()
+        status_code = None
+        response_size = 0
+
+        async def send_and_measure(message: Message) -> None:
+            nonlocal status_code, response_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
 
-        # Write log entry
-        db: Session = SessionLocal()
         try:
-            log = SystemLog(
-                user_id=user_id,
-                role=role,
-                endpoint=request.url.path,
-                method=request.method,
-                status_code=response.status_code,
-            )
-            db.add(log)
-            db.commit()
-        except Exception:
-            db.rollback()
+            await self.app(scope, receive, send_and_measure)
         finally:
-            db.close()
-
-        return response
+            duration_ms = round((time.perf_counter() - started) * 1000.0, 3)
+            user_id, role = _identity(scope)
+            await self.writer.submit({
+                "user_id": user_id,
+                "role": role,
+                "endpoint": scope["path"],
+                "method": scope["method"],
+                # No response started: the app raised, and the server answers 500
+                "status_code": status_code if status_code is not None else 500,
+                "duration_ms": duration_ms,
+                "response_size": response_size,
+            })
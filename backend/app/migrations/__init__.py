@@ -0,0 +1,120 @@
+"""
+migrations
+==========
+Versioned schema migrations, applied at start-up and by
+`python -m app.cli migrate`.
+
+Each migration is a module in this package exposing
+`upgrade(connection)`, registered in MIGRATIONS below with a version
+number that only ever grows. Applied versions are recorded in the
+`schema_migrations` table; run_migrations() applies the pending ones in
+order, each in its own transaction together with its bookkeeping row,
+so a failed migration leaves the earlier ones applied and is retried on
+the next run.
+
+A migration never imports app.models: it spells out the tables,
+columns and indexes it creates as they were when it shipped, so its
+output doesn't change with the models. Once released a migration is
+frozen; a schema change is a new migration, and the models are updated
+to match.
+
+Migrations must be safe to run against a database that already has
+their objects (create with checkfirst / IF NOT EXISTS): databases
+created by main.py's old create_all() call already hold some of them;
+and SQLite's driver commits DDL as it goes, so a failed migration may
+have been partly applied there (PostgreSQL rolls it back).
+
+On PostgreSQL an advisory lock serialises concurrent runs (several app
+workers starting at once); SQLite serialises writers by itself.
+"""
+
+from dataclasses import dataclass
+from typing import Callable
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.migrations import (
+    m0001_baseline,
+    m0002_query_indexes,
+    m0003_system_log_timing,
+    m0004_unread_notification_count,
+    m0005_notification_archive,
+    m0006_outbox,
+    m0007_notification_coalescing,
+)
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    upgrade: Callable[[Connection], None]
+
+
+MIGRATIONS: list[Migration] = [
+    Migration(1, "baseline", m0001_baseline.upgrade),
+    Migration(2, "query_indexes", m0002_query_indexes.upgrade),
+    Migration(3, "system_log_timing", m0003_system_log_timing.upgrade),
+    Migration(4, "unread_notification_count", m0004_unread_notification_count.upgrade),
+    Migration(5, "notification_archive", m0005_notification_archive.upgrade),
+    Migration(6, "outbox", m0006_outbox.upgrade),
+    Migration(7, "notification_coalescing", m0007_notification_coalescing.upgrade),
+]
+
+# Kept out of the models' metadata so create_all / drop_all leave it alone
+schema_migrations = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("applied_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+)
+
+# Arbitrary key for pg_advisory_lock, shared by every app process
+_ADVISORY_LOCK_KEY = 4_862_017
+
+
+def applied_versions(connection: Connection) -> set[int]:
+    """Versions recorded in schema_migrations (empty before the first run)."""
+    schema_migrations.create(connection, checkfirst=True)
+    return set(connection.execute(select(schema_migrations.c.version)).scalars())
+
+
+def pending_migrations(connection: Connection) -> list[Migration]:
+    applied = applied_versions(connection)
+    return [m for m in MIGRATIONS if m.version not in applied]
+
+
+def run_migrations(engine: Engine) -> list[Migration]:
+    """
+    Applies every pending migration in version order and returns the
+    ones applied by this call.
+    """
+    applied = []
+
+    with engine.connect() as connection:
+        locking = connection.dialect.name == "postgresql"
+        if locking:
+            with connection.begin():
+                connection.execute(text("SELECT pg_advisory_lock(:key)"), {"key": _ADVISORY_LOCK_KEY})
+
+        try:
+            with connection.begin():
+                pending = pending_migrations(connection)
+
+            for migration in pending:
+                with connection.begin():
+                    migration.upgrade(connection)
+                    connection.execute(
+                        schema_migrations.insert().values(
+                            version=migration.version, name=migration.name
+                        )
+                    )
+                applied.append(migration)
+        finally:
+            if locking:
+                with connection.begin():
+                    connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _ADVISORY_LOCK_KEY})
+
+    return applied
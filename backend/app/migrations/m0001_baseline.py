@@ -0,0 +1,236 @@
+"""
+Baseline: every table as the models declared it when migrations were
+introduced, plus the project full-text index.
+
+Replaces the create_all() call main.py used to make at import. Tables
+that already exist are left as they are. The definitions below are a
+snapshot, not the live models: later schema changes belong in later
+migrations.
+"""
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Enum,
+    Float,
+    ForeignKey,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Text,
+    UniqueConstraint,
+    func,
+    text,
+)
+from sqlalchemy.engine import Connection
+
+
+metadata = MetaData()
+
+Table(
+    "users", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String, nullable=True),
+    Column("email", String, unique=True, index=True, nullable=False),
+    Column("hashed_password", String, nullable=False),
+    Column("role", Enum("student", "organization", "admin", name="userrole"), nullable=False),
+    Column("is_active", Boolean, nullable=False),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+Table(
+    "student_profiles", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("user_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), unique=True, nullable=False),
+    Column("university", String, nullable=False),
+    Column("major", String, nullable=False),
+    Column("graduation_year", Integer, nullable=False),
+    Column("skills", String, nullable=True),
+    Column("bio", Text, nullable=True),
+    Column("portfolio_links", Text, nullable=True),
+    Column("badges", Text, nullable=True),
+)
+
+Table(
+    "organization_profiles", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("user_id", Integer, ForeignKey("users.id"), nullable=False, unique=True),
+    Column("organization_name", String, nullable=False),
+    Column("industry", String, nullable=True),
+    Column("website", String, nullable=True),
+    Column("description", String, nullable=True),
+)
+
+Table(
+    "projects", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("organization_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+    Column("title", String, nullable=False),
+    Column("description", Text, nullable=False),
+    Column("required_skills", String, nullable=True),
+    Column("duration", String, nullable=True),
+    Column("status", String, nullable=False),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    Column("completed_at", DateTime(timezone=True), nullable=True),
+)
+
+Table(
+    "applications", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("student_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+    Column("project_id", Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False),
+    Column("status", String, nullable=False),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    Column("updated_at", DateTime(timezone=True), server_default=func.now()),
+    UniqueConstraint("student_id", "project_id", name="uq_student_project"),
+)
+
+Table(
+    "deliverables", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("application_id", Integer, ForeignKey("applications.id", ondelete="CASCADE"), nullable=False, unique=True),
+    Column("content", Text, nullable=False),
+    Column("status", String, nullable=False),
+    Column("feedback", Text, nullable=True),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    Column("reviewed_at", DateTime(timezone=True), nullable=True),
+)
+
+Table(
+    "feedback", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("user_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+    Column("project_id", Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False),
+    Column("rating", Integer, nullable=False),
+    Column("comment", Text, nullable=True),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    UniqueConstraint("user_id", "project_id", name="uq_user_project_feedback"),
+)
+
+Table(
+    "system_logs", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("user_id", Integer, ForeignKey("users.id"), nullable=True),
+    Column("role", String, nullable=True),
+    Column("endpoint", String, nullable=False),
+    Column("method", String, nullable=False),
+    Column("status_code", Integer, nullable=True),
+    Column("timestamp", DateTime(timezone=True), server_default=func.now(), nullable=False),
+)
+
+Table(
+    "notifications", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("recipient_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+    Column("message", String, nullable=False),
+    Column("is_read", Boolean, nullable=False),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+Table(
+    "project_messages", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("project_id", Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False),
+    Column("sender_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+    Column("content", Text, nullable=False),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+Table(
+    "student_stats", metadata,
+    Column("student_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+    Column("applications_submitted", Integer, nullable=False),
+    Column("accepted_applications", Integer, nullable=False),
+    Column("completed_projects", Integer, nullable=False),
+    Column("accepted_deliverables", Integer, nullable=False),
+    Column("rating_sum", Integer, nullable=False),
+    Column("rating_count", Integer, nullable=False),
+    Column("recent_applications", Integer, nullable=False),
+    Column("recent_window_expires_at", DateTime(timezone=True), nullable=True),
+    Column("updated_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+Table(
+    "recommendation_snapshots", metadata,
+    Column("student_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+    Column("rank", Integer, primary_key=True),
+    Column("project_id", Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False),
+    Column("title", String, nullable=False),
+    Column("match_score", Float, nullable=False),
+    Column("skill_score", Float, nullable=False),
+    Column("experience_score", Float, nullable=False),
+    Column("interest_score", Float, nullable=False),
+    Column("activity_score", Float, nullable=False),
+    Column("success_score", Float, nullable=False),
+    Column("complete", Boolean, nullable=False),
+    Column("generated_at", DateTime(timezone=True), nullable=False),
+)
+
+# Full-text index over projects (see app.services.project_search)
+_POSTGRES_SEARCH_DDL = [
+    """
+    ALTER TABLE projects ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(required_skills, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_projects_search_vector ON projects USING GIN (search_vector)",
+]
+
+_SQLITE_SEARCH_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS projects_fts USING fts5(
+        title, description, required_skills,
+        content='projects', content_rowid='id',
+        tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS projects_fts_ai AFTER INSERT ON projects BEGIN
+        INSERT INTO projects_fts(rowid, title, description, required_skills)
+        VALUES (new.id, new.title, new.description, new.required_skills);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS projects_fts_ad AFTER DELETE ON projects BEGIN
+        INSERT INTO projects_fts(projects_fts, rowid, title, description, required_skills)
+        VALUES ('delete', old.id, old.title, old.description, old.required_skills);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS projects_fts_au
+    AFTER UPDATE OF title, description, required_skills ON projects BEGIN
+        INSERT INTO projects_fts(projects_fts, rowid, title, description, required_skills)
+        VALUES ('delete', old.id, old.title, old.description, old.required_skills);
+        INSERT INTO projects_fts(rowid, title, description, required_skills)
+        VALUES (new.id, new.title, new.description, new.required_skills);
+    END
+    """,
+]
+
+
+def _install_search_index(connection: Connection) -> None:
+    dialect = connection.dialect.name
+
+    if dialect == "postgresql":
+        for statement in _POSTGRES_SEARCH_DDL:
+            connection.execute(text(statement))
+
+    elif dialect == "sqlite":
+        existed = connection.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'projects_fts'"
+        )).first() is not None
+        for statement in _SQLITE_SEARCH_DDL:
+            connection.execute(text(statement))
+        if not existed:
+            # Index the projects already stored
+            connection.execute(text("INSERT INTO projects_fts(projects_fts) VALUES ('rebuild')"))
+
+
+def upgrade(connection: Connection) -> None:
+    metadata.create_all(bind=connection, checkfirst=True)
+    _install_search_index(connection)
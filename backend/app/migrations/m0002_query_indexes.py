@@ -0,0 +1,84 @@
+"""
+Indexes for the hot listing and lookup queries, on tables created before
+the models declared them.
+
+Creates whichever are missing. Partial indexes cover open projects and
+unread notifications. The tables below carry only the columns the
+indexes need; they are a snapshot, not the live models.
+"""
+
+from sqlalchemy import Boolean, Column, DateTime, Index, Integer, MetaData, String, Table, text
+from sqlalchemy.engine import Connection
+
+
+metadata = MetaData()
+
+projects = Table(
+    "projects", metadata,
+    Column("id", Integer),
+    Column("organization_id", Integer),
+    Column("status", String),
+    Column("created_at", DateTime(timezone=True)),
+)
+applications = Table(
+    "applications", metadata,
+    Column("id", Integer),
+    Column("student_id", Integer),
+    Column("project_id", Integer),
+    Column("status", String),
+    Column("created_at", DateTime(timezone=True)),
+)
+feedback = Table(
+    "feedback", metadata,
+    Column("project_id", Integer),
+)
+notifications = Table(
+    "notifications", metadata,
+    Column("id", Integer),
+    Column("recipient_id", Integer),
+    Column("is_read", Boolean),
+    Column("created_at", DateTime(timezone=True)),
+)
+project_messages = Table(
+    "project_messages", metadata,
+    Column("id", Integer),
+    Column("project_id", Integer),
+    Column("created_at", DateTime(timezone=True)),
+)
+
+INDEXES = [
+    # Newest-first listings: open projects (partial), an organization's
+    # own, and all; per-status counts for an organization's dashboard
+    Index(
+        "ix_projects_open_created_at_id", projects.c.created_at, projects.c.id,
+        postgresql_where=text("status = 'open'"),
+        sqlite_where=text("status = 'open'"),
+    ),
+    Index("ix_projects_organization_created_at_id", projects.c.organization_id, projects.c.created_at, projects.c.id),
+    Index("ix_projects_created_at_id", projects.c.created_at, projects.c.id),
+    Index("ix_projects_organization_status", projects.c.organization_id, projects.c.status),
+    # A project's applications, newest first; a student's by status; a
+    # project's accepted / pending ones
+    Index("ix_applications_project_created_at_id", applications.c.project_id, applications.c.created_at, applications.c.id),
+    Index("ix_applications_student_status", applications.c.student_id, applications.c.status),
+    Index("ix_applications_project_status", applications.c.project_id, applications.c.status),
+    Index("ix_feedback_project_id", feedback.c.project_id),
+    # A user's notifications newest first, and just the unread ones
+    Index("ix_notifications_recipient_created_at_id", notifications.c.recipient_id, notifications.c.created_at, notifications.c.id),
+    Index(
+        "ix_notifications_unread_recipient_created_at_id",
+        notifications.c.recipient_id, notifications.c.created_at, notifications.c.id,
+        postgresql_where=text("is_read = false"),
+        sqlite_where=text("is_read = 0"),
+    ),
+    # A project's conversation in order
+    Index(
+        "ix_project_messages_project_created_at_id",
+        project_messages.c.project_id, project_messages.c.created_at, project_messages.c.id,
+    ),
+]
+
+
+def upgrade(connection: Connection) -> None:
+    for index in sorted(INDEXES, key=lambda ix: (ix.table.name, ix.name)):
+        index.create(connection, checkfirst=True)
@@ -0,0 +1,22 @@
+"""
+Request duration and response size on system_logs.
+
+Both columns are nullable: rows written before this migration have
+neither.
+"""
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+
+COLUMNS = {
+    "duration_ms": "FLOAT",
+    "response_size": "INTEGER",
+}
+
+
+def upgrade(connection: Connection) -> None:
+    existing = {column["name"] for column in inspect(connection).get_columns("system_logs")}
+    for name, type_ in COLUMNS.items():
+        if name not in existing:
+            connection.execute(text(f"ALTER TABLE system_logs ADD COLUMN {name} {type_}"))
@@ -0,0 +1,28 @@
+"""
+Per-user unread notification counter on users, backfilled from the
+notifications table.
+
+The counter is maintained from then on by app.utils.notifications.
+"""
+
+from sqlalchemy import column, false, func, inspect, select, table, text, update
+from sqlalchemy.engine import Connection
+
+
+users = table("users", column("id"), column("unread_notification_count"))
+notifications = table("notifications", column("recipient_id"), column("is_read"))
+
+
+def upgrade(connection: Connection) -> None:
+    existing = {c["name"] for c in inspect(connection).get_columns("users")}
+    if "unread_notification_count" not in existing:
+        connection.execute(text(
+            "ALTER TABLE users ADD COLUMN unread_notification_count INTEGER NOT NULL DEFAULT 0"
+        ))
+
+    unread = (
+        select(func.count())
+        .where(notifications.c.recipient_id == users.c.id, notifications.c.is_read == false())
+        .scalar_subquery()
+    )
+    connection.execute(update(users).values(unread_notification_count=unread))
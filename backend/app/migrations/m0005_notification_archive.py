@@ -0,0 +1,14 @@
+"""
+Archive timestamp on notifications.
+
+Nullable: notifications stored before this migration are not archived.
+"""
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+
+def upgrade(connection: Connection) -> None:
+    existing = {column["name"] for column in inspect(connection).get_columns("notifications")}
+    if "archived_at" not in existing:
+        connection.execute(text("ALTER TABLE notifications ADD COLUMN archived_at TIMESTAMP WITH TIME ZONE"))
@@ -0,0 +1,34 @@
+"""
+The outbox_events table, queue of side effects for the outbox worker.
+"""
+
+from sqlalchemy import JSON, Column, DateTime, Index, Integer, MetaData, String, Table, Text, func, text
+from sqlalchemy.engine import Connection
+
+
+metadata = MetaData()
+
+outbox_events = Table(
+    "outbox_events", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("kind", String, nullable=False),
+    Column("payload", JSON, nullable=False),
+    Column("status", String, nullable=False),
+    Column("attempts", Integer, nullable=False),
+    Column("available_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+    Column("last_error", Text, nullable=True),
+    Column("created_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+    Column("processed_at", DateTime(timezone=True), nullable=True),
+    # The worker's queue: due pending events, oldest first
+    Index(
+        "ix_outbox_events_pending_available_at_id", "available_at", "id",
+        postgresql_where=text("status = 'pending'"),
+        sqlite_where=text("status = 'pending'"),
+    ),
+)
+
+
+def upgrade(connection: Connection) -> None:
+    outbox_events.create(connection, checkfirst=True)
+    for index in outbox_events.indexes:
+        index.create(connection, checkfirst=True)
@@ -0,0 +1,37 @@
+"""
+Coalescing columns on notifications: group_key, count and updated_at,
+and the index that finds a recipient's latest row of a group.
+
+Notifications stored before this migration have no group and count 1.
+"""
+
+from sqlalchemy import Column, Index, Integer, MetaData, String, Table, inspect, text
+from sqlalchemy.engine import Connection
+
+
+notifications = Table(
+    "notifications", MetaData(),
+    Column("id", Integer),
+    Column("recipient_id", Integer),
+    Column("group_key", String),
+)
+
+# A recipient's latest notification of a coalescing group
+recipient_group_key_index = Index(
+    "ix_notifications_recipient_group_key_id",
+    notifications.c.recipient_id, notifications.c.group_key, notifications.c.id,
+    postgresql_where=text("group_key IS NOT NULL"),
+    sqlite_where=text("group_key IS NOT NULL"),
+)
+
+
+def upgrade(connection: Connection) -> None:
+    existing = {column["name"] for column in inspect(connection).get_columns("notifications")}
+    if "group_key" not in existing:
+        connection.execute(text("ALTER TABLE notifications ADD COLUMN group_key VARCHAR"))
+    if "count" not in existing:
+        connection.execute(text("ALTER TABLE notifications ADD COLUMN count INTEGER NOT NULL DEFAULT 1"))
+    if "updated_at" not in existing:
+        connection.execute(text("ALTER TABLE notifications ADD COLUMN updated_at TIMESTAMP WITH TIME ZONE"))
+
+    recipient_group_key_index.create(connection, checkfirst=True)
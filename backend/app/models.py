@@ -19,6 +19,8 @@ class User(Base):
     role = Column(Enum(UserRole), nullable=False, default=UserRole.student)
     is_active = Column(Boolean, nullable=False, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Kept in step with notifications by app.utils.notifications
+    unread_notification_count = Column(Integer, nullable=False, default=0, server_default="0")
 
     # One-to-one relationship with StudentProfile
     student_profile = relationship(
@@ -119,6 +121,19 @@ class Project(Base):
 
     __tablename__ = "projects"
 
+    # Newest-first listings: open projects (partial), an organization's
+    # own, and all; per-status counts for an organization's dashboard
+    __table_args__ = (
+        Index(
+            "ix_projects_open_created_at_id", "created_at", "id",
+            postgresql_where=text("status = 'open'"),
+            sqlite_where=text("status = 'open'"),
+        ),
+        Index("ix_projects_organization_created_at_id", "organization_id", "created_at", "id"),
+        Index("ix_projects_created_at_id", "created_at", "id"),
+        Index("ix_projects_organization_status", "organization_id", "status"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
 
     # Linked to organization user
@@ -160,6 +175,11 @@ class Application(Base):
 
     __table_args__ = (
         UniqueConstraint("student_id", "project_id", name="uq_student_project"),
+        # A project's applications, newest first
+        Index("ix_applications_project_created_at_id", "project_id", "created_at", "id"),
+        # A student's applications by status; a project's accepted / pending ones
+        Index("ix_applications_student_status", "student_id", "status"),
+        Index("ix_applications_project_status", "project_id", "status"),
     )
 
     id = Column(Integer, primary_key=True, index=True)
@@ -223,7 +243,11 @@ class Feedback(Base):
     Represents feedback submitted by a student or org for a completed project.
     """
     __tablename__ = "feedback"
-    __table_args__ = (UniqueConstraint("user_id", "project_id", name="uq_user_project_feedback"),)
+    # The unique constraint's index also serves lookups by user_id alone
+    __table_args__ = (
+        UniqueConstraint("user_id", "project_id", name="uq_user_project_feedback"),
+        Index("ix_feedback_project_id", "project_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
@@ -249,6 +273,8 @@ class SystemLog(Base):
     method = Column(String, nullable=False)
     status_code = Column(Integer, nullable=True)
     timestamp = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    duration_ms = Column(Float, nullable=True)     # request start → last body chunk sent
+    response_size = Column(Integer, nullable=True)  # response body bytes
 
 class Notification(Base):
     """
@@ -256,11 +282,38 @@ class Notification(Base):
     """
     __tablename__ = "notifications"
 
+    # created_at comes back with the INSERT, for the stream's payload
+    __mapper_args__ = {"eager_defaults": True}
+
+    # A user's notifications newest first, and just the unread ones
+    __table_args__ = (
+        Index("ix_notifications_recipient_created_at_id", "recipient_id", "created_at", "id"),
+        Index(
+            "ix_notifications_unread_recipient_created_at_id", "recipient_id", "created_at", "id",
+            postgresql_where=text("is_read = false"),
+            sqlite_where=text("is_read = 0"),
+        ),
+        # A recipient's latest notification of a coalescing group
+        Index(
+            "ix_notifications_recipient_group_key_id", "recipient_id", "group_key", "id",
+            postgresql_where=text("group_key IS NOT NULL"),
+            sqlite_where=text("group_key IS NOT NULL"),
+        ),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     recipient_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     message = Column(String, nullable=False)
     is_read = Column(Boolean, default=False, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    archived_at = Column(DateTime(timezone=True), nullable=True)  # hidden from the inbox once set
+
+    # Coalescing (see app.utils.notifications.create_notification): events
+    # with the same group_key fold into one row, which keeps the latest
+    # message and counts the events it stands for
+    group_key = Column(String, nullable=True)
+    count = Column(Integer, nullable=False, default=1, server_default="1")
+    updated_at = Column(DateTime(timezone=True), nullable=True)  # last event folded in
 
     # Relationship back to User (recipient)
     recipient = relationship("User", back_populates="notifications")
@@ -272,6 +325,11 @@ class ProjectMessage(Base):
     """
     __tablename__ = "project_messages"
 
+    # A project's conversation in order
+    __table_args__ = (
+        Index("ix_project_messages_project_created_at_id", "project_id", "created_at", "id"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(
         Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False
@@ -284,4 +342,86 @@ class ProjectMessage(Base):
 
     # Relationships
     project = relationship("Project", back_populates="messages")
-    sender = relationship("User")
\ No newline at end of file
+    sender = relationship("User")
+
+class StudentStats(Base):
+    """
+    Materialized per-student history counters.
+
+    Maintained transactionally by the write paths that change a student's
+    history (applying, application decisions, deliverable reviews, project
+    completion, feedback) so reads are a primary-key lookup instead of
+    joins. Rebuild with: python -m app.cli rebuild-student-stats
+    """
+    __tablename__ = "student_stats"
+
+    student_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    applications_submitted = Column(Integer, nullable=False, default=0)
+    accepted_applications = Column(Integer, nullable=False, default=0)
+    completed_projects = Column(Integer, nullable=False, default=0)
+    accepted_deliverables = Column(Integer, nullable=False, default=0)
+    rating_sum = Column(Integer, nullable=False, default=0)
+    rating_count = Column(Integer, nullable=False, default=0)
+
+    # Applications inside the recent-activity window, and when the oldest of
+    # them drops out of it (after which the count must be recomputed)
+    recent_applications = Column(Integer, nullable=False, default=0)
+    recent_window_expires_at = Column(DateTime(timezone=True), nullable=True)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class RecommendationSnapshot(Base):
+    """
+    One precomputed recommendation: a project ranked for a student.
+
+    Written in bulk by the offline job (python -m app.cli
+    precompute-recommendations) and served by GET /recommendations when
+    RECOMMENDATION_SNAPSHOTS_ENABLED is set. Each student's rows are
+    replaced as a whole on every run.
+    """
+    __tablename__ = "recommendation_snapshots"
+
+    student_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    rank = Column(Integer, primary_key=True)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    title = Column(String, nullable=False)
+    match_score = Column(Float, nullable=False)
+    skill_score = Column(Float, nullable=False)
+    experience_score = Column(Float, nullable=False)
+    interest_score = Column(Float, nullable=False)
+    activity_score = Column(Float, nullable=False)
+    success_score = Column(Float, nullable=False)
+
+    # Rankings are truncated to the job's depth; complete is True when the
+    # student's whole ranking fit, so requests without top_n can be served
+    complete = Column(Boolean, nullable=False, default=True)
+    generated_at = Column(DateTime(timezone=True), nullable=False)
+
+
+class OutboxEvent(Base):
+    """
+    A side effect (notification fan-out, and later emails or webhooks)
+    written in the same transaction as the change that causes it, and
+    carried out afterwards by the outbox worker (app.services.outbox).
+    """
+    __tablename__ = "outbox_events"
+
+    # The worker's queue: due pending events, oldest first
+    __table_args__ = (
+        Index(
+            "ix_outbox_events_pending_available_at_id", "available_at", "id",
+            postgresql_where=text("status = 'pending'"),
+            sqlite_where=text("status = 'pending'"),
+        ),
+    )
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String, nullable=False)          # selects the handler
+    payload = Column(JSON, nullable=False)
+    status = Column(String, nullable=False, default="pending")  # pending, done, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    available_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)  # next try
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    processed_at = Column(DateTime(timezone=True), nullable=True)
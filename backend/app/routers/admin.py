@@ -1,24 +1,41 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
-from app.database import get_db
-from app.models import Project, User, SystemLog
+from app.database import get_db, get_read_db
+from app.models import Application, Project, User, SystemLog
 from app.schemas.project import ProjectRead
 from app.core.dependencies import require_role
+from app.middleware.logging_middleware import log_writer
+from app.services.notification_broker import notification_broker
+from app.services.outbox import outbox_stats
+from app.services.password_hasher import password_hasher
+from app.services.principal_cache import principal_cache
+from app.services.project_index import project_index
+from app.services.recommendation_cache import recommendation_cache
+from app.services.recommendation_snapshots import discard_snapshots
+from app.utils.pagination import keyset_page
+from app.utils.student_metrics import refresh_student_stats
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
 
 @router.get("/projects", response_model=list[ProjectRead])
 def admin_get_all_projects(
-    db: Session = Depends(get_db),
+    response: Response,
+    cursor: str | None = None,
+    limit: int | None = Query(default=None, ge=1, description="Page size; all projects when omitted"),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_role("admin"))
 ):
     """
     Returns all projects regardless of status.
 
     Admins can see all projects, including disabled ones, for oversight and management purposes.
+    With a limit, pages are chained through the X-Next-Cursor header.
     """
-    return db.query(Project).order_by(Project.created_at.desc()).all()
+    return keyset_page(
+        db.query(Project), Project, kind="admin_projects", response=response,
+        cursor=cursor, limit=limit,
+    )
 
 
 @router.delete("/listings/{project_id}", status_code=status.HTTP_200_OK)
@@ -37,7 +54,22 @@ def disable_project(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
 
     project.status = "disabled"
+    # A completed project no longer counts towards its students' history
+    accepted_students = [
+        student_id for (student_id,) in
+        db.query(Application.student_id).filter(
+            Application.project_id == project_id, Application.status == "accepted"
+        )
+    ]
+    refresh_student_stats(db, accepted_students)
+    discard_snapshots(db, accepted_students)
     db.commit()
+
+    # Removing an open project bumps the index epoch, which invalidates every
+    # cached ranking; a completed or closed one was never in the index, so
+    # its students' rankings (which counted it) are invalidated explicitly
+    project_index.remove(project_id)
+    recommendation_cache.invalidate_students(accepted_students)
     return {"detail": f"Project {project_id} has been disabled"}
 
 
@@ -60,19 +92,91 @@ def update_user_status(
 
     user.is_active = is_active
     db.commit()
+
+    # Cached principals carry is_active; drop it so the change applies at once
+    principal_cache.invalidate_user(user_id)
     return {"detail": f"User {user_id} is_active set to {is_active}"}
 
 @router.get("/logs")
 def get_system_logs(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_role("admin"))
 ):
+    # Include requests still waiting in this worker's log queue (on a
+    # replica they show up once replicated)
+    log_writer.flush(timeout=5)
     return db.query(SystemLog).order_by(SystemLog.timestamp.desc()).limit(500).all()
 
 
 @router.get("/users")
 def get_all_users(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_role("admin"))
 ):
     return db.query(User).order_by(User.created_at.desc()).all()
+
+
+@router.get("/metrics/recommendation-cache")
+def get_recommendation_cache_metrics(
+    current_user: User = Depends(require_role("admin"))
+):
+    """
+    Returns hit/miss counters of this worker's recommendation cache.
+    """
+    return recommendation_cache.stats()
+
+
+@router.get("/metrics/notification-broker")
+def get_notification_broker_metrics(
+    current_user: User = Depends(require_role("admin"))
+):
+    """
+    Returns open notification streams and publish / delivery counters of
+    this worker's notification broker.
+    """
+    return notification_broker.stats()
+
+
+@router.get("/metrics/outbox")
+def get_outbox_metrics(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_role("admin"))
+):
+    """
+    Returns outbox events per status and how long the oldest pending one
+    has waited — a growing backlog means the outbox worker is down or
+    behind.
+    """
+    return outbox_stats(db)
+
+
+@router.get("/metrics/password-hasher")
+def get_password_hasher_metrics(
+    current_user: User = Depends(require_role("admin"))
+):
+    """
+    Returns queue depth, rejections and latency of this worker's
+    password-hashing pool.
+    """
+    return password_hasher.stats()
+
+
+@router.get("/metrics/principal-cache")
+def get_principal_cache_metrics(
+    current_user: User = Depends(require_role("admin"))
+):
+    """
+    Returns hit/miss counters of this worker's authenticated-user cache.
+    """
+    return principal_cache.stats()
+
+
+@router.get("/metrics/system-log-writer")
+def get_system_log_writer_metrics(
+    current_user: User = Depends(require_role("admin"))
+):
+    """
+    Returns queue depth and write / sampling / drop counters of this
+    worker's request-log writer.
+    """
+    return log_writer.stats()
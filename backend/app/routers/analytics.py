@@ -2,17 +2,18 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 
-from app.database import get_db
-from app.models import User, Project, Application, Feedback
+from app.database import get_read_db
+from app.models import User, Project, Application
 from app.schemas.analytics import StudentAnalytics, OrganizationAnalytics
 from app.core.dependencies import require_role
+from app.utils.student_metrics import get_student_metrics
 
 router = APIRouter(prefix="/analytics", tags=["Analytics"])
 
 
 @router.get("/student", response_model=StudentAnalytics)
 def get_student_analytics(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_role("student")),
 ):
     """
@@ -26,52 +27,22 @@ def get_student_analytics(
 
     RBAC: student role only.
     """
-    applications_submitted = (
-        db.query(func.count(Application.id))
-        .filter(Application.student_id == current_user.id)
-        .scalar()
-    )
-
-    accepted_applications = (
-        db.query(func.count(Application.id))
-        .filter(
-            Application.student_id == current_user.id,
-            Application.status == "accepted",
-        )
-        .scalar()
-    )
-
-    completed_projects = (
-        db.query(func.count(Application.id))
-        .join(Project, Project.id == Application.project_id)
-        .filter(
-            Application.student_id == current_user.id,
-            Application.status == "accepted",
-            Project.status == "completed",
-        )
-        .scalar()
-    )
-
-    avg_rating_result = (
-        db.query(func.avg(Feedback.rating))
-        .filter(Feedback.user_id == current_user.id)
-        .scalar()
-    )
+    metrics = get_student_metrics(db, current_user.id)
     average_feedback_rating = (
-        round(float(avg_rating_result), 2) if avg_rating_result is not None else None
+        round(metrics.average_rating, 2) if metrics.average_rating is not None else None
     )
 
     return StudentAnalytics(
-        applications_submitted=applications_submitted,
-        accepted_applications=accepted_applications,
-        completed_projects=completed_projects,
+        applications_submitted=metrics.applications_submitted,
+        accepted_applications=metrics.accepted_applications,
+        completed_projects=metrics.completed_projects,
         average_feedback_rating=average_feedback_rating,
     )
 
 
 @router.get("/organization", response_model=OrganizationAnalytics)
 def get_organization_analytics(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_role("organization")),
 ):
     """
@@ -8,6 +8,11 @@ from app.schemas.application import ApplicationCreate, ApplicationRead, Applicat
 from app.schemas.deliverable import DeliverableCreate, DeliverableRead
 from app.core.dependencies import require_role
 from app.utils.notifications import create_notification
+from app.services.outbox import notify_many
+from app.services.project_index import project_index
+from app.services.recommendation_cache import recommendation_cache
+from app.services.recommendation_snapshots import discard_snapshots
+from app.utils.student_metrics import refresh_student_stats
 
 router = APIRouter(
     prefix="/applications",
@@ -59,6 +64,8 @@ def apply_to_project(
     db.add(application)
 
     try:
+        refresh_student_stats(db, [current_user.id])
+        discard_snapshots(db, [current_user.id])
         db.commit()
         db.refresh(application)
     except IntegrityError:
@@ -70,6 +77,8 @@ def apply_to_project(
             detail="You have already applied to this project"
         )
 
+    # A new application changes the student's activity signal
+    recommendation_cache.invalidate_student(current_user.id)
     return application
 
 @router.get("/me", response_model=List[ApplicationRead], status_code=status.HTTP_200_OK)
@@ -200,15 +209,24 @@ def update_application_status(
         application.status = "accepted"
 
         # Reject all other pending applications for this project
-        db.query(Application).filter(
+        other_pending = db.query(Application).filter(
             Application.project_id == project.id,
             Application.id != application.id,
             Application.status == "pending"
-        ).update(
+        )
+        auto_rejected = [student_id for (student_id,) in other_pending.with_entities(Application.student_id)]
+        other_pending.update(
             {"status": "rejected"},
             synchronize_session=False
         )
 
+        # Tell them too — fanned out by the outbox worker
+        notify_many(
+            db,
+            auto_rejected,
+            f"Your application for '{project.title}' has been rejected: another applicant was selected."
+        )
+
         # Close the project
         project.status = "closed"
 
@@ -226,9 +244,19 @@ def update_application_status(
 
     create_notification(db, recipient_id=application.student_id, message=message)
 
+    # Keep the student's materialized history counters in step
+    refresh_student_stats(db, [application.student_id])
+    discard_snapshots(db, [application.student_id])
+
     db.commit()
     db.refresh(application)
 
+    recommendation_cache.invalidate_student(application.student_id)
+
+    # An acceptance closes the project — drop it from recommendations
+    if new_status == "accepted":
+        project_index.remove(project.id)
+
     return application
 
 @router.post(
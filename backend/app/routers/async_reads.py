@@ -0,0 +1,161 @@
+"""
+async_reads.py
+==============
+Async implementations of the hottest read endpoints, served on the async
+engine (ASYNC_DATABASE_URL):
+
+- GET /projects
+- GET /notifications
+- GET /recommendations
+- GET /projects/{project_id}/messages
+
+Sync endpoints run in Starlette's threadpool, one thread per in-flight
+request, which caps how many of them a worker serves concurrently. These
+await the database on the event loop instead, so concurrency is bounded
+by the connection pool, not the threadpool.
+
+main.py registers this router ahead of the sync ones only when
+ASYNC_DATABASE_URL is set; routes are matched in registration order, so
+these then shadow their sync twins. Behaviour, parameters and responses
+are the same as the sync endpoints — filters and checks are shared with
+them where possible.
+"""
+
+from typing import List, Literal, Optional
+
+from anyio import to_thread
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import false, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.core.dependencies import (
+    get_current_user_async,
+    require_project_participant_async,
+    require_role_async,
+)
+from app.database import get_async_db
+from app.models import Notification, Project, ProjectMessage
+from app.routers.recommendations import lookup_recommendations, rank_and_cache, to_items
+from app.schemas.message import MessageRead
+from app.schemas.notification import NotificationRead
+from app.schemas.project import ProjectRead
+from app.schemas.recommendation import RecommendationItem
+from app.services.batch_scoring import ProjectMatrix
+from app.services.principal_cache import Principal
+from app.services.project_index import open_projects_statement, project_index
+from app.services.project_search import apply_fulltext_search, keyword_filter
+from app.utils.pagination import keyset_page_async
+
+router = APIRouter()
+
+
+@router.get("/projects", response_model=List[ProjectRead], tags=["Projects"])
+async def get_projects(
+    response: Response,
+    search: str | None = None,
+    mode: Literal["keyword", "fulltext"] = "keyword",
+    cursor: str | None = None,
+    skip: int = 0,
+    limit: int = 10,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Async GET /projects; see projects.get_projects."""
+    statement = select(Project).where(Project.status == "open")
+
+    if search and mode == "fulltext":
+        if cursor is not None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor pagination is not supported for full-text search"
+            )
+
+        statement = apply_fulltext_search(statement, search, dialect=db.get_bind().dialect.name)
+        return (await db.scalars(statement.offset(skip).limit(limit))).all()
+
+    elif search:
+        statement = statement.where(keyword_filter(search))
+
+    return await keyset_page_async(
+        db, statement, Project, kind="projects", response=response,
+        cursor=cursor, skip=skip, limit=limit,
+    )
+
+
+@router.get("/notifications", response_model=List[NotificationRead], tags=["Notifications"])
+async def get_notifications(
+    response: Response,
+    unread_only: bool = False,
+    archived: bool = False,
+    cursor: str | None = None,
+    limit: Optional[int] = Query(default=None, ge=1, description="Page size; all notifications when omitted"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_async)
+):
+    """Async GET /notifications; see notifications.get_notifications."""
+    statement = select(Notification).where(
+        Notification.recipient_id == current_user.id,
+        Notification.archived_at.is_not(None) if archived else Notification.archived_at.is_(None),
+    )
+    if unread_only:
+        statement = statement.where(Notification.is_read == false())
+
+    return await keyset_page_async(
+        db, statement, Notification, kind="notifications", response=response,
+        cursor=cursor, limit=limit,
+    )
+
+
+@router.get("/recommendations", response_model=List[RecommendationItem], tags=["Recommendations"])
+async def get_recommendations(
+    top_n: Optional[int] = Query(default=None, ge=1, le=100, description="Limit results to top N matches"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(require_role_async("student")),
+):
+    """
+    Async GET /recommendations; see recommendations.get_recommendations.
+
+    The project index is refreshed with rows read on the async engine,
+    but tokenised, encoded and locked in a worker thread: a rebuild is
+    O(open projects) and its lock is shared with the threadpool's
+    requests, so neither may hold up the event loop. The remaining
+    lookups (profile, cache, snapshot, metrics) go through the shared sync
+    helper via run_sync, and ranking, CPU-bound numpy work, runs in a
+    worker thread too.
+    """
+    project_matrix, project_epoch = await _project_matrix(db)
+    ranked, pending = await db.run_sync(
+        lookup_recommendations, current_user.id, top_n, project_matrix, project_epoch
+    )
+    if ranked is None:
+        ranked = await to_thread.run_sync(rank_and_cache, current_user.id, top_n, *pending)
+
+    return to_items(ranked)
+
+
+async def _project_matrix(db: AsyncSession) -> tuple[ProjectMatrix, int]:
+    """project_index.matrix_and_epoch for the async engine; only the query runs on the loop."""
+    while True:
+        rows = None
+        if project_index.expired:
+            rows = (await db.execute(open_projects_statement())).all()
+        indexed = await to_thread.run_sync(project_index.matrix_from_rows, rows)
+        if indexed is not None:
+            return indexed
+
+
+@router.get("/projects/{project_id}/messages", response_model=List[MessageRead], tags=["Messages"])
+async def get_messages(
+    project_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(require_project_participant_async)
+):
+    """Async GET /projects/{project_id}/messages; see messages.get_messages."""
+    statement = (
+        select(ProjectMessage)
+        .where(ProjectMessage.project_id == project_id)
+        .order_by(ProjectMessage.created_at.asc())
+        # The response embeds the sender; lazy loads can't run under asyncio
+        .options(selectinload(ProjectMessage.sender))
+    )
+    return (await db.scalars(statement)).all()
@@ -1,36 +1,59 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models import User
 from app.schemas.user import UserCreate, LoginRequest, TokenResponse
-from app.utils.security import hash_password, verify_password
 from app.core.auth import create_access_token
 from app.core.dependencies import get_current_user, require_role
 from app.schemas.user import UserRole
+from app.services.password_hasher import HasherBusy, password_hasher
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
+def _hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many sign-ins in progress, please retry",
+        headers={"Retry-After": "1"},
+    )
+
+
+# Both endpoints are async so that bcrypt (~250 ms of CPU) is awaited on
+# the password hasher's process pool without holding a threadpool thread
+# or a database connection; their short database calls are handed to the
+# threadpool instead.
+
 @router.post("/register", status_code=201)
-def register(
+async def register(
     user: UserCreate, 
     db: Session = Depends(get_db)):
     """
     Registers a new user.
 
     - Ensures email is unique
-    - Hashes password before storing
+    - Hashes password before storing (503 if the hasher is saturated)
     - Returns only safe fields (email + role)
     """
 
+    def email_taken():
+        taken = db.query(User.id).filter(User.email == user.email).first() is not None
+        # End the read so no pooled connection is held while bcrypt runs
+        db.rollback()
+        return taken
+
     # Check if email already exists
-    existing_user = db.query(User).filter(User.email == user.email).first()
-    if existing_user:
+    if await run_in_threadpool(email_taken):
         raise HTTPException(status_code=409, detail="Email already registered")
 
     # Hash the password before storing
-    hashed_password = hash_password(user.password)
+    try:
+        hashed_password = await password_hasher.hash(user.password)
+    except HasherBusy:
+        raise _hasher_busy()
 
     # Create the user
     new_user = User(
@@ -40,24 +63,45 @@ def register(
         name=user.name
     )
 
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    def save():
+        db.add(new_user)
+        db.commit()
+        db.refresh(new_user)
+        # tests expect email and no password in response
+        return {"email": new_user.email, "role": new_user.role}
 
-    # tests expect email and no password in response
-    return {"email": new_user.email, "role": new_user.role}
+    return await run_in_threadpool(save)
 
 @router.post("/login", response_model=TokenResponse)
-def login(data: LoginRequest, db: Session = Depends(get_db)):
+async def login(data: LoginRequest, db: Session = Depends(get_db)):
     """
     Authenticates a user and returns a JWT access token.
+
+    A password hashed with an outdated bcrypt cost is re-hashed at the
+    current BCRYPT_ROUNDS on successful login.
     """
 
+    def find_user():
+        found = db.query(User).filter(User.email == data.email).first()
+        # Detach with its loaded columns and end the read, so no pooled
+        # connection is held while bcrypt runs
+        if found:
+            db.expunge(found)
+        db.rollback()
+        return found
+
     # Find the user by email
-    user = db.query(User).filter(User.email == data.email).first()
+    user = await run_in_threadpool(find_user)
 
     # Validate credentials
-    if not user or not verify_password(data.password, user.hashed_password):
+    verified, new_hash = False, None
+    if user:
+        try:
+            verified, new_hash = await password_hasher.verify_and_update(data.password, user.hashed_password)
+        except HasherBusy:
+            raise _hasher_busy()
+
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials"
@@ -67,6 +111,14 @@ def login(data: LoginRequest, db: Session = Depends(get_db)):
     token_data = {"user_id": user.id, "role": user.role.value, "name": user.name}
     access_token = create_access_token(token_data)
 
+    # Transparent upgrade to the current cost factor
+    if new_hash:
+        def store_hash():
+            db.execute(update(User).where(User.id == user.id).values(hashed_password=new_hash))
+            db.commit()
+
+        await run_in_threadpool(store_hash)
+
     return {
         "access_token": access_token,
         "token_type": "bearer"
@@ -7,6 +7,9 @@ from app.models import Deliverable, Application, Project, User
 from app.schemas.deliverable import DeliverableReview, DeliverableRead
 from app.core.dependencies import require_role
 from app.utils.notifications import create_notification
+from app.services.recommendation_cache import recommendation_cache
+from app.services.recommendation_snapshots import discard_snapshots
+from app.utils.student_metrics import refresh_student_stats
 
 router = APIRouter(
     prefix="/deliverables",
@@ -101,9 +104,14 @@ def review_deliverable(
         message=f"Your deliverable for '{project.title}' has been {new_status}."
     )
 
+    # Keep the student's materialized history counters in step
+    refresh_student_stats(db, [application.student_id])
+    discard_snapshots(db, [application.student_id])
+
     db.commit()
     db.refresh(deliverable)
 
+    recommendation_cache.invalidate_student(application.student_id)
     return deliverable
 
 @router.get("/projects/{project_id}", response_model=list[DeliverableRead])
@@ -3,7 +3,11 @@ from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models import Feedback, Project, User
 from app.utils.badges import award_badges
+from app.services.recommendation_cache import recommendation_cache
+from app.services.recommendation_snapshots import discard_snapshots
+from app.utils.student_metrics import refresh_student_stats
 from app.schemas.feedback import FeedbackCreate, FeedbackRead
+from app.schemas.user import UserRole
 from app.core.dependencies import get_current_user
 
 router = APIRouter(prefix="/feedback", tags=["Feedback"])
@@ -50,10 +54,17 @@ def submit_feedback(
         comment=feedback_data.comment
     )
     db.add(feedback)
+    # Keep the author's materialized rating totals in step (students only:
+    # student_stats has no rows for other roles)
+    if current_user.role == UserRole.student:
+        refresh_student_stats(db, [feedback.user_id])
+        discard_snapshots(db, [feedback.user_id])
     # Recompute badges since rating may have changed badge eligibility
     award_badges(feedback.user_id, db)
     db.commit()
     db.refresh(feedback)
+
+    recommendation_cache.invalidate_student(feedback.user_id)
     return feedback
 
 
@@ -74,6 +74,8 @@ def send_message(
             db,
             recipient_id=recipient_id,
             message=f"💬 New message in '{project.title}': {preview}",
+            # One notification per conversation while it stays unread
+            group_key=f"messages:{project_id}",
         )
 
     db.commit()
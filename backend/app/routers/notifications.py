@@ -1,40 +1,178 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+import json
+import os
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import false, or_, select
 from sqlalchemy.orm import Session
-from typing import List
+from typing import AsyncIterator, List, Optional
 
 from app.database import get_db
 from app.models import Notification, User
-from app.schemas.notification import NotificationRead
-from app.core.dependencies import get_current_user
+from app.schemas.notification import (
+    NotificationBulkResult,
+    NotificationRead,
+    NotificationSelection,
+    UnreadCountRead,
+)
+from app.core.dependencies import get_current_user, get_stream_user
+from app.services.notification_broker import Subscription, notification_broker
+from app.services.principal_cache import Principal
+from app.utils.notifications import archive_notifications, delete_notifications, mark_notifications_read
+from app.utils.pagination import keyset_page
 
 router = APIRouter(prefix="/notifications", tags=["Notifications"])
 
+# Comment line sent on idle streams so proxies don't time them out
+SSE_KEEPALIVE_SECONDS = float(os.getenv("SSE_KEEPALIVE_SECONDS", "15"))
+# Most notifications replayed to a client reconnecting with Last-Event-ID
+SSE_REPLAY_LIMIT = int(os.getenv("SSE_REPLAY_LIMIT", "100"))
+# Reconnection delay suggested to EventSource clients
+SSE_RETRY_MS = 3000
+
 
 @router.get("", response_model=List[NotificationRead], status_code=status.HTTP_200_OK)
 def get_notifications(
+    response: Response,
+    unread_only: bool = False,
+    archived: bool = False,
+    cursor: str | None = None,
+    limit: Optional[int] = Query(default=None, ge=1, description="Page size; all notifications when omitted"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-    Returns all notifications for the authenticated user.
+    Returns notifications for the authenticated user.
 
     Business Rules:
     - Any authenticated user may access this endpoint (student or organization).
     - Returns only notifications belonging to the current user.
     - Results ordered newest-first.
+    - unread_only=true returns only unread notifications.
+    - Archived notifications are left out; archived=true lists only them.
+    - With a limit, pages are chained through the X-Next-Cursor header.
     - Returns empty list if no notifications exist — not a 404.
 
     Raises:
     - 401 if no valid JWT token provided
+    - 400 if the cursor is invalid
     """
 
-    notifications = (
-        db.query(Notification)
-        .filter(Notification.recipient_id == current_user.id)
-        .order_by(Notification.created_at.desc(), Notification.id.desc())        .all()
+    query = db.query(Notification).filter(
+        Notification.recipient_id == current_user.id,
+        Notification.archived_at.is_not(None) if archived else Notification.archived_at.is_(None),
+    )
+
+    if unread_only:
+        # Spelled to match the partial index's predicate (is_read = false)
+        query = query.filter(Notification.is_read == false())
+
+    return keyset_page(
+        query, Notification, kind="notifications", response=response,
+        cursor=cursor, limit=limit,
+    )
+
+
+def _unread_count(db: Session, user_id: int) -> int:
+    return db.query(User.unread_notification_count).filter(User.id == user_id).scalar() or 0
+
+
+@router.get("/unread-count", response_model=UnreadCountRead, status_code=status.HTTP_200_OK)
+def get_unread_count(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Returns how many unread notifications the authenticated user has.
+
+    Served from the user's counter (users.unread_notification_count), a
+    primary-key lookup, so polling it does not scan notifications.
+
+    Raises:
+    - 401 if no valid JWT token provided
+    """
+
+    return {"unread_count": _unread_count(db, current_user.id)}
+
+
+@router.post("/read", response_model=NotificationBulkResult, status_code=status.HTTP_200_OK)
+def bulk_mark_read(
+    selection: NotificationSelection,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Marks many notifications read in one request.
+
+    Business Rules:
+    - Body names either `ids` or `up_to_id` (that notification and every
+      older one — e.g. the newest one the client has shown).
+    - Only the current user's notifications are affected; other ids are ignored.
+    - Already-read notifications are left as they are.
+    - Runs as one UPDATE; returns how many changed and the new unread count.
+
+    Raises:
+    - 401 if no valid JWT token provided
+    - 422 if the body names both or neither selector
+    """
+
+    affected = mark_notifications_read(
+        db, current_user.id, ids=selection.ids, up_to_id=selection.up_to_id
+    )
+    db.commit()
+
+    return {"affected": affected, "unread_count": _unread_count(db, current_user.id)}
+
+
+@router.post("/archive", response_model=NotificationBulkResult, status_code=status.HTTP_200_OK)
+def bulk_archive(
+    selection: NotificationSelection,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Archives many notifications in one request: they are marked read and
+    leave the inbox listing (GET /notifications?archived=true lists them).
+
+    Selection and ownership rules as for POST /notifications/read.
+
+    Raises:
+    - 401 if no valid JWT token provided
+    - 422 if the body names both or neither selector
+    """
+
+    affected = archive_notifications(
+        db, current_user.id, ids=selection.ids, up_to_id=selection.up_to_id
+    )
+    db.commit()
+
+    return {"affected": affected, "unread_count": _unread_count(db, current_user.id)}
+
+
+@router.post("/delete", response_model=NotificationBulkResult, status_code=status.HTTP_200_OK)
+def bulk_delete(
+    selection: NotificationSelection,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Permanently deletes many notifications in one request.
+
+    Selection and ownership rules as for POST /notifications/read.
+
+    Raises:
+    - 401 if no valid JWT token provided
+    - 422 if the body names both or neither selector
+    """
+
+    affected = delete_notifications(
+        db, current_user.id, ids=selection.ids, up_to_id=selection.up_to_id
     )
+    db.commit()
 
-    return notifications
+    return {"affected": affected, "unread_count": _unread_count(db, current_user.id)}
 
 
 @router.put("/{notification_id}/read", response_model=NotificationRead, status_code=status.HTTP_200_OK)
@@ -87,4 +225,122 @@ def mark_notification_read(
     db.commit()
     db.refresh(notification)
 
-    return notification
\ No newline at end of file
+    return notification
+
+# ---------------------------------------------------------
+# GET /notifications/stream (Server-Sent Events)
+# ---------------------------------------------------------
+
+def _missed_since(db: Session, recipient_id: int, last_event_id: int) -> tuple[list[dict], bool]:
+    """
+    Inbox notifications with an id above `last_event_id`, or coalesced
+    since that one was created, oldest first, and whether there were
+    more than SSE_REPLAY_LIMIT of them.
+    """
+    since = (
+        select(Notification.created_at)
+        .where(Notification.id == last_event_id, Notification.recipient_id == recipient_id)
+        .scalar_subquery()
+    )
+    rows = (
+        db.query(Notification)
+        .filter(
+            Notification.recipient_id == recipient_id,
+            Notification.archived_at.is_(None),
+            or_(Notification.id > last_event_id, Notification.updated_at >= since),
+        )
+        .order_by(Notification.created_at.asc(), Notification.id.asc())
+        .limit(SSE_REPLAY_LIMIT + 1)
+        .all()
+    )
+    missed = [NotificationRead.model_validate(n).model_dump(mode="json") for n in rows]
+    return missed[:SSE_REPLAY_LIMIT], len(missed) > SSE_REPLAY_LIMIT
+
+
+def _sse_event(notification: dict, with_id: bool = True) -> str:
+    event_id = f"id: {notification['id']}\n" if with_id else ""
+    return f"{event_id}event: notification\ndata: {json.dumps(notification)}\n\n"
+
+
+async def _event_stream(
+    subscription: Subscription, missed: list[dict], truncated: bool, last_event_id: int = 0
+) -> AsyncIterator[str]:
+    try:
+        yield f"retry: {SSE_RETRY_MS}\n\n"
+        if truncated:
+            # Too much to replay: the client should reload with GET /notifications
+            yield "event: resync\ndata: {}\n\n"
+
+        # Ids only ever move the client's Last-Event-ID forward: an update
+        # to an older, coalesced notification is sent without one
+        def send(notification: dict) -> str:
+            nonlocal last_event_id
+            advances = notification["id"] > last_event_id
+            last_event_id = max(last_event_id, notification["id"])
+            return _sse_event(notification, with_id=advances)
+
+        replayed = set()
+        for notification in missed:
+            replayed.add((notification["id"], notification.get("count")))
+            yield send(notification)
+
+        while True:
+            try:
+                notification = await asyncio.wait_for(subscription.get(), SSE_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+
+            if notification is None:
+                # Fell too far behind; the client reconnects with Last-Event-ID
+                return
+            if (notification["id"], notification.get("count")) not in replayed:
+                yield send(notification)
+    finally:
+        subscription.close()
+
+
+@router.get("/stream", response_class=StreamingResponse, status_code=status.HTTP_200_OK)
+async def stream_notifications(
+    last_event_id: int | None = Header(default=None),
+    db: Session = Depends(get_db, scope="function"),
+    current_user: Principal = Depends(get_stream_user)
+):
+    """
+    Streams the authenticated user's new notifications as Server-Sent
+    Events, replacing polling GET /notifications.
+
+    Business Rules:
+    - Each committed notification is sent as an `event: notification`
+      with the notification as JSON data and its id as the event id.
+    - A notification that absorbs another event (coalescing) is sent
+      again with the same id in its data, its new count and message;
+      being older, it carries no event id.
+    - A client reconnecting with Last-Event-ID (EventSource does this
+      itself) first gets the inbox notifications it missed (new or
+      coalesced since), up to SSE_REPLAY_LIMIT; past that it gets an
+      `event: resync` and should reload the list.
+    - The token may be sent as the `access_token` query parameter, for
+      EventSource clients that cannot set headers.
+    - Idle streams get a keep-alive comment every SSE_KEEPALIVE_SECONDS.
+
+    Raises:
+    - 401 if no valid JWT token provided
+    """
+
+    # Subscribe before reading the backlog, so nothing committed in
+    # between is lost (duplicates are filtered out instead)
+    subscription = notification_broker.subscribe(current_user.id)
+    try:
+        missed, truncated = [], False
+        if last_event_id is not None:
+            missed, truncated = await run_in_threadpool(_missed_since, db, current_user.id, last_event_id)
+    except BaseException:
+        subscription.close()
+        raise
+
+    return StreamingResponse(
+        _event_stream(subscription, missed, truncated, last_event_id or 0),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,15 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
+from sqlalchemy import and_
 from sqlalchemy.sql import func
 
-from typing import List
-from app.database import get_db
+from typing import List, Literal, Optional
+from app.database import get_db, get_read_db
 from app.models import Project, User, Application, StudentProfile, Deliverable
 from app.schemas.project import ProjectCreate, ProjectRead
 from app.schemas.application import ApplicationWithStudentRead
+from app.schemas.recommendation import CandidateItem
+from app.schemas.user import UserRole
 from app.core.dependencies import require_role
-from app.utils.notifications import create_notification
+from app.services.matching_engine import build_student_dto, rank_students
+from app.services.outbox import notify_many
+from app.services.project_index import build_project_dto, project_index
+from app.services.project_search import apply_fulltext_search, keyword_filter
+from app.services.recommendation_cache import recommendation_cache
+from app.services.recommendation_snapshots import discard_snapshots
+from app.utils.pagination import keyset_page
+from app.utils.student_metrics import get_student_metrics_bulk, refresh_student_stats
 
 router = APIRouter(prefix="/projects", tags=["Projects"])
 
@@ -31,58 +40,68 @@ def create_project(
     db.add(project)
     db.commit()
     db.refresh(project)
+
+    project_index.upsert(project)
     return project
 
 @router.get("", response_model=List[ProjectRead])
 def get_projects(
+    response: Response,
     search: str | None = None,
+    mode: Literal["keyword", "fulltext"] = "keyword",
+    cursor: str | None = None,
     skip: int = 0,
     limit: int = 10,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Retrieve open projects.
     Supports keyword search across title, description,
     and required_skills with pagination.
+
+    mode=keyword (default) matches substrings, newest first;
+    mode=fulltext uses the full-text index and orders by relevance.
+
+    Newest-first listings are paginated by cursor (X-Next-Cursor header,
+    echoed back as `cursor`) or by skip/limit. Full-text results are
+    ordered by relevance and paginated by skip/limit only.
     """
 
     query = db.query(Project).filter(Project.status.notin_(["disabled"])).filter(Project.status == "open").order_by(Project.created_at.desc())
     
     # Enhanced search
-    if search:
-        keywords = search.strip().split()
-
-        search_filters = []
-
-        for keyword in keywords:
-            term = f"%{keyword}%"
-            search_filters.append(
-                or_(
-                    Project.title.ilike(term),
-                    Project.description.ilike(term),
-                    Project.required_skills.ilike(term)
-                )
+    if search and mode == "fulltext":
+        if cursor is not None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor pagination is not supported for full-text search"
             )
 
-        # Match ALL keywords (AND logic)
-        query = query.filter(and_(*search_filters))
+        query = apply_fulltext_search(query, search)
+        return query.offset(skip).limit(limit).all()
 
-    query = query.order_by(Project.created_at.desc())
+    elif search:
+        query = query.filter(keyword_filter(search))
 
-    projects = query.offset(skip).limit(limit).all()
+    projects = keyset_page(
+        query, Project, kind="projects", response=response,
+        cursor=cursor, skip=skip, limit=limit,
+    )
 
     return projects
 
 @router.get("/me", response_model=List[ProjectRead])
 def get_my_projects(
+    response: Response,
+    cursor: str | None = None,
+    limit: Optional[int] = Query(default=None, ge=1, description="Page size; all projects when omitted"),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_role("organization"))
 ):
-    projects = (
-        db.query(Project)
-        .filter(Project.organization_id == current_user.id)
-        .order_by(Project.created_at.desc())
-        .all()
+    projects = keyset_page(
+        db.query(Project).filter(Project.organization_id == current_user.id),
+        Project, kind="my_projects", response=response,
+        cursor=cursor, limit=limit,
     )
 
     return projects
@@ -90,6 +109,8 @@ def get_my_projects(
 @router.get("/{project_id}/applications", response_model=List[ApplicationWithStudentRead], status_code=status.HTTP_200_OK)
 def get_project_applications(
     project_id: int,
+    response: Response,
+    cursor: str | None = None,
     skip: int = 0,
     limit: int = 10,
     db: Session = Depends(get_db),
@@ -103,7 +124,8 @@ def get_project_applications(
     - Only users with role "organization" may access this endpoint.
     - Project must exist.
     - Organization must own the project.
-    - Results are paginated using skip and limit.
+    - Results are paginated using skip and limit, or by cursor
+      (X-Next-Cursor header, echoed back as `cursor`).
     - Returns application metadata and safe student information.
 
     Raises:
@@ -134,17 +156,113 @@ def get_project_applications(
     # ---------------------------------------------------------
     # Query applications with student + profile join
     # ---------------------------------------------------------
-    applications = (
-        db.query(Application)
-        .filter(Application.project_id == project_id)
-        .order_by(Application.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
+    applications = keyset_page(
+        db.query(Application).filter(Application.project_id == project_id),
+        Application, kind="project_applications", response=response,
+        cursor=cursor, skip=skip, limit=limit,
     )
 
     return applications
 
+@router.get("/{project_id}/candidates", response_model=List[CandidateItem], status_code=status.HTTP_200_OK)
+def get_project_candidates(
+    project_id: int,
+    scope: Literal["applicants", "all"] = Query(
+        default="applicants",
+        description="Rank the project's applicants, or every active student",
+    ),
+    top_n: Optional[int] = Query(default=None, ge=1, le=100, description="Limit results to top N matches"),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(require_role("organization"))
+):
+    """
+    Ranks candidate students for a project the organization owns,
+    using the same match score as student recommendations.
+
+    Business Rules:
+    - Only users with role "organization" may access this endpoint.
+    - Project must exist and be owned by the organization.
+    - scope=applicants (default) ranks students who applied;
+      scope=all ranks every active student.
+    - Only students with a profile can be scored; others are omitted.
+    - Ranked by match score descending; optional top_n (1–100).
+
+    Raises:
+    - 404 if project not found
+    - 403 if organization does not own project
+    """
+
+    project = db.query(Project).filter(Project.id == project_id).first()
+
+    if not project:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+
+    if project.organization_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to view candidates for this project"
+        )
+
+    # ---------------------------------------------------------
+    # Load candidates (profile + application) in one query
+    # ---------------------------------------------------------
+    applied = and_(Application.student_id == User.id, Application.project_id == project_id)
+    query = (
+        db.query(
+            User.id.label("user_id"),
+            User.name,
+            User.email,
+            StudentProfile.skills,
+            StudentProfile.major,
+            StudentProfile.bio,
+            StudentProfile.graduation_year,
+            Application.id.label("application_id"),
+            Application.status.label("application_status"),
+        )
+        .join(StudentProfile, StudentProfile.user_id == User.id)
+    )
+    if scope == "applicants":
+        query = query.join(Application, applied)
+    else:
+        query = query.outerjoin(Application, applied).filter(
+            User.role == UserRole.student,
+            User.is_active.is_(True),
+        )
+    candidates = query.order_by(User.id).all()
+
+    if not candidates:
+        return []
+
+    # ---------------------------------------------------------
+    # All candidate histories from one bulk lookup
+    # ---------------------------------------------------------
+    metrics = get_student_metrics_bulk(db, [c.user_id for c in candidates])
+    students = [build_student_dto(c, metrics[c.user_id]) for c in candidates]
+
+    ranked = rank_students(build_project_dto(project), students, top_n=top_n)
+
+    by_id = {c.user_id: c for c in candidates}
+    return [
+        CandidateItem(
+            student_id=r.student_id,
+            name=by_id[r.student_id].name,
+            email=by_id[r.student_id].email,
+            application_id=by_id[r.student_id].application_id,
+            application_status=by_id[r.student_id].application_status,
+            match_score=r.match_score,
+            rank=r.rank,
+            skill_score=r.skill_score,
+            experience_score=r.experience_score,
+            interest_score=r.interest_score,
+            activity_score=r.activity_score,
+            success_score=r.success_score,
+        )
+        for r in ranked
+    ]
+
 @router.put("/{project_id}/complete", response_model=ProjectRead)
 def complete_project(
     project_id: int,
@@ -216,14 +334,21 @@ def complete_project(
         Application.status == "accepted"
     ).all()
 
-    for app in accepted_applications:
-        create_notification(
-            db,
-            recipient_id=app.student_id,
-            message=f"The project '{project.title}' has been marked complete. Congratulations!"
-        )
+    # Fanned out by the outbox worker, so the request doesn't pay per student
+    notify_many(
+        db,
+        [app.student_id for app in accepted_applications],
+        f"The project '{project.title}' has been marked complete. Congratulations!"
+    )
+
+    # Completion changes every accepted student's completed-project count
+    refresh_student_stats(db, [app.student_id for app in accepted_applications])
+    discard_snapshots(db, [app.student_id for app in accepted_applications])
 
     db.commit()
     db.refresh(project)
 
+    project_index.remove(project.id)
+    recommendation_cache.invalidate_students(app.student_id for app in accepted_applications)
+
     return project
\ No newline at end of file
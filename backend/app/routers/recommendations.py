@@ -1,120 +1,26 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from datetime import datetime, timezone, timedelta
 from typing import List, Optional
 
-from app.database import get_db
-from app.models import (
-    User, StudentProfile, Project,
-    Application, Deliverable, Feedback
-)
+from app.database import get_db, get_read_db
+from app.models import User, StudentProfile
 from app.schemas.recommendation import RecommendationItem
 from app.core.dependencies import require_role
-from app.services.matching_engine import (
-    StudentDTO, ProjectDTO, rank_projects, parse_skills
-)
+from app.services.batch_scoring import ProjectMatrix
+from app.services.matching_engine import ScoredProject, StudentDTO, build_student_dto, rank_project_matrix
+from app.services.project_index import project_index
+from app.services.recommendation_cache import CacheStamp, recommendation_cache
+from app.services.recommendation_snapshots import load_snapshot
+from app.utils.student_metrics import get_student_metrics
 
 router = APIRouter(prefix="/recommendations", tags=["Recommendations"])
 
 
-def _build_student_dto(
-    current_user: User,
-    profile: StudentProfile,
-    db: Session,
-) -> StudentDTO:
-    """
-    Assembles a StudentDTO from ORM objects.
-    All DB queries needed to populate the DTO happen here,
-    keeping the engine itself free of SQLAlchemy dependencies.
-    """
-
-    student_id = current_user.id
-
-    # ── Completed project count ───────────────────────────────────────────
-    # A project is "completed by this student" when their application was
-    # accepted AND the project status is "completed".
-    completed_count = (
-        db.query(Application)
-        .join(Project, Project.id == Application.project_id)
-        .filter(
-            Application.student_id == student_id,
-            Application.status == "accepted",
-            Project.status == "completed",
-        )
-        .count()
-    )
-
-    # ── Total ever-accepted count ─────────────────────────────────────────
-    total_accepted = (
-        db.query(Application)
-        .filter(
-            Application.student_id == student_id,
-            Application.status == "accepted",
-        )
-        .count()
-    )
-
-    # ── Accepted deliverable count ────────────────────────────────────────
-    accepted_deliverables = (
-        db.query(Deliverable)
-        .join(Application, Application.id == Deliverable.application_id)
-        .filter(
-            Application.student_id == student_id,
-            Deliverable.status == "accepted",
-        )
-        .count()
-    )
-
-    # ── Average feedback rating ───────────────────────────────────────────
-    rating_result = (
-        db.query(func.avg(Feedback.rating))
-        .filter(Feedback.user_id == student_id)
-        .scalar()
-    )
-    avg_rating = float(rating_result) if rating_result is not None else 0.0
-
-    # ── Recent application count (last 30 days) ───────────────────────────
-    thirty_days_ago = datetime.now(timezone.utc) - timedelta(days=30)
-    recent_apps = (
-        db.query(Application)
-        .filter(
-            Application.student_id == student_id,
-            Application.created_at >= thirty_days_ago,
-        )
-        .count()
-    )
-
-    return StudentDTO(
-        student_id=student_id,
-        skills=parse_skills(profile.skills),
-        major=profile.major or "",
-        bio=profile.bio or "",
-        completed_project_count=completed_count,
-        total_accepted_count=total_accepted,
-        accepted_deliverable_count=accepted_deliverables,
-        average_feedback_rating=avg_rating,
-        recent_application_count=recent_apps,
-        graduation_year=profile.graduation_year,
-    )
-
-
-def _build_project_dto(project: Project) -> ProjectDTO:
-    """Maps a Project ORM object to a ProjectDTO."""
-    return ProjectDTO(
-        project_id=project.id,
-        title=project.title,
-        description=project.description or "",
-        required_skills=parse_skills(project.required_skills),
-        duration=project.duration or "",
-        status=project.status,
-    )
-
-
 @router.get("", response_model=List[RecommendationItem], status_code=status.HTTP_200_OK)
 def get_recommendations(
     top_n: Optional[int] = Query(default=None, ge=1, le=100, description="Limit results to top N matches"),
     db: Session = Depends(get_db),
+    read_db: Session = Depends(get_read_db),
     current_user: User = Depends(require_role("student")),
 ):
     """
@@ -127,6 +33,13 @@ def get_recommendations(
     - Projects are ranked by match score descending.
     - Returns empty list if no open projects exist — not an error.
     - Optional top_n query param slices to the N best matches (1–100).
+    - Rankings are cached per student until their profile or history,
+      or the open-project set, changes (see recommendation_cache.py).
+    - With RECOMMENDATION_SNAPSHOTS_ENABLED, rankings written by the
+      precompute job are served directly (see recommendation_snapshots.py).
+    - The student's own profile, history and snapshot are read from the
+      primary, so their own writes count at once (and are not cached
+      behind replica lag); only the open projects may come from the replica.
 
     Query Params:
     - top_n (optional): Return only the top N results. Default: all results.
@@ -140,10 +53,43 @@ def get_recommendations(
     - 404 if student profile does not exist
     """
 
+    ranked, pending = lookup_recommendations(db, current_user.id, top_n, projects_db=read_db)
+    if ranked is None:
+        ranked = rank_and_cache(current_user.id, top_n, *pending)
+
+    return to_items(ranked)
+
+
+def lookup_recommendations(
+    db: Session,
+    student_id: int,
+    top_n: Optional[int],
+    project_matrix: Optional[ProjectMatrix] = None,
+    project_epoch: Optional[int] = None,
+    projects_db: Optional[Session] = None,
+) -> tuple[Optional[list[ScoredProject]], Optional[tuple]]:
+    """
+    Everything GET /recommendations reads from the database. Returns
+    (ranking, None) when a cached or precomputed ranking answers the
+    request, else (None, (student DTO, project matrix, cache stamp)) to
+    pass to rank_and_cache().
+
+    project_matrix, project_epoch: the open projects and the index epoch
+    they belong to, if the caller already has them (the async endpoint
+    builds them off the event loop); else they come from project_index,
+    loaded through projects_db (default: db) when it has to read them.
+
+    db must see the student's own latest writes (the primary): the
+    ranking is cached under a stamp taken after those writes.
+
+    Raises:
+    - 404 if student profile does not exist
+    """
+
     # ── Require student profile ───────────────────────────────────────────
     profile = (
         db.query(StudentProfile)
-        .filter(StudentProfile.user_id == current_user.id)
+        .filter(StudentProfile.user_id == student_id)
         .first()
     )
 
@@ -154,25 +100,51 @@ def get_recommendations(
         )
 
     # ── Load only open projects ───────────────────────────────────────────
-    # Excludes closed, completed, and disabled projects.
-    open_projects = (
-        db.query(Project)
-        .filter(Project.status == "open")
-        .all()
-    )
+    # Served from the in-process feature index (already tokenised and
+    # encoded); closed, completed, and disabled projects are never in it.
+    if project_matrix is None:
+        project_matrix, project_epoch = project_index.matrix_and_epoch(projects_db or db)
 
     # Empty project list — return gracefully, not an error
-    if not open_projects:
-        return []
+    if len(project_matrix) == 0:
+        return [], None
+
+    # ── Serve a cached ranking if nothing it depends on changed ──────────
+    # Stamped with the epoch of the matrix it will be ranked against: one
+    # read afterwards may already include a change the matrix lacks
+    stamp = recommendation_cache.stamp(student_id, project_epoch)
+    ranked = recommendation_cache.get(student_id, top_n, stamp)
+
+    # ── Precomputed snapshot (when enabled) ───────────────────────────────
+    if ranked is None:
+        ranked = load_snapshot(
+            db, student_id, top_n, lambda pid: pid in project_index, project_index.added_at
+        )
+
+    if ranked is not None:
+        return ranked, None
+
+    # ── Build student DTO ─────────────────────────────────────────────────
+    # All history counters come back from one aggregated query
+    student_dto = build_student_dto(profile, get_student_metrics(db, student_id))
+    return None, (student_dto, project_matrix, stamp)
+
 
-    # ── Build DTOs ────────────────────────────────────────────────────────
-    student_dto = _build_student_dto(current_user, profile, db)
-    project_dtos = [_build_project_dto(p) for p in open_projects]
+def rank_and_cache(
+    student_id: int,
+    top_n: Optional[int],
+    student_dto: StudentDTO,
+    project_matrix: ProjectMatrix,
+    stamp: CacheStamp,
+) -> list[ScoredProject]:
+    """Runs the matching engine (no database access) and caches the result."""
+    ranked = rank_project_matrix(student_dto, project_matrix, top_n=top_n)
+    recommendation_cache.put(student_id, top_n, stamp, ranked)
+    return ranked
 
-    # ── Run matching engine ───────────────────────────────────────────────
-    ranked = rank_projects(student_dto, project_dtos, top_n=top_n)
 
-    # ── Map ScoredProject → RecommendationItem ────────────────────────────
+def to_items(ranked: list[ScoredProject]) -> list[RecommendationItem]:
+    """Maps ScoredProject → RecommendationItem."""
     return [
         RecommendationItem(
             project_id=r.project_id,
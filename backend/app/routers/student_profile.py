@@ -1,9 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 
 from app.database import get_db
-from app.models import StudentProfile, User, Application, Project, Feedback
+from app.models import StudentProfile, User
 from app.schemas.student_profile import (
     StudentProfileCreate,
     StudentProfileRead,
@@ -11,6 +10,9 @@ from app.schemas.student_profile import (
     StudentProfileEnhance,
 )
 from app.core.dependencies import require_role, get_current_user
+from app.services.recommendation_cache import recommendation_cache
+from app.services.recommendation_snapshots import discard_snapshot
+from app.utils.student_metrics import get_student_metrics
 
 router = APIRouter(prefix="/student/profile", tags=["Student Profile"])
 
@@ -20,24 +22,9 @@ def _build_profile_read(profile: StudentProfile, db: Session) -> StudentProfileR
     Assembles a StudentProfileRead by augmenting the ORM object with
     computed fields (completed_projects, average_rating) from the DB.
     """
-    completed_projects = (
-        db.query(func.count(Application.id))
-        .join(Project, Project.id == Application.project_id)
-        .filter(
-            Application.student_id == profile.user_id,
-            Application.status == "accepted",
-            Project.status == "completed",
-        )
-        .scalar()
-    )
-
-    avg_rating_result = (
-        db.query(func.avg(Feedback.rating))
-        .filter(Feedback.user_id == profile.user_id)
-        .scalar()
-    )
+    metrics = get_student_metrics(db, profile.user_id)
     average_rating = (
-        round(float(avg_rating_result), 2) if avg_rating_result is not None else None
+        round(metrics.average_rating, 2) if metrics.average_rating is not None else None
     )
 
     return StudentProfileRead(
@@ -50,7 +37,7 @@ def _build_profile_read(profile: StudentProfile, db: Session) -> StudentProfileR
         bio=profile.bio,
         portfolio_links=profile.portfolio_links,
         badges=profile.badges,
-        completed_projects=completed_projects,
+        completed_projects=metrics.completed_projects,
         average_rating=average_rating,
     )
 
@@ -72,6 +59,8 @@ def create_student_profile(
     db.add(profile)
     db.commit()
     db.refresh(profile)
+
+    recommendation_cache.invalidate_student(current_user.id)
     return _build_profile_read(profile, db)
 
 
@@ -128,8 +117,11 @@ def update_student_profile(
     for field, value in profile_data.model_dump(exclude_unset=True).items():
         setattr(profile, field, value)
 
+    discard_snapshot(db, current_user.id)
     db.commit()
     db.refresh(profile)
+
+    recommendation_cache.invalidate_student(current_user.id)
     return _build_profile_read(profile, db)
 
 
@@ -162,8 +154,11 @@ def enhance_student_profile(
     for field, value in enhance_data.model_dump(exclude_unset=True).items():
         setattr(profile, field, value)
 
+    discard_snapshot(db, current_user.id)
     db.commit()
     db.refresh(profile)
+
+    recommendation_cache.invalidate_student(current_user.id)
     return _build_profile_read(profile, db)
 
 
@@ -180,4 +175,7 @@ def delete_student_profile(
         raise HTTPException(status_code=404, detail="Profile not found")
 
     db.delete(profile)
-    db.commit()
\ No newline at end of file
+    discard_snapshot(db, current_user.id)
+    db.commit()
+
+    recommendation_cache.invalidate_student(current_user.id)
\ No newline at end of file
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 from datetime import datetime
 
 
@@ -9,4 +9,33 @@ class NotificationRead(BaseModel):
     recipient_id: int
     message: str
     is_read: bool
-    created_at: datetime
\ No newline at end of file
+    created_at: datetime
+    # How many events this notification stands for (more than 1 once
+    # coalesced; `message` is then the latest), and when the last came in
+    count: int = 1
+    updated_at: datetime | None = None
+
+class UnreadCountRead(BaseModel):
+    unread_count: int
+
+
+class NotificationSelection(BaseModel):
+    """
+    The notifications a bulk operation applies to: either explicit ids,
+    or every notification up to and including `up_to_id` (that one and
+    all older ones). Ids of other users' notifications are ignored.
+    """
+    ids: list[int] | None = Field(default=None, min_length=1, max_length=1000)
+    up_to_id: int | None = None
+
+    @model_validator(mode="after")
+    def exactly_one_selector(self):
+        if (self.ids is None) == (self.up_to_id is None):
+            raise ValueError("Provide either ids or up_to_id")
+        return self
+
+
+class NotificationBulkResult(BaseModel):
+    """How many notifications the operation changed, and the new unread count."""
+    affected: int
+    unread_count: int
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseModel, ConfigDict
 
 
@@ -16,4 +18,25 @@ class RecommendationItem(BaseModel):
     activity_score: float
     success_score: float
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class CandidateItem(BaseModel):
+    """
+    A single ranked candidate student returned to an organization
+    for one of its projects. Application fields are set when the
+    student has applied to the project.
+    """
+    student_id: int
+    name: Optional[str] = None
+    email: str
+    application_id: Optional[int] = None
+    application_status: Optional[str] = None
+    match_score: float      # 0.0 – 100.0, final weighted score
+    rank: int               # 1 = best match
+    skill_score: float
+    experience_score: float
+    interest_score: float
+    activity_score: float
+    success_score: float
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,531 @@
+"""
+batch_scoring.py
+================
+Vectorized batch scorer for the Smart Matching engine.
+
+Scores one student against N projects in a single NumPy pass instead of
+calling score_student_project() once per (student, project) pair.
+
+Encoding
+--------
+Projects are tokenised once into ProjectFeatures and encoded into a
+ProjectMatrix:
+
+- Skills and keywords are mapped to integer ids through a shared
+  vocabulary and stored as sparse COO pairs (row = project, col = token).
+- Per-project set sizes (unique required skills, unique keywords) and
+  duration weeks are stored as dense columns.
+
+Scoring a student then reduces to:
+
+- Build a boolean mask over the vocabulary for the student's tokens.
+- Count overlaps per project with one np.bincount over the COO rows.
+- Evaluate all five factor columns with array arithmetic.
+
+Parity
+------
+Every factor is computed with the same floating-point operations, in the
+same order, as the scalar helpers in matching_engine.py, and rounding is
+delegated to Python's round() so results are bit-for-bit identical to the
+scalar path. Ties keep input order (stable sort), matching list.sort().
+
+Complexity
+----------
+- Encoding N projects: O(N × (R + K)) where K = keywords per project.
+- Scoring one student: O(nnz + N) vectorized, plus O(S) for the student.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+import heapq
+
+import numpy as np
+
+from app.services.matching_engine import (
+    PreparedStudent,
+    ProjectDTO,
+    StudentDTO,
+    _duration_to_weeks,
+    prepare_student,
+)
+from app.services.tokenizer import tokenize
+
+
+# ---------------------------------------------------------------------------
+# Encoded project batch
+# ---------------------------------------------------------------------------
+
+@dataclass
+class ProjectMatrix:
+    """
+    Vocabulary-indexed encoding of a batch of projects.
+
+    skill_rows / skill_cols and keyword_rows / keyword_cols are COO
+    coordinates of a sparse (N × V) incidence matrix: project row i
+    contains token id j.
+    """
+    project_ids: list[int]
+    titles: list[str]
+    vocabulary: dict[str, int]
+    skill_rows: np.ndarray               # int64, one entry per (project, skill)
+    skill_cols: np.ndarray               # int64 vocabulary ids
+    skill_counts: np.ndarray             # unique required skills per project
+    keyword_rows: np.ndarray             # int64, one entry per (project, keyword)
+    keyword_cols: np.ndarray             # int64 vocabulary ids
+    keyword_counts: np.ndarray           # unique title/description keywords per project
+    weeks: np.ndarray                    # estimated duration in weeks
+    _inverted: Optional["InvertedIndex"] = field(default=None, repr=False, compare=False)
+
+    def __len__(self) -> int:
+        return len(self.project_ids)
+
+    def inverted(self) -> "InvertedIndex":
+        """Token → project-row postings, built on first use and cached."""
+        if self._inverted is None:
+            self._inverted = InvertedIndex.build(self)
+        return self._inverted
+
+
+@dataclass(frozen=True)
+class ProjectFeatures:
+    """
+    Pre-tokenised, project-only inputs to the scoring factors.
+
+    Everything the engine derives from a ProjectDTO that does not depend
+    on the student: the required skill set, the title + description
+    keyword set and the estimated duration in weeks.
+    """
+    project_id: int
+    title: str
+    skills: frozenset[str]
+    keywords: frozenset[str]
+    weeks: int
+
+
+def extract_features(project: ProjectDTO) -> ProjectFeatures:
+    """
+    Tokenises a ProjectDTO into ProjectFeatures.
+
+    Uses the uncached tokenizer: each project is tokenised once when it is
+    encoded, so its text would only churn the shared keyword cache.
+    """
+    return ProjectFeatures(
+        project_id=project.project_id,
+        title=project.title,
+        skills=frozenset(project.required_skills),
+        keywords=tokenize(project.title + " " + project.description),
+        weeks=_duration_to_weeks(project.duration),
+    )
+
+
+def encode_features(features: Iterable[ProjectFeatures]) -> ProjectMatrix:
+    """
+    Encodes already-tokenised ProjectFeatures into a ProjectMatrix.
+
+    No text processing happens here, so a cached feature set (see
+    project_index.py) can be re-encoded cheaply after it changes.
+    """
+    vocabulary: dict[str, int] = {}
+    project_ids: list[int] = []
+    titles: list[str] = []
+    skill_rows: list[int] = []
+    skill_cols: list[int] = []
+    skill_counts: list[int] = []
+    keyword_rows: list[int] = []
+    keyword_cols: list[int] = []
+    keyword_counts: list[int] = []
+    weeks: list[int] = []
+
+    for row, feature in enumerate(features):
+        project_ids.append(feature.project_id)
+        titles.append(feature.title)
+
+        for token in feature.skills:
+            skill_rows.append(row)
+            skill_cols.append(vocabulary.setdefault(token, len(vocabulary)))
+        skill_counts.append(len(feature.skills))
+
+        for token in feature.keywords:
+            keyword_rows.append(row)
+            keyword_cols.append(vocabulary.setdefault(token, len(vocabulary)))
+        keyword_counts.append(len(feature.keywords))
+
+        weeks.append(feature.weeks)
+
+    return ProjectMatrix(
+        project_ids=project_ids,
+        titles=titles,
+        vocabulary=vocabulary,
+        skill_rows=np.asarray(skill_rows, dtype=np.int64),
+        skill_cols=np.asarray(skill_cols, dtype=np.int64),
+        skill_counts=np.asarray(skill_counts, dtype=np.int64),
+        keyword_rows=np.asarray(keyword_rows, dtype=np.int64),
+        keyword_cols=np.asarray(keyword_cols, dtype=np.int64),
+        keyword_counts=np.asarray(keyword_counts, dtype=np.int64),
+        weeks=np.asarray(weeks, dtype=np.int64),
+    )
+
+
+def encode_projects(projects: Iterable[ProjectDTO]) -> ProjectMatrix:
+    """
+    Encodes ProjectDTOs into a ProjectMatrix.
+
+    Tokenisation (parse_skills output, keyword extraction, duration lookup)
+    happens exactly once per project here, never per student.
+    """
+    return encode_features(extract_features(p) for p in projects)
+
+
+# ---------------------------------------------------------------------------
+# Vectorized helpers
+# ---------------------------------------------------------------------------
+
+def _round2(values: np.ndarray) -> np.ndarray:
+    """
+    Element-wise round(v, 2) with Python semantics.
+
+    np.round() can differ from round() in the last ulp, so only the
+    distinct values are rounded in Python and scattered back.
+    """
+    if values.size == 0:
+        return values.astype(np.float64)
+    unique, inverse = np.unique(values, return_inverse=True)
+    rounded = np.array([round(v, 2) for v in unique.tolist()], dtype=np.float64)
+    return rounded[inverse.reshape(values.shape)]
+
+
+def _token_mask(tokens: Iterable[str], vocabulary: dict[str, int]) -> np.ndarray:
+    """Boolean vector over the vocabulary, True for each known token."""
+    mask = np.zeros(len(vocabulary), dtype=bool)
+    ids = [vocabulary[t] for t in tokens if t in vocabulary]
+    if ids:
+        mask[ids] = True
+    return mask
+
+
+def _overlap_counts(
+    mask: np.ndarray, rows: np.ndarray, cols: np.ndarray, n: int
+) -> np.ndarray:
+    """Per-project count of tokens in the COO matrix that are set in mask."""
+    if rows.size == 0:
+        return np.zeros(n, dtype=np.int64)
+    return np.bincount(rows[mask[cols]], minlength=n)
+
+
+# ---------------------------------------------------------------------------
+# Factor columns
+# ---------------------------------------------------------------------------
+# Each helper takes pre-computed per-project arrays (set sizes, overlap
+# counts, weeks) so the full-batch path and the pruned top-N path share
+# exactly the same arithmetic.
+
+def _skill_values(has_skills: bool, counts: np.ndarray, matched: np.ndarray) -> np.ndarray:
+    """Vectorized compute_skill_match."""
+    if not has_skills:
+        return np.where(counts == 0, 50.0, 0.0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = (matched / np.maximum(counts, 1)) * 100.0
+    return np.where(counts == 0, 50.0, _round2(ratio))
+
+
+def _experience_values(completed_count: int, base: float, weeks: np.ndarray) -> np.ndarray:
+    """Vectorized compute_experience_match, given PreparedStudent.experience_base."""
+    if completed_count == 0:
+        penalty = np.where(weeks > 12, -15.0, np.where(weeks > 8, -5.0, 0.0))
+    elif completed_count <= 1:
+        penalty = np.where(weeks > 8, -5.0, 0.0)
+    else:
+        penalty = np.zeros(len(weeks), dtype=np.float64)
+
+    score = base + penalty
+    return _round2(np.maximum(0.0, np.minimum(100.0, score)))
+
+
+def _interest_values(
+    major_len: int,
+    bio_len: int,
+    keyword_counts: np.ndarray,
+    major_overlap: np.ndarray,
+    bio_overlap: np.ndarray,
+) -> np.ndarray:
+    """Vectorized compute_interest_match."""
+    major_score = np.minimum(100.0, (major_overlap / max(major_len, 1)) * 100.0)
+
+    if bio_len:
+        union = bio_len + keyword_counts - bio_overlap
+        with np.errstate(divide="ignore", invalid="ignore"):
+            bio_score = np.where(union > 0, (bio_overlap / union) * 100.0, 0.0)
+    else:
+        bio_score = np.zeros(len(keyword_counts), dtype=np.float64)
+
+    combined = (major_score * 0.6) + (bio_score * 0.4)
+    return np.where(keyword_counts == 0, 50.0, _round2(np.minimum(100.0, combined)))
+
+
+def _final_values(skill, experience, interest, activity: float, success: float):
+    """The weighted formula from score_student_project, element-wise."""
+    final = (
+        (0.40 * skill) +
+        (0.20 * experience) +
+        (0.15 * interest) +
+        (0.10 * activity) +
+        (0.15 * success)
+    )
+    return _round2(np.maximum(0.0, np.minimum(100.0, final)))
+
+
+def _prepared(student: StudentDTO | PreparedStudent) -> PreparedStudent:
+    """Accepts a StudentDTO or an already prepared student."""
+    if isinstance(student, PreparedStudent):
+        return student
+    return prepare_student(student)
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+@dataclass
+class BatchScores:
+    """All factor columns and final scores for one student × N projects."""
+    match_score: np.ndarray
+    skill_score: np.ndarray
+    experience_score: np.ndarray
+    interest_score: np.ndarray
+    activity_score: float
+    success_score: float
+
+
+def score_batch(student: StudentDTO | PreparedStudent, matrix: ProjectMatrix) -> BatchScores:
+    """
+    Computes all five factor columns and the final weighted score for
+    every project in the matrix in one vectorized pass.
+
+    Student-only factors (activity, success) are computed once and
+    broadcast across the batch.
+    """
+    prepared = _prepared(student)
+    n = len(matrix)
+    vocabulary = matrix.vocabulary
+
+    skill_mask = _token_mask(prepared.skills, vocabulary)
+    matched = _overlap_counts(skill_mask, matrix.skill_rows, matrix.skill_cols, n)
+
+    major_mask = _token_mask(prepared.major_tokens, vocabulary)
+    major_overlap = _overlap_counts(major_mask, matrix.keyword_rows, matrix.keyword_cols, n)
+
+    bio_mask = _token_mask(prepared.bio_tokens, vocabulary)
+    bio_overlap = _overlap_counts(bio_mask, matrix.keyword_rows, matrix.keyword_cols, n)
+
+    skill = _skill_values(bool(prepared.skills), matrix.skill_counts, matched)
+    experience = _experience_values(
+        prepared.student.completed_project_count, prepared.experience_base, matrix.weeks
+    )
+    interest = _interest_values(
+        len(prepared.major_tokens), len(prepared.bio_tokens),
+        matrix.keyword_counts, major_overlap, bio_overlap,
+    )
+    activity, success = prepared.activity_score, prepared.success_score
+
+    return BatchScores(
+        match_score=_final_values(skill, experience, interest, activity, success),
+        skill_score=skill,
+        experience_score=experience,
+        interest_score=interest,
+        activity_score=activity,
+        success_score=success,
+    )
+
+
+def rank_order(scores: BatchScores, top_n: Optional[int] = None) -> np.ndarray:
+    """
+    Row indices sorted by match_score descending.
+
+    Uses a stable sort on the negated scores, so equal scores keep their
+    input order exactly as list.sort(reverse=True) does.
+    """
+    order = np.argsort(-scores.match_score, kind="stable")
+    if top_n is not None and top_n > 0:
+        order = order[:top_n]
+    return order
+
+
+# ---------------------------------------------------------------------------
+# Inverted index + pruned top-N selection
+# ---------------------------------------------------------------------------
+# For top_n requests most projects cannot reach the top N: a project that
+# shares no skill with the student scores 0 on the 40%-weighted factor.
+# Projects are split into tiers by what the inverted index says about
+# them, each tier gets an upper bound on its final score, and a tier is
+# only scored when its bound can still beat the current Nth score.
+#
+#   Tier                                   skill    interest   bound uses
+#   -------------------------------------  -------  ---------  -----------
+#   1. shares ≥1 skill with the student    ≤ 100    ≤ 100      100 / 100
+#   2. project lists no required skills    = 50     ≤ 100      50 / 100
+#   3. shares ≥1 major/bio keyword         = 0      ≤ 100      0 / 100
+#   4. everything else                     = 0      ≤ 50       0 / 50
+#
+# Experience is bounded by its no-penalty value; activity and success are
+# student constants. Bounds go through the same weighted formula and
+# rounding as real scores, so bound ≥ score always holds and pruning never
+# changes the result.
+
+@dataclass
+class Postings:
+    """CSC-style postings: rows for token t are rows[offsets[t]:offsets[t + 1]]."""
+    rows: np.ndarray
+    offsets: np.ndarray
+
+    @classmethod
+    def build(cls, rows: np.ndarray, cols: np.ndarray, vocab_size: int) -> "Postings":
+        order = np.argsort(cols, kind="stable")
+        offsets = np.searchsorted(cols[order], np.arange(vocab_size + 1))
+        return cls(rows=rows[order], offsets=offsets)
+
+    def lookup(self, token_ids: list[int]) -> np.ndarray:
+        """Concatenated postings of all tokens (a row repeats once per hit)."""
+        if not token_ids:
+            return np.zeros(0, dtype=np.int64)
+        return np.concatenate(
+            [self.rows[self.offsets[t]:self.offsets[t + 1]] for t in token_ids]
+        )
+
+
+@dataclass
+class InvertedIndex:
+    """Skill and keyword postings for a ProjectMatrix."""
+    skills: Postings
+    keywords: Postings
+    no_skill_rows: np.ndarray            # projects with no required skills
+
+    @classmethod
+    def build(cls, matrix: ProjectMatrix) -> "InvertedIndex":
+        vocab_size = len(matrix.vocabulary)
+        return cls(
+            skills=Postings.build(matrix.skill_rows, matrix.skill_cols, vocab_size),
+            keywords=Postings.build(matrix.keyword_rows, matrix.keyword_cols, vocab_size),
+            no_skill_rows=np.flatnonzero(matrix.skill_counts == 0),
+        )
+
+
+def _hit_counts(rows: np.ndarray, hits: np.ndarray) -> np.ndarray:
+    """How many times each (sorted, unique) row appears in hits."""
+    if hits.size == 0 or rows.size == 0:
+        return np.zeros(rows.size, dtype=np.int64)
+    unique, counts = np.unique(hits, return_counts=True)
+    pos = np.minimum(np.searchsorted(unique, rows), unique.size - 1)
+    return np.where(unique[pos] == rows, counts[pos], 0)
+
+
+def _token_ids(tokens: Iterable[str], vocabulary: dict[str, int]) -> list[int]:
+    return [vocabulary[t] for t in tokens if t in vocabulary]
+
+
+def rank_top_n(student: StudentDTO | PreparedStudent, matrix: ProjectMatrix, top_n: int) -> list[tuple[int, float, float, float, float]]:
+    """
+    Returns the top_n rows as (row, match, skill, experience, interest),
+    best first, with exactly the same order as a full stable sort.
+
+    Only tiers whose upper bound can still beat the current Nth score are
+    scored; the running top N is kept in a size-N min-heap.
+    """
+    prepared = _prepared(student)
+    n = len(matrix)
+    index = matrix.inverted()
+    vocabulary = matrix.vocabulary
+
+    major_tokens = prepared.major_tokens
+    bio_tokens = prepared.bio_tokens
+    skill_hits = index.skills.lookup(_token_ids(prepared.skills, vocabulary))
+    major_hits = index.keywords.lookup(_token_ids(major_tokens, vocabulary))
+    bio_hits = index.keywords.lookup(_token_ids(bio_tokens, vocabulary))
+
+    has_skills = bool(prepared.skills)
+    completed_count = prepared.student.completed_project_count
+    experience_base = prepared.experience_base
+    activity, success = prepared.activity_score, prepared.success_score
+
+    experience_max = _experience_values(
+        completed_count, experience_base, np.zeros(1, dtype=np.int64)
+    )
+
+    def bound(skill: float, interest: float) -> float:
+        return float(_final_values(
+            np.array([skill]), experience_max, np.array([interest]), activity, success
+        )[0])
+
+    # ── Tier row sets (lazily materialised — tier 4 needs an O(N) mask) ────
+    tier1 = np.unique(skill_hits)
+    tier2 = index.no_skill_rows
+
+    def tier3() -> np.ndarray:
+        rows = np.unique(np.concatenate([major_hits, bio_hits]))
+        return np.setdiff1d(rows, np.union1d(tier1, tier2), assume_unique=True)
+
+    def tier4() -> np.ndarray:
+        seen = np.zeros(n, dtype=bool)
+        seen[tier1] = True
+        seen[tier2] = True
+        seen[np.concatenate([major_hits, bio_hits])] = True
+        return np.flatnonzero(~seen)
+
+    tiers = [
+        (bound(100.0, 100.0), lambda: tier1),
+        (bound(50.0, 100.0), lambda: tier2),
+        (bound(0.0, 100.0), tier3),
+        (bound(0.0, 50.0), tier4),
+    ]
+
+    # Min-heap of the best rows so far. Key (score, -row): the root is the
+    # current Nth best — lowest score, latest input position on ties.
+    heap: list[tuple[float, int]] = []
+    factors: dict[int, tuple[float, float, float]] = {}
+
+    for tier_bound, materialise in tiers:
+        if len(heap) == top_n and tier_bound < heap[0][0]:
+            continue
+
+        rows = materialise()
+        if rows.size == 0:
+            continue
+
+        skill = _skill_values(
+            has_skills, matrix.skill_counts[rows], _hit_counts(rows, skill_hits)
+        )
+        experience = _experience_values(completed_count, experience_base, matrix.weeks[rows])
+        interest = _interest_values(
+            len(major_tokens),
+            len(bio_tokens),
+            matrix.keyword_counts[rows],
+            _hit_counts(rows, major_hits),
+            _hit_counts(rows, bio_hits),
+        )
+        match = _final_values(skill, experience, interest, activity, success)
+
+        # Partial selection: keep only rows scoring at least this tier's
+        # top_n-th best value (O(M) via np.partition), order those stably
+        # (rows are ascending, so ties keep input order), then merge them
+        # into the heap.
+        if rows.size > top_n:
+            kth = np.partition(match, rows.size - top_n)[rows.size - top_n]
+            candidates = np.flatnonzero(match >= kth)
+        else:
+            candidates = np.arange(rows.size)
+        local = candidates[np.argsort(-match[candidates], kind="stable")][:top_n].tolist()
+        match_list = match.tolist()
+        for i in local:
+            key = (match_list[i], -int(rows[i]))
+            if len(heap) < top_n:
+                heapq.heappush(heap, key)
+            elif key > heap[0]:
+                heapq.heapreplace(heap, key)
+            else:
+                continue
+            factors[int(rows[i])] = (float(skill[i]), float(experience[i]), float(interest[i]))
+
+    best = sorted(heap, reverse=True)
+    return [(-neg_row, score, *factors[-neg_row]) for score, neg_row in best]
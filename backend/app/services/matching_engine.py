@@ -22,6 +22,8 @@ Complexity
   R = required skill count for that project.
 - Full ranking over N projects: O(N log N) due to sort.
 - Total: O(N × (S + R) + N log N)
+- rank_projects() scores the whole batch in one NumPy pass
+  (see batch_scoring.py) instead of one Python call per project.
 
 Design
 ------
@@ -31,15 +33,23 @@ Design
 - Deterministic — identical inputs always produce identical outputs.
 - Divide-by-zero safe — all denominators are guarded.
 - Top-N slicing supported via rank_projects(top_n=...).
+- Reverse matching: rank_students() ranks candidate students for one
+  project with the same factors.
 """
 
 from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
 import math
 
+from app.services.tokenizer import extract_keywords
+
+if TYPE_CHECKING:
+    from app.services.batch_scoring import ProjectMatrix
+    from app.utils.student_metrics import StudentMetrics
+
 
 # ---------------------------------------------------------------------------
 # Data Transfer Objects
@@ -87,6 +97,34 @@ class ScoredProject:
     success_score: float
 
 
+@dataclass(frozen=True)
+class PreparedStudent:
+    """
+    Student-only scoring inputs, computed once per ranking call by
+    prepare_student() and reused for every project.
+    """
+    student: StudentDTO
+    skills: frozenset[str]               # normalised skill set
+    major_tokens: frozenset[str]         # keywords of the major
+    bio_tokens: frozenset[str]           # keywords of the bio
+    experience_base: float               # experience before the duration penalty
+    activity_score: float                # factor 4 — project-independent
+    success_score: float                 # factor 5 — project-independent
+
+
+@dataclass
+class ScoredStudent:
+    """Output object — a candidate student paired with their score and rank."""
+    student_id: int
+    match_score: float                   # 0.0–100.0, rounded to 2dp
+    rank: int
+    skill_score: float
+    experience_score: float
+    interest_score: float
+    activity_score: float
+    success_score: float
+
+
 # ---------------------------------------------------------------------------
 # Helper: string → skill list
 # ---------------------------------------------------------------------------
@@ -106,6 +144,29 @@ def parse_skills(raw: Optional[str]) -> list[str]:
     return [s.strip().lower() for s in raw.split(",") if s.strip()]
 
 
+# ---------------------------------------------------------------------------
+# Helper: profile + history → StudentDTO
+# ---------------------------------------------------------------------------
+
+def build_student_dto(profile, metrics: StudentMetrics) -> StudentDTO:
+    """
+    Maps a StudentProfile (or a row with the same attributes) and the
+    student's history metrics to a StudentDTO.
+    """
+    return StudentDTO(
+        student_id=profile.user_id,
+        skills=parse_skills(profile.skills),
+        major=profile.major or "",
+        bio=profile.bio or "",
+        completed_project_count=metrics.completed_projects,
+        total_accepted_count=metrics.accepted_applications,
+        accepted_deliverable_count=metrics.accepted_deliverables,
+        average_feedback_rating=metrics.average_rating or 0.0,
+        recent_application_count=metrics.recent_applications,
+        graduation_year=profile.graduation_year,
+    )
+
+
 # ---------------------------------------------------------------------------
 # Factor 1 — Skill Match (weight: 0.40)
 # ---------------------------------------------------------------------------
@@ -126,14 +187,18 @@ def compute_skill_match(student_skills: list[str], required_skills: list[str]) -
     >>> compute_skill_match([], [])
     50.0
     """
+    return _skill_score(frozenset(student_skills), required_skills)
+
+
+def _skill_score(student_set: frozenset[str], required_skills: list[str]) -> float:
+    """compute_skill_match() for an already-built student skill set."""
     if not required_skills:
         # Project requires nothing specific — all students are equally valid
         return 50.0
 
-    if not student_skills:
+    if not student_set:
         return 0.0
 
-    student_set = set(student_skills)
     required_set = set(required_skills)
 
     matched = len(student_set & required_set)
@@ -190,6 +255,13 @@ def compute_experience_match(
     >>> compute_experience_match(3, 2024, "1 month")
     90.0
     """
+    weeks = _duration_to_weeks(project_duration)
+    score = _experience_base(completed_count, graduation_year) + _duration_penalty(completed_count, weeks)
+    return round(max(0.0, min(100.0, score)), 2)
+
+
+def _experience_base(completed_count: int, graduation_year: int) -> float:
+    """Student-only part of compute_experience_match (base + year_adj)."""
     current_year = datetime.now(timezone.utc).year
 
     # Base score from completed project count
@@ -216,43 +288,33 @@ def compute_experience_match(
     else:
         year_adj = -5.0   # Far from graduation, likely early in program
 
-    # Duration penalty for inexperienced students on long projects
-    weeks = _duration_to_weeks(project_duration)
+    return base + year_adj
+
+
+def _duration_penalty(completed_count: int, weeks: int) -> float:
+    """Penalty for inexperienced students on long projects."""
     if completed_count == 0 and weeks > 12:
-        duration_penalty = -15.0
+        return -15.0
     elif completed_count <= 1 and weeks > 8:
-        duration_penalty = -5.0
-    else:
-        duration_penalty = 0.0
-
-    score = base + year_adj + duration_penalty
-    return round(max(0.0, min(100.0, score)), 2)
+        return -5.0
+    return 0.0
 
 
 # ---------------------------------------------------------------------------
 # Factor 3 — Interest Match (weight: 0.15)
 # ---------------------------------------------------------------------------
 
-def _extract_keywords(text: Optional[str]) -> set[str]:
+def _extract_keywords(text: Optional[str]) -> frozenset[str]:
     """
     Extracts meaningful keywords from free text.
     Lowercases, splits on whitespace and punctuation,
     filters single-char tokens and common stop words.
-    """
-    if not text:
-        return set()
-
-    stop_words = {
-        "a", "an", "the", "and", "or", "but", "in", "on", "at", "to",
-        "for", "of", "with", "by", "from", "is", "it", "as", "be",
-        "this", "that", "are", "was", "were", "has", "have", "had",
-        "will", "would", "can", "could", "i", "we", "you", "they",
-        "my", "our", "your", "their", "its",
-    }
 
-    import re
-    tokens = re.split(r"[\s,.\-_/\\()\[\]{}:;!?\"']+", text.lower())
-    return {t for t in tokens if len(t) > 1 and t not in stop_words}
+    Delegates to the memoised tokenizer (tokenizer.py), so repeated
+    texts — the student's major and bio, a project's description —
+    are only tokenised once.
+    """
+    return extract_keywords(text)
 
 
 def compute_interest_match(
@@ -275,18 +337,27 @@ def compute_interest_match(
     ...                        "Web API Project", "Build a REST API using Python")
     75.0
     """
-    project_keywords = _extract_keywords(project_title + " " + project_description)
+    return _interest_score(
+        _extract_keywords(student_major),
+        _extract_keywords(student_bio or ""),
+        _extract_keywords(project_title + " " + project_description),
+    )
+
 
+def _interest_score(
+    major_tokens: frozenset[str],
+    bio_tokens: frozenset[str],
+    project_keywords: frozenset[str],
+) -> float:
+    """compute_interest_match() for already-extracted keyword sets."""
     if not project_keywords:
         return 50.0  # No project description → neutral
 
     # Major match — each matching token from major = strong signal
-    major_tokens = _extract_keywords(student_major)
     major_overlap = len(major_tokens & project_keywords)
     major_score = min(100.0, (major_overlap / max(len(major_tokens), 1)) * 100.0)
 
     # Bio match — keyword overlap between bio and project
-    bio_tokens = _extract_keywords(student_bio or "")
     if bio_tokens:
         bio_overlap = len(bio_tokens & project_keywords)
         # Jaccard similarity
@@ -407,27 +478,61 @@ def score_student_project(student: StudentDTO, project: ProjectDTO) -> dict:
     Returns a dict with all component scores and the final score.
     All scores are in [0, 100].
 
+    When scoring one student against many projects, call
+    prepare_student() once and score_prepared() per project instead.
+
     Complexity: O(S + R) where S = student skills, R = required skills.
     """
-    skill = compute_skill_match(student.skills, project.required_skills)
-    experience = compute_experience_match(
-        student.completed_project_count,
-        student.graduation_year,
-        project.duration,
-    )
-    interest = compute_interest_match(
-        student.major,
-        student.bio,
-        project.title,
-        project.description,
+    return score_prepared(prepare_student(student), project)
+
+
+def prepare_student(student: StudentDTO) -> PreparedStudent:
+    """
+    Computes every student-only input to the factors: the skill and
+    keyword sets, the experience base, and the activity and success
+    scores (which do not depend on the project at all).
+
+    Complexity: O(S + len(major) + len(bio)), once per ranking call.
+    """
+    return PreparedStudent(
+        student=student,
+        skills=frozenset(student.skills),
+        major_tokens=_extract_keywords(student.major),
+        bio_tokens=_extract_keywords(student.bio or ""),
+        experience_base=_experience_base(student.completed_project_count, student.graduation_year),
+        activity_score=compute_activity_score(student.recent_application_count),
+        success_score=compute_success_score(
+            student.completed_project_count,
+            student.total_accepted_count,
+            student.accepted_deliverable_count,
+            student.average_feedback_rating,
+        ),
     )
-    activity = compute_activity_score(student.recent_application_count)
-    success = compute_success_score(
-        student.completed_project_count,
-        student.total_accepted_count,
-        student.accepted_deliverable_count,
-        student.average_feedback_rating,
+
+
+def score_prepared(prepared: PreparedStudent, project: ProjectDTO) -> dict:
+    """
+    Fast path of score_student_project(): evaluates only the
+    project-dependent terms (skill overlap, duration penalty, keyword
+    overlap) against a PreparedStudent. Returns the same dict.
+
+    Complexity: O(R + K) where R = required skills, K = project keywords.
+    """
+    skill = _skill_score(prepared.skills, project.required_skills)
+
+    weeks = _duration_to_weeks(project.duration)
+    completed_count = prepared.student.completed_project_count
+    experience = round(max(0.0, min(100.0,
+        prepared.experience_base + _duration_penalty(completed_count, weeks)
+    )), 2)
+
+    interest = _interest_score(
+        prepared.major_tokens,
+        prepared.bio_tokens,
+        _extract_keywords(project.title + " " + project.description),
     )
+    activity = prepared.activity_score
+    success = prepared.success_score
 
     # Weighted formula
     final = (
@@ -464,6 +569,9 @@ def rank_projects(
     descending (O(N log N)), assigns rank positions, and optionally
     slices to top-N.
 
+    Scoring runs through the vectorized batch scorer in batch_scoring.py,
+    which yields exactly the same scores as score_student_project().
+
     Only projects with status="open" should be passed in — filtering
     is the caller's responsibility (enforced in the API layer).
 
@@ -480,31 +588,131 @@ def rank_projects(
     if not projects:
         return []
 
-    # Score all projects — O(N × (S + R))
-    raw_scores = [score_student_project(student, p) for p in projects]
+    from app.services.batch_scoring import encode_projects
+
+    return rank_project_matrix(student, encode_projects(projects), top_n=top_n)
+
+
+def rank_project_matrix(
+    student: StudentDTO,
+    matrix: "ProjectMatrix",
+    top_n: Optional[int] = None,
+) -> list[ScoredProject]:
+    """
+    Same as rank_projects(), but takes projects that are already encoded
+    into a ProjectMatrix (e.g. from the in-process project feature index),
+    so no per-request tokenisation is needed.
+
+    When top_n is smaller than the batch, projects are pruned through the
+    matrix's inverted skill index (batch_scoring.rank_top_n) and only the
+    tiers that can still reach the top N are scored.
+
+    Complexity: O(nnz + N log N) full ranking;
+                O(postings + M) for top-N, where M = projects in scored tiers
+    """
+    if len(matrix) == 0:
+        return []
+
+    from app.services.batch_scoring import score_batch, rank_order, rank_top_n
+
+    # Student-only terms are computed once for the whole batch
+    prepared = prepare_student(student)
+
+    # Top-N: prune via the inverted skill index and select with a heap
+    if top_n is not None and 0 < top_n < len(matrix):
+        activity = prepared.activity_score
+        success = prepared.success_score
+        return [
+            ScoredProject(
+                project_id=matrix.project_ids[row],
+                title=matrix.titles[row],
+                match_score=match,
+                rank=i,
+                skill_score=skill,
+                experience_score=experience,
+                interest_score=interest,
+                activity_score=activity,
+                success_score=success,
+            )
+            for i, (row, match, skill, experience, interest) in enumerate(
+                rank_top_n(prepared, matrix, top_n), start=1
+            )
+        ]
+
+    # Score all projects in one vectorized pass — O(nnz + N)
+    scores = score_batch(prepared, matrix)
+
+    # Stable sort descending by match_score — O(N log N)
+    order = rank_order(scores, top_n=top_n)
 
-    # Sort descending by match_score — O(N log N)
-    raw_scores.sort(key=lambda x: x["match_score"], reverse=True)
+    match_scores = scores.match_score.tolist()
+    skill_scores = scores.skill_score.tolist()
+    experience_scores = scores.experience_score.tolist()
+    interest_scores = scores.interest_score.tolist()
 
     # Assign rank and build output objects
     ranked = []
-    for i, scored in enumerate(raw_scores, start=1):
+    for i, row in enumerate(order.tolist(), start=1):
         ranked.append(
             ScoredProject(
-                project_id=scored["project_id"],
-                title=scored["title"],
-                match_score=scored["match_score"],
+                project_id=matrix.project_ids[row],
+                title=matrix.titles[row],
+                match_score=match_scores[row],
                 rank=i,
-                skill_score=scored["skill_score"],
-                experience_score=scored["experience_score"],
-                interest_score=scored["interest_score"],
-                activity_score=scored["activity_score"],
-                success_score=scored["success_score"],
+                skill_score=skill_scores[row],
+                experience_score=experience_scores[row],
+                interest_score=interest_scores[row],
+                activity_score=scores.activity_score,
+                success_score=scores.success_score,
             )
         )
 
-    # Apply top-N slice if requested
-    if top_n is not None and top_n > 0:
-        ranked = ranked[:top_n]
+    return ranked
+
+
+# ---------------------------------------------------------------------------
+# Public API: rank candidate students for a project (reverse matching)
+# ---------------------------------------------------------------------------
 
-    return ranked
\ No newline at end of file
+def rank_students(
+    project: ProjectDTO,
+    students: list[StudentDTO],
+    top_n: Optional[int] = None,
+) -> list[ScoredStudent]:
+    """
+    Scores every candidate student against one project with the same
+    five factors as rank_projects(), sorts by score descending and
+    assigns rank positions. Ties keep the input order.
+
+    Loading the students' histories is the caller's responsibility —
+    build the DTOs from one bulk metrics lookup
+    (student_metrics.get_student_metrics_bulk), not one query per student.
+
+    Args:
+        project:  ProjectDTO the candidates are matched against.
+        students: List of StudentDTOs to score.
+        top_n:    If provided, return only the top N results.
+
+    Returns:
+        List of ScoredStudent objects, sorted by match_score descending.
+
+    Complexity: O(M × (S + R) + M log M) for M students
+    """
+    raw = [score_student_project(student, project) for student in students]
+    order = sorted(range(len(raw)), key=lambda i: raw[i]["match_score"], reverse=True)
+    if top_n is not None and top_n > 0:
+        order = order[:top_n]
+
+    return [
+        ScoredStudent(
+            student_id=students[i].student_id,
+            match_score=raw[i]["match_score"],
+            rank=rank,
+            skill_score=raw[i]["skill_score"],
+            experience_score=raw[i]["experience_score"],
+            interest_score=raw[i]["interest_score"],
+            activity_score=raw[i]["activity_score"],
+            success_score=raw[i]["success_score"],
+        )
+        for rank, i in enumerate(order, start=1)
+    ]
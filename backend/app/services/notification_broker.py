@@ -0,0 +1,289 @@
+"""
+notification_broker.py
+======================
+Publish / subscribe channel that pushes new notifications to the
+clients streaming GET /notifications/stream.
+
+Publishing: app.utils.notifications collects every notification a
+session inserts and publishes the batch from the session's after_commit
+hook, so subscribers only ever see committed rows and nothing from a
+rolled-back transaction.
+
+Subscribing: each open stream holds a Subscription, an asyncio queue on
+the server's event loop keyed by recipient. publish() may be called from
+any thread (sync endpoints commit in the threadpool) and hands events
+to the loop with call_soon_threadsafe.
+
+Brokers (NOTIFICATION_BROKER):
+
+- memory:   fans out within this process only. Enough for a single
+            worker; with several, a user only hears about notifications
+            committed by the worker their stream is connected to.
+- postgres: publishes with pg_notify on the primary database, and every
+            worker LISTENs on a dedicated connection and fans out to its
+            own subscribers — so all workers share one channel without
+            any extra infrastructure.
+
+A subscriber that falls more than queue_size events behind is closed
+rather than buffered without bound; the client reconnects with
+Last-Event-ID and the stream replays what it missed from the database.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import select
+import threading
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+
+NOTIFICATION_BROKER = os.getenv("NOTIFICATION_BROKER", "memory")
+NOTIFICATION_STREAM_QUEUE_SIZE = int(os.getenv("NOTIFICATION_STREAM_QUEUE_SIZE", "100"))
+
+logger = logging.getLogger(__name__)
+
+# An event is (recipient_id, notification as a JSON-ready dict)
+Event = tuple[int, dict[str, Any]]
+
+
+class Subscription:
+    """One stream's inbox. Created and read on the event loop."""
+
+    def __init__(self, broker: "InMemoryBroker", recipient_id: int, max_pending: int):
+        self.broker = broker
+        self.recipient_id = recipient_id
+        self.max_pending = max_pending
+        self.overflowed = False
+        self._loop = asyncio.get_running_loop()
+        # Unbounded underneath: max_pending is enforced in _offer, so the
+        # end-of-stream marker always fits
+        self._queue: asyncio.Queue = asyncio.Queue()
+
+    def _offer(self, notification: dict[str, Any]) -> None:
+        """Runs on the event loop."""
+        if self.overflowed:
+            return
+        if self._queue.qsize() >= self.max_pending:
+            self.overflowed = True
+            self.broker._count("overflowed")
+            self._queue.put_nowait(None)
+            return
+        self._queue.put_nowait(notification)
+
+    async def get(self) -> Optional[dict[str, Any]]:
+        """The next notification, or None once the subscriber fell too far behind."""
+        return await self._queue.get()
+
+    def close(self) -> None:
+        self.broker.unsubscribe(self)
+
+
+class InMemoryBroker:
+    """Fans events out to the subscribers of this process."""
+
+    def __init__(self, queue_size: int = NOTIFICATION_STREAM_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._subscribers: dict[int, set[Subscription]] = {}
+
+        self.published = 0
+        self.delivered = 0
+        self.overflowed = 0
+
+    def _count(self, counter: str, n: int = 1) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + n)
+
+    # ── Subscribers ───────────────────────────────────────────────────────
+
+    def subscribe(self, recipient_id: int) -> Subscription:
+        """Registers a stream for `recipient_id`; call on the event loop."""
+        subscription = Subscription(self, recipient_id, self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(recipient_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscriptions = self._subscribers.get(subscription.recipient_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscribers[subscription.recipient_id]
+
+    def has_subscribers(self, recipient_id: int) -> bool:
+        with self._lock:
+            return recipient_id in self._subscribers
+
+    # ── Publishing ────────────────────────────────────────────────────────
+
+    def publish(self, events: Iterable[Event]) -> None:
+        """Delivers committed notifications; safe to call from any thread."""
+        events = list(events)
+        self._count("published", len(events))
+        self._deliver(events)
+
+    def _deliver(self, events: Iterable[Event]) -> None:
+        for recipient_id, notification in events:
+            with self._lock:
+                subscriptions = list(self._subscribers.get(recipient_id, ()))
+            for subscription in subscriptions:
+                try:
+                    subscription._loop.call_soon_threadsafe(subscription._offer, notification)
+                except RuntimeError:
+                    # Its event loop has shut down
+                    self.unsubscribe(subscription)
+                    continue
+                self._count("delivered")
+
+    # ── Lifecycle / stats ─────────────────────────────────────────────────
+
+    def close(self) -> None:
+        pass
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "broker": "memory",
+                "recipients": len(self._subscribers),
+                "subscribers": sum(len(s) for s in self._subscribers.values()),
+                "published": self.published,
+                "delivered": self.delivered,
+                "overflowed": self.overflowed,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._subscribers.clear()
+            self.published = self.delivered = self.overflowed = 0
+
+
+class PostgresBroker(InMemoryBroker):
+    """
+    Shares events between worker processes through PostgreSQL
+    LISTEN / NOTIFY on `channel`.
+
+    publish() sends one pg_notify per event; the listener thread, started
+    with the first subscription, receives every worker's events and
+    delivers those whose recipient has a stream open here. NOTIFY
+    payloads are capped at 8000 bytes, so an event too large to carry
+    inline is sent as just its id and loaded by the receiving worker.
+    """
+
+    MAX_PAYLOAD_BYTES = 7900
+
+    def __init__(self, engine: Engine, session_factory, channel: str = "notifications", **kwargs):
+        super().__init__(**kwargs)
+        self.engine = engine
+        self.session_factory = session_factory
+        self.channel = channel
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def subscribe(self, recipient_id: int) -> Subscription:
+        self._ensure_listening()
+        return super().subscribe(recipient_id)
+
+    def publish(self, events: Iterable[Event]) -> None:
+        payloads = [{"channel": self.channel, "payload": self._encode(*event)} for event in events]
+        if not payloads:
+            return
+        with self.engine.connect() as connection:
+            connection.execute(text("SELECT pg_notify(:channel, :payload)"), payloads)
+            connection.commit()
+        self._count("published", len(payloads))
+
+    def _encode(self, recipient_id: int, notification: dict[str, Any]) -> str:
+        payload = json.dumps({"r": recipient_id, "n": notification}, separators=(",", ":"))
+        if len(payload.encode()) > self.MAX_PAYLOAD_BYTES:
+            payload = json.dumps({"r": recipient_id, "id": notification["id"]}, separators=(",", ":"))
+        return payload
+
+    def _decode(self, payload: str) -> Optional[Event]:
+        data = json.loads(payload)
+        recipient_id = data["r"]
+        if not self.has_subscribers(recipient_id):
+            return None
+        if "n" in data:
+            return recipient_id, data["n"]
+
+        from app.models import Notification
+        from app.schemas.notification import NotificationRead
+
+        with self.session_factory() as db:
+            notification = db.get(Notification, data["id"])
+            if notification is None:
+                return None
+            return recipient_id, NotificationRead.model_validate(notification).model_dump(mode="json")
+
+    # ── Listener thread ───────────────────────────────────────────────────
+
+    def _ensure_listening(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopped.clear()
+                self._thread = threading.Thread(
+                    target=self._listen, name="notification-listener", daemon=True
+                )
+                self._thread.start()
+
+    def _listen(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                self._listen_once()
+            except Exception:
+                logger.exception("Notification listener failed; reconnecting")
+                self._stopped.wait(1.0)
+
+    def _listen_once(self) -> None:
+        # A connection of its own, outside the pool, held for LISTEN
+        raw = self.engine.raw_connection()
+        raw.detach()
+        connection = raw.driver_connection
+        try:
+            connection.autocommit = True
+            connection.cursor().execute(f'LISTEN "{self.channel}"')
+            while not self._stopped.is_set():
+                if select.select([connection], [], [], 1.0) == ([], [], []):
+                    continue
+                connection.poll()
+                events = []
+                while connection.notifies:
+                    event = self._decode(connection.notifies.pop(0).payload)
+                    if event is not None:
+                        events.append(event)
+                self._deliver(events)
+        finally:
+            connection.close()
+
+    def close(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(5.0)
+
+    def stats(self) -> dict[str, Any]:
+        return {**super().stats(), "broker": "postgres", "listening": bool(self._thread and self._thread.is_alive())}
+
+
+def make_broker(name: str = NOTIFICATION_BROKER) -> InMemoryBroker:
+    """The broker selected by NOTIFICATION_BROKER."""
+    if name == "memory":
+        return InMemoryBroker()
+    if name == "postgres":
+        from app.database import SessionLocal, engine
+
+        if engine.dialect.name != "postgresql":
+            raise ValueError("NOTIFICATION_BROKER=postgres needs a PostgreSQL DATABASE_URL")
+        return PostgresBroker(engine, SessionLocal)
+    raise ValueError(f"Unknown NOTIFICATION_BROKER: {name!r}")
+
+
+notification_broker = make_broker()
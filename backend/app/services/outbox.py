@@ -0,0 +1,264 @@
+"""
+outbox.py
+=========
+Transactional outbox: side effects that fan out (a notification per
+applicant, and later emails or webhooks) are recorded as OutboxEvent
+rows in the same transaction as the change that causes them, and carried
+out afterwards by OutboxWorker.
+
+The app runs one worker on a background thread for its lifetime
+(OUTBOX_WORKER_IN_APP, on by default), woken as soon as a transaction
+that enqueued events commits. Deployments that would rather drain the
+queue elsewhere set OUTBOX_WORKER_IN_APP=false and run
+`python -m app.cli outbox-worker` as its own process.
+
+So a write endpoint commits one small row however many recipients there
+are, and the side effect still happens if and only if the change
+committed — a crash after the commit leaves the event pending rather
+than lost.
+
+The worker takes one due event at a time (FOR UPDATE SKIP LOCKED on
+PostgreSQL, so several workers can share the queue) and runs its handler
+in the same transaction that marks it done, so a handler's writes and
+the bookkeeping commit together. A failing event is retried with
+exponential backoff (retry_base_seconds, doubling per attempt, capped at
+an hour) and marked failed after max_attempts.
+
+Notifications created by the in-app worker reach that process's open
+streams directly; from a separate worker process they need a broker
+shared between processes (NOTIFICATION_BROKER=postgres).
+"""
+
+import logging
+import os
+import threading
+import traceback
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Optional
+
+from sqlalchemy import event as sa_event, func, literal_column, select
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models import OutboxEvent
+from app.utils.notifications import create_notifications
+
+
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "100"))
+OUTBOX_POLL_SECONDS = float(os.getenv("OUTBOX_POLL_SECONDS", "1.0"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "5"))
+OUTBOX_RETRY_BASE_SECONDS = float(os.getenv("OUTBOX_RETRY_BASE_SECONDS", "5"))
+OUTBOX_WORKER_IN_APP = os.getenv("OUTBOX_WORKER_IN_APP", "true").lower() in ("1", "true", "yes")
+_MAX_BACKOFF_SECONDS = 3600
+
+# Session.info key: this transaction enqueued events
+_ENQUEUED = "outbox_enqueued"
+
+# Inlined rather than bound, to match the partial index's predicate
+_PENDING = literal_column("'pending'")
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[Session, dict[str, Any]], None]
+
+# kind → handler; handlers run inside the worker's transaction and must
+# not commit
+HANDLERS: dict[str, Handler] = {}
+
+
+def handler(kind: str) -> Callable[[Handler], Handler]:
+    """Registers the decorated function as the handler of `kind` events."""
+    def register(fn: Handler) -> Handler:
+        HANDLERS[kind] = fn
+        return fn
+    return register
+
+
+def enqueue(db: Session, kind: str, payload: dict[str, Any]) -> OutboxEvent:
+    """
+    Records an event for the worker. Does NOT commit — the caller's
+    transaction owns it, so the event exists only if the change commits.
+    """
+    if kind not in HANDLERS:
+        raise ValueError(f"No outbox handler for {kind!r}")
+    event = OutboxEvent(kind=kind, payload=payload)
+    db.add(event)
+    db.info[_ENQUEUED] = True
+    return event
+
+
+def notify_many(db: Session, recipient_ids, message: str) -> Optional[OutboxEvent]:
+    """Enqueues the same notification for many recipients (none: nothing)."""
+    recipient_ids = list(dict.fromkeys(recipient_ids))
+    if not recipient_ids:
+        return None
+    return enqueue(db, "notifications.fanout", {"recipient_ids": recipient_ids, "message": message})
+
+
+@handler("notifications.fanout")
+def _fan_out_notifications(db: Session, payload: dict[str, Any]) -> None:
+    create_notifications(db, payload["recipient_ids"], payload["message"])
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class OutboxWorker:
+    """
+    Drains due outbox events. `session_factory` is called per event, so
+    tests can point the worker at their database.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        batch_size: int = OUTBOX_BATCH_SIZE,
+        max_attempts: int = OUTBOX_MAX_ATTEMPTS,
+        retry_base_seconds: float = OUTBOX_RETRY_BASE_SECONDS,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+
+        self.processed = 0
+        self.retried = 0
+        self.failed = 0
+
+        self._wake = threading.Event()
+        self._stop: Optional[threading.Event] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, poll_seconds: float = OUTBOX_POLL_SECONDS) -> None:
+        """Runs run_forever on a daemon thread until stop(); no-op if running."""
+        with self._lock:
+            if self.running:
+                return
+            self._stop = threading.Event()
+            self._thread = threading.Thread(
+                target=self.run_forever,
+                args=(poll_seconds, self._stop),
+                name="outbox-worker",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stops the thread started by start(), letting its current event finish."""
+        with self._lock:
+            thread, stop = self._thread, self._stop
+            self._thread = self._stop = None
+        if thread is None:
+            return
+        stop.set()
+        self._wake.set()
+        thread.join(timeout)
+
+    def wake(self) -> None:
+        """Cuts the current idle wait short: new events were committed."""
+        self._wake.set()
+
+    def run_once(self) -> int:
+        """Handles up to batch_size due events; returns how many it took."""
+        handled = 0
+        while handled < self.batch_size and self._handle_next():
+            handled += 1
+        return handled
+
+    def run_forever(self, poll_seconds: float = OUTBOX_POLL_SECONDS, stop: Optional[threading.Event] = None) -> None:
+        """Drains the queue, sleeping poll_seconds whenever it is empty, until `stop` is set."""
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            try:
+                idle = self.run_once() == 0
+            except Exception:
+                # Database unreachable and the like; try again later
+                logger.exception("Outbox worker pass failed")
+                idle = True
+            if idle and not stop.is_set():
+                self._wake.wait(poll_seconds)
+            self._wake.clear()
+
+    def _handle_next(self) -> bool:
+        """Takes the oldest due event and handles it; False when none is due."""
+        with self.session_factory() as db:
+            event = db.scalars(
+                select(OutboxEvent)
+                .where(OutboxEvent.status == _PENDING, OutboxEvent.available_at <= _now())
+                .order_by(OutboxEvent.available_at, OutboxEvent.id)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            ).first()
+            if event is None:
+                db.rollback()
+                return False
+
+            event_id, kind, payload = event.id, event.kind, event.payload
+            try:
+                HANDLERS[kind](db, payload)
+                event.status = "done"
+                event.attempts += 1
+                event.processed_at = func.now()
+                db.commit()
+                self.processed += 1
+                return True
+            except Exception:
+                db.rollback()
+                error = traceback.format_exc(limit=5)
+                logger.exception("Outbox event %s (%s) failed", event_id, kind)
+
+        self._record_failure(event_id, error)
+        return True
+
+    def _record_failure(self, event_id: int, error: str) -> None:
+        with self.session_factory() as db:
+            event = db.get(OutboxEvent, event_id)
+            if event is None or event.status != "pending":
+                return
+            event.attempts += 1
+            event.last_error = error
+            if event.attempts >= self.max_attempts:
+                event.status = "failed"
+                self.failed += 1
+            else:
+                backoff = min(self.retry_base_seconds * 2 ** (event.attempts - 1), _MAX_BACKOFF_SECONDS)
+                event.available_at = _now() + timedelta(seconds=backoff)
+                self.retried += 1
+            db.commit()
+
+
+# The app's own worker, started and stopped by the lifespan in main.py
+outbox_worker = OutboxWorker(SessionLocal)
+
+
+@sa_event.listens_for(Session, "after_commit")
+def _wake_worker(db: Session) -> None:
+    if db.info.pop(_ENQUEUED, False):
+        outbox_worker.wake()
+
+
+@sa_event.listens_for(Session, "after_rollback")
+def _forget_enqueued(db: Session) -> None:
+    db.info.pop(_ENQUEUED, None)
+
+
+def outbox_stats(db: Session) -> dict[str, Any]:
+    """Events per status and the age of the oldest pending one, in seconds."""
+    counts = dict(
+        db.query(OutboxEvent.status, func.count()).group_by(OutboxEvent.status).all()
+    )
+    oldest = db.query(func.min(OutboxEvent.created_at)).filter(OutboxEvent.status == "pending").scalar()
+    if oldest is not None and oldest.tzinfo is None:
+        oldest = oldest.replace(tzinfo=timezone.utc)
+    return {
+        "pending": counts.get("pending", 0),
+        "done": counts.get("done", 0),
+        "failed": counts.get("failed", 0),
+        "oldest_pending_seconds": (_now() - oldest).total_seconds() if oldest else None,
+    }
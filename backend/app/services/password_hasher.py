@@ -0,0 +1,132 @@
+"""
+password_hasher.py
+==================
+Runs bcrypt for login and registration in a dedicated process pool.
+
+A bcrypt hash or check at the default cost is ~250 ms of pure CPU. Done
+inline in the sync auth endpoints it occupied one of the threads of the
+threadpool every sync endpoint shares, and held the GIL for most of
+that time, so a burst of logins starved unrelated requests on the
+worker. The auth endpoints now await PasswordHasher instead: the work
+runs in PASSWORD_HASH_WORKERS separate processes, and the event loop
+and the shared threadpool stay free while it does.
+
+The pool is bounded: at most max_pending hashes may be queued or running.
+Past that, requests are refused with HasherBusy (the endpoints answer
+503 with Retry-After) rather than queueing work that would time out
+anyway. Queue depth, peak depth, rejections and average latency are
+exposed by stats().
+
+The cost factor is BCRYPT_ROUNDS (app.utils.security); the worker
+processes are spawned with the parent's environment and so use the same
+value.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+from app.utils.security import hash_password, verify_and_update
+
+
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+
+
+class HasherBusy(Exception):
+    """Raised when max_pending hashes are already queued or running."""
+
+
+class PasswordHasher:
+    """Bounded process pool for bcrypt, awaited from async endpoints."""
+
+    def __init__(
+        self,
+        workers: int = PASSWORD_HASH_WORKERS,
+        max_pending: int = PASSWORD_HASH_MAX_PENDING,
+    ):
+        self.workers = max(1, workers)
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+        self.peak_pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self._busy_seconds = 0.0
+
+    # ── Operations ────────────────────────────────────────────────────────
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+        """(matches, replacement hash if the stored one uses an outdated cost)."""
+        return await self._run(verify_and_update, password, hashed_password)
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise HasherBusy()
+            self._pending += 1
+            self.peak_pending = max(self.peak_pending, self._pending)
+            executor = self._ensure_executor()
+
+        started = time.perf_counter()
+        try:
+            return await asyncio.wrap_future(executor.submit(fn, *args))
+        except BrokenProcessPool:
+            # A worker died; the next call starts a fresh pool
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            raise
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self.completed += 1
+                self._busy_seconds += time.perf_counter() - started
+
+    # ── Lifecycle ─────────────────────────────────────────────────────────
+
+    def _ensure_executor(self) -> Executor:
+        # Called with the lock held. Spawned rather than forked: the app
+        # process runs threads (log writer, threadpool) that fork would copy
+        # mid-flight.
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def shutdown(self) -> None:
+        """Stops the worker processes; a later call starts a new pool."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    # ── Observability ─────────────────────────────────────────────────────
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "peak_pending": self.peak_pending,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_ms": round(self._busy_seconds * 1000.0 / self.completed, 2) if self.completed else 0.0,
+            }
+
+
+# Process-wide singleton shared by the auth endpoints
+password_hasher = PasswordHasher()
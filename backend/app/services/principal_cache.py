@@ -0,0 +1,145 @@
+"""
+principal_cache.py
+==================
+Per-worker cache of authenticated users for get_current_user.
+
+Every authenticated request used to load its user row — and
+require_role / require_project_participant stack on top of
+get_current_user, so even a request rejected on role paid for the
+SELECT. Authorisation only needs three columns of that row, so
+get_current_user now resolves the token's user_id to a Principal
+(id, role, is_active) and keeps it here.
+
+Invalidation:
+
+- invalidate_user() is called after commit by every write path that
+  changes one of those columns (today: admin suspend / reactivate).
+- Entries also expire after ttl_seconds, which bounds how long another
+  worker process keeps serving a principal it did not see change.
+
+A lookup that races an invalidation is never cached: take stamp()
+before loading the row and put() drops the result if the user was
+invalidated meanwhile. Least recently used entries are evicted beyond
+max_entries.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from app.models import User, UserRole
+
+
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+PRINCIPAL_CACHE_MAX_ENTRIES = int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", "10000"))
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated user as seen by route handlers."""
+    id: int
+    role: UserRole
+    is_active: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(id=user.id, role=user.role, is_active=user.is_active)
+
+
+@dataclass
+class _Entry:
+    principal: Principal
+    expires_at: float
+
+
+class PrincipalCache:
+    """Thread-safe LRU + TTL cache of principals, keyed by user id."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = PRINCIPAL_CACHE_TTL_SECONDS,
+        max_entries: int = PRINCIPAL_CACHE_MAX_ENTRIES,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[int, _Entry] = OrderedDict()
+        self._versions: dict[int, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # ── Reads ─────────────────────────────────────────────────────────────
+
+    def get(self, user_id: int) -> Optional[Principal]:
+        """Returns the cached principal, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires_at <= time.monotonic():
+                del self._entries[user_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry.principal
+
+    def stamp(self, user_id: int) -> int:
+        """Current version of a user; take it BEFORE loading the row."""
+        with self._lock:
+            return self._versions.get(user_id, 0)
+
+    def stats(self) -> dict:
+        """Counters for the admin metrics endpoint."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+    # ── Writes ────────────────────────────────────────────────────────────
+
+    def put(self, principal: Principal, stamp: int) -> None:
+        """
+        Stores a principal loaded under `stamp`; dropped if the user has
+        been invalidated since.
+        """
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            if stamp != self._versions.get(principal.id, 0):
+                return
+            self._entries[principal.id] = _Entry(principal, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(principal.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Drops a user's principal; the next request reloads it."""
+        with self._lock:
+            self._entries.pop(user_id, None)
+            self._versions[user_id] = self._versions.get(user_id, 0) + 1
+
+    def clear(self) -> None:
+        """Drops all entries and resets the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+
+# Process-wide singleton shared by the auth dependencies
+principal_cache = PrincipalCache()
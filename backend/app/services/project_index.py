@@ -0,0 +1,240 @@
+"""
+project_index.py
+================
+In-process feature index of open projects for the matching engine.
+
+GET /recommendations used to reload every open Project row and re-tokenise
+its skills, title and description on every request. This index keeps the
+tokenised ProjectFeatures of all open projects in memory and hands the
+engine a ready-to-score ProjectMatrix.
+
+Lifecycle
+---------
+- Built lazily from the database on first use.
+- Updated incrementally by the write paths that change the open-project
+  set (create, close on acceptance, complete, admin disable) via
+  upsert() / remove(), called only after the write has committed.
+- Rebuilt from the database once it is older than max_age_seconds, which
+  bounds staleness when several worker processes each hold their own copy.
+
+The encoded ProjectMatrix is cached and only re-encoded (from the cached
+features — no text processing) after the feature set has changed.
+
+`epoch` increases on every change to the open-project set, so caches of
+anything derived from it (see recommendation_cache.py) can tell when
+they are stale. `added_at` is when a project last joined the set, for
+rankings stored outside this process (recommendation_snapshots.py): one
+made before it is missing a project, while closed projects can simply
+be filtered out of it.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models import Project
+from app.services.batch_scoring import (
+    ProjectFeatures,
+    ProjectMatrix,
+    encode_features,
+    extract_features,
+)
+from app.services.matching_engine import ProjectDTO, parse_skills
+
+
+PROJECT_INDEX_MAX_AGE_SECONDS = float(os.getenv("PROJECT_INDEX_MAX_AGE_SECONDS", "60"))
+
+
+def build_project_dto(project) -> ProjectDTO:
+    """
+    Maps a Project ORM object (or a row with the same attributes)
+    to a ProjectDTO.
+    """
+    return ProjectDTO(
+        project_id=project.id,
+        title=project.title,
+        description=project.description or "",
+        required_skills=parse_skills(project.required_skills),
+        duration=project.duration or "",
+        status=project.status,
+    )
+
+
+class ProjectFeatureIndex:
+    """
+    Thread-safe cache of ProjectFeatures for every open project,
+    keyed by project id and scored in ascending id order.
+    """
+
+    def __init__(self, max_age_seconds: float = PROJECT_INDEX_MAX_AGE_SECONDS):
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+        self._features: dict[int, ProjectFeatures] = {}
+        self._matrix: Optional[ProjectMatrix] = None
+        self._loaded_at: Optional[float] = None
+        self._epoch = 0
+        self._added_at: Optional[datetime] = None
+
+    # ── Reads ─────────────────────────────────────────────────────────────
+
+    def matrix(self, db: Session) -> ProjectMatrix:
+        """
+        Returns the encoded matrix of all open projects, loading or
+        refreshing the index from the database first if needed.
+        """
+        return self.matrix_and_epoch(db)[0]
+
+    def matrix_and_epoch(self, db: Session) -> tuple[ProjectMatrix, int]:
+        """
+        matrix() together with the epoch it belongs to, read under the
+        same lock: stamp anything derived from the matrix with this epoch,
+        not a later read of `epoch`, which a concurrent change may have
+        moved on already.
+        """
+        with self._lock:
+            if self._is_expired():
+                self._load(db.execute(open_projects_statement()).all())
+            return self._encoded(), self._epoch
+
+    def matrix_from_rows(self, rows: Optional[list]) -> Optional[tuple[ProjectMatrix, int]]:
+        """
+        matrix_and_epoch() for callers that query open_projects_statement()
+        themselves (the async endpoints, which can't hand over a Session):
+        `rows` is its result, or None if `expired` was False. Returns None
+        when the index needs those rows after all; query and call again.
+
+        Tokenises and encodes, so call it from a worker thread, not the
+        event loop.
+        """
+        with self._lock:
+            if self._is_expired():
+                if rows is None:
+                    return None
+                self._load(rows)
+            return self._encoded(), self._epoch
+
+    @property
+    def expired(self) -> bool:
+        """True if the next read reloads from the database."""
+        return self._is_expired()
+
+    @property
+    def epoch(self) -> int:
+        """Version of the open-project set; never decreases."""
+        return self._epoch
+
+    @property
+    def added_at(self) -> Optional[datetime]:
+        """
+        When an open project last joined the index (created, or found new
+        or changed by a reload); None before the first load.
+        """
+        return self._added_at
+
+    def __len__(self) -> int:
+        return len(self._features)
+
+    def __contains__(self, project_id: int) -> bool:
+        """True if the project is currently open (as of the last load)."""
+        return project_id in self._features
+
+    # ── Incremental updates ───────────────────────────────────────────────
+
+    def upsert(self, project: Project) -> None:
+        """
+        Adds or refreshes a project after it was created or edited.
+        Projects that are no longer open are dropped instead.
+        """
+        if project.status != "open":
+            self.remove(project.id)
+            return
+
+        features = extract_features(build_project_dto(project))
+        with self._lock:
+            if self._loaded_at is None:
+                # Not built yet — the first read will load it from the DB
+                return
+            self._features[project.id] = features
+            self._matrix = None
+            self._epoch += 1
+            self._added_at = datetime.now(timezone.utc)
+
+    def remove(self, project_id: int) -> None:
+        """Drops a project that was closed, completed or disabled."""
+        with self._lock:
+            if self._features.pop(project_id, None) is not None:
+                self._matrix = None
+                self._epoch += 1
+
+    def clear(self) -> None:
+        """Forgets everything; the next read rebuilds from the database."""
+        with self._lock:
+            self._features = {}
+            self._matrix = None
+            self._loaded_at = None
+            self._epoch += 1
+            self._added_at = None
+
+    # ── Internals ─────────────────────────────────────────────────────────
+
+    def _is_expired(self) -> bool:
+        if self._loaded_at is None:
+            return True
+        return time.monotonic() - self._loaded_at > self.max_age_seconds
+
+    def _encoded(self) -> ProjectMatrix:
+        if self._matrix is None:
+            ordered = [self._features[pid] for pid in sorted(self._features)]
+            self._matrix = encode_features(ordered)
+        return self._matrix
+
+    def _load(self, rows: list) -> None:
+        features = {row.id: extract_features(build_project_dto(row)) for row in rows}
+
+        if self._loaded_at is None:
+            # First load: projects joined the set when they were created
+            created = [_as_utc(row.created_at) for row in rows if row.created_at is not None]
+            self._added_at = max(created, default=None)
+        elif any(self._features.get(pid) != f for pid, f in features.items()):
+            # Created or edited in another process since the last load
+            self._added_at = datetime.now(timezone.utc)
+
+        if features != self._features or self._loaded_at is None:
+            # A periodic reload that finds nothing new keeps the epoch
+            self._features = features
+            self._matrix = None
+            self._epoch += 1
+        self._loaded_at = time.monotonic()
+
+
+def open_projects_statement():
+    """The rows the index is built from: every open project, in id order."""
+    return (
+        select(
+            Project.id,
+            Project.title,
+            Project.description,
+            Project.required_skills,
+            Project.duration,
+            Project.status,
+            Project.created_at,
+        )
+        .where(Project.status == "open")
+        .order_by(Project.id)
+    )
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes; timestamps are stored in UTC
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+# Process-wide singleton shared by the routers
+project_index = ProjectFeatureIndex()
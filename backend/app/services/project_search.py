@@ -0,0 +1,191 @@
+"""
+project_search.py
+=================
+Search over project title, description and required skills for
+GET /projects.
+
+Two modes:
+
+- keyword  (default) — the original AND of ILIKE '%kw%' filters. Matches
+  arbitrary substrings, but every query scans every open project.
+- fulltext — an inverted full-text index, ranked by relevance:
+    * PostgreSQL: a generated `search_vector` tsvector column on
+      projects (title weighted A, skills B, description C) with a GIN
+      index; queried with to_tsquery and ranked with ts_rank_cd.
+    * SQLite (tests / local dev): an external-content FTS5 table
+      `projects_fts` kept in step by insert/update/delete triggers;
+      ranked with bm25.
+  Every search word must match, as a word prefix ("pyth" finds
+  "python").
+
+The index is maintained by the database itself — the generated column
+and the triggers follow every insert and update — so the write paths do
+not need to know about it. It is created together with the projects
+table, and the baseline migration, which keeps its own copy of the DDL,
+adds it to existing databases.
+"""
+
+import re
+from typing import Optional
+
+from sqlalchemy import DDL, Float, Integer, and_, event, or_, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Query
+
+from app.models import Project
+
+
+# ---------------------------------------------------------------------------
+# Schema
+# ---------------------------------------------------------------------------
+
+_POSTGRES_DDL = [
+    """
+    ALTER TABLE projects ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(required_skills, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_projects_search_vector ON projects USING GIN (search_vector)",
+]
+
+_SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS projects_fts USING fts5(
+        title, description, required_skills,
+        content='projects', content_rowid='id',
+        tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS projects_fts_ai AFTER INSERT ON projects BEGIN
+        INSERT INTO projects_fts(rowid, title, description, required_skills)
+        VALUES (new.id, new.title, new.description, new.required_skills);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS projects_fts_ad AFTER DELETE ON projects BEGIN
+        INSERT INTO projects_fts(projects_fts, rowid, title, description, required_skills)
+        VALUES ('delete', old.id, old.title, old.description, old.required_skills);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS projects_fts_au
+    AFTER UPDATE OF title, description, required_skills ON projects BEGIN
+        INSERT INTO projects_fts(projects_fts, rowid, title, description, required_skills)
+        VALUES ('delete', old.id, old.title, old.description, old.required_skills);
+        INSERT INTO projects_fts(rowid, title, description, required_skills)
+        VALUES (new.id, new.title, new.description, new.required_skills);
+    END
+    """,
+]
+
+
+def install_search_index(connection: Connection) -> None:
+    """
+    Creates the full-text index for the connection's dialect if it does
+    not exist yet, indexing any projects already stored. Idempotent.
+    """
+    dialect = connection.dialect.name
+
+    if dialect == "postgresql":
+        for statement in _POSTGRES_DDL:
+            connection.execute(text(statement))
+
+    elif dialect == "sqlite":
+        existed = connection.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'projects_fts'"
+        )).first() is not None
+        for statement in _SQLITE_DDL:
+            connection.execute(text(statement))
+        if not existed:
+            connection.execute(text("INSERT INTO projects_fts(projects_fts) VALUES ('rebuild')"))
+
+
+# Build the index whenever the projects table is created, and drop the
+# SQLite FTS table with it (it lives outside the ORM metadata)
+event.listen(
+    Project.__table__, "after_create",
+    lambda target, connection, **kw: install_search_index(connection),
+)
+event.listen(
+    Project.__table__, "before_drop",
+    DDL("DROP TABLE IF EXISTS projects_fts").execute_if(dialect="sqlite"),
+)
+
+
+# ---------------------------------------------------------------------------
+# Queries
+# ---------------------------------------------------------------------------
+
+_WORD = re.compile(r"\w+")
+
+
+def keyword_filter(search: str):
+    """
+    The original search: every whitespace-separated keyword must occur
+    (case-insensitively) in the title, description or required skills.
+    """
+    search_filters = []
+
+    for keyword in search.strip().split():
+        term = f"%{keyword}%"
+        search_filters.append(
+            or_(
+                Project.title.ilike(term),
+                Project.description.ilike(term),
+                Project.required_skills.ilike(term)
+            )
+        )
+
+    # Match ALL keywords (AND logic)
+    return and_(*search_filters)
+
+
+def search_words(search: str) -> list[str]:
+    """Lowercased word tokens of a search string; punctuation is dropped."""
+    return _WORD.findall(search.lower())
+
+
+def _match_subquery(dialect: str, words: list[str]):
+    """(project_id, score) rows for projects matching every word, higher = better."""
+    if dialect == "postgresql":
+        tsquery = " & ".join(f"{word}:*" for word in words)
+        statement = text(
+            "SELECT id AS project_id, ts_rank_cd(search_vector, q) AS score "
+            "FROM projects, to_tsquery('english', :tsquery) AS q "
+            "WHERE search_vector @@ q"
+        ).bindparams(tsquery=tsquery)
+    else:
+        # Quoted so FTS5 operators in user input are treated as text
+        match = " AND ".join(f'"{word}"*' for word in words)
+        statement = text(
+            "SELECT rowid AS project_id, -bm25(projects_fts, 10.0, 1.0, 5.0) AS score "
+            "FROM projects_fts WHERE projects_fts MATCH :match"
+        ).bindparams(match=match)
+
+    return statement.columns(project_id=Integer, score=Float).subquery("search_matches")
+
+
+def apply_fulltext_search(query: Query, search: str, dialect: Optional[str] = None) -> Query:
+    """
+    Restricts a Project query to full-text matches of `search` and orders
+    it by relevance, newest first among equally relevant projects.
+    A search without any words leaves the query unchanged.
+
+    Also accepts a select(Project), which has no session to take the
+    dialect name from; pass `dialect` with it.
+    """
+    words = search_words(search)
+    if not words:
+        return query
+
+    dialect = dialect or query.session.get_bind().dialect.name
+    matches = _match_subquery(dialect, words)
+    return (
+        query.join(matches, matches.c.project_id == Project.id)
+        .order_by(None)
+        .order_by(matches.c.score.desc(), Project.created_at.desc(), Project.id.desc())
+    )
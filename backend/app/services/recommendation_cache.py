@@ -0,0 +1,153 @@
+"""
+recommendation_cache.py
+=======================
+Per-student cache of ranked recommendations for GET /recommendations.
+
+Students reload the recommendations page far more often than anything
+that feeds their ranking changes. A ranking only depends on:
+
+- the student's profile and history   → a per-student profile version
+- the set of open projects             → the project index epoch
+
+Each entry is stamped with both when it is computed and is served only
+while both still match, so invalidation is event-driven:
+
+- invalidate_student() is called after commit by every write path that
+  changes a student's profile or history (profile endpoints, applying,
+  application decisions, deliverable reviews, project completion,
+  feedback).
+- The epoch comes from ProjectFeatureIndex, which bumps it whenever the
+  open-project set changes (create, close, complete, disable, reload).
+
+Entries additionally expire after ttl_seconds — this bounds staleness for
+signals no write path announces (the 30-day recent-application window,
+writes handled by another worker process) — and the least recently used
+entries are evicted beyond max_entries.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional
+
+
+RECOMMENDATION_CACHE_TTL_SECONDS = float(os.getenv("RECOMMENDATION_CACHE_TTL_SECONDS", "300"))
+RECOMMENDATION_CACHE_MAX_ENTRIES = int(os.getenv("RECOMMENDATION_CACHE_MAX_ENTRIES", "10000"))
+
+
+@dataclass(frozen=True)
+class CacheStamp:
+    """Versions a cached ranking was computed against."""
+    profile_version: int
+    project_epoch: int
+
+
+@dataclass
+class _Entry:
+    stamp: CacheStamp
+    expires_at: float
+    value: Any
+
+
+class RecommendationCache:
+    """
+    Thread-safe LRU + TTL cache of ranked results,
+    keyed by (student_id, top_n).
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = RECOMMENDATION_CACHE_TTL_SECONDS,
+        max_entries: int = RECOMMENDATION_CACHE_MAX_ENTRIES,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[int, Optional[int]], _Entry] = OrderedDict()
+        self._profile_versions: dict[int, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # ── Reads ─────────────────────────────────────────────────────────────
+
+    def stamp(self, student_id: int, project_epoch: int) -> CacheStamp:
+        """
+        Captures the current versions for a student. Take the stamp BEFORE
+        computing a ranking so a concurrent invalidation is never masked.
+        """
+        with self._lock:
+            return CacheStamp(self._profile_versions.get(student_id, 0), project_epoch)
+
+    def get(self, student_id: int, top_n: Optional[int], stamp: CacheStamp) -> Optional[Any]:
+        """Returns the cached ranking, or None on a miss."""
+        key = (student_id, top_n)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.stamp != stamp or entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def stats(self) -> dict:
+        """Counters for the admin metrics endpoint."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+    # ── Writes ────────────────────────────────────────────────────────────
+
+    def put(self, student_id: int, top_n: Optional[int], stamp: CacheStamp, value: Any) -> None:
+        """
+        Stores a ranking computed against `stamp`. Results computed against
+        an already superseded profile version are dropped.
+        """
+        if self.max_entries <= 0:
+            return
+        key = (student_id, top_n)
+        with self._lock:
+            if stamp.profile_version != self._profile_versions.get(student_id, 0):
+                return
+            self._entries[key] = _Entry(stamp, time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate_student(self, student_id: int) -> None:
+        """Marks every cached ranking of one student as stale."""
+        self.invalidate_students([student_id])
+
+    def invalidate_students(self, student_ids: Iterable[int]) -> None:
+        """Marks every cached ranking of the given students as stale."""
+        with self._lock:
+            for sid in student_ids:
+                self._profile_versions[sid] = self._profile_versions.get(sid, 0) + 1
+
+    def clear(self) -> None:
+        """Drops all entries and resets the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+
+# Process-wide singleton shared by the routers
+recommendation_cache = RecommendationCache()
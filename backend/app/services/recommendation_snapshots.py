@@ -0,0 +1,269 @@
+"""
+recommendation_snapshots.py
+===========================
+Offline precompute of recommendations for every student.
+
+During peak traffic GET /recommendations would otherwise score every
+open project per request. This job ranks all students in one pass and
+writes the results to the recommendation_snapshots table, which the
+endpoint then serves with a single indexed lookup.
+
+Job (python -m app.cli precompute-recommendations)
+--------------------------------------------------
+1. Load and encode every open project once (ProjectFeatureIndex).
+2. Load every StudentProfile once, plus their history metrics in bulk.
+3. Split students into shards and rank each shard in a process pool;
+   the encoded projects are shipped to each worker once, at start-up.
+4. Replace each shard's snapshot rows and commit per shard.
+
+Serving
+-------
+Disabled unless RECOMMENDATION_SNAPSHOTS_ENABLED is set. A snapshot is
+only served while younger than RECOMMENDATION_SNAPSHOT_MAX_AGE_SECONDS
+and newer than the last project to open (project_index.added_at);
+projects that have closed since are dropped from it. It is discarded,
+in the same transaction, when the student edits their profile or their
+history changes (applications, deliverable reviews, completions,
+feedback). Anything it cannot answer (stale, missing, or truncated below
+the requested top_n) falls back to live scoring.
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterable, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models import RecommendationSnapshot, StudentProfile, User
+from app.schemas.user import UserRole
+from app.services.batch_scoring import ProjectMatrix
+from app.services.matching_engine import (
+    ScoredProject,
+    StudentDTO,
+    build_student_dto,
+    rank_project_matrix,
+)
+from app.services.project_index import ProjectFeatureIndex
+from app.utils.student_metrics import get_student_metrics_bulk
+
+
+RECOMMENDATION_SNAPSHOTS_ENABLED = os.getenv(
+    "RECOMMENDATION_SNAPSHOTS_ENABLED", "false"
+).lower() in ("1", "true", "yes")
+RECOMMENDATION_SNAPSHOT_MAX_AGE_SECONDS = float(
+    os.getenv("RECOMMENDATION_SNAPSHOT_MAX_AGE_SECONDS", "3600")
+)
+
+# Rankings are stored to the deepest top_n the endpoint accepts
+SNAPSHOT_DEPTH = 100
+
+
+# ---------------------------------------------------------------------------
+# Scoring (runs in pool workers)
+# ---------------------------------------------------------------------------
+
+_worker_matrix: Optional[ProjectMatrix] = None
+
+
+def _init_worker(matrix: ProjectMatrix) -> None:
+    global _worker_matrix
+    _worker_matrix = matrix
+
+
+def _rank_shard(
+    students: list[StudentDTO], depth: int
+) -> list[tuple[int, list[ScoredProject], bool]]:
+    """Ranks one shard against the worker's projects."""
+    complete = len(_worker_matrix) <= depth
+    return [
+        (student.student_id, rank_project_matrix(student, _worker_matrix, top_n=depth), complete)
+        for student in students
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Job
+# ---------------------------------------------------------------------------
+
+def _load_students(db: Session, shard_size: int) -> list[list[StudentDTO]]:
+    profiles = (
+        db.query(
+            StudentProfile.user_id,
+            StudentProfile.skills,
+            StudentProfile.major,
+            StudentProfile.bio,
+            StudentProfile.graduation_year,
+        )
+        .join(User, User.id == StudentProfile.user_id)
+        .filter(User.role == UserRole.student)
+        .order_by(StudentProfile.user_id)
+        .all()
+    )
+
+    shards = []
+    for start in range(0, len(profiles), shard_size):
+        batch = profiles[start:start + shard_size]
+        metrics = get_student_metrics_bulk(db, [p.user_id for p in batch])
+        shards.append([build_student_dto(p, metrics[p.user_id]) for p in batch])
+    return shards
+
+
+def _store_shard(
+    db: Session,
+    results: list[tuple[int, list[ScoredProject], bool]],
+    generated_at: datetime,
+) -> None:
+    student_ids = [student_id for student_id, _, _ in results]
+    db.query(RecommendationSnapshot).filter(
+        RecommendationSnapshot.student_id.in_(student_ids)
+    ).delete(synchronize_session=False)
+
+    rows = [
+        {
+            "student_id": student_id,
+            "rank": r.rank,
+            "project_id": r.project_id,
+            "title": r.title,
+            "match_score": r.match_score,
+            "skill_score": r.skill_score,
+            "experience_score": r.experience_score,
+            "interest_score": r.interest_score,
+            "activity_score": r.activity_score,
+            "success_score": r.success_score,
+            "complete": complete,
+            "generated_at": generated_at,
+        }
+        for student_id, ranked, complete in results
+        for r in ranked
+    ]
+    if rows:
+        db.execute(insert(RecommendationSnapshot), rows)
+    db.commit()
+
+
+def precompute_recommendations(
+    db: Session,
+    workers: Optional[int] = None,
+    shard_size: int = 500,
+    depth: int = SNAPSHOT_DEPTH,
+) -> int:
+    """
+    Ranks every student with a profile and replaces their snapshot rows.
+
+    workers: pool size (default: CPU count); 1 scores in this process.
+    Returns the number of students processed.
+    """
+    # Taken before the projects are read: a project opened meanwhile is
+    # then newer than the snapshot, which load_snapshot won't serve
+    generated_at = datetime.now(timezone.utc)
+    matrix = ProjectFeatureIndex().matrix(db)
+    shards = _load_students(db, shard_size)
+    workers = workers or os.cpu_count() or 1
+
+    if workers <= 1 or len(shards) <= 1:
+        _init_worker(matrix)
+        try:
+            for shard in shards:
+                _store_shard(db, _rank_shard(shard, depth), generated_at)
+        finally:
+            _init_worker(None)
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(shards)),
+            initializer=_init_worker,
+            initargs=(matrix,),
+        ) as pool:
+            for results in pool.map(_rank_shard, shards, [depth] * len(shards)):
+                _store_shard(db, results, generated_at)
+
+    return sum(len(shard) for shard in shards)
+
+
+# ---------------------------------------------------------------------------
+# Serving
+# ---------------------------------------------------------------------------
+
+def load_snapshot(
+    db: Session,
+    student_id: int,
+    top_n: Optional[int],
+    is_open: Callable[[int], bool],
+    projects_added_at: Optional[datetime] = None,
+) -> Optional[list[ScoredProject]]:
+    """
+    Returns the student's precomputed ranking, or None if snapshots are
+    disabled or this one cannot answer the request.
+
+    is_open: predicate on project id; projects closed since the snapshot
+    was generated are dropped and the remaining ranks renumbered.
+    projects_added_at: when a project last opened; a snapshot generated
+    before then does not rank it, so it is not served.
+    """
+    if not RECOMMENDATION_SNAPSHOTS_ENABLED:
+        return None
+
+    rows = (
+        db.query(RecommendationSnapshot)
+        .filter(RecommendationSnapshot.student_id == student_id)
+        .order_by(RecommendationSnapshot.rank)
+        .all()
+    )
+    if not rows:
+        return None
+
+    generated_at = rows[0].generated_at
+    if generated_at.tzinfo is None:
+        generated_at = generated_at.replace(tzinfo=timezone.utc)
+    max_age = timedelta(seconds=RECOMMENDATION_SNAPSHOT_MAX_AGE_SECONDS)
+    if datetime.now(timezone.utc) - generated_at > max_age:
+        return None
+    if projects_added_at is not None and generated_at < projects_added_at:
+        return None
+
+    complete = rows[0].complete
+    rows = [row for row in rows if is_open(row.project_id)]
+
+    # A truncated ranking can only answer a top_n it still covers
+    if not complete and (top_n is None or len(rows) < top_n):
+        return None
+    if top_n is not None:
+        rows = rows[:top_n]
+
+    return [
+        ScoredProject(
+            project_id=row.project_id,
+            title=row.title,
+            match_score=row.match_score,
+            rank=rank,
+            skill_score=row.skill_score,
+            experience_score=row.experience_score,
+            interest_score=row.interest_score,
+            activity_score=row.activity_score,
+            success_score=row.success_score,
+        )
+        for rank, row in enumerate(rows, start=1)
+    ]
+
+
+def discard_snapshot(db: Session, student_id: int) -> None:
+    """
+    Deletes a student's snapshot, e.g. after a profile edit.
+    Does NOT commit — runs inside the caller's transaction.
+    """
+    discard_snapshots(db, [student_id])
+
+
+def discard_snapshots(db: Session, student_ids: Iterable[int]) -> None:
+    """
+    Deletes the snapshots of students whose history changed, next to
+    refresh_student_stats. Does NOT commit.
+    """
+    ids = list(dict.fromkeys(student_ids))
+    if ids:
+        db.query(RecommendationSnapshot).filter(
+            RecommendationSnapshot.student_id.in_(ids)
+        ).delete(synchronize_session=False)
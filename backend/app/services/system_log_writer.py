@@ -0,0 +1,247 @@
+"""
+system_log_writer.py
+====================
+Background, batched writer for SystemLog rows.
+
+The logging middleware used to open a session, INSERT one row and
+COMMIT inside the event loop on every request — a blocking round trip
+(two, with the commit) that stalled every other request on the worker.
+Now the middleware only hands a plain dict to SystemLogWriter, which
+keeps them in a bounded in-process queue; a daemon thread drains the
+queue and bulk-inserts a batch in one statement and one commit whenever
+batch_size rows are waiting or flush_interval seconds have passed since
+the oldest one arrived.
+
+When the database cannot keep up, the queue fills and the writer
+degrades in two steps:
+
+- sampling: above sample_above (a fraction of max_queue), only one in
+  sample_every successful (< 400) requests is kept; error responses
+  are always kept.
+- back-pressure: when the queue is full, submit() waits (off the event
+  loop) up to block_seconds for room, slowing the request down rather
+  than the loop; after that the row is dropped.
+
+Counters for each outcome are exposed by stats(). Queued rows are lost
+if the process is killed; stop() — called on application shutdown —
+writes everything still queued first.
+"""
+
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from anyio import to_thread
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models import SystemLog
+
+
+SYSTEM_LOG_BATCH_SIZE = int(os.getenv("SYSTEM_LOG_BATCH_SIZE", "200"))
+SYSTEM_LOG_FLUSH_SECONDS = float(os.getenv("SYSTEM_LOG_FLUSH_SECONDS", "1.0"))
+SYSTEM_LOG_QUEUE_SIZE = int(os.getenv("SYSTEM_LOG_QUEUE_SIZE", "10000"))
+SYSTEM_LOG_SAMPLE_ABOVE = float(os.getenv("SYSTEM_LOG_SAMPLE_ABOVE", "0.8"))
+SYSTEM_LOG_SAMPLE_EVERY = int(os.getenv("SYSTEM_LOG_SAMPLE_EVERY", "10"))
+SYSTEM_LOG_BLOCK_SECONDS = float(os.getenv("SYSTEM_LOG_BLOCK_SECONDS", "0.05"))
+
+
+class _Marker:
+    """Queued by flush() / stop(); set once every row ahead of it is written."""
+
+    def __init__(self, stop: bool = False):
+        self.stop = stop
+        self.done = threading.Event()
+
+
+class SystemLogWriter:
+    """
+    Bounded queue of SystemLog rows drained by a batching thread.
+
+    `session_factory` is called for every batch, so tests can redirect
+    writes by swapping the factory it resolves to.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        batch_size: int = SYSTEM_LOG_BATCH_SIZE,
+        flush_interval: float = SYSTEM_LOG_FLUSH_SECONDS,
+        max_queue: int = SYSTEM_LOG_QUEUE_SIZE,
+        sample_above: float = SYSTEM_LOG_SAMPLE_ABOVE,
+        sample_every: int = SYSTEM_LOG_SAMPLE_EVERY,
+        block_seconds: float = SYSTEM_LOG_BLOCK_SECONDS,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.sample_threshold = int(max_queue * sample_above)
+        self.sample_every = max(1, sample_every)
+        self.block_seconds = block_seconds
+
+        # Unbounded underneath: max_queue is enforced on rows in offer(),
+        # so flush / stop markers can always be queued
+        self._queue: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._sample_counter = 0
+
+        self.written = 0
+        self.batches = 0
+        self.sampled_out = 0
+        self.dropped = 0
+        self.failed = 0
+
+    # ── Producers ─────────────────────────────────────────────────────────
+
+    def offer(self, entry: dict[str, Any]) -> Optional[bool]:
+        """
+        Queues a row without blocking. Returns True if queued, False if
+        sampling skipped it, or None if the queue is full.
+        """
+        self._ensure_started()
+        depth = self._queue.qsize()
+
+        if depth >= self.max_queue:
+            return None
+
+        if depth >= self.sample_threshold and (entry.get("status_code") or 0) < 400:
+            with self._lock:
+                self._sample_counter += 1
+                if self._sample_counter % self.sample_every:
+                    self.sampled_out += 1
+                    return False
+
+        self._queue.put_nowait(entry)
+        return True
+
+    async def submit(self, entry: dict[str, Any]) -> bool:
+        """
+        Queues a row from async code. When the queue is full, waits in a
+        worker thread (not on the event loop) for up to block_seconds;
+        returns False if the row was sampled out or dropped.
+        """
+        queued = self.offer(entry)
+        if queued is not None:
+            return queued
+
+        try:
+            await to_thread.run_sync(self._put_blocking, entry)
+            return True
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+
+    def _put_blocking(self, entry: dict[str, Any]) -> None:
+        deadline = time.monotonic() + self.block_seconds
+        while self._queue.qsize() >= self.max_queue:
+            if time.monotonic() >= deadline:
+                raise queue.Full
+            time.sleep(0.001)
+        self._queue.put_nowait(entry)
+
+    # ── Lifecycle ─────────────────────────────────────────────────────────
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="system-log-writer", daemon=True
+                )
+                self._thread.start()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Blocks until every row queued before the call has been written.
+        Returns False if `timeout` ran out first.
+        """
+        if (self._thread is None or not self._thread.is_alive()) and self._queue.empty():
+            return True
+        self._ensure_started()
+        marker = _Marker()
+        self._queue.put(marker)
+        return marker.done.wait(timeout)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """
+        Writes everything still queued and stops the flusher thread.
+        A later offer() starts a new one.
+        """
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        self._queue.put(_Marker(stop=True))
+        thread.join(timeout)
+
+    # ── Flusher thread ────────────────────────────────────────────────────
+
+    def _run(self) -> None:
+        while True:
+            batch, marker = self._collect()
+            if batch:
+                self._write(batch)
+            if marker is not None:
+                marker.done.set()
+                if marker.stop:
+                    return
+
+    def _collect(self) -> tuple[list[dict[str, Any]], Optional[_Marker]]:
+        """
+        Gathers up to batch_size rows: waits for the first, then until the
+        batch is full, flush_interval has passed, or a marker arrives
+        (the queue is FIFO, so every row queued before it is in the batch).
+        """
+        batch: list[dict[str, Any]] = []
+        deadline = None
+
+        while len(batch) < self.batch_size:
+            timeout = None if deadline is None else deadline - time.monotonic()
+            if timeout is not None and timeout <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+
+            if isinstance(item, _Marker):
+                return batch, item
+
+            batch.append(item)
+            if deadline is None:
+                deadline = time.monotonic() + self.flush_interval
+
+        return batch, None
+
+    def _write(self, batch: list[dict[str, Any]]) -> None:
+        db = self.session_factory()
+        try:
+            db.execute(insert(SystemLog), batch)
+            db.commit()
+            with self._lock:
+                self.written += len(batch)
+                self.batches += 1
+        except Exception:
+            db.rollback()
+            with self._lock:
+                self.failed += len(batch)
+        finally:
+            db.close()
+
+    # ── Observability ─────────────────────────────────────────────────────
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "queued": self._queue.qsize(),
+                "written": self.written,
+                "batches": self.batches,
+                "sampled_out": self.sampled_out,
+                "dropped": self.dropped,
+                "failed": self.failed,
+            }
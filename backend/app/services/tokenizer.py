@@ -0,0 +1,73 @@
+"""
+tokenizer.py
+============
+Keyword extraction for the matching engine's interest factor.
+
+The engine tokenises the student's major and bio and every project's
+title + description, once per (student, project) pair on the scalar
+path. The same handful of strings therefore come up again and again, so
+extract_keywords() memoises its result in a bounded LRU cache keyed by
+the text itself. The split pattern is compiled and the stop-word set
+built once, at import time.
+
+Results are frozensets: they are shared between callers through the
+cache and must not be mutated.
+"""
+
+import re
+from functools import lru_cache
+from typing import Optional
+
+
+# Distinct texts remembered by extract_keywords()
+KEYWORD_CACHE_SIZE = 4096
+
+STOP_WORDS: frozenset[str] = frozenset({
+    "a", "an", "the", "and", "or", "but", "in", "on", "at", "to",
+    "for", "of", "with", "by", "from", "is", "it", "as", "be",
+    "this", "that", "are", "was", "were", "has", "have", "had",
+    "will", "would", "can", "could", "i", "we", "you", "they",
+    "my", "our", "your", "their", "its",
+})
+
+_TOKEN_SPLIT = re.compile(r"[\s,.\-_/\\()\[\]{}:;!?\"']+")
+
+_EMPTY: frozenset[str] = frozenset()
+
+
+def tokenize(text: str) -> frozenset[str]:
+    """
+    Lowercases and splits on whitespace and punctuation, dropping
+    single-character tokens and stop words. Not cached.
+
+    >>> sorted(tokenize("Build a REST API, using Python!"))
+    ['api', 'build', 'python', 'rest', 'using']
+    """
+    return frozenset(
+        t for t in _TOKEN_SPLIT.split(text.lower())
+        if len(t) > 1 and t not in STOP_WORDS
+    )
+
+
+@lru_cache(maxsize=KEYWORD_CACHE_SIZE)
+def _cached_tokenize(text: str) -> frozenset[str]:
+    return tokenize(text)
+
+
+def extract_keywords(text: Optional[str]) -> frozenset[str]:
+    """
+    Memoised tokenize(); None and empty text give an empty set.
+    """
+    if not text:
+        return _EMPTY
+    return _cached_tokenize(text)
+
+
+def keyword_cache_info():
+    """Hit/miss statistics of the keyword cache (functools CacheInfo)."""
+    return _cached_tokenize.cache_info()
+
+
+def clear_keyword_cache() -> None:
+    """Empties the keyword cache."""
+    _cached_tokenize.cache_clear()
@@ -1,77 +1,61 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.models import StudentProfile, Application, Project, Feedback
+from app.models import StudentProfile
+from app.utils.student_metrics import StudentMetrics, get_student_metrics
 
 
 # ── Badge definitions ─────────────────────────────────────────────────────────
-# Each badge: (badge_key, label, check_fn(student_id, db) -> bool)
-
-def _completed_count(student_id: int, db: Session) -> int:
-    return (
-        db.query(func.count(Application.id))
-        .join(Project, Project.id == Application.project_id)
-        .filter(
-            Application.student_id == student_id,
-            Application.status == "accepted",
-            Project.status == "completed",
-        )
-        .scalar()
-    )
-
-
-def _avg_rating(student_id: int, db: Session) -> float | None:
-    result = (
-        db.query(func.avg(Feedback.rating))
-        .filter(Feedback.user_id == student_id)
-        .scalar()
-    )
-    return float(result) if result is not None else None
-
+# Each badge: (badge_key, label, check_fn(metrics) -> bool)
+# Checks read from one StudentMetrics snapshot, loaded with a single query.
 
 BADGE_DEFINITIONS = [
     (
         "first_project",
         "First Project",
-        lambda sid, db: _completed_count(sid, db) >= 1,
+        lambda m: m.completed_projects >= 1,
     ),
     (
         "three_projects",
         "3 Projects",
-        lambda sid, db: _completed_count(sid, db) >= 3,
+        lambda m: m.completed_projects >= 3,
     ),
     (
         "ten_projects",
         "10 Projects",
-        lambda sid, db: _completed_count(sid, db) >= 10,
+        lambda m: m.completed_projects >= 10,
     ),
     (
         "top_rated",
         "Top Rated",
-        lambda sid, db: (_avg_rating(sid, db) or 0) >= 4.5,
+        lambda m: (m.average_rating or 0) >= 4.5,
     ),
     (
         "rising_star",
         "Rising Star",
-        lambda sid, db: (
-            _completed_count(sid, db) >= 3
-            and (_avg_rating(sid, db) or 0) >= 4.0
+        lambda m: (
+            m.completed_projects >= 3
+            and (m.average_rating or 0) >= 4.0
         ),
     ),
 ]
 
 
+def badges_for_metrics(metrics: StudentMetrics) -> str:
+    """Returns the comma-separated badge keys earned for a metrics snapshot."""
+    earned = [
+        key
+        for key, _label, check in BADGE_DEFINITIONS
+        if check(metrics)
+    ]
+    return ",".join(earned)
+
+
 def compute_badges(student_id: int, db: Session) -> str:
     """
     Evaluates all badge definitions against the student's current activity.
     Returns a comma-separated string of earned badge keys.
     Does NOT commit — the caller owns the transaction.
     """
-    earned = [
-        key
-        for key, _label, check in BADGE_DEFINITIONS
-        if check(student_id, db)
-    ]
-    return ",".join(earned)
+    return badges_for_metrics(get_student_metrics(db, student_id))
 
 
 def award_badges(student_id: int, db: Session) -> None:
@@ -1,17 +1,286 @@
-from sqlalchemy.orm import Session
-from app.models import Notification
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional, Sequence
 
+from sqlalchemy import event, false, func, insert, inspect, select, true, tuple_, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Query, Session, object_session
+from app.models import Notification, User
+from app.schemas.notification import NotificationRead
+from app.services.notification_broker import notification_broker
 
-def create_notification(db: Session, recipient_id: int, message: str) -> None:
+
+# Digest mode: when above 0, a coalescing group keeps folding events
+# into its latest notification, even once read, until the group has been
+# quiet for this long (0: only while unread)
+NOTIFICATION_DIGEST_WINDOW_SECONDS = int(os.getenv("NOTIFICATION_DIGEST_WINDOW_SECONDS", "0"))
+
+
+def create_notification(db: Session, recipient_id: int, message: str, group_key: Optional[str] = None) -> None:
     """
     Creates a notification record for the given recipient.
 
+    With a group_key (e.g. "messages:<project_id>"), the event is folded
+    into the recipient's latest notification of that group while it is
+    still open — unread, or last active less than
+    NOTIFICATION_DIGEST_WINDOW_SECONDS ago — instead of adding a row: its
+    count goes up, its message becomes this one, it is marked unread again
+    and it moves to the top of the inbox (created_at is now). It keeps its
+    id, so the stream sends it as an update without an event id, and
+    cursors already issued keep the position their anchor had.
+
     Intentionally does NOT commit — the calling endpoint owns the
     transaction so that notification creation and the parent operation
     are atomic. If the parent rolls back, the notification rolls back too.
     """
+    if group_key is not None:
+        notification = _open_group_notification(db, recipient_id, group_key)
+        if notification is not None:
+            # Row locked by the lookup, so incrementing here is safe
+            notification.count += 1
+            notification.message = message
+            notification.is_read = False
+            notification.created_at = notification.updated_at = datetime.now(timezone.utc)
+            db.flush()
+            _queue_for_publishing(db, NotificationRead.model_validate(notification))
+            return
+
     notification = Notification(
         recipient_id=recipient_id,
-        message=message
+        message=message,
+        group_key=group_key,
+    )
+    db.add(notification)
+
+
+def _open_group_notification(db: Session, recipient_id: int, group_key: str) -> Optional[Notification]:
+    """The recipient's latest notification of the group, if still open to coalescing."""
+    latest = (
+        db.query(Notification)
+        .filter(Notification.recipient_id == recipient_id, Notification.group_key == group_key)
+        .order_by(Notification.id.desc())
+        .limit(1)
+        .with_for_update()
+        .first()
+    )
+    if latest is None or latest.archived_at is not None:
+        return None
+    if not latest.is_read:
+        return latest
+
+    # Read already: still open while its digest window lasts, counted from
+    # the last event folded in (created_at moves with each one)
+    if NOTIFICATION_DIGEST_WINDOW_SECONDS <= 0:
+        return None
+    last_active = latest.created_at
+    if last_active.tzinfo is None:
+        last_active = last_active.replace(tzinfo=timezone.utc)
+    if datetime.now(timezone.utc) - last_active < timedelta(seconds=NOTIFICATION_DIGEST_WINDOW_SECONDS):
+        return latest
+    return None
+
+
+def create_notifications(db: Session, recipient_ids: Iterable[int], message: str) -> int:
+    """
+    Creates the same notification for many recipients in one INSERT and
+    one counter UPDATE, instead of a flush per row; returns how many were
+    created. Used for fan-out by the outbox worker. Like
+    create_notification it does NOT commit, and the rows are published to
+    streams once the caller commits.
+    """
+    recipient_ids = list(dict.fromkeys(recipient_ids))
+    if not recipient_ids:
+        return 0
+
+    notifications = Notification.__table__
+    rows = db.execute(
+        insert(notifications).returning(
+            notifications.c.id, notifications.c.recipient_id, notifications.c.created_at
+        ),
+        [{"recipient_id": r, "message": message, "is_read": False} for r in recipient_ids],
+    ).all()
+
+    users = User.__table__
+    db.execute(
+        update(users)
+        .where(users.c.id.in_(recipient_ids))
+        .values(unread_notification_count=users.c.unread_notification_count + 1)
+    )
+
+    for row in rows:
+        _queue_for_publishing(db, NotificationRead(
+            id=row.id, recipient_id=row.recipient_id, message=message,
+            is_read=False, created_at=row.created_at,
+        ))
+    return len(rows)
+
+
+# ---------------------------------------------------------------------------
+# Bulk operations
+# ---------------------------------------------------------------------------
+# Each runs as set-based UPDATE / DELETE statements over the selection
+# rather than loading rows, and adjusts the unread counter itself (bulk
+# statements skip the ORM hooks below). None of them commits.
+
+def _selection(db: Session, recipient_id: int, ids: Optional[Sequence[int]], up_to_id: Optional[int]) -> Query:
+    """
+    The recipient's notifications named by `ids`, or the one `up_to_id`
+    and every older one ((created_at, id) at or before it).
+    """
+    query = db.query(Notification).filter(Notification.recipient_id == recipient_id)
+
+    if ids is not None:
+        return query.filter(Notification.id.in_(ids))
+
+    watermark = (
+        select(Notification.created_at)
+        .where(Notification.id == up_to_id, Notification.recipient_id == recipient_id)
+        .scalar_subquery()
+    )
+    return query.filter(
+        tuple_(Notification.created_at, Notification.id) <= tuple_(watermark, up_to_id)
+    )
+
+
+def mark_notifications_read(
+    db: Session, recipient_id: int, *, ids: Optional[Sequence[int]] = None, up_to_id: Optional[int] = None
+) -> int:
+    """Marks the selected unread notifications read; returns how many changed."""
+    changed = _selection(db, recipient_id, ids, up_to_id).filter(
+        Notification.is_read == false()
+    ).update({Notification.is_read: true()}, synchronize_session=False)
+
+    adjust_unread_count(db.connection(), recipient_id, -changed)
+    return changed
+
+
+def archive_notifications(
+    db: Session, recipient_id: int, *, ids: Optional[Sequence[int]] = None, up_to_id: Optional[int] = None
+) -> int:
+    """
+    Archives the selected notifications, marking them read on the way;
+    returns how many were newly archived.
+    """
+    mark_notifications_read(db, recipient_id, ids=ids, up_to_id=up_to_id)
+
+    return _selection(db, recipient_id, ids, up_to_id).filter(
+        Notification.archived_at.is_(None)
+    ).update({Notification.archived_at: func.now()}, synchronize_session=False)
+
+
+def delete_notifications(
+    db: Session, recipient_id: int, *, ids: Optional[Sequence[int]] = None, up_to_id: Optional[int] = None
+) -> int:
+    """Deletes the selected notifications; returns how many were deleted."""
+    # Read first, so the counter loses exactly the unread ones being deleted
+    mark_notifications_read(db, recipient_id, ids=ids, up_to_id=up_to_id)
+
+    return _selection(db, recipient_id, ids, up_to_id).delete(synchronize_session=False)
+
+
+# ---------------------------------------------------------------------------
+# Unread counter
+# ---------------------------------------------------------------------------
+# users.unread_notification_count backs GET /notifications/unread-count.
+# Every ORM insert, delete or is_read change of a notification adjusts it
+# in the same flush, so it commits or rolls back with the change. Bulk
+# UPDATE / DELETE statements bypass these hooks and must call
+# adjust_unread_count themselves.
+
+def adjust_unread_count(connection: Connection, recipient_id: int, delta: int) -> None:
+    """Adds `delta` to a user's unread counter, atomically in SQL."""
+    if delta:
+        connection.execute(
+            update(User.__table__)
+            .where(User.__table__.c.id == recipient_id)
+            .values(unread_notification_count=User.__table__.c.unread_notification_count + delta)
+        )
+
+
+def recount_unread_notifications(connection: Connection, recipient_id: Optional[int] = None) -> None:
+    """
+    Recomputes unread counters from the notifications table: one user's,
+    or every user's when no recipient is given.
+    """
+    users, notifications = User.__table__, Notification.__table__
+    unread = (
+        select(func.count())
+        .where(notifications.c.recipient_id == users.c.id, notifications.c.is_read == false())
+        .scalar_subquery()
+    )
+    statement = update(users).values(unread_notification_count=unread)
+    if recipient_id is not None:
+        statement = statement.where(users.c.id == recipient_id)
+    connection.execute(statement)
+
+
+@event.listens_for(Notification, "after_insert")
+def _inserted(mapper, connection, target):
+    if not target.is_read:
+        adjust_unread_count(connection, target.recipient_id, 1)
+
+    # Queued for the streams (see below)
+    session = object_session(target)
+    if session is not None:
+        _queue_for_publishing(session, NotificationRead(
+            id=target.id,
+            recipient_id=target.recipient_id,
+            message=target.message,
+            is_read=target.is_read,
+            created_at=target.created_at,
+        ))
+
+
+@event.listens_for(Notification, "after_update")
+def _count_read_change(mapper, connection, target):
+    history = inspect(target).attrs.is_read.history
+    if not history.has_changes():
+        return
+    if not history.deleted:
+        # Set on an expired instance, so the previous value is unknown
+        recount_unread_notifications(connection, target.recipient_id)
+    elif bool(history.deleted[0]) != bool(target.is_read):
+        adjust_unread_count(connection, target.recipient_id, -1 if target.is_read else 1)
+
+
+@event.listens_for(Notification, "after_delete")
+def _count_deleted(mapper, connection, target):
+    if not target.is_read:
+        adjust_unread_count(connection, target.recipient_id, -1)
+
+
+# ---------------------------------------------------------------------------
+# Push to streams
+# ---------------------------------------------------------------------------
+# Inserted notifications wait in session.info until the transaction
+# commits, then go to notification_broker in one batch; a rollback
+# discards them. Payloads are built at insert time, since attributes
+# can't be loaded once the session has committed.
+
+_PENDING_KEY = "notifications_to_publish"
+
+logger = logging.getLogger(__name__)
+
+
+def _queue_for_publishing(session: Session, notification: NotificationRead) -> None:
+    session.info.setdefault(_PENDING_KEY, []).append(
+        (notification.recipient_id, notification.model_dump(mode="json"))
     )
-    db.add(notification)
\ No newline at end of file
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed(session):
+    events = session.info.pop(_PENDING_KEY, None)
+    if events:
+        try:
+            notification_broker.publish(events)
+        except Exception:
+            # The rows are committed; streams catch up on reconnect
+            logger.exception("Publishing %d notification(s) failed", len(events))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session):
+    session.info.pop(_PENDING_KEY, None)
+
@@ -0,0 +1,180 @@
+"""
+pagination.py
+=============
+Keyset (cursor) pagination for newest-first listings.
+
+Listings are ordered by (created_at DESC, id DESC). Instead of skipping
+`skip` rows, the next page starts strictly after the last row already
+seen, so page N costs the same as page 1 (an index range scan on a
+matching composite index) and rows posted meanwhile neither shift nor
+repeat results.
+
+The continuation token is opaque to clients: URL-safe base64 of the
+listing kind and the id and created_at of the last row returned. The
+next page starts at that position even if the anchor row has since
+been deleted (e.g. the last notification of a page) or moved up (a
+coalesced notification takes a new created_at). While the anchor row
+is still in place its created_at is read back inside the same SQL
+statement, so the comparison uses the value exactly as the database
+stores it; otherwise the copy in the token is used.
+
+Endpoints return the token for the following page in the X-Next-Cursor
+response header (absent on the last page) and accept it back as the
+`cursor` query parameter. Offset pagination with `skip` keeps working,
+and skip still applies after a cursor.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Optional
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import DateTime, Select, String, func, literal, select, tuple_
+from sqlalchemy.types import TypeDecorator
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query
+
+
+CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(kind: str, row_id: int, created_at: Optional[datetime] = None) -> str:
+    """Opaque token pointing just past the row (`created_at`, `row_id`) of a `kind` listing."""
+    payload = {"k": kind, "id": row_id}
+    if created_at is not None:
+        payload["at"] = created_at.isoformat()
+    payload = json.dumps(payload, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(kind: str, token: str) -> tuple[int, Optional[datetime]]:
+    """
+    Returns the anchor row's id and created_at (None in tokens that
+    lack it) from a token issued for the `kind` listing.
+
+    Raises:
+    - 400 if the token is malformed or belongs to another listing
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        row_id = payload["id"]
+        created_at = payload.get("at")
+        if created_at is not None:
+            created_at = datetime.fromisoformat(created_at)
+        valid = payload["k"] == kind and isinstance(row_id, int)
+    except (binascii.Error, ValueError, TypeError, KeyError, AttributeError):
+        valid = False
+
+    if not valid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+    return row_id, created_at
+
+
+class _StoredTimestamp(TypeDecorator):
+    """
+    A created_at bound as the database stores it. SQLite keeps timestamps
+    as text, without a fraction when they come from CURRENT_TIMESTAMP, and
+    compares them as text; a plain DateTime bind always adds one.
+    """
+    impl = DateTime(timezone=True)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "sqlite":
+            return dialect.type_descriptor(String())
+        return dialect.type_descriptor(DateTime(timezone=True))
+
+    def process_bind_param(self, value, dialect):
+        if value is not None and dialect.name == "sqlite":
+            return value.strftime("%Y-%m-%d %H:%M:%S.%f" if value.microsecond else "%Y-%m-%d %H:%M:%S")
+        return value
+
+
+def _keyset_filter(query, model, kind: str, cursor: Optional[str], skip: int):
+    """Newest-first order, the cursor condition and `skip`; works on Query or Select."""
+    query = query.order_by(None).order_by(model.created_at.desc(), model.id.desc())
+
+    if cursor is not None:
+        anchor_id, token_created_at = decode_cursor(kind, cursor)
+        anchor_created_at = (
+            select(model.created_at).where(model.id == anchor_id).scalar_subquery()
+        )
+        if token_created_at is not None:
+            # The anchor row may have been deleted or moved up since
+            token_created_at = literal(token_created_at, _StoredTimestamp())
+            anchor_created_at = func.coalesce(
+                select(model.created_at)
+                .where(model.id == anchor_id, model.created_at <= token_created_at)
+                .scalar_subquery(),
+                token_created_at,
+            )
+        query = query.filter(
+            tuple_(model.created_at, model.id) < tuple_(anchor_created_at, anchor_id)
+        )
+
+    if skip:
+        query = query.offset(skip)
+
+    return query
+
+
+def _trim_page(rows: list, limit: int, kind: str, response: Response) -> list:
+    """Drops the look-ahead row and, if there was one, sets X-Next-Cursor."""
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if has_more and rows:
+        response.headers[CURSOR_HEADER] = encode_cursor(kind, rows[-1].id, rows[-1].created_at)
+    return rows
+
+
+def keyset_page(
+    query: Query,
+    model,
+    *,
+    kind: str,
+    response: Response,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    limit: Optional[int] = None,
+) -> list:
+    """
+    Runs `query` newest first, starting after `cursor` when given.
+
+    Fetches one row beyond `limit` to learn whether another page exists
+    and, if so, sets X-Next-Cursor on `response`. Without a limit every
+    remaining row is returned and no header is set.
+    """
+    query = _keyset_filter(query, model, kind, cursor, skip)
+
+    if limit is None:
+        return query.all()
+
+    return _trim_page(query.limit(limit + 1).all(), limit, kind, response)
+
+
+async def keyset_page_async(
+    db: AsyncSession,
+    statement: Select,
+    model,
+    *,
+    kind: str,
+    response: Response,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    limit: Optional[int] = None,
+) -> list:
+    """keyset_page for a select() run on an AsyncSession."""
+    statement = _keyset_filter(statement, model, kind, cursor, skip)
+
+    if limit is None:
+        return list((await db.scalars(statement)).all())
+
+    rows = (await db.scalars(statement.limit(limit + 1))).all()
+    return _trim_page(list(rows), limit, kind, response)
@@ -1,7 +1,13 @@
+import os
+
 from passlib.context import CryptContext
 
+# bcrypt cost factor (log2 of the work); hashes made with another cost are
+# upgraded on the user's next successful login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
 # Configure bcrypt hashing algorithm
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
 
 def hash_password(password: str) -> str:
     """
@@ -13,4 +19,11 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify that a plain-text password matches its hashed version.
     """
-    return pwd_context.verify(plain_password, hashed_password)
\ No newline at end of file
+    return pwd_context.verify(plain_password, hashed_password)
+
+def verify_and_update(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """
+    Verify a password and, if it matches but was hashed with an outdated
+    cost, also return a replacement hash at the current cost.
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
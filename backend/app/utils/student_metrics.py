@@ -0,0 +1,298 @@
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone, timedelta
+from typing import Callable, Iterable, Optional
+
+from sqlalchemy import and_, case, func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models import User, Application, Project, Deliverable, Feedback, StudentStats
+from app.schemas.user import UserRole
+
+
+# Window used for the "recent applications" activity signal
+RECENT_APPLICATION_WINDOW = timedelta(days=30)
+
+# Primary sessions for re-materialising expired rows from the read paths,
+# whose own session may be a replica's; tests point it at their database
+write_session_factory: Callable[[], Session] = SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StudentMetrics:
+    """
+    A student's history counters, as used by recommendations, analytics,
+    profile reads and badge awards.
+    """
+    student_id: int
+    applications_submitted: int = 0
+    accepted_applications: int = 0
+    completed_projects: int = 0          # accepted AND project completed
+    accepted_deliverables: int = 0
+    rating_sum: int = 0
+    rating_count: int = 0
+    recent_applications: int = 0         # created within the recent window
+    recent_window_expires_at: Optional[datetime] = None
+
+    @property
+    def average_rating(self) -> float | None:
+        """Mean feedback rating, or None if no feedback yet."""
+        if not self.rating_count:
+            return None
+        return self.rating_sum / self.rating_count
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # SQLite hands back naive datetimes; timestamps are stored in UTC
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+# ---------------------------------------------------------------------------
+# Source of truth: one aggregated query over the history tables
+# ---------------------------------------------------------------------------
+
+def _metrics_statement(student_ids: list[int], since: datetime):
+    """
+    One SELECT returning every metric for each requested student.
+
+    Applications are scanned once with conditional aggregates; projects
+    and deliverables are joined in (at most one deliverable per
+    application, so no row multiplication) and the feedback totals come
+    from a pre-aggregated subquery.
+    """
+    ratings = (
+        select(
+            Feedback.user_id,
+            func.sum(Feedback.rating).label("rating_sum"),
+            func.count(Feedback.id).label("rating_count"),
+        )
+        .where(Feedback.user_id.in_(student_ids))
+        .group_by(Feedback.user_id)
+        .subquery()
+    )
+
+    accepted = Application.status == "accepted"
+    recent = Application.created_at >= since
+
+    def count_if(condition):
+        return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+    return (
+        select(
+            User.id,
+            func.count(Application.id),
+            count_if(accepted),
+            count_if(and_(accepted, Project.status == "completed")),
+            count_if(Deliverable.status == "accepted"),
+            func.coalesce(ratings.c.rating_sum, 0),
+            func.coalesce(ratings.c.rating_count, 0),
+            count_if(recent),
+            func.min(case((recent, Application.created_at))),
+        )
+        .select_from(User)
+        .outerjoin(Application, Application.student_id == User.id)
+        .outerjoin(Project, Project.id == Application.project_id)
+        .outerjoin(Deliverable, Deliverable.application_id == Application.id)
+        .outerjoin(ratings, ratings.c.user_id == User.id)
+        .where(User.id.in_(student_ids))
+        .group_by(User.id, ratings.c.rating_sum, ratings.c.rating_count)
+    )
+
+
+def compute_student_metrics_bulk(db: Session, student_ids: Iterable[int]) -> dict[int, StudentMetrics]:
+    """
+    Computes metrics for many students from the history tables in a
+    single round trip. Students that do not exist get zeroed metrics.
+    """
+    ids = list(dict.fromkeys(student_ids))
+    if not ids:
+        return {}
+
+    since = datetime.now(timezone.utc) - RECENT_APPLICATION_WINDOW
+    metrics = {sid: StudentMetrics(student_id=sid) for sid in ids}
+
+    for (
+        sid, submitted, accepted, completed, deliverables,
+        rating_sum, rating_count, recent, oldest_recent,
+    ) in db.execute(_metrics_statement(ids, since)):
+        oldest_recent = _as_utc(oldest_recent)
+        metrics[sid] = StudentMetrics(
+            student_id=sid,
+            applications_submitted=submitted,
+            accepted_applications=accepted,
+            completed_projects=completed,
+            accepted_deliverables=deliverables,
+            rating_sum=rating_sum,
+            rating_count=rating_count,
+            recent_applications=recent,
+            recent_window_expires_at=(
+                oldest_recent + RECENT_APPLICATION_WINDOW if oldest_recent else None
+            ),
+        )
+
+    return metrics
+
+
+def compute_student_metrics(db: Session, student_id: int) -> StudentMetrics:
+    """Computes all history metrics for one student in a single query."""
+    return compute_student_metrics_bulk(db, [student_id])[student_id]
+
+
+# ---------------------------------------------------------------------------
+# Materialized student_stats rows
+# ---------------------------------------------------------------------------
+
+def _from_row(row: StudentStats) -> StudentMetrics:
+    return StudentMetrics(
+        student_id=row.student_id,
+        applications_submitted=row.applications_submitted,
+        accepted_applications=row.accepted_applications,
+        completed_projects=row.completed_projects,
+        accepted_deliverables=row.accepted_deliverables,
+        rating_sum=row.rating_sum,
+        rating_count=row.rating_count,
+        recent_applications=row.recent_applications,
+        recent_window_expires_at=_as_utc(row.recent_window_expires_at),
+    )
+
+
+def _is_fresh(row: StudentStats, now: datetime) -> bool:
+    expires_at = _as_utc(row.recent_window_expires_at)
+    return expires_at is None or now < expires_at
+
+
+def _store(db: Session, metrics: dict[int, StudentMetrics]) -> None:
+    """Inserts or updates student_stats rows for the given metrics."""
+    existing = {
+        row.student_id: row
+        for row in db.query(StudentStats).filter(StudentStats.student_id.in_(list(metrics)))
+    }
+    for sid, m in metrics.items():
+        row = existing.get(sid)
+        if row is None:
+            row = StudentStats(student_id=sid)
+            db.add(row)
+        row.applications_submitted = m.applications_submitted
+        row.accepted_applications = m.accepted_applications
+        row.completed_projects = m.completed_projects
+        row.accepted_deliverables = m.accepted_deliverables
+        row.rating_sum = m.rating_sum
+        row.rating_count = m.rating_count
+        row.recent_applications = m.recent_applications
+        row.recent_window_expires_at = m.recent_window_expires_at
+
+
+def _rematerialize(student_ids: list[int]) -> dict[int, StudentMetrics]:
+    """
+    Recomputes and stores the student_stats rows of the given students
+    on the primary, in a transaction of its own, and returns their
+    metrics: for reads that found a row whose recent-application window
+    has moved on, so later reads are a primary-key lookup again. The rows
+    are locked first, so a concurrent refresh_student_stats is never
+    overwritten with older counts. Returns {} if the write fails; the
+    caller then computes the metrics itself.
+    """
+    try:
+        with write_session_factory() as db:
+            locked = [
+                sid for (sid,) in
+                db.query(StudentStats.student_id)
+                .filter(StudentStats.student_id.in_(student_ids))
+                .with_for_update()
+            ]
+            metrics = compute_student_metrics_bulk(db, locked) if locked else {}
+            _store(db, metrics)
+            db.commit()
+            return metrics
+    except SQLAlchemyError:
+        logger.exception("Could not refresh expired student_stats rows")
+        return {}
+
+
+def refresh_student_stats(db: Session, student_ids: Iterable[int]) -> None:
+    """
+    Recomputes the student_stats rows of the given students from the
+    history tables, inside the caller's transaction.
+
+    Call from every write path that changes a student's history, after
+    the change has been added to the session. Flushes pending changes so
+    the aggregate sees them. Does NOT commit — the caller owns the
+    transaction, so the stats commit or roll back with the change.
+    """
+    ids = list(dict.fromkeys(student_ids))
+    if not ids:
+        return
+    db.flush()
+    _store(db, compute_student_metrics_bulk(db, ids))
+    db.flush()
+
+
+def rebuild_student_stats(db: Session, batch_size: int = 500) -> int:
+    """
+    Backfills student_stats for every student user, in batches.
+    Commits after each batch. Returns the number of students processed.
+    """
+    student_ids = [
+        sid for (sid,) in
+        db.query(User.id).filter(User.role == UserRole.student).order_by(User.id)
+    ]
+    for start in range(0, len(student_ids), batch_size):
+        batch = student_ids[start:start + batch_size]
+        _store(db, compute_student_metrics_bulk(db, batch))
+        db.commit()
+    return len(student_ids)
+
+
+# ---------------------------------------------------------------------------
+# Reads
+# ---------------------------------------------------------------------------
+
+def get_student_metrics_bulk(db: Session, student_ids: Iterable[int]) -> dict[int, StudentMetrics]:
+    """
+    Returns metrics for many students.
+
+    Served from student_stats by primary key. Rows whose recent-application
+    window has moved past a counted application are recomputed and
+    stored again on the primary (see _rematerialize); students without a
+    row yet fall back to one aggregated query, and are left to the write
+    paths and rebuild_student_stats.
+    """
+    ids = list(dict.fromkeys(student_ids))
+    if not ids:
+        return {}
+
+    now = datetime.now(timezone.utc)
+    metrics: dict[int, StudentMetrics] = {}
+    expired = []
+    for row in db.query(StudentStats).filter(StudentStats.student_id.in_(ids)):
+        if _is_fresh(row, now):
+            metrics[row.student_id] = _from_row(row)
+        else:
+            expired.append(row.student_id)
+
+    if expired:
+        metrics.update(_rematerialize(expired))
+
+    missing = [sid for sid in ids if sid not in metrics]
+    if missing:
+        metrics.update(compute_student_metrics_bulk(db, missing))
+
+    return {sid: metrics[sid] for sid in ids}
+
+
+def get_student_metrics(db: Session, student_id: int) -> StudentMetrics:
+    """Returns all history metrics for one student (see get_student_metrics_bulk)."""
+    row = db.get(StudentStats, student_id)
+    if row is not None:
+        if _is_fresh(row, datetime.now(timezone.utc)):
+            return _from_row(row)
+        metrics = _rematerialize([student_id])
+        if student_id in metrics:
+            return metrics[student_id]
+    return compute_student_metrics(db, student_id)
@@ -0,0 +1,167 @@
+"""
+bench_async_reads.py
+====================
+Requests per second on the hot read endpoints at high concurrency:
+sync endpoints (threadpool + sync Session) vs their async twins in
+routers/async_reads.py (AsyncSession on the event loop).
+
+Both variants serve the same throwaway SQLite file, through pysqlite and
+aiosqlite respectively, and are driven in-process with httpx's ASGI
+transport by `--concurrency` clients for `--seconds` per endpoint.
+Reported: requests per second and latency p50 / p99 (ms).
+
+SQLite serialises access to one file and aiosqlite runs each connection
+on its own thread, so this understates what asyncpg against PostgreSQL
+gains; it does show the threadpool ceiling (40 threads by default) the
+sync endpoints queue behind.
+
+Usage (from backend/):
+    python -m benchmarks.bench_async_reads
+    python -m benchmarks.bench_async_reads --concurrency 500 --seconds 10
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+import httpx
+
+# app.database builds its engine at import time; the benchmark uses its own
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from fastapi import FastAPI
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.auth import create_access_token
+from app.database import get_async_db, get_db
+from app.models import Base, Notification, Project, User
+from app.routers import async_reads, notifications, projects
+from benchmarks.bench_logging_middleware import percentile
+from benchmarks.bench_rank_projects import WORDS
+
+
+def seed(session_factory, project_count: int) -> int:
+    """Creates projects and one user with notifications; returns the user id."""
+    with session_factory() as db:
+        org = User(email="org@bench.test", hashed_password="x", role="organization")
+        user = User(email="student@bench.test", hashed_password="x", role="student")
+        db.add_all([org, user])
+        db.flush()
+        db.add_all(
+            Project(
+                organization_id=org.id,
+                title=" ".join(WORDS[(i + k) % len(WORDS)] for k in range(3)),
+                description="Bench project",
+                required_skills="python,sql",
+                status="open",
+            )
+            for i in range(project_count)
+        )
+        db.add_all(Notification(recipient_id=user.id, message=f"n{i}") for i in range(20))
+        db.commit()
+        return user.id
+
+
+def make_sync_app(session_factory) -> FastAPI:
+    app = FastAPI()
+    app.include_router(projects.router)
+    app.include_router(notifications.router)
+
+    def bench_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = bench_db
+    return app
+
+
+def make_async_app(async_session_factory) -> FastAPI:
+    app = FastAPI()
+    app.include_router(async_reads.router)
+
+    async def bench_async_db():
+        async with async_session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = bench_async_db
+    return app
+
+
+async def load(app: FastAPI, path: str, headers: dict, concurrency: int, seconds: float) -> tuple[float, list[float]]:
+    """Runs one warm-up second (opens the pooled connections), then measures."""
+    latencies: list[float] = []
+    measure_from = time.perf_counter() + 1.0
+    deadline = measure_from + seconds
+
+    transport = httpx.ASGITransport(app=app)
+    limits = httpx.Limits(max_connections=None)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", limits=limits, timeout=None) as client:
+
+        async def worker():
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                (await client.get(path, headers=headers)).raise_for_status()
+                if start >= measure_from:
+                    latencies.append((time.perf_counter() - start) * 1000.0)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    return len(latencies) / seconds, latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--projects", type=int, default=1_000)
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    # Pools sized for the concurrency so neither variant waits on connections
+    engine = create_engine(
+        f"sqlite:///{path}", connect_args={"check_same_thread": False},
+        pool_size=args.concurrency, max_overflow=0,
+    )
+    async_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{path}", pool_size=args.concurrency, max_overflow=0,
+    )
+
+    try:
+        Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(bind=engine)
+        user_id = seed(session_factory, args.projects)
+        headers = {"Authorization": f"Bearer {create_access_token({'user_id': user_id})}"}
+
+        variants = {
+            "sync": make_sync_app(session_factory),
+            "async": make_async_app(async_sessionmaker(async_engine, expire_on_commit=False)),
+        }
+        endpoints = ["/projects?limit=20", "/projects?search=python&limit=20", "/notifications"]
+
+        print(f"{args.concurrency} concurrent clients, {args.seconds:.0f}s per run")
+        print(f"{'endpoint':>34} {'variant':>7} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8}")
+        for endpoint in endpoints:
+            for name, app in variants.items():
+                rate, latencies = asyncio.run(load(app, endpoint, headers, args.concurrency, args.seconds))
+                print(
+                    f"{endpoint:>34} {name:>7} {rate:8.0f} "
+                    f"{statistics.median(latencies):8.1f} {percentile(latencies, 0.99):8.1f}"
+                )
+                # aiosqlite connections are bound to the loop that opened them
+                asyncio.run(async_engine.dispose())
+    finally:
+        engine.dispose()
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
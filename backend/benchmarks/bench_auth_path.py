@@ -0,0 +1,91 @@
+"""
+bench_auth_path.py
+==================
+Microbenchmark of token handling on an authenticated request.
+
+Per request, the logging middleware and get_current_user both need the
+token's claims. Compared, in µs per request:
+- before:       two full verifications (HMAC, base64, JSON) — what the
+                middleware and the dependency used to do separately
+- first use:    request_claims() on a token not seen yet — one
+                verification, shared through the request state
+- reused token: request_claims() on a token already verified — served
+                from the verified-token LRU
+- reused token, per call: the LRU lookup alone, as a floor
+
+Usage (from backend/):
+    python -m benchmarks.bench_auth_path
+    python -m benchmarks.bench_auth_path --requests 50000 --repeat 7
+"""
+
+import argparse
+
+from jose import jwt
+
+from app.core.auth import (
+    ALGORITHM,
+    SECRET_KEY,
+    create_access_token,
+    decode_access_token,
+    request_claims,
+    verified_tokens,
+)
+from benchmarks.bench_rank_projects import timed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    # A realistic login payload; distinct tokens for the first-use case
+    tokens = [
+        create_access_token({"user_id": i, "role": "student", "name": f"Student {i}"})
+        for i in range(args.requests)
+    ]
+    token = tokens[0]
+
+    def before():
+        for _ in range(args.requests):
+            jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+            jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+
+    def first_use():
+        verified_tokens.clear()
+        for t in tokens:
+            state = {}
+            request_claims(state, t)
+            request_claims(state, t)
+
+    def reused():
+        for _ in range(args.requests):
+            state = {}
+            request_claims(state, token)
+            request_claims(state, token)
+
+    def lookup():
+        for _ in range(args.requests):
+            decode_access_token(token)
+
+    rows = [
+        ("before", timed(before, args.repeat)),
+        ("first use", timed(first_use, args.repeat)),
+    ]
+    # first_use() cleared the LRU; verify the shared token once again
+    decode_access_token(token)
+    rows += [
+        ("reused token", timed(reused, args.repeat)),
+        ("lookup only", timed(lookup, args.repeat)),
+    ]
+
+    per_request = lambda ms: ms * 1000.0 / args.requests
+    print(f"{args.requests} requests")
+    print(f"{'path':>13} {'total ms':>10} {'µs / request':>13}")
+    for name, ms in rows:
+        print(f"{name:>13} {ms:10.2f} {per_request(ms):13.2f}")
+    print(f"reused token speedup over before: {rows[0][1] / rows[2][1]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+bench_logging_middleware.py
+===========================
+Event-loop latency under load: inline SystemLog writes vs the batched
+background writer.
+
+Serves a trivial async endpoint through two versions of the logging
+middleware, against a throwaway SQLite file database:
+- inline:   the previous dispatch — SessionLocal(), INSERT one row and
+            COMMIT on the event loop for every request
+- batched:  LoggingMiddleware (pure ASGI) handing rows to SystemLogWriter
+
+Requests arrive at a fixed `--rate` (open loop). Meanwhile a probe task
+sleeps 1 ms in a loop and records how late it wakes up; that lag is
+what every other coroutine on the worker waits on. Reported: request
+latency and probe lag, p50 / p99.
+
+Usage (from backend/):
+    python -m benchmarks.bench_logging_middleware
+    python -m benchmarks.bench_logging_middleware --requests 5000 --rate 400
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+from starlette.middleware.base import BaseHTTPMiddleware
+
+# app.database builds its engine at import time; the benchmark uses its own
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from app.middleware import logging_middleware
+from app.middleware.logging_middleware import LoggingMiddleware, log_writer
+from app.models import Base, SystemLog
+
+
+def make_inline_middleware(session_factory):
+    class InlineLoggingMiddleware(BaseHTTPMiddleware):
+        async def dispatch(self, request, call_next):
+            response = await call_next(request)
+            db = session_factory()
+            try:
+                db.add(SystemLog(
+                    endpoint=request.url.path,
+                    method=request.method,
+                    status_code=response.status_code,
+                ))
+                db.commit()
+            except Exception:
+                db.rollback()
+            finally:
+                db.close()
+            return response
+
+    return InlineLoggingMiddleware
+
+
+def make_app(middleware) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(middleware)
+
+    @app.get("/ping")
+    async def ping():
+        # In-process transport does no socket I/O; yield as a real server would
+        await asyncio.sleep(0)
+        return {"ok": True}
+
+    return app
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def drive(app: FastAPI, requests: int, rate: float) -> tuple[list[float], list[float]]:
+    """
+    Sends `requests` requests arriving at `rate` per second (open loop:
+    arrivals do not wait for earlier responses). Returns (request
+    latencies, probe lags), both in ms.
+    """
+    latencies: list[float] = []
+    lags: list[float] = []
+    running = True
+
+    async def probe():
+        while running:
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lags.append((time.perf_counter() - start - 0.001) * 1000.0)
+
+    async def one(client):
+        start = time.perf_counter()
+        response = await client.get("/ping")
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000.0)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        probe_task = asyncio.create_task(probe())
+        start = time.perf_counter()
+        tasks = []
+        for i in range(requests):
+            delay = start + i / rate - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(one(client)))
+        await asyncio.gather(*tasks)
+        running = False
+        await probe_task
+
+    return latencies, lags
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--rate", type=float, default=250.0, help="Requests per second")
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+
+    try:
+        Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(bind=engine)
+        logging_middleware.SessionLocal = session_factory
+
+        variants = {
+            "inline": make_app(make_inline_middleware(session_factory)),
+            "batched": make_app(LoggingMiddleware),
+        }
+
+        print(f"{args.requests} requests at {args.rate:.0f} req/s")
+        print(f"{'variant':>8} {'latency p50':>12} {'latency p99':>12} {'lag p50':>8} {'lag p99':>8} {'rows':>6}  (ms)")
+        for name, app in variants.items():
+            with engine.begin() as connection:
+                connection.execute(SystemLog.__table__.delete())
+
+            latencies, lags = asyncio.run(drive(app, args.requests, args.rate))
+            log_writer.flush()
+
+            with engine.connect() as connection:
+                rows = connection.execute(select(func.count()).select_from(SystemLog)).scalar()
+            print(
+                f"{name:>8} {statistics.median(latencies):12.2f} {percentile(latencies, 0.99):12.2f} "
+                f"{statistics.median(lags):8.2f} {percentile(lags, 0.99):8.2f} {rows:6d}"
+            )
+
+        log_writer.stop()
+    finally:
+        engine.dispose()
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+bench_login.py
+==============
+Login throughput, and what a login storm does to other endpoints:
+bcrypt inline in a sync endpoint vs the password hasher's process pool.
+
+Serves POST /auth/login two ways against a throwaway SQLite file:
+- inline:  the previous sync endpoint — verify_password() in a threadpool
+           thread, holding the GIL for the whole bcrypt run
+- pooled:  the current async endpoint (app.routers.auth), awaiting
+           PasswordHasher
+
+For each `--users` level, that many clients log in back to back for
+`--seconds`, while one more client keeps calling a trivial sync endpoint
+(/health) to show what everyone else sees. Reported: logins per second,
+login p50 / p99, /health p99 (ms), and requests refused with 503.
+
+The pool has PASSWORD_HASH_WORKERS processes (default: up to 4, one per
+CPU), so pooled throughput scales with cores the inline path cannot use.
+
+Usage (from backend/):
+    python -m benchmarks.bench_login
+    python -m benchmarks.bench_login --users 50 200 --seconds 10 --rounds 12
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import httpx
+
+# app.database builds its engine at import time; the benchmark uses its own
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, nargs="+", default=[50, 200], help="Concurrent clients")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--rounds", type=int, default=10, help="bcrypt cost (production default: 12)")
+    return parser.parse_args()
+
+
+ARGS = parse_args() if __name__ == "__main__" else None
+if ARGS is not None:
+    # Read by app.utils.security at import, and by the spawned hash workers
+    os.environ["BCRYPT_ROUNDS"] = str(ARGS.rounds)
+
+from fastapi import Depends, FastAPI, HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.database import get_db
+from app.models import Base, User
+from app.routers import auth
+from app.schemas.user import LoginRequest
+from app.services.password_hasher import password_hasher
+from app.utils.security import hash_password, verify_password
+from benchmarks.bench_logging_middleware import percentile
+
+EMAIL = "bench@test.com"
+PASSWORD = "password123"
+
+
+def make_app(session_factory, pooled: bool) -> FastAPI:
+    app = FastAPI()
+
+    def bench_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    @app.get("/health")
+    def health():
+        return {"status": "ok"}
+
+    if pooled:
+        app.include_router(auth.router)
+        app.dependency_overrides[get_db] = bench_db
+    else:
+        @app.post("/auth/login")
+        def inline_login(data: LoginRequest, db: Session = Depends(bench_db)):
+            user = db.query(User).filter(User.email == data.email).first()
+            if not user or not verify_password(data.password, user.hashed_password):
+                raise HTTPException(status_code=401, detail="Invalid credentials")
+            return {"access_token": "x", "token_type": "bearer"}
+
+    return app
+
+
+async def storm(app: FastAPI, users: int, seconds: float) -> dict:
+    logins: list[float] = []
+    health: list[float] = []
+    refused = 0
+    deadline = time.perf_counter() + seconds
+
+    transport = httpx.ASGITransport(app=app)
+    limits = httpx.Limits(max_connections=None)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", limits=limits, timeout=None) as client:
+
+        async def login_client():
+            nonlocal refused
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                response = await client.post("/auth/login", json={"email": EMAIL, "password": PASSWORD})
+                if response.status_code == 503:
+                    refused += 1
+                    await asyncio.sleep(0.01)
+                    continue
+                response.raise_for_status()
+                logins.append((time.perf_counter() - start) * 1000.0)
+
+        async def health_client():
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                (await client.get("/health")).raise_for_status()
+                health.append((time.perf_counter() - start) * 1000.0)
+                await asyncio.sleep(0.01)
+
+        started = time.perf_counter()
+        await asyncio.gather(health_client(), *(login_client() for _ in range(users)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "rate": len(logins) / elapsed,
+        "p50": statistics.median(logins) if logins else float("nan"),
+        "p99": percentile(logins, 0.99) if logins else float("nan"),
+        "health_p99": percentile(health, 0.99) if health else float("nan"),
+        "refused": refused,
+    }
+
+
+def main() -> None:
+    args = ARGS
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+
+    try:
+        Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(bind=engine)
+        with session_factory() as db:
+            db.add(User(email=EMAIL, hashed_password=hash_password(PASSWORD), role="student"))
+            db.commit()
+
+        variants = {
+            "inline": make_app(session_factory, pooled=False),
+            "pooled": make_app(session_factory, pooled=True),
+        }
+
+        print(f"bcrypt rounds {args.rounds}, {password_hasher.workers} hash workers, {os.cpu_count()} CPUs, {args.seconds:.0f}s per run")
+        print(f"{'users':>6} {'variant':>8} {'logins/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'health p99':>11} {'503s':>6}")
+        for users in args.users:
+            for name, app in variants.items():
+                r = asyncio.run(storm(app, users, args.seconds))
+                print(
+                    f"{users:6d} {name:>8} {r['rate']:9.1f} {r['p50']:9.1f} {r['p99']:9.1f} "
+                    f"{r['health_p99']:11.1f} {r['refused']:6d}"
+                )
+                sys.stdout.flush()
+    finally:
+        password_hasher.shutdown()
+        engine.dispose()
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
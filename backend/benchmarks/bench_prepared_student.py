@@ -0,0 +1,63 @@
+"""
+bench_prepared_student.py
+=========================
+Per-pair microbenchmark of the prepared-student fast path.
+
+Compares, for one student against N projects:
+- pairwise:  score_student_project() per project — re-derives the skill
+             set, major/bio keywords, experience base, activity and
+             success scores for every pair
+- prepared:  prepare_student() once, then score_prepared() per project —
+             evaluates only the project-dependent terms
+
+Project texts are distinct, so the keyword cache only helps with the
+student's own major and bio.
+
+Usage (from backend/):
+    python -m benchmarks.bench_prepared_student
+    python -m benchmarks.bench_prepared_student --projects 20000 --repeat 7
+"""
+
+import argparse
+import random
+import time
+
+from app.services.matching_engine import prepare_student, score_prepared, score_student_project
+from benchmarks.bench_rank_projects import make_projects, make_student, timed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", type=int, default=5_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    student = make_student(rng)
+    _, projects = make_projects(args.projects, rng)
+
+    def pairwise():
+        for project in projects:
+            score_student_project(student, project)
+
+    def prepared():
+        ready = prepare_student(student)
+        for project in projects:
+            score_prepared(ready, project)
+
+    # Warm the keyword cache so both paths see the same cache state
+    pairwise()
+
+    pairwise_ms = timed(pairwise, args.repeat)
+    prepared_ms = timed(prepared, args.repeat)
+
+    per_pair = lambda ms: ms * 1000.0 / args.projects
+    print(f"{'path':>10} {'total ms':>10} {'µs / pair':>10}")
+    print(f"{'pairwise':>10} {pairwise_ms:10.2f} {per_pair(pairwise_ms):10.2f}")
+    print(f"{'prepared':>10} {prepared_ms:10.2f} {per_pair(prepared_ms):10.2f}")
+    print(f"speedup: {pairwise_ms / prepared_ms:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+bench_project_search.py
+=======================
+GET /projects search latency: ILIKE keyword filters vs the full-text index.
+
+Builds a throwaway SQLite database with N open projects (the FTS5 index
+is filled by its triggers as the rows are inserted) and times the same
+searches through both paths of the endpoint's query:
+- keyword:   AND of ILIKE '%kw%' over title, description, skills —
+             a scan of every open project per query
+- fulltext:  projects_fts MATCH, ranked by bm25
+
+Each search is run for a rare term, a common term and a two-term query.
+The full-text numbers include relevance ordering; the keyword numbers
+only order by created_at.
+
+Usage (from backend/):
+    python -m benchmarks.bench_project_search
+    python -m benchmarks.bench_project_search --projects 200000 --repeat 7
+"""
+
+import argparse
+import os
+import random
+import tempfile
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+# app.database builds its engine at import time; the benchmark uses its own
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from app.models import Base, Project, User
+from app.services.project_search import apply_fulltext_search, keyword_filter
+from benchmarks.bench_rank_projects import SKILLS, WORDS, timed
+
+
+def populate(session, n: int, rng: random.Random) -> None:
+    org = User(email="bench_org@test.com", hashed_password="x", role="organization")
+    session.add(org)
+    session.flush()
+
+    rows = [
+        {
+            "organization_id": org.id,
+            "title": " ".join(rng.sample(WORDS, 3)),
+            "description": " ".join(rng.sample(WORDS, rng.randint(10, 40))),
+            "required_skills": ",".join(rng.sample(SKILLS, rng.randint(0, 5))),
+            "duration": "1 month",
+            "status": "open",
+        }
+        for _ in range(n)
+    ]
+    session.execute(insert(Project), rows)
+    session.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", type=int, default=100_000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    engine = create_engine(f"sqlite:///{path}")
+
+    try:
+        Base.metadata.create_all(bind=engine)
+        session = sessionmaker(bind=engine)()
+        populate(session, args.projects, rng)
+
+        base = (
+            session.query(Project)
+            .filter(Project.status == "open")
+            .order_by(Project.created_at.desc())
+        )
+        searches = {
+            "rare": WORDS[4321],
+            "common": SKILLS[7],
+            "two terms": f"{SKILLS[7]} {WORDS[42]}",
+        }
+
+        print(f"{args.projects} projects, limit {args.limit}")
+        print(f"{'search':>10} {'keyword ms':>11} {'fulltext ms':>12} {'speedup':>8}")
+        for label, search in searches.items():
+            keyword = lambda: base.filter(keyword_filter(search)).limit(args.limit).all()
+            fulltext = lambda: apply_fulltext_search(base, search).limit(args.limit).all()
+
+            # Warm the page cache for both paths
+            keyword()
+            fulltext()
+
+            keyword_ms = timed(keyword, args.repeat)
+            fulltext_ms = timed(fulltext, args.repeat)
+            print(f"{label:>10} {keyword_ms:11.2f} {fulltext_ms:12.2f} {keyword_ms / fulltext_ms:7.1f}x")
+
+        session.close()
+    finally:
+        engine.dispose()
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
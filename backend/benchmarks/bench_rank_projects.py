@@ -0,0 +1,112 @@
+"""
+bench_rank_projects.py
+======================
+Scaling benchmark for project ranking (1k → 500k open projects).
+
+Compares, for one student:
+- scalar:  score_student_project() per project + list.sort (original path,
+           only run up to 10k projects — it is too slow beyond that)
+- full:    vectorized rank_project_matrix() over the whole batch
+- top-10:  rank_project_matrix(top_n=10) — inverted-index tier pruning
+           plus heap selection
+
+Projects are generated directly as ProjectFeatures so the timings measure
+scoring only, not tokenisation (which the project index does once).
+
+Usage (from backend/):
+    python -m benchmarks.bench_rank_projects
+    python -m benchmarks.bench_rank_projects --sizes 1000 50000 --repeat 5
+"""
+
+import argparse
+import random
+import time
+
+from app.services.batch_scoring import ProjectFeatures, encode_features
+from app.services.matching_engine import (
+    ProjectDTO,
+    StudentDTO,
+    rank_project_matrix,
+    score_student_project,
+)
+
+SKILLS = [f"skill{i}" for i in range(400)]
+WORDS = [f"word{i}" for i in range(5000)]
+DURATIONS = {"1 week": 1, "1 month": 4, "2 months": 8, "3 months": 12, "6 months": 26}
+
+
+def make_projects(n: int, rng: random.Random) -> tuple[list[ProjectFeatures], list[ProjectDTO]]:
+    features, dtos = [], []
+    for pid in range(1, n + 1):
+        skills = rng.sample(SKILLS, rng.randint(0, 5))
+        words = rng.sample(WORDS, rng.randint(3, 20))
+        duration = rng.choice(list(DURATIONS))
+        features.append(ProjectFeatures(
+            project_id=pid,
+            title=words[0],
+            skills=frozenset(skills),
+            keywords=frozenset(words),
+            weeks=DURATIONS[duration],
+        ))
+        dtos.append(ProjectDTO(pid, words[0], " ".join(words[1:]), skills, duration, "open"))
+    return features, dtos
+
+
+def make_student(rng: random.Random) -> StudentDTO:
+    return StudentDTO(
+        student_id=1,
+        skills=rng.sample(SKILLS, 6),
+        major=" ".join(rng.sample(WORDS, 2)),
+        bio=" ".join(rng.sample(WORDS, 15)),
+        completed_project_count=2,
+        total_accepted_count=3,
+        accepted_deliverable_count=2,
+        average_feedback_rating=4.2,
+        recent_application_count=2,
+        graduation_year=2027,
+    )
+
+
+def timed(fn, repeat: int) -> float:
+    """Best-of-N wall time in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 500_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top-n", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    student = make_student(rng)
+
+    print(f"{'projects':>10} {'scalar ms':>11} {'full ms':>10} {f'top-{args.top_n} ms':>11} {'speedup':>9}")
+    for size in args.sizes:
+        features, dtos = make_projects(size, rng)
+        matrix = encode_features(features)
+        matrix.inverted()  # built once per index change, not per request
+
+        if size <= 10_000:
+            def scalar():
+                scored = [score_student_project(student, p) for p in dtos]
+                scored.sort(key=lambda x: x["match_score"], reverse=True)
+            scalar_ms = f"{timed(scalar, args.repeat):11.2f}"
+        else:
+            scalar_ms = f"{'-':>11}"
+
+        full_ms = timed(lambda: rank_project_matrix(student, matrix), args.repeat)
+        top_ms = timed(lambda: rank_project_matrix(student, matrix, top_n=args.top_n), args.repeat)
+
+        print(f"{size:>10} {scalar_ms} {full_ms:10.2f} {top_ms:11.2f} {full_ms / top_ms:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
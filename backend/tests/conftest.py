@@ -1,10 +1,22 @@
+import os
+
 import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from fastapi.testclient import TestClient
 
+# Minimum bcrypt cost: tests hash many passwords and don't need the work factor
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
 from app.main import app
-from app.database import Base, get_db
+from app.database import Base, get_db, get_read_db
+from app.services.project_index import project_index
+from app.services.recommendation_cache import recommendation_cache
+from app.services.notification_broker import notification_broker
+from app.services.principal_cache import principal_cache
+from app.services.outbox import outbox_worker
+from app.utils import student_metrics
+from app.middleware.logging_middleware import log_writer
 
 # ------------------------------------------------------------------
 # Test Database Configuration (SQLite)
@@ -39,8 +51,14 @@ def override_get_db():
     finally:
         db.close()
 
-# Apply override globally for tests
+# Apply override globally for tests; reads share the test database
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_read_db] = override_get_db
+
+# The app's outbox worker drains the test database too
+outbox_worker.session_factory = TestingSessionLocal
+# ...and expired student_stats rows are stored back into it
+student_metrics.write_session_factory = TestingSessionLocal
 
 
 # ------------------------------------------------------------------
@@ -77,6 +95,22 @@ def client():
 @pytest.fixture(autouse=True) 
 def reset_dependency_overrides(): 
     # Always keep the DB override in place 
-    app.dependency_overrides = {get_db: override_get_db} 
+    app.dependency_overrides = {get_db: override_get_db, get_read_db: override_get_db} 
     yield 
-    app.dependency_overrides = {get_db: override_get_db}
\ No newline at end of file
+    app.dependency_overrides = {get_db: override_get_db, get_read_db: override_get_db}
+
+@pytest.fixture(autouse=True)
+def reset_in_process_state():
+    # In-process caches must not leak rows between tests that recreate the DB,
+    # nor queued request logs land in the next test's tables
+    log_writer.flush()
+    project_index.clear()
+    recommendation_cache.clear()
+    principal_cache.clear()
+    notification_broker.clear()
+    yield
+    log_writer.flush()
+    project_index.clear()
+    recommendation_cache.clear()
+    principal_cache.clear()
+    notification_broker.clear()
@@ -0,0 +1,270 @@
+"""
+test_async_reads.py
+===================
+Tests for the async read endpoints (routers/async_reads.py) and the
+async auth dependencies.
+
+The async router is mounted on its own app with get_async_db pointed at
+the test database through aiosqlite, and every response is compared with
+the sync endpoint's answer for the same data.
+
+Covers:
+- GET /projects: listing, cursor pages, keyword and full-text search
+- GET /notifications, including unread_only and cursor pages
+- GET /recommendations, including the role check, with the project
+  index built in a worker thread
+- GET /projects/{id}/messages, including the participant check
+- 401 / 403 / 404 from the async auth dependencies
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.database import get_async_db
+from app.models import Application, Notification, Project, ProjectMessage, StudentProfile, User
+from app.routers import async_reads
+from app.utils.security import hash_password
+from app.core.auth import create_access_token
+from app.services.principal_cache import principal_cache
+from app.services.project_index import project_index
+from tests.conftest import TestingSessionLocal
+
+
+@pytest.fixture
+def async_client(client):
+    # NullPool: aiosqlite connections belong to the event loop that opened
+    # them, and each TestClient runs its own loop
+    engine = create_async_engine("sqlite+aiosqlite:///./test.db", poolclass=NullPool)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+
+    async def override_get_async_db():
+        async with session_factory() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(async_reads.router)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def db(client):
+    # Closed after the test so its connection goes back to the pool
+    session = TestingSessionLocal()
+    yield session
+    session.close()
+
+
+def create_user(db, email, role):
+    user = User(email=email, hashed_password=hash_password("password"), role=role, name="Test User")
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+def headers_for(user):
+    return {"Authorization": f"Bearer {create_access_token({'user_id': user.id})}"}
+
+
+def create_projects(db, org, count):
+    projects = [
+        Project(
+            organization_id=org.id,
+            title=f"Python API {i}" if i % 2 else f"Design work {i}",
+            description="Build and ship",
+            required_skills="python,sql" if i % 2 else "figma",
+            status="open",
+        )
+        for i in range(count)
+    ]
+    db.add_all(projects)
+    db.commit()
+    return projects
+
+
+def assert_same(sync_response, async_response):
+    assert async_response.status_code == sync_response.status_code
+    assert async_response.json() == sync_response.json()
+    assert async_response.headers.get("X-Next-Cursor") == sync_response.headers.get("X-Next-Cursor")
+
+
+# ── GET /projects ─────────────────────────────────────────────────────────
+
+def test_projects_match_sync_pages(client, async_client, db):
+    create_projects(db, create_user(db, "org@test.com", "organization"), 7)
+
+    params = {"limit": 3}
+    while True:
+        sync_response = client.get("/projects", params=params)
+        async_response = async_client.get("/projects", params=params)
+        assert_same(sync_response, async_response)
+        cursor = async_response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        params = {"limit": 3, "cursor": cursor}
+
+
+@pytest.mark.parametrize("mode", ["keyword", "fulltext"])
+def test_project_search_matches_sync(client, async_client, db, mode):
+    create_projects(db, create_user(db, "org@test.com", "organization"), 6)
+    params = {"search": "python", "mode": mode}
+
+    async_response = async_client.get("/projects", params=params)
+
+    assert_same(client.get("/projects", params=params), async_response)
+    assert len(async_response.json()) == 3
+
+
+def test_fulltext_rejects_cursor(async_client):
+    response = async_client.get("/projects", params={"search": "python", "mode": "fulltext", "cursor": "x"})
+
+    assert response.status_code == 400
+
+
+# ── GET /notifications ────────────────────────────────────────────────────
+
+def test_notifications_match_sync(client, async_client, db):
+    user = create_user(db, "student@test.com", "student")
+    other = create_user(db, "other@test.com", "student")
+    db.add_all([Notification(recipient_id=user.id, message=f"n{i}") for i in range(3)])
+    db.add(Notification(recipient_id=other.id, message="not yours"))
+    db.commit()
+
+    async_response = async_client.get("/notifications", headers=headers_for(user))
+
+    assert_same(client.get("/notifications", headers=headers_for(user)), async_response)
+    assert len(async_response.json()) == 3
+
+
+def test_unread_notification_pages_match_sync(client, async_client, db):
+    user = create_user(db, "student@test.com", "student")
+    db.add_all([Notification(recipient_id=user.id, message=f"n{i}", is_read=i % 3 == 0) for i in range(7)])
+    db.commit()
+
+    params = {"unread_only": True, "limit": 2}
+    while True:
+        sync_response = client.get("/notifications", params=params, headers=headers_for(user))
+        async_response = async_client.get("/notifications", params=params, headers=headers_for(user))
+        assert_same(sync_response, async_response)
+        assert not any(n["is_read"] for n in async_response.json())
+        cursor = async_response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        params = {**params, "cursor": cursor}
+
+
+def test_async_auth_errors(async_client, db):
+    user = create_user(db, "gone@test.com", "student")
+    headers = headers_for(user)
+    db.delete(user)
+    db.commit()
+
+    assert async_client.get("/notifications").status_code == 401
+    assert async_client.get("/notifications", headers={"Authorization": "Bearer nope"}).status_code == 401
+    assert async_client.get("/notifications", headers=headers).status_code == 404
+
+
+def test_async_auth_caches_principal(async_client, db):
+    user = create_user(db, "cached@test.com", "student")
+
+    async_client.get("/notifications", headers=headers_for(user))
+
+    assert principal_cache.get(user.id).id == user.id
+
+
+# ── GET /recommendations ──────────────────────────────────────────────────
+
+def test_recommendations_match_sync(client, async_client, db):
+    create_projects(db, create_user(db, "org@test.com", "organization"), 4)
+    student = create_user(db, "student@test.com", "student")
+    db.add(StudentProfile(
+        user_id=student.id, university="U", major="Computer Science",
+        graduation_year=2025, skills="python,sql", bio="APIs",
+    ))
+    db.commit()
+
+    async_response = async_client.get("/recommendations", headers=headers_for(student))
+
+    assert async_response.status_code == 200
+    assert [r["project_id"] for r in async_response.json()] == [
+        r["project_id"] for r in client.get("/recommendations", headers=headers_for(student)).json()
+    ]
+    assert len(async_response.json()) == 4
+
+
+def test_recommendations_build_the_project_index_off_the_event_loop(async_client, db, monkeypatch):
+    create_projects(db, create_user(db, "org@test.com", "organization"), 3)
+    student = create_user(db, "student@test.com", "student")
+    db.add(StudentProfile(
+        user_id=student.id, university="U", major="Computer Science",
+        graduation_year=2025, skills="python,sql", bio="APIs",
+    ))
+    db.commit()
+    project_index.clear()
+
+    builds = []
+    matrix_from_rows = project_index.matrix_from_rows
+
+    def recording(rows):
+        builds.append(_on_event_loop())
+        return matrix_from_rows(rows)
+
+    monkeypatch.setattr(project_index, "matrix_from_rows", recording)
+    monkeypatch.setattr(project_index, "matrix_and_epoch", lambda db: pytest.fail("sync load on the event loop"))
+
+    response = async_client.get("/recommendations", headers=headers_for(student))
+
+    assert response.status_code == 200
+    assert len(response.json()) == 3
+    assert builds == [False]
+
+
+def _on_event_loop():
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
+def test_recommendations_require_student_with_profile(async_client, db):
+    org = create_user(db, "org@test.com", "organization")
+    student = create_user(db, "student@test.com", "student")
+
+    assert async_client.get("/recommendations", headers=headers_for(org)).status_code == 403
+    assert async_client.get("/recommendations", headers=headers_for(student)).status_code == 404
+
+
+# ── GET /projects/{id}/messages ───────────────────────────────────────────
+
+def test_messages_match_sync(client, async_client, db):
+    org = create_user(db, "org@test.com", "organization")
+    student = create_user(db, "student@test.com", "student")
+    outsider = create_user(db, "outsider@test.com", "student")
+    project = create_projects(db, org, 1)[0]
+    db.add(Application(student_id=student.id, project_id=project.id, status="accepted"))
+    db.add_all([
+        ProjectMessage(project_id=project.id, sender_id=org.id, content="hello"),
+        ProjectMessage(project_id=project.id, sender_id=student.id, content="hi"),
+    ])
+    db.commit()
+    url = f"/projects/{project.id}/messages"
+
+    for user in (org, student):
+        async_response = async_client.get(url, headers=headers_for(user))
+        assert_same(client.get(url, headers=headers_for(user)), async_response)
+        assert [m["sender"]["email"] for m in async_response.json()] == ["org@test.com", "student@test.com"]
+
+    assert async_client.get(url, headers=headers_for(outsider)).status_code == 403
+    assert async_client.get("/projects/9999/messages", headers=headers_for(org)).status_code == 404
@@ -1,7 +1,19 @@
 # tests/test_auth_token_utils.py
 
+import time
 from datetime import timedelta
-from app.core.auth import create_access_token, decode_access_token
+from unittest.mock import patch
+
+from jose import jwt
+
+from app.core.auth import (
+    CLAIMS_STATE_KEY,
+    VerifiedTokenCache,
+    create_access_token,
+    decode_access_token,
+    request_claims,
+    verified_tokens,
+)
 
 
 def test_create_token_with_custom_expiry():
@@ -21,4 +33,63 @@ def test_decode_invalid_token_returns_none():
 
     result = decode_access_token(invalid_token)
 
-    assert result is None
\ No newline at end of file
+    assert result is None
+
+def test_verified_token_is_served_from_cache():
+    verified_tokens.clear()
+    token = create_access_token({"user_id": 7})
+
+    with patch("app.core.auth.jwt.decode", wraps=jwt.decode) as verify:
+        first = decode_access_token(token)
+        second = decode_access_token(token)
+
+    assert first == second
+    assert verify.call_count == 1
+    assert verified_tokens.stats()["hits"] == 1
+
+
+def test_cached_claims_cannot_be_modified_by_callers():
+    token = create_access_token({"user_id": 7})
+
+    decode_access_token(token)["user_id"] = 99
+
+    assert decode_access_token(token)["user_id"] == 7
+
+
+def test_cache_entry_ends_at_token_expiry():
+    cache = VerifiedTokenCache()
+    cache.put("expired", {"user_id": 1, "exp": time.time() - 1})
+    cache.put("valid", {"user_id": 1, "exp": time.time() + 60})
+
+    assert cache.get("expired") is None
+    assert cache.get("valid")["user_id"] == 1
+
+
+def test_expired_token_is_rejected_after_being_cached():
+    verified_tokens.clear()
+    token = create_access_token({"user_id": 1}, expires_delta=timedelta(seconds=1))
+    assert decode_access_token(token) is not None
+
+    with patch("app.core.auth.time.time", return_value=time.time() + 5):
+        assert verified_tokens.get(token) is None
+
+
+def test_cache_is_bounded():
+    cache = VerifiedTokenCache(max_entries=2)
+    for token in ("a", "b", "c"):
+        cache.put(token, {"user_id": 1})
+
+    assert cache.get("a") is None
+    assert cache.stats()["entries"] == 2
+
+
+def test_request_claims_decodes_once_per_request():
+    token = create_access_token({"user_id": 3})
+    state = {}
+
+    with patch("app.core.auth.decode_access_token", wraps=decode_access_token) as decode:
+        request_claims(state, token)
+        request_claims(state, token)
+
+    assert decode.call_count == 1
+    assert state[CLAIMS_STATE_KEY]["user_id"] == 3
@@ -0,0 +1,219 @@
+"""
+test_batch_scoring.py
+=====================
+Parity tests for the vectorized batch scorer (batch_scoring.py).
+
+The batch path must reproduce the scalar score_student_project() output
+exactly — every factor column, the final score, and the ranking order
+(including ties). The pruned top-N path must return exactly the prefix
+of the full ranking.
+"""
+
+import random
+
+import pytest
+from app.services.matching_engine import (
+    StudentDTO,
+    ProjectDTO,
+    score_student_project,
+    rank_projects,
+)
+from app.services import batch_scoring
+from app.services.batch_scoring import encode_projects, score_batch, rank_order, rank_top_n
+
+
+SKILL_POOL = [
+    "python", "fastapi", "sql", "react", "css", "docker", "java",
+    "kotlin", "figma", "go", "rust", "excel",
+]
+WORD_POOL = [
+    "backend", "api", "web", "data", "design", "mobile", "computer",
+    "science", "python", "marketing", "the", "and", "a", "research",
+    "analytics", "business", "ui", "cloud", "sql", "x",
+]
+DURATIONS = [
+    "1 week", "2 weeks", "1 month", "2 months", "3 months",
+    "6 months", "1 year", "", "unknown",
+]
+
+
+def _words(rng, low, high):
+    return " ".join(rng.choice(WORD_POOL) for _ in range(rng.randint(low, high)))
+
+
+def _random_student(rng, student_id):
+    return StudentDTO(
+        student_id=student_id,
+        skills=rng.sample(SKILL_POOL, rng.randint(0, 5)),
+        major=rng.choice(["Computer Science", "Business", "Data Science", "Art", ""]),
+        bio=_words(rng, 0, 12),
+        completed_project_count=rng.randint(0, 8),
+        total_accepted_count=rng.randint(0, 10),
+        accepted_deliverable_count=rng.randint(0, 8),
+        average_feedback_rating=rng.choice([0.0, 1.0, 3.5, 4.2, 5.0]),
+        recent_application_count=rng.randint(0, 6),
+        graduation_year=rng.randint(2022, 2032),
+    )
+
+
+def _random_project(rng, project_id):
+    skills = rng.sample(SKILL_POOL, rng.randint(0, 5))
+    if skills and rng.random() < 0.2:
+        skills.append(skills[0])  # duplicate skills must not inflate counts
+    return ProjectDTO(
+        project_id=project_id,
+        title=_words(rng, 1, 4),
+        description=_words(rng, 0, 15),
+        required_skills=skills,
+        duration=rng.choice(DURATIONS),
+        status="open",
+    )
+
+
+def _scalar_ranking(student, projects):
+    raw = [score_student_project(student, p) for p in projects]
+    raw.sort(key=lambda x: x["match_score"], reverse=True)
+    return raw
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_batch_factor_columns_match_scalar(seed):
+    rng = random.Random(seed)
+    student = _random_student(rng, 1)
+    projects = [_random_project(rng, i) for i in range(60)]
+
+    scores = score_batch(student, encode_projects(projects))
+
+    for row, project in enumerate(projects):
+        expected = score_student_project(student, project)
+        assert scores.match_score[row] == expected["match_score"]
+        assert scores.skill_score[row] == expected["skill_score"]
+        assert scores.experience_score[row] == expected["experience_score"]
+        assert scores.interest_score[row] == expected["interest_score"]
+        assert scores.activity_score == expected["activity_score"]
+        assert scores.success_score == expected["success_score"]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_rank_projects_matches_scalar_order(seed):
+    rng = random.Random(1000 + seed)
+    student = _random_student(rng, 1)
+    projects = [_random_project(rng, i) for i in range(80)]
+
+    expected = _scalar_ranking(student, projects)
+    ranked = rank_projects(student, projects)
+
+    assert [r.project_id for r in ranked] == [e["project_id"] for e in expected]
+    assert [r.match_score for r in ranked] == [e["match_score"] for e in expected]
+    assert [r.rank for r in ranked] == list(range(1, len(projects) + 1))
+
+
+def test_ties_keep_input_order():
+    student = _random_student(random.Random(7), 1)
+    project = ProjectDTO(1, "Same", "Same text", ["python"], "1 month", "open")
+    projects = [
+        ProjectDTO(pid, project.title, project.description,
+                   project.required_skills, project.duration, "open")
+        for pid in (5, 3, 9, 1)
+    ]
+
+    ranked = rank_projects(student, projects)
+
+    assert [r.project_id for r in ranked] == [5, 3, 9, 1]
+
+
+def test_rank_order_top_n_is_prefix_of_full_order():
+    rng = random.Random(42)
+    student = _random_student(rng, 1)
+    scores = score_batch(student, encode_projects([_random_project(rng, i) for i in range(50)]))
+
+    full = rank_order(scores).tolist()
+    assert rank_order(scores, top_n=7).tolist() == full[:7]
+
+
+def test_batch_outputs_are_python_floats():
+    rng = random.Random(3)
+    ranked = rank_projects(_random_student(rng, 1), [_random_project(rng, 1)])
+
+    assert type(ranked[0].match_score) is float
+    assert type(ranked[0].skill_score) is float
+    assert type(ranked[0].activity_score) is float
+
+
+def test_encode_projects_empty_inputs():
+    project = ProjectDTO(1, "", "", [], "", "open")
+    student = StudentDTO(1, [], "", "", 0, 0, 0, 0.0, 0, 2025)
+
+    scores = score_batch(student, encode_projects([project]))
+
+    assert scores.match_score[0] == score_student_project(student, project)["match_score"]
+    assert scores.skill_score[0] == 50.0
+    assert scores.interest_score[0] == 50.0
+
+
+# ---------------------------------------------------------------------------
+# Pruned top-N selection (inverted index + heap)
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize("seed", range(25))
+@pytest.mark.parametrize("top_n", [1, 3, 10, 79])
+def test_pruned_top_n_matches_full_ranking(seed, top_n):
+    rng = random.Random(5000 + seed)
+    student = _random_student(rng, 1)
+    projects = [_random_project(rng, i) for i in range(80)]
+
+    full = rank_projects(student, projects)
+    pruned = rank_projects(student, projects, top_n=top_n)
+
+    assert len(pruned) == top_n
+    for got, want in zip(pruned, full):
+        assert got == want
+
+
+def test_pruned_top_n_keeps_ties_in_input_order():
+    student = StudentDTO(1, ["python"], "Art", "", 0, 0, 0, 0.0, 0, 2025)
+    projects = [
+        ProjectDTO(pid, "Same", "Same text", ["java"], "1 month", "open")
+        for pid in (8, 2, 6, 4)
+    ]
+
+    ranked = rank_projects(student, projects, top_n=2)
+
+    assert [r.project_id for r in ranked] == [8, 2]
+
+
+def test_pruned_top_n_skips_tiers_that_cannot_win(monkeypatch):
+    """With enough skill matches, zero-overlap projects are never scored."""
+    student = StudentDTO(1, ["python", "sql"], "Computer Science", "", 3, 3, 3, 5.0, 4, 2025)
+    matching = [ProjectDTO(i, "Match", "python sql", ["python", "sql"], "1 month", "open")
+                for i in range(5)]
+    unrelated = [ProjectDTO(100 + i, "Other", "painting", ["oil"], "1 month", "open")
+                 for i in range(50)]
+    matrix = encode_projects(matching + unrelated)
+
+    scored_rows = []
+    original = batch_scoring._hit_counts
+
+    def spy(rows, hits):
+        scored_rows.extend(rows.tolist())
+        return original(rows, hits)
+
+    monkeypatch.setattr(batch_scoring, "_hit_counts", spy)
+    result = rank_top_n(student, matrix, 3)
+
+    assert [row for row, *_ in result] == [0, 1, 2]
+    assert set(scored_rows) <= set(range(5))
+
+
+def test_inverted_index_postings():
+    matrix = encode_projects([
+        ProjectDTO(1, "A", "", ["python", "sql"], "", "open"),
+        ProjectDTO(2, "B", "", [], "", "open"),
+        ProjectDTO(3, "C", "", ["python"], "", "open"),
+    ])
+    index = matrix.inverted()
+
+    python_id = matrix.vocabulary["python"]
+    assert index.skills.lookup([python_id]).tolist() == [0, 2]
+    assert index.no_skill_rows.tolist() == [1]
+    assert matrix.inverted() is index
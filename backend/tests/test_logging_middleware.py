@@ -1,10 +1,13 @@
+import asyncio
+
 import pytest
 from unittest.mock import patch
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from app.models import User, SystemLog
 from app.utils.security import hash_password
-from app.core.auth import create_access_token
+from app.core.auth import create_access_token, decode_access_token
+from app.middleware.logging_middleware import LoggingMiddleware, log_writer
 
 # Mirror the conftest test DB so middleware writes go to the same SQLite file
 test_engine = create_engine("sqlite:///./test.db", connect_args={"check_same_thread": False})
@@ -25,6 +28,7 @@ def test_unauthenticated_request_is_logged(client, db_session):
         json={"email": "log@test.com", "password": "password123", "role": "student"}
     )
 
+    log_writer.flush()
     log = db_session.query(SystemLog).first()
     assert log is not None
     assert log.user_id is None
@@ -52,6 +56,7 @@ def test_authenticated_request_logs_user_id_and_role(client, db_session):
         headers={"Authorization": f"Bearer {token}"}
     )
 
+    log_writer.flush()
     log = db_session.query(SystemLog).first()
     assert log is not None
     assert log.user_id == user.id
@@ -60,10 +65,26 @@ def test_authenticated_request_logs_user_id_and_role(client, db_session):
     assert log.method == "GET"
 
 
+def test_token_is_decoded_once_per_request(client, db_session):
+    """The middleware reuses the claims get_current_user stored on request.state."""
+    user = User(email="once@test.com", hashed_password=hash_password("password123"), role="student")
+    db_session.add(user)
+    db_session.commit()
+    token = create_access_token({"user_id": user.id, "role": "student"})
+
+    with patch("app.core.auth.decode_access_token", wraps=decode_access_token) as decode:
+        client.get("/auth/protected", headers={"Authorization": f"Bearer {token}"})
+
+    log_writer.flush()
+    assert decode.call_count == 1
+    assert db_session.query(SystemLog).first().user_id == user.id
+
+
 def test_failed_request_logs_error_status_code(client, db_session):
     """A 401 response should still be logged with the correct status code."""
     client.get("/auth/protected")  # no token -> 401
 
+    log_writer.flush()
     log = db_session.query(SystemLog).first()
     assert log is not None
     assert log.status_code == 401
@@ -81,6 +102,7 @@ def test_multiple_requests_create_multiple_log_entries(client, db_session):
         json={"email": "b@test.com", "password": "password123", "role": "student"}
     )
 
+    log_writer.flush()
     logs = db_session.query(SystemLog).all()
     assert len(logs) == 2
 
@@ -92,6 +114,7 @@ def test_log_timestamp_is_set(client, db_session):
         json={"email": "ts@test.com", "password": "password123", "role": "student"}
     )
 
+    log_writer.flush()
     log = db_session.query(SystemLog).first()
     assert log is not None
     assert log.timestamp is not None
@@ -101,6 +124,79 @@ def test_log_records_correct_http_method(client, db_session):
     """Log entry must record the actual HTTP method used."""
     client.get("/auth/protected")
 
+    log_writer.flush()
     log = db_session.query(SystemLog).first()
     assert log is not None
     assert log.method == "GET"
+
+
+def test_log_records_duration_and_response_size(client, db_session):
+    """Entries carry the request duration and the response body size in bytes."""
+    response = client.post(
+        "/auth/register",
+        json={"email": "size@test.com", "password": "password123", "role": "student"}
+    )
+
+    log_writer.flush()
+    log = db_session.query(SystemLog).first()
+    assert log is not None
+    assert log.response_size == len(response.content)
+    assert log.duration_ms is not None and log.duration_ms >= 0
+
+
+class RecordingWriter:
+    def __init__(self):
+        self.entries = []
+
+    async def submit(self, entry):
+        self.entries.append(entry)
+        return True
+
+
+def run_asgi(app, path="/stream"):
+    """Calls an ASGI app directly; returns the messages it sent."""
+    scope = {
+        "type": "http", "method": "GET", "path": path,
+        "headers": [(b"authorization", b"Bearer not-a-token")],
+    }
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    return sent
+
+
+def test_streamed_chunks_pass_through_unbuffered():
+    """Each body chunk is forwarded as sent; sizes add up across chunks."""
+    async def streaming_app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        for chunk in (b"ab", b"cde", b""):
+            await send({"type": "http.response.body", "body": chunk, "more_body": chunk != b""})
+
+    writer = RecordingWriter()
+    sent = run_asgi(LoggingMiddleware(streaming_app, writer=writer))
+
+    assert [m.get("body") for m in sent] == [None, b"ab", b"cde", b""]
+    [entry] = writer.entries
+    assert entry["status_code"] == 200
+    assert entry["response_size"] == 5
+    assert entry["endpoint"] == "/stream"
+    assert entry["user_id"] is None
+
+
+def test_unhandled_exception_is_logged_as_500():
+    """An app that raises before responding is logged with status 500."""
+    async def failing_app(scope, receive, send):
+        raise RuntimeError("boom")
+
+    writer = RecordingWriter()
+    with pytest.raises(RuntimeError):
+        run_asgi(LoggingMiddleware(failing_app, writer=writer), path="/boom")
+
+    assert writer.entries[0]["status_code"] == 500
+    assert writer.entries[0]["response_size"] == 0
@@ -10,6 +10,8 @@ Coverage targets:
 - Ranking order correctness
 - Determinism (same inputs → same outputs)
 - Top-N slicing
+- Reverse matching (rank_students)
+- Prepared-student fast path (prepare_student / score_prepared)
 """
 
 import pytest
@@ -22,9 +24,14 @@ from app.services.matching_engine import (
     compute_success_score,
     score_student_project,
     rank_projects,
+    rank_students,
+    prepare_student,
+    score_prepared,
+    PreparedStudent,
     StudentDTO,
     ProjectDTO,
     ScoredProject,
+    ScoredStudent,
 )
 
 
@@ -499,4 +506,83 @@ def test_rank_top_n_zero_returns_all(base_student, base_project):
     Valid top_n usage starts at 1.
     """
     results = rank_projects(base_student, [base_project], top_n=0)
-    assert len(results) == 1  # all results returned, no slice applied
\ No newline at end of file
+    assert len(results) == 1  # all results returned, no slice applied
+
+
+# ---------------------------------------------------------------------------
+# Reverse matching — rank_students
+# ---------------------------------------------------------------------------
+
+def test_rank_students_scores_match_pairwise(base_student, new_student, base_project):
+    results = rank_students(base_project, [new_student, base_student])
+
+    assert all(isinstance(r, ScoredStudent) for r in results)
+    assert [r.student_id for r in results] == [1, 2]
+    assert [r.rank for r in results] == [1, 2]
+    expected = score_student_project(base_student, base_project)
+    assert results[0].match_score == expected["match_score"]
+    assert results[0].skill_score == expected["skill_score"]
+    assert results[0].success_score == expected["success_score"]
+
+
+def test_rank_students_ties_keep_input_order(new_student, base_project):
+    students = [
+        StudentDTO(**{**new_student.__dict__, "student_id": sid})
+        for sid in (7, 3, 5)
+    ]
+    results = rank_students(base_project, students)
+    assert [r.student_id for r in results] == [7, 3, 5]
+
+
+def test_rank_students_top_n(base_student, new_student, base_project):
+    results = rank_students(base_project, [new_student, base_student], top_n=1)
+    assert [r.student_id for r in results] == [1]
+
+
+@pytest.mark.parametrize("top_n", [0, -1])
+def test_rank_students_non_positive_top_n_returns_all(base_student, new_student, base_project, top_n):
+    """Same 'no limit' reading of top_n <= 0 as rank_projects."""
+    students = [new_student, base_student]
+
+    assert len(rank_students(base_project, students, top_n=top_n)) == 2
+    assert len(rank_projects(base_student, [base_project], top_n=top_n)) == 1
+
+
+def test_rank_students_empty_list(base_project):
+    assert rank_students(base_project, []) == []
+
+
+# ---------------------------------------------------------------------------
+# Prepared-student fast path
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize("duration", ["1 week", "2 months", "6 months", "1 year", "", None])
+def test_score_prepared_matches_pairwise(base_student, new_student, base_project, duration):
+    project = ProjectDTO(
+        project_id=9,
+        title="Long Data Science Study",
+        description="Research APIs for business analytics",
+        required_skills=["python", "excel"],
+        duration=duration,
+        status="open",
+    )
+    for student in (base_student, new_student):
+        prepared = prepare_student(student)
+        for p in (base_project, project):
+            assert score_prepared(prepared, p) == score_student_project(student, p)
+
+
+def test_prepare_student_hoists_student_only_terms(base_student):
+    prepared = prepare_student(base_student)
+
+    assert isinstance(prepared, PreparedStudent)
+    assert prepared.skills == {"python", "fastapi", "sql"}
+    assert prepared.major_tokens == {"computer", "science"}
+    assert prepared.activity_score == compute_activity_score(3)
+    assert prepared.success_score == compute_success_score(2, 2, 2, 4.5)
+
+
+def test_prepared_student_is_immutable(base_student):
+    prepared = prepare_student(base_student)
+    with pytest.raises(Exception):
+        prepared.activity_score = 0.0
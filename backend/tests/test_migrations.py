@@ -0,0 +1,214 @@
+"""
+test_migrations.py
+==================
+Tests for the versioned schema migrations (app/migrations).
+
+Covers:
+- A fresh database gets every table, index and the full-text index
+- Migrated and model-created databases have the same schema
+- Applied versions are recorded; re-running applies nothing
+- A database created before the migration system gains the new
+  indexes and full-text index, with existing rows searchable
+- Columns added to tables that predate them
+- Unread notification counters backfilled
+- Coalescing columns and index added to an older notifications table,
+  and by migration 7 alone to a database at version 6
+- A failing migration is not recorded and is retried
+- `python -m app.cli migrate` / `--status`
+"""
+
+import pytest
+from sqlalchemy import create_engine, insert, inspect, text
+
+from app import cli
+from app import migrations
+from app.migrations import MIGRATIONS, Migration, applied_versions, run_migrations
+from app.migrations.m0002_query_indexes import INDEXES
+from app.models import Base, Notification, Project, User
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+    yield engine
+    engine.dispose()
+
+
+def index_names(engine, table):
+    return {ix["name"] for ix in inspect(engine).get_indexes(table)}
+
+
+def test_fresh_database_is_fully_migrated(engine):
+    applied = run_migrations(engine)
+
+    assert [m.version for m in applied] == [m.version for m in MIGRATIONS]
+    assert set(Base.metadata.tables) <= set(inspect(engine).get_table_names())
+    assert "projects_fts" in inspect(engine).get_table_names()
+    assert "ix_notifications_unread_recipient_created_at_id" in index_names(engine, "notifications")
+
+
+def schema(engine):
+    inspector = inspect(engine)
+    return {
+        table: (
+            {c["name"]: c["nullable"] for c in inspector.get_columns(table)},
+            {ix["name"] for ix in inspector.get_indexes(table)},
+        )
+        for table in Base.metadata.tables
+    }
+
+
+def test_migrations_build_the_schema_the_models_declare(engine, tmp_path):
+    # Migrations are frozen snapshots; this catches models and migrations
+    # drifting apart
+    declared = create_engine(f"sqlite:///{tmp_path / 'declared.db'}")
+    try:
+        Base.metadata.create_all(bind=declared)
+        run_migrations(engine)
+
+        assert schema(engine) == schema(declared)
+    finally:
+        declared.dispose()
+
+
+def test_versions_are_recorded_and_rerun_is_a_no_op(engine):
+    run_migrations(engine)
+
+    assert run_migrations(engine) == []
+    with engine.begin() as connection:
+        assert applied_versions(connection) == {m.version for m in MIGRATIONS}
+
+
+def test_legacy_database_gains_indexes_and_search(engine):
+    # As main.py's create_all left it: tables, but none of the newer indexes
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(text("DROP TABLE projects_fts"))
+        for trigger in ("projects_fts_ai", "projects_fts_ad", "projects_fts_au"):
+            connection.execute(text(f"DROP TRIGGER {trigger}"))
+        for index in INDEXES:
+            connection.execute(text(f"DROP INDEX {index.name}"))
+        connection.execute(insert(User).values(email="o@x.com", hashed_password="x", role="organization"))
+        connection.execute(insert(Project).values(
+            organization_id=1, title="Legacy robotics", description="Old listing", status="open"
+        ))
+    assert "ix_projects_open_created_at_id" not in index_names(engine, "projects")
+
+    run_migrations(engine)
+
+    assert "ix_projects_open_created_at_id" in index_names(engine, "projects")
+    assert "ix_applications_student_status" in index_names(engine, "applications")
+    with engine.connect() as connection:
+        matches = connection.execute(
+            text("SELECT rowid FROM projects_fts WHERE projects_fts MATCH 'robotics'")
+        ).scalars().all()
+    assert matches == [1]
+
+
+def test_system_log_timing_columns_added_to_existing_table(engine):
+    with engine.begin() as connection:
+        connection.execute(text(
+            "CREATE TABLE system_logs (id INTEGER PRIMARY KEY, user_id INTEGER, role VARCHAR, "
+            "endpoint VARCHAR NOT NULL, method VARCHAR NOT NULL, status_code INTEGER, "
+            "timestamp DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL)"
+        ))
+
+    run_migrations(engine)
+
+    columns = {c["name"] for c in inspect(engine).get_columns("system_logs")}
+    assert {"duration_ms", "response_size"} <= columns
+
+
+def test_unread_notification_counts_backfilled(engine):
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(text("ALTER TABLE users DROP COLUMN unread_notification_count"))
+        connection.execute(text(
+            "INSERT INTO users (email, hashed_password, role, is_active) VALUES "
+            "('a@x.com', 'x', 'student', 1), ('b@x.com', 'x', 'student', 1)"
+        ))
+        connection.execute(insert(Notification), [
+            {"recipient_id": 1, "message": "one", "is_read": False},
+            {"recipient_id": 1, "message": "two", "is_read": False},
+            {"recipient_id": 1, "message": "seen", "is_read": True},
+            {"recipient_id": 2, "message": "seen", "is_read": True},
+        ])
+
+    run_migrations(engine)
+
+    with engine.connect() as connection:
+        counts = connection.execute(
+            text("SELECT id, unread_notification_count FROM users ORDER BY id")
+        ).all()
+    assert [tuple(row) for row in counts] == [(1, 2), (2, 0)]
+
+
+def test_notification_coalescing_columns_added(engine):
+    # notifications as it was before coalescing, with a row in it
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(text("DROP INDEX ix_notifications_recipient_group_key_id"))
+        for column in ("group_key", "count", "updated_at"):
+            connection.execute(text(f"ALTER TABLE notifications DROP COLUMN {column}"))
+        connection.execute(text(
+            "INSERT INTO users (email, hashed_password, role, is_active, unread_notification_count) "
+            "VALUES ('a@x.com', 'x', 'student', 1, 0)"
+        ))
+        connection.execute(text("INSERT INTO notifications (recipient_id, message, is_read) VALUES (1, 'old', 0)"))
+
+    run_migrations(engine)
+
+    columns = {c["name"] for c in inspect(engine).get_columns("notifications")}
+    assert {"group_key", "count", "updated_at"} <= columns
+    assert "ix_notifications_recipient_group_key_id" in index_names(engine, "notifications")
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT count, group_key FROM notifications")).one() == (1, None)
+
+
+def test_coalescing_is_added_by_its_own_migration(engine, monkeypatch):
+    # A database that ran every migration released before coalescing
+    monkeypatch.setattr(migrations, "MIGRATIONS", [m for m in MIGRATIONS if m.version < 7])
+    run_migrations(engine)
+    columns = {c["name"] for c in inspect(engine).get_columns("notifications")}
+    assert "group_key" not in columns
+    monkeypatch.setattr(migrations, "MIGRATIONS", MIGRATIONS)
+
+    assert [m.version for m in run_migrations(engine)] == [7]
+
+    columns = {c["name"] for c in inspect(engine).get_columns("notifications")}
+    assert {"group_key", "count", "updated_at"} <= columns
+    assert "ix_notifications_recipient_group_key_id" in index_names(engine, "notifications")
+
+
+def test_failed_migration_is_not_recorded_and_is_retried(engine, monkeypatch):
+    calls = []
+
+    def broken(connection):
+        calls.append(1)
+        connection.execute(text("CREATE TABLE IF NOT EXISTS half_done (id INTEGER)"))
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+
+    monkeypatch.setattr(migrations, "MIGRATIONS", MIGRATIONS + [Migration(99, "broken", broken)])
+
+    with pytest.raises(RuntimeError):
+        run_migrations(engine)
+
+    with engine.begin() as connection:
+        assert 99 not in applied_versions(connection)
+        assert {m.version for m in MIGRATIONS} <= applied_versions(connection)
+
+    assert [m.version for m in run_migrations(engine)] == [99]
+
+
+def test_cli_migrate_and_status(engine, monkeypatch, capsys):
+    monkeypatch.setattr(cli, "engine", engine)
+
+    cli.main(["migrate", "--status"])
+    assert "0001 baseline" in capsys.readouterr().out
+
+    cli.main(["migrate"])
+    assert f"{len(MIGRATIONS)} migration(s) applied" in capsys.readouterr().out
+
+    cli.main(["migrate", "--status"])
+    assert "pending" not in capsys.readouterr().out
@@ -1,3 +1,4 @@
+import pytest
 from app.models import User, Project, Application, Notification
 from app.utils.security import hash_password
 from app.core.auth import create_access_token
@@ -41,6 +42,14 @@ def seed_notification(db, recipient, message="Test notification", is_read=False)
     return n
 
 
+@pytest.fixture
+def db(client):
+    # Closed after the test so its connection goes back to the pool
+    session = TestingSessionLocal()
+    yield session
+    session.close()
+
+
 # ---------------------------------------------------------
 # GET /notifications
 # ---------------------------------------------------------
@@ -262,4 +271,241 @@ def test_org_user_can_receive_and_read_notifications(client):
         headers=get_auth_headers(org)
     )
     assert put_response.status_code == 200
-    assert put_response.json()["is_read"] is True
\ No newline at end of file
+    assert put_response.json()["is_read"] is True
+
+# ---------------------------------------------------------
+# Pagination and unread_only
+# ---------------------------------------------------------
+
+def test_get_notifications_cursor_pages(client, db):
+    """
+    With a limit, pages chain through X-Next-Cursor without gaps or repeats.
+    """
+    student = create_user(db, "pages@test.com", "student")
+    seeded = [seed_notification(db, student, f"n{i}").id for i in range(5)]
+
+    seen = []
+    params = {"limit": 2}
+    while True:
+        response = client.get("/notifications", params=params, headers=get_auth_headers(student))
+        assert response.status_code == 200
+        seen.extend(item["id"] for item in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        params = {"limit": 2, "cursor": cursor}
+
+    assert seen == list(reversed(seeded))
+
+
+def test_get_notifications_invalid_cursor(client, db):
+    student = create_user(db, "badcursor@test.com", "student")
+
+    response = client.get("/notifications", params={"cursor": "nope"}, headers=get_auth_headers(student))
+
+    assert response.status_code == 400
+
+
+def test_get_notifications_unread_only(client, db):
+    student = create_user(db, "unread@test.com", "student")
+    unread = seed_notification(db, student, "Unread")
+    seed_notification(db, student, "Read", is_read=True)
+
+    response = client.get("/notifications", params={"unread_only": True}, headers=get_auth_headers(student))
+
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()] == [unread.id]
+
+
+# ---------------------------------------------------------
+# GET /notifications/unread-count
+# ---------------------------------------------------------
+
+def unread_count(client, user):
+    response = client.get("/notifications/unread-count", headers=get_auth_headers(user))
+    assert response.status_code == 200
+    return response.json()["unread_count"]
+
+
+def test_unread_count_tracks_new_and_read_notifications(client, db):
+    student = create_user(db, "badge@test.com", "student")
+    other = create_user(db, "badge_other@test.com", "student")
+    assert unread_count(client, student) == 0
+
+    first = seed_notification(db, student, "One")
+    seed_notification(db, student, "Two")
+    seed_notification(db, student, "Seen", is_read=True)
+    seed_notification(db, other, "Not yours")
+    assert unread_count(client, student) == 2
+
+    client.put(f"/notifications/{first.id}/read", headers=get_auth_headers(student))
+    assert unread_count(client, student) == 1
+
+    # Marking it read again does not decrement twice
+    client.put(f"/notifications/{first.id}/read", headers=get_auth_headers(student))
+    assert unread_count(client, student) == 1
+    assert unread_count(client, other) == 1
+
+
+def test_unread_count_follows_deletes_and_rollbacks(client, db):
+    student = create_user(db, "badge_rb@test.com", "student")
+    kept = seed_notification(db, student, "Kept")
+    gone = seed_notification(db, student, "Gone")
+
+    db.delete(gone)
+    db.commit()
+    assert unread_count(client, student) == 1
+
+    db.add(Notification(recipient_id=student.id, message="Rolled back"))
+    db.flush()
+    db.rollback()
+    assert unread_count(client, student) == 1
+
+    # Set on an expired instance: the previous value is not loaded
+    db.expire(kept)
+    kept.is_read = True
+    db.commit()
+    assert unread_count(client, student) == 0
+
+
+def test_unread_count_requires_auth(client):
+    assert client.get("/notifications/unread-count").status_code == 401
+
+
+# ---------------------------------------------------------
+# Bulk operations: POST /notifications/read, /archive, /delete
+# ---------------------------------------------------------
+
+def listed_ids(client, user, **params):
+    response = client.get("/notifications", params=params, headers=get_auth_headers(user))
+    assert response.status_code == 200
+    return [item["id"] for item in response.json()]
+
+
+def test_bulk_mark_read_by_ids(client, db):
+    student = create_user(db, "bulk_ids@test.com", "student")
+    other = create_user(db, "bulk_other@test.com", "student")
+    n1, n2, n3 = (seed_notification(db, student, f"n{i}") for i in range(3))
+    foreign = seed_notification(db, other, "Not yours")
+
+    response = client.post(
+        "/notifications/read",
+        json={"ids": [n1.id, n3.id, foreign.id]},
+        headers=get_auth_headers(student),
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"affected": 2, "unread_count": 1}
+    assert listed_ids(client, student, unread_only=True) == [n2.id]
+    assert listed_ids(client, other, unread_only=True) == [foreign.id]
+
+
+def test_bulk_mark_read_up_to_watermark(client, db):
+    student = create_user(db, "bulk_wm@test.com", "student")
+    older = [seed_notification(db, student, f"n{i}") for i in range(3)]
+    newer = seed_notification(db, student, "Arrived after the client looked")
+
+    response = client.post(
+        "/notifications/read",
+        json={"up_to_id": older[-1].id},
+        headers=get_auth_headers(student),
+    )
+
+    assert response.json() == {"affected": 3, "unread_count": 1}
+    assert listed_ids(client, student, unread_only=True) == [newer.id]
+
+    # Repeating it changes nothing
+    again = client.post("/notifications/read", json={"up_to_id": older[-1].id}, headers=get_auth_headers(student))
+    assert again.json() == {"affected": 0, "unread_count": 1}
+
+
+def test_bulk_watermark_of_other_users_notification_selects_nothing(client, db):
+    student = create_user(db, "bulk_wm_own@test.com", "student")
+    other = create_user(db, "bulk_wm_other@test.com", "student")
+    seed_notification(db, student, "Mine")
+    foreign = seed_notification(db, other, "Theirs")
+
+    response = client.post("/notifications/read", json={"up_to_id": foreign.id}, headers=get_auth_headers(student))
+
+    assert response.json() == {"affected": 0, "unread_count": 1}
+
+
+def test_bulk_archive_hides_and_reads(client, db):
+    student = create_user(db, "bulk_archive@test.com", "student")
+    kept = seed_notification(db, student, "Kept")
+    archived = seed_notification(db, student, "Archived")
+    seed_read = seed_notification(db, student, "Archived, already read", is_read=True)
+
+    response = client.post(
+        "/notifications/archive",
+        json={"ids": [archived.id, seed_read.id]},
+        headers=get_auth_headers(student),
+    )
+
+    assert response.json() == {"affected": 2, "unread_count": 1}
+    assert listed_ids(client, student) == [kept.id]
+    assert listed_ids(client, student, archived=True) == [seed_read.id, archived.id]
+
+
+def test_bulk_delete(client, db):
+    student = create_user(db, "bulk_delete@test.com", "student")
+    deleted = [
+        seed_notification(db, student, "Unread, deleted").id,
+        seed_notification(db, student, "Read, deleted", is_read=True).id,
+    ]
+    kept = seed_notification(db, student, "Kept").id
+
+    response = client.post("/notifications/delete", json={"up_to_id": deleted[-1]}, headers=get_auth_headers(student))
+
+    assert response.json() == {"affected": 2, "unread_count": 1}
+    assert listed_ids(client, student) == [kept]
+    assert db.query(Notification).filter(Notification.id.in_(deleted)).count() == 0
+
+
+def test_pages_continue_after_deleting_the_last_item_seen(client, db):
+    student = create_user(db, "bulk_page@test.com", "student")
+    seeded = [seed_notification(db, student, f"n{i}").id for i in range(5)]
+    headers = get_auth_headers(student)
+
+    first = client.get("/notifications", params={"limit": 2}, headers=headers)
+    client.post("/notifications/delete", json={"ids": [seeded[3]]}, headers=headers)
+    second = client.get(
+        "/notifications", params={"limit": 2, "cursor": first.headers["X-Next-Cursor"]}, headers=headers
+    )
+
+    assert [item["id"] for item in second.json()] == [seeded[2], seeded[1]]
+
+
+def test_bulk_operations_are_single_statements(client, db):
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    student = create_user(db, "bulk_sql@test.com", "student")
+    ids = [seed_notification(db, student, f"n{i}").id for i in range(50)]
+    headers = get_auth_headers(student)
+    client.get("/notifications/unread-count", headers=headers)  # cache the principal
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.lstrip().split()[0].upper())
+
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        response = client.post("/notifications/read", json={"ids": ids}, headers=headers)
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+
+    assert response.json() == {"affected": 50, "unread_count": 0}
+    # The notifications UPDATE, the counter UPDATE, and reading the counter back
+    assert statements == ["UPDATE", "UPDATE", "SELECT"]
+
+
+def test_bulk_selection_validation(client, db):
+    student = create_user(db, "bulk_invalid@test.com", "student")
+    headers = get_auth_headers(student)
+
+    assert client.post("/notifications/read", json={}, headers=headers).status_code == 422
+    assert client.post("/notifications/read", json={"ids": [1], "up_to_id": 1}, headers=headers).status_code == 422
+    assert client.post("/notifications/read", json={"ids": []}, headers=headers).status_code == 422
+    assert client.post("/notifications/read", json={"ids": [1]}).status_code == 401
@@ -0,0 +1,255 @@
+"""
+test_notification_coalescing.py
+===============================
+Tests for notification coalescing and digest mode
+(app.utils.notifications.create_notification with a group_key).
+
+Covers:
+- Chat messages in a conversation fold into one unread notification
+  with a count and the latest preview
+- Reading (or archiving) the notification closes its group; groups and
+  recipients don't mix; ungrouped notifications never coalesce
+- A coalesced notification moves to the top of the inbox; cursors
+  issued before keep their place
+- Digest window: a read notification reopens while its window lasts
+- Unread counters and publishing to streams for coalesced notifications
+- Stream: updates carry no event id; replay includes coalesced rows
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from anyio import to_thread
+
+from app.models import Application, Notification, Project, User
+from app.routers.notifications import _missed_since
+from app.services.notification_broker import notification_broker
+from app.utils import notifications as notification_utils
+from app.utils.notifications import create_notification
+from app.core.auth import create_access_token
+from tests.conftest import TestingSessionLocal
+from tests.test_notification_stream import Stream, wait_for_subscribers
+
+
+@pytest.fixture
+def db(client):
+    # Closed after the test so its connection goes back to the pool
+    session = TestingSessionLocal()
+    yield session
+    session.close()
+
+
+def create_user(db, email, role="student"):
+    user = User(email=email, hashed_password="x", role=role)
+    db.add(user)
+    db.commit()
+    return user.id
+
+
+def headers_for(user_id):
+    return {"Authorization": f"Bearer {create_access_token({'user_id': user_id})}"}
+
+
+def notify(db, user_id, message, group_key="g"):
+    create_notification(db, recipient_id=user_id, message=message, group_key=group_key)
+    db.commit()
+
+
+def inbox(db, user_id):
+    db.expire_all()
+    return [
+        (n.message, n.count, n.is_read)
+        for n in db.query(Notification).filter(Notification.recipient_id == user_id).order_by(Notification.id)
+    ]
+
+
+def unread_count(db, user_id):
+    db.expire_all()
+    return db.get(User, user_id).unread_notification_count
+
+
+@pytest.fixture
+def conversation(db):
+    org_id = create_user(db, "org@test.com", "organization")
+    student_id = create_user(db, "student@test.com")
+    project = Project(organization_id=org_id, title="Robot", description="d", status="open")
+    db.add(project)
+    db.flush()
+    db.add(Application(student_id=student_id, project_id=project.id, status="accepted"))
+    db.commit()
+    return org_id, student_id, project.id
+
+
+# ── Coalescing ────────────────────────────────────────────────────────────
+
+def test_chat_messages_coalesce_into_one_notification(client, db, conversation):
+    org_id, student_id, project_id = conversation
+
+    for content in ("hi", "are you there?", "ping"):
+        response = client.post(
+            f"/projects/{project_id}/messages", json={"content": content}, headers=headers_for(org_id)
+        )
+        assert response.status_code == 201
+
+    assert inbox(db, student_id) == [("💬 New message in 'Robot': ping", 3, False)]
+    assert unread_count(db, student_id) == 1
+
+    listed = client.get("/notifications", headers=headers_for(student_id)).json()
+    assert (listed[0]["count"], listed[0]["updated_at"] is not None) == (3, True)
+
+
+def test_reading_closes_the_group(db):
+    user_id = create_user(db, "read@test.com")
+    notify(db, user_id, "one")
+    notify(db, user_id, "two")
+    db.query(Notification).filter(Notification.recipient_id == user_id).one().is_read = True
+    db.commit()
+
+    notify(db, user_id, "three")
+
+    assert inbox(db, user_id) == [("two", 2, True), ("three", 1, False)]
+    assert unread_count(db, user_id) == 1
+
+
+def test_archived_notification_is_not_reused(db):
+    user_id = create_user(db, "archived@test.com")
+    notify(db, user_id, "one")
+    db.query(Notification).filter(Notification.recipient_id == user_id).one().archived_at = datetime.now(timezone.utc)
+    db.commit()
+
+    notify(db, user_id, "two")
+
+    assert [count for _, count, _ in inbox(db, user_id)] == [1, 1]
+
+
+def test_groups_and_recipients_are_kept_apart(db):
+    first = create_user(db, "first@test.com")
+    second = create_user(db, "second@test.com")
+    notify(db, first, "a", group_key="messages:1")
+    notify(db, first, "b", group_key="messages:2")
+    notify(db, second, "c", group_key="messages:1")
+    notify(db, first, "d", group_key=None)
+    notify(db, first, "e", group_key=None)
+
+    assert inbox(db, first) == [("a", 1, False), ("b", 1, False), ("d", 1, False), ("e", 1, False)]
+    assert inbox(db, second) == [("c", 1, False)]
+    assert unread_count(db, first) == 4
+
+
+# ── Inbox order ───────────────────────────────────────────────────────────
+
+def inbox_page(client, user_id, **params):
+    response = client.get("/notifications", params=params, headers=headers_for(user_id))
+    assert response.status_code == 200
+    return [n["message"] for n in response.json()], response.headers.get("X-Next-Cursor")
+
+
+def test_coalesced_notification_moves_to_the_top(client, db):
+    user_id = create_user(db, "top@test.com")
+    notify(db, user_id, "chat 1", "chat")
+    notify(db, user_id, "other", None)
+
+    notify(db, user_id, "chat 2", "chat")
+
+    assert inbox_page(client, user_id)[0] == ["chat 2", "other"]
+
+
+def test_cursor_keeps_its_place_when_its_row_moves_up(client, db):
+    user_id = create_user(db, "cursor@test.com")
+    notify(db, user_id, "a", None)
+    notify(db, user_id, "b", "chat")
+    notify(db, user_id, "c", None)
+    first_page, cursor = inbox_page(client, user_id, limit=2)
+    assert first_page == ["c", "b"]
+
+    notify(db, user_id, "b again", "chat")
+
+    assert inbox_page(client, user_id, limit=2, cursor=cursor) == (["a"], None)
+    assert inbox_page(client, user_id)[0] == ["b again", "c", "a"]
+
+
+# ── Digest window ─────────────────────────────────────────────────────────
+
+def test_digest_window_reopens_a_read_notification(db, monkeypatch):
+    monkeypatch.setattr(notification_utils, "NOTIFICATION_DIGEST_WINDOW_SECONDS", 600)
+    user_id = create_user(db, "digest@test.com")
+    notify(db, user_id, "one")
+    db.query(Notification).filter(Notification.recipient_id == user_id).one().is_read = True
+    db.commit()
+    assert unread_count(db, user_id) == 0
+
+    notify(db, user_id, "two")
+
+    assert inbox(db, user_id) == [("two", 2, False)]
+    assert unread_count(db, user_id) == 1
+
+
+def test_digest_window_expires(db, monkeypatch):
+    monkeypatch.setattr(notification_utils, "NOTIFICATION_DIGEST_WINDOW_SECONDS", 600)
+    user_id = create_user(db, "expired@test.com")
+    notify(db, user_id, "one")
+    notification = db.query(Notification).filter(Notification.recipient_id == user_id).one()
+    notification.is_read = True
+    notification.created_at = datetime.now(timezone.utc) - timedelta(seconds=601)
+    db.commit()
+
+    notify(db, user_id, "two")
+
+    assert inbox(db, user_id) == [("one", 1, True), ("two", 1, False)]
+
+
+# ── Publishing and the stream ─────────────────────────────────────────────
+
+def test_coalesced_notification_is_published_with_its_count(db, monkeypatch):
+    published = []
+    monkeypatch.setattr(notification_broker, "publish", lambda batch: published.extend(batch))
+    user_id = create_user(db, "pub@test.com")
+    notify(db, user_id, "one")
+
+    create_notification(db, recipient_id=user_id, message="rolled back", group_key="g")
+    db.rollback()
+    notify(db, user_id, "two")
+
+    assert [(n["id"], n["message"], n["count"]) for _, n in published] == [
+        (published[0][1]["id"], "one", 1),
+        (published[0][1]["id"], "two", 2),
+    ]
+
+
+def test_stream_sends_updates_without_moving_the_event_id(db):
+    user_id = create_user(db, "stream@test.com")
+
+    def send(message, group_key):
+        session = TestingSessionLocal()
+        try:
+            notify(session, user_id, message, group_key)
+        finally:
+            session.close()
+
+    async def scenario():
+        async with Stream("/notifications/stream", headers_for(user_id)) as stream:
+            await wait_for_subscribers()
+            await to_thread.run_sync(send, "chat 1", "chat")
+            await to_thread.run_sync(send, "other", None)
+            await to_thread.run_sync(send, "chat 2", "chat")
+            return [await stream.next_event() for _ in range(3)]
+
+    (_, first_id, first), (_, other_id, _), (_, update_id, update) = asyncio.run(scenario())
+
+    assert (first["count"], update["count"], update["message"]) == (1, 2, "chat 2")
+    assert update["id"] == first["id"]
+    assert (first_id, other_id, update_id) == (str(first["id"]), str(first["id"] + 1), None)
+
+
+def test_replay_includes_notifications_coalesced_since(db):
+    user_id = create_user(db, "replay@test.com")
+    notify(db, user_id, "chat 1", "chat")
+    notify(db, user_id, "seen", None)
+    seen_id = db.query(Notification.id).filter(Notification.message == "seen").scalar()
+    notify(db, user_id, "chat 2", "chat")
+
+    missed, truncated = _missed_since(db, user_id, seen_id)
+
+    assert [(n["message"], n["count"]) for n in missed] == [("chat 2", 2)]
+    assert not truncated
@@ -0,0 +1,337 @@
+"""
+test_notification_stream.py
+===========================
+Tests for pushing notifications to clients: the broker
+(services/notification_broker.py), publishing after commit
+(utils/notifications.py) and GET /notifications/stream.
+
+TestClient collects a whole response before returning it, and a stream
+never ends; so the stream tests drive the ASGI app directly, read
+events as they are sent, then disconnect.
+
+Covers:
+- Fan-out per recipient, from any thread; overflow closes a subscriber
+- Broker selection from NOTIFICATION_BROKER
+- Publishing only committed notifications, with their created_at
+- Live events, Last-Event-ID replay (and resync past the limit),
+  keep-alives, token in the query string, 401
+- Subscriptions released when the client disconnects
+"""
+
+import asyncio
+import json
+
+import pytest
+from anyio import to_thread
+
+from app.main import app
+from app.models import Notification, User
+from app.routers import notifications as notifications_router
+from app.services.notification_broker import InMemoryBroker, make_broker, notification_broker
+from app.utils.notifications import create_notification
+from app.core.auth import create_access_token
+from tests.conftest import TestingSessionLocal
+
+
+@pytest.fixture
+def db(client):
+    # Closed after the test so its connection goes back to the pool
+    session = TestingSessionLocal()
+    yield session
+    session.close()
+
+
+def create_user(db, email, role="student"):
+    user = User(email=email, hashed_password="x", role=role)
+    db.add(user)
+    db.commit()
+    return user.id
+
+
+def token_for(user_id):
+    return create_access_token({"user_id": user_id})
+
+
+def notify(user_id, message):
+    """Creates and commits a notification the way the routers do."""
+    session = TestingSessionLocal()
+    try:
+        create_notification(session, recipient_id=user_id, message=message)
+        session.commit()
+    finally:
+        session.close()
+
+
+# ── Driving the stream ────────────────────────────────────────────────────
+
+class Stream:
+    """An open GET request on the ASGI app, read event by event."""
+
+    def __init__(self, path, headers=None, query=""):
+        self.scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+            "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+            "query_string": query.encode(), "root_path": "",
+            "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+            "client": ("test", 1), "server": ("test", 80),
+        }
+        self.status = None
+        self._buffer = ""
+        self._chunks: asyncio.Queue = asyncio.Queue()
+        self._disconnect = asyncio.Event()
+        self._sent_request = False
+
+    async def _receive(self):
+        if not self._sent_request:
+            self._sent_request = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await self._disconnect.wait()
+        return {"type": "http.disconnect"}
+
+    async def _send(self, message):
+        if message["type"] == "http.response.start":
+            self.status = message["status"]
+        elif message["type"] == "http.response.body":
+            await self._chunks.put(message.get("body", b"").decode())
+            if not message.get("more_body", False):
+                await self._chunks.put(None)
+
+    async def __aenter__(self):
+        self._task = asyncio.create_task(app(self.scope, self._receive, self._send))
+        while self.status is None and not self._task.done():
+            await asyncio.sleep(0.01)
+        return self
+
+    async def __aexit__(self, *exc):
+        self._disconnect.set()
+        await asyncio.wait_for(self._task, 5)
+
+    async def next_block(self, timeout=5):
+        """The next SSE block (lines up to a blank line), or None at the end of the response."""
+        while "\n\n" not in self._buffer:
+            chunk = await asyncio.wait_for(self._chunks.get(), timeout)
+            if chunk is None:
+                return None
+            self._buffer += chunk
+        block, self._buffer = self._buffer.split("\n\n", 1)
+        return block
+
+    async def next_event(self, timeout=5):
+        """The next `event:` block as (event, id, data), skipping retry / comments."""
+        while True:
+            block = await self.next_block(timeout)
+            if block is None:
+                return None
+            fields = dict(line.split(": ", 1) for line in block.split("\n") if not line.startswith(":"))
+            if "event" in fields:
+                data = json.loads(fields["data"])
+                return fields["event"], fields.get("id"), data
+
+
+async def wait_for_subscribers(count=1):
+    while notification_broker.stats()["subscribers"] < count:
+        await asyncio.sleep(0.01)
+
+
+# ── Broker ────────────────────────────────────────────────────────────────
+
+def test_broker_delivers_to_the_recipients_subscribers_only():
+    broker = InMemoryBroker()
+
+    async def scenario():
+        mine = [broker.subscribe(1), broker.subscribe(1)]
+        other = broker.subscribe(2)
+        # Published from another thread, as sync endpoints do
+        await to_thread.run_sync(broker.publish, [(1, {"id": 10})])
+
+        assert [await asyncio.wait_for(s.get(), 1) for s in mine] == [{"id": 10}, {"id": 10}]
+        assert other._queue.empty()
+        for subscription in mine + [other]:
+            subscription.close()
+
+    asyncio.run(scenario())
+
+    assert broker.stats() == {
+        "broker": "memory", "recipients": 0, "subscribers": 0,
+        "published": 1, "delivered": 2, "overflowed": 0,
+    }
+
+
+def test_slow_subscriber_is_closed_on_overflow():
+    broker = InMemoryBroker(queue_size=2)
+
+    async def scenario():
+        subscription = broker.subscribe(1)
+        broker.publish([(1, {"id": i}) for i in range(5)])
+        await asyncio.sleep(0)
+
+        received = [await subscription.get() for _ in range(3)]
+        subscription.close()
+        return received, subscription.overflowed
+
+    received, overflowed = asyncio.run(scenario())
+
+    assert received == [{"id": 0}, {"id": 1}, None]
+    assert overflowed
+    assert broker.stats()["overflowed"] == 1
+
+
+def test_make_broker():
+    assert type(make_broker("memory")) is InMemoryBroker
+    with pytest.raises(ValueError, match="PostgreSQL"):
+        make_broker("postgres")
+    with pytest.raises(ValueError, match="Unknown"):
+        make_broker("carrier-pigeon")
+
+
+# ── Publishing after commit ───────────────────────────────────────────────
+
+@pytest.fixture
+def published(monkeypatch):
+    events = []
+    monkeypatch.setattr(notification_broker, "publish", lambda batch: events.extend(batch))
+    return events
+
+
+def test_committed_notifications_are_published_once(db, published):
+    user_id = create_user(db, "pub@test.com")
+    create_notification(db, recipient_id=user_id, message="first")
+    create_notification(db, recipient_id=user_id, message="second")
+    db.flush()
+    assert published == []
+
+    db.commit()
+
+    assert [(r, n["message"]) for r, n in published] == [(user_id, "first"), (user_id, "second")]
+    assert published[0][1]["created_at"] is not None
+    assert published[0][1]["is_read"] is False
+
+    db.commit()
+    assert len(published) == 2
+
+
+def test_rolled_back_notifications_are_not_published(db, published):
+    user_id = create_user(db, "rollback@test.com")
+    create_notification(db, recipient_id=user_id, message="never")
+    db.flush()
+
+    db.rollback()
+    db.commit()
+
+    assert published == []
+
+
+def test_publish_failure_does_not_fail_the_commit(db, monkeypatch):
+    def broken(batch):
+        raise RuntimeError("broker down")
+
+    monkeypatch.setattr(notification_broker, "publish", broken)
+    user_id = create_user(db, "broken@test.com")
+    create_notification(db, recipient_id=user_id, message="kept")
+
+    db.commit()
+
+    assert db.query(Notification).filter(Notification.recipient_id == user_id).count() == 1
+
+
+# ── GET /notifications/stream ─────────────────────────────────────────────
+
+def test_stream_pushes_new_notifications(db):
+    user_id = create_user(db, "live@test.com")
+    other_id = create_user(db, "live_other@test.com")
+
+    async def scenario():
+        headers = {"Authorization": f"Bearer {token_for(user_id)}"}
+        async with Stream("/notifications/stream", headers) as stream:
+            assert stream.status == 200
+            await wait_for_subscribers()
+
+            await to_thread.run_sync(notify, other_id, "not for you")
+            await to_thread.run_sync(notify, user_id, "hello")
+
+            return await stream.next_event()
+
+    event, event_id, data = asyncio.run(scenario())
+
+    assert event == "notification"
+    assert data["message"] == "hello"
+    assert data["recipient_id"] == user_id
+    assert event_id == str(data["id"])
+    assert notification_broker.stats()["subscribers"] == 0
+
+
+def test_stream_replays_after_last_event_id(db):
+    user_id = create_user(db, "replay@test.com")
+    seen, *missed = [
+        Notification(recipient_id=user_id, message=f"n{i}") for i in range(3)
+    ]
+    db.add_all([seen, *missed])
+    db.commit()
+    last_event_id = str(seen.id)
+
+    async def scenario():
+        headers = {"Authorization": f"Bearer {token_for(user_id)}", "Last-Event-ID": last_event_id}
+        async with Stream("/notifications/stream", headers) as stream:
+            replayed = [await stream.next_event() for _ in range(2)]
+            await to_thread.run_sync(notify, user_id, "live")
+            return replayed + [await stream.next_event()]
+
+    events = asyncio.run(scenario())
+
+    assert [data["message"] for _, _, data in events] == ["n1", "n2", "live"]
+
+
+def test_stream_asks_for_resync_past_the_replay_limit(db, monkeypatch):
+    monkeypatch.setattr(notifications_router, "SSE_REPLAY_LIMIT", 2)
+    user_id = create_user(db, "resync@test.com")
+    db.add_all([Notification(recipient_id=user_id, message=f"n{i}") for i in range(4)])
+    db.commit()
+
+    async def scenario():
+        headers = {"Authorization": f"Bearer {token_for(user_id)}", "Last-Event-ID": "0"}
+        async with Stream("/notifications/stream", headers) as stream:
+            return [await stream.next_event() for _ in range(3)]
+
+    events = asyncio.run(scenario())
+
+    assert events[0][0] == "resync"
+    assert [data["message"] for _, _, data in events[1:]] == ["n0", "n1"]
+
+
+def test_stream_sends_keepalives_and_accepts_query_token(db, monkeypatch):
+    monkeypatch.setattr(notifications_router, "SSE_KEEPALIVE_SECONDS", 0.05)
+    user_id = create_user(db, "idle@test.com")
+
+    async def scenario():
+        async with Stream("/notifications/stream", query=f"access_token={token_for(user_id)}") as stream:
+            assert stream.status == 200
+            return [await stream.next_block() for _ in range(3)]
+
+    blocks = asyncio.run(scenario())
+
+    assert blocks[0].startswith("retry: ")
+    assert blocks[1:] == [": keepalive", ": keepalive"]
+
+
+def test_stream_requires_auth(client):
+    assert client.get("/notifications/stream").status_code == 401
+    assert client.get("/notifications/stream", params={"access_token": "nope"}).status_code == 401
+
+
+def test_overflowed_stream_ends(db, monkeypatch):
+    user_id = create_user(db, "slow@test.com")
+    monkeypatch.setattr(notification_broker, "queue_size", 1)
+
+    async def scenario():
+        headers = {"Authorization": f"Bearer {token_for(user_id)}"}
+        async with Stream("/notifications/stream", headers) as stream:
+            await wait_for_subscribers()
+            # Delivered faster than the stream is read
+            notification_broker.publish([(user_id, {"id": i}) for i in range(1, 4)])
+            first = await stream.next_event()
+            return first, await stream.next_event()
+
+    first, end = asyncio.run(scenario())
+
+    assert first[2] == {"id": 1}
+    assert end is None
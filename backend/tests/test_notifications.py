@@ -1,5 +1,7 @@
+import time
+
 import pytest
-from app.models import User, Project, Application, Deliverable, Notification
+from app.models import User, Project, Application, Deliverable, Notification, OutboxEvent
 from app.utils.security import hash_password
 from app.core.auth import create_access_token
 from tests.conftest import TestingSessionLocal
@@ -26,6 +28,16 @@ def create_user(db, email, role):
     return user
 
 
+def wait_for_outbox(db, timeout=5.0):
+    """Waits for the app's outbox worker to deliver the queued fan-outs."""
+    deadline = time.monotonic() + timeout
+    while db.query(OutboxEvent).filter(OutboxEvent.status == "pending").count():
+        assert time.monotonic() < deadline, "outbox worker did not deliver in time"
+        db.rollback()
+        time.sleep(0.01)
+    db.expire_all()
+
+
 def create_project(db, org, title="Test Project"):
     project = Project(
         organization_id=org.id,
@@ -193,6 +205,9 @@ def test_notification_created_on_project_completion(client):
 
     assert response.status_code == 200
 
+    # Fanned out by the app's outbox worker
+    wait_for_outbox(db)
+
     notification = db.query(Notification).filter(
         Notification.recipient_id == student.id
     ).first()
@@ -235,12 +250,16 @@ def test_notification_only_sent_to_correct_student(client):
     ).first()
     assert s1_notification is not None
 
-    # student2 should NOT have a notification from this event
-    # (auto-reject fires but does not generate a notification — by design)
-    s2_notification = db.query(Notification).filter(
+    # student2 is only told about the auto-rejection, fanned out by the
+    # app's outbox worker
+    wait_for_outbox(db)
+    s2_messages = [n.message for n in db.query(Notification).filter(
         Notification.recipient_id == student2.id
-    ).first()
-    assert s2_notification is None
+    )]
+    assert s2_messages == [
+        "Your application for 'Targeted Notification Project' has been rejected: "
+        "another applicant was selected."
+    ]
 
 
 # ---------------------------------------------------------
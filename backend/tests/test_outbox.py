@@ -0,0 +1,274 @@
+"""
+test_outbox.py
+==============
+Tests for the transactional outbox (services/outbox.py) and the
+notification fan-outs that go through it.
+
+Covers:
+- Project completion and auto-rejection enqueue one event, and the worker
+  turns it into notifications (unread counters included)
+- Events roll back with the change that enqueued them
+- Bulk notification insert: one INSERT for all recipients
+- Retries with backoff, then failed after max_attempts
+- Unknown kinds rejected at enqueue
+- The app's own worker: started by the lifespan (unless disabled) and
+  woken when a transaction that enqueued events commits
+- `python -m app.cli outbox-worker --once` and /admin/metrics/outbox
+"""
+
+import time
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app import cli, main
+from app.models import Application, Deliverable, Notification, OutboxEvent, Project, User
+from app.services import outbox
+from app.services.outbox import OutboxWorker, enqueue, notify_many, outbox_worker
+from app.utils.notifications import create_notifications
+from app.core.auth import create_access_token
+from tests.conftest import TestingSessionLocal
+
+
+@pytest.fixture
+def db(client):
+    # These tests drive workers by hand; the app's own would race them
+    outbox_worker.stop()
+    # Closed after the test so its connection goes back to the pool
+    session = TestingSessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def worker():
+    return OutboxWorker(TestingSessionLocal, retry_base_seconds=0)
+
+
+def create_user(db, email, role="student"):
+    user = User(email=email, hashed_password="x", role=role)
+    db.add(user)
+    db.commit()
+    return user
+
+
+def headers_for(user_id):
+    return {"Authorization": f"Bearer {create_access_token({'user_id': user_id})}"}
+
+
+def notifications_of(db, user_id):
+    db.expire_all()
+    return [n.message for n in db.query(Notification).filter(Notification.recipient_id == user_id)]
+
+
+# ── Fan-outs through the outbox ───────────────────────────────────────────
+
+def test_project_completion_notifies_through_outbox(client, db, worker):
+    org = create_user(db, "org@test.com", "organization")
+    student = create_user(db, "student@test.com")
+    project = Project(organization_id=org.id, title="Robot", description="d", status="closed")
+    db.add(project)
+    db.flush()
+    application = Application(student_id=student.id, project_id=project.id, status="accepted")
+    db.add(application)
+    db.flush()
+    db.add(Deliverable(application_id=application.id, content="done", status="accepted"))
+    db.commit()
+    org_id, student_id, project_id = org.id, student.id, project.id
+
+    response = client.put(f"/projects/{project_id}/complete", headers=headers_for(org_id))
+
+    assert response.status_code == 200
+    assert notifications_of(db, student_id) == []
+    assert db.query(OutboxEvent).one().payload == {
+        "recipient_ids": [student_id],
+        "message": "The project 'Robot' has been marked complete. Congratulations!",
+    }
+
+    assert worker.run_once() == 1
+
+    assert notifications_of(db, student_id) == ["The project 'Robot' has been marked complete. Congratulations!"]
+    assert client.get("/notifications/unread-count", headers=headers_for(student_id)).json() == {"unread_count": 1}
+    assert db.query(OutboxEvent).one().status == "done"
+    assert worker.run_once() == 0
+
+
+def test_auto_rejected_applicants_are_notified(client, db, worker):
+    org = create_user(db, "org@test.com", "organization")
+    chosen, *others = [create_user(db, f"s{i}@test.com") for i in range(4)]
+    project = Project(organization_id=org.id, title="Robot", description="d", status="open")
+    db.add(project)
+    db.flush()
+    applications = [Application(student_id=s.id, project_id=project.id) for s in [chosen, *others]]
+    db.add_all(applications)
+    db.commit()
+    org_id, chosen_id, other_ids = org.id, chosen.id, [s.id for s in others]
+
+    response = client.patch(
+        f"/applications/{applications[0].id}/status",
+        json={"status": "accepted"},
+        headers=headers_for(org_id),
+    )
+    assert response.status_code == 200
+    worker.run_once()
+
+    assert notifications_of(db, chosen_id) == ["Your application for 'Robot' has been accepted."]
+    for student_id in other_ids:
+        assert notifications_of(db, student_id) == [
+            "Your application for 'Robot' has been rejected: another applicant was selected."
+        ]
+
+
+def test_enqueued_event_rolls_back_with_the_change(db):
+    student = create_user(db, "rb@test.com")
+    notify_many(db, [student.id], "never")
+    db.flush()
+
+    db.rollback()
+
+    assert db.query(OutboxEvent).count() == 0
+
+
+def test_nobody_to_notify_enqueues_nothing(db):
+    assert notify_many(db, [], "nobody") is None
+    db.commit()
+
+    assert db.query(OutboxEvent).count() == 0
+
+
+def test_unknown_kind_is_rejected(db):
+    with pytest.raises(ValueError, match="No outbox handler"):
+        enqueue(db, "carrier-pigeon", {})
+
+
+# ── Bulk insert ───────────────────────────────────────────────────────────
+
+def test_create_notifications_is_one_insert(db):
+    ids = [create_user(db, f"bulk{i}@test.com").id for i in range(20)]
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.lstrip().split()[0].upper())
+
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        created = create_notifications(db, ids + ids[:3], "hello")
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+    db.commit()
+
+    assert created == 20
+    assert statements == ["INSERT", "UPDATE"]
+    counts = {u.id: u.unread_notification_count for u in db.query(User).filter(User.id.in_(ids))}
+    assert set(counts.values()) == {1}
+
+
+# ── Retries ───────────────────────────────────────────────────────────────
+
+def test_failing_event_is_retried_then_marked_failed(db, monkeypatch):
+    calls = []
+
+    def flaky(session, payload):
+        calls.append(payload)
+        raise RuntimeError("smtp down")
+
+    monkeypatch.setitem(outbox.HANDLERS, "test.flaky", flaky)
+    enqueue(db, "test.flaky", {"n": 1})
+    db.commit()
+
+    worker = OutboxWorker(TestingSessionLocal, max_attempts=3, retry_base_seconds=3600)
+    assert worker.run_once() == 1
+
+    db.expire_all()
+    event_row = db.query(OutboxEvent).one()
+    assert (event_row.status, event_row.attempts) == ("pending", 1)
+    assert "smtp down" in event_row.last_error
+    # Backed off: not due again yet
+    assert worker.run_once() == 0
+
+    worker.retry_base_seconds = 0
+    event_row.available_at = datetime.now(timezone.utc)
+    db.commit()
+    # Due immediately now, so one pass uses up the remaining attempts
+    worker.run_once()
+
+    db.expire_all()
+    assert (db.query(OutboxEvent).one().status, len(calls)) == ("failed", 3)
+    assert (worker.retried, worker.failed) == (2, 1)
+    assert worker.run_once() == 0
+
+
+def test_handler_writes_roll_back_on_failure(db, monkeypatch):
+    student = create_user(db, "half@test.com")
+
+    def half_done(session, payload):
+        create_notifications(session, [student.id], "partial")
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(outbox.HANDLERS, "test.half", half_done)
+    enqueue(db, "test.half", {})
+    db.commit()
+
+    OutboxWorker(TestingSessionLocal).run_once()
+
+    assert notifications_of(db, student.id) == []
+
+
+# ── CLI and metrics ───────────────────────────────────────────────────────
+
+def test_cli_outbox_worker_once(db, monkeypatch, capsys):
+    student = create_user(db, "cli@test.com")
+    notify_many(db, [student.id], "from the cli")
+    db.commit()
+    monkeypatch.setattr(cli, "SessionLocal", TestingSessionLocal)
+
+    cli.main(["outbox-worker", "--once"])
+
+    assert "Processed 1 outbox event(s)" in capsys.readouterr().out
+    assert notifications_of(db, student.id) == ["from the cli"]
+
+
+def test_outbox_metrics(client, db):
+    admin = create_user(db, "admin@test.com", "admin")
+    notify_many(db, [admin.id], "pending")
+    db.commit()
+
+    response = client.get("/admin/metrics/outbox", headers=headers_for(admin.id))
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["pending"], body["done"], body["failed"]) == (1, 0, 0)
+    assert body["oldest_pending_seconds"] >= 0
+
+
+# ── The app's worker ──────────────────────────────────────────────────────
+
+def test_lifespan_runs_the_worker(client):
+    assert outbox_worker.running
+
+
+def test_lifespan_leaves_the_worker_to_a_separate_process(db, monkeypatch):
+    monkeypatch.setattr(main, "OUTBOX_WORKER_IN_APP", False)
+
+    with TestClient(main.app):
+        assert not outbox_worker.running
+
+
+def test_worker_wakes_when_events_commit(db):
+    student = create_user(db, "wake@test.com")
+    # Far longer than the test may take: only the commit can wake it
+    outbox_worker.start(poll_seconds=60)
+    time.sleep(0.05)
+    try:
+        notify_many(db, [student.id], "right away")
+        db.commit()
+
+        deadline = time.monotonic() + 5
+        while notifications_of(db, student.id) != ["right away"]:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+    finally:
+        outbox_worker.stop()
@@ -0,0 +1,267 @@
+"""
+test_pagination.py
+==================
+Tests for keyset (cursor) pagination (pagination.py).
+
+Covers:
+- Token round trip; malformed and foreign tokens rejected (400)
+- Walking /projects page by page: no gaps, no repeats, same order as offset
+- Ties on created_at broken by id
+- Projects posted between pages do not shift later pages
+- A cursor whose anchor row was deleted carries on after it
+- /projects/me, /projects/{id}/applications and /admin/projects
+- Offset pagination unchanged; cursor rejected for full-text search
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from app.models import Application, Project, User
+from app.utils.security import hash_password
+from app.core.auth import create_access_token
+from app.utils.pagination import CURSOR_HEADER, decode_cursor, encode_cursor
+from tests.conftest import TestingSessionLocal
+
+
+BASE_TIME = datetime(2025, 1, 1, 12, 0, 0)
+
+
+def get_auth_headers(user):
+    token = create_access_token({"user_id": user.id})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def db(client):
+    # Closed after the test so its connection goes back to the pool
+    session = TestingSessionLocal()
+    yield session
+    session.close()
+
+
+def create_user(db, email, role):
+    user = User(email=email, hashed_password=hash_password("password"), role=role)
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+def create_projects(db, org, count, minutes=None, status="open"):
+    """`count` projects; created_at steps by `minutes`, or the server default (ties)."""
+    projects = []
+    for i in range(count):
+        project = Project(
+            organization_id=org.id,
+            title=f"Project {i}",
+            description="Python backend work",
+            status=status,
+        )
+        if minutes is not None:
+            project.created_at = BASE_TIME + timedelta(minutes=minutes * i)
+        db.add(project)
+        projects.append(project)
+    db.commit()
+    return [p.id for p in projects]
+
+
+def walk(client, path, limit, headers=None, **params):
+    """Follows X-Next-Cursor until the last page; returns ids per page."""
+    pages = []
+    cursor = None
+    while True:
+        query = {"limit": limit, **params}
+        if cursor:
+            query["cursor"] = cursor
+        response = client.get(path, params=query, headers=headers)
+        assert response.status_code == 200
+        pages.append([row["id"] for row in response.json()])
+        cursor = response.headers.get(CURSOR_HEADER)
+        if cursor is None:
+            return pages
+
+
+# ---------------------------------------------------------------------------
+# Tokens
+# ---------------------------------------------------------------------------
+
+def test_cursor_round_trip():
+    created_at = datetime(2025, 3, 1, 12, 30, 5, 123456, tzinfo=timezone.utc)
+    token = encode_cursor("projects", 42, created_at)
+
+    assert decode_cursor("projects", token) == (42, created_at)
+    assert "42" not in token
+    # Tokens issued before they carried created_at still work
+    assert decode_cursor("projects", encode_cursor("projects", 42)) == (42, None)
+
+
+@pytest.mark.parametrize("token", ["", "not-base64!", "bnVsbA", encode_cursor("projects", 1)[:-3]])
+def test_malformed_cursor_rejected(token):
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor("projects", token)
+
+    assert exc.value.status_code == 400
+
+
+def test_cursor_for_other_listing_rejected(client, db):
+    org = create_user(db, "foreign_org@test.com", "organization")
+    create_projects(db, org, 2)
+
+    response = client.get(
+        "/projects", params={"cursor": encode_cursor("admin_projects", 1)}
+    )
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+# ---------------------------------------------------------------------------
+# GET /projects
+# ---------------------------------------------------------------------------
+
+def test_walk_matches_offset_order(client, db):
+    org = create_user(db, "walk_org@test.com", "organization")
+    ids = create_projects(db, org, 5, minutes=1)
+
+    pages = walk(client, "/projects", limit=2)
+
+    assert pages == [ids[4:2:-1], ids[2:0:-1], ids[:1]]
+    everything = client.get("/projects", params={"limit": 10}).json()
+    assert [p["id"] for p in everything] == list(reversed(ids))
+
+
+def test_equal_timestamps_ordered_by_id(client, db):
+    org = create_user(db, "ties_org@test.com", "organization")
+    ids = create_projects(db, org, 5)
+
+    pages = walk(client, "/projects", limit=2)
+
+    assert [pid for page in pages for pid in page] == sorted(ids, reverse=True)
+
+
+def test_last_full_page_has_no_cursor(client, db):
+    org = create_user(db, "full_org@test.com", "organization")
+    create_projects(db, org, 4, minutes=1)
+
+    assert [len(page) for page in walk(client, "/projects", limit=2)] == [2, 2]
+
+
+def test_new_projects_do_not_shift_later_pages(client, db):
+    org = create_user(db, "shift_org@test.com", "organization")
+    ids = create_projects(db, org, 4, minutes=1)
+
+    first = client.get("/projects", params={"limit": 2})
+    newer = Project(
+        organization_id=org.id, title="Newest", description="x",
+        created_at=BASE_TIME + timedelta(hours=1),
+    )
+    db.add(newer)
+    db.commit()
+
+    second = client.get(
+        "/projects", params={"limit": 2, "cursor": first.headers[CURSOR_HEADER]}
+    )
+
+    assert [p["id"] for p in second.json()] == [ids[1], ids[0]]
+
+
+@pytest.mark.parametrize("minutes", [1, None], ids=["distinct", "ties"])
+def test_deleted_anchor_does_not_end_the_listing(client, db, minutes):
+    org = create_user(db, f"anchor_{minutes}_org@test.com", "organization")
+    ids = create_projects(db, org, 5, minutes=minutes)
+    newest_first = sorted(ids, reverse=True) if minutes is None else list(reversed(ids))
+
+    first = client.get("/projects", params={"limit": 2})
+    assert [p["id"] for p in first.json()] == newest_first[:2]
+    db.delete(db.get(Project, newest_first[1]))
+    db.commit()
+
+    second = client.get(
+        "/projects", params={"limit": 2, "cursor": first.headers[CURSOR_HEADER]}
+    )
+
+    assert [p["id"] for p in second.json()] == newest_first[2:4]
+
+
+def test_search_filters_apply_with_cursor(client, db):
+    org = create_user(db, "filter_org@test.com", "organization")
+    ids = create_projects(db, org, 3, minutes=1)
+    create_projects(db, org, 2, minutes=1, status="closed")
+
+    pages = walk(client, "/projects", limit=2, search="python")
+
+    assert pages == [[ids[2], ids[1]], [ids[0]]]
+
+
+def test_offset_pagination_unchanged(client, db):
+    org = create_user(db, "offset_org@test.com", "organization")
+    ids = create_projects(db, org, 5, minutes=1)
+
+    response = client.get("/projects", params={"skip": 2, "limit": 2})
+
+    assert [p["id"] for p in response.json()] == [ids[2], ids[1]]
+
+
+def test_cursor_rejected_for_fulltext_search(client, db):
+    org = create_user(db, "fts_org@test.com", "organization")
+    create_projects(db, org, 1)
+
+    response = client.get(
+        "/projects",
+        params={"search": "python", "mode": "fulltext", "cursor": encode_cursor("projects", 1)},
+    )
+
+    assert response.status_code == 400
+
+
+# ---------------------------------------------------------------------------
+# Other listings
+# ---------------------------------------------------------------------------
+
+def test_my_projects_pages(client, db):
+    org = create_user(db, "mine_org@test.com", "organization")
+    other = create_user(db, "notmine_org@test.com", "organization")
+    ids = create_projects(db, org, 3, minutes=1)
+    create_projects(db, other, 2, minutes=1)
+    headers = get_auth_headers(org)
+
+    assert walk(client, "/projects/me", limit=2, headers=headers) == [[ids[2], ids[1]], [ids[0]]]
+
+    everything = client.get("/projects/me", headers=headers)
+    assert len(everything.json()) == 3
+    assert CURSOR_HEADER not in everything.headers
+
+
+def test_project_applications_pages(client, db):
+    org = create_user(db, "apps_org@test.com", "organization")
+    [project_id] = create_projects(db, org, 1)
+    app_ids = []
+    for i in range(3):
+        student = create_user(db, f"apps_student{i}@test.com", "student")
+        application = Application(
+            student_id=student.id, project_id=project_id,
+            created_at=BASE_TIME + timedelta(minutes=i),
+        )
+        db.add(application)
+        db.commit()
+        app_ids.append(application.id)
+
+    pages = walk(
+        client, f"/projects/{project_id}/applications", limit=2, headers=get_auth_headers(org)
+    )
+
+    assert pages == [[app_ids[2], app_ids[1]], [app_ids[0]]]
+
+
+def test_admin_projects_pages(client, db):
+    admin = create_user(db, "pages_admin@test.com", "admin")
+    org = create_user(db, "admin_pages_org@test.com", "organization")
+    ids = create_projects(db, org, 3, minutes=1)
+    db.get(Project, ids[2]).status = "disabled"
+    db.commit()
+    headers = get_auth_headers(admin)
+
+    assert walk(client, "/admin/projects", limit=2, headers=headers) == [[ids[2], ids[1]], [ids[0]]]
+    assert len(client.get("/admin/projects", headers=headers).json()) == 3
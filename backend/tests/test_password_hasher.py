@@ -0,0 +1,126 @@
+"""
+test_password_hasher.py
+=======================
+Tests for bcrypt in the password hasher's process pool
+(password_hasher.py) and its use by /auth/register and /auth/login.
+
+Covers:
+- Hash and verify round trip through the pool
+- Rejection past max_pending
+- Rehash on login when the stored hash uses another cost
+- 503 with Retry-After when the pool is saturated
+- Admin metrics endpoint
+"""
+
+import asyncio
+
+import pytest
+from passlib.context import CryptContext
+
+from app.models import User
+from app.utils.security import BCRYPT_ROUNDS, hash_password
+from app.core.auth import create_access_token
+from app.services.password_hasher import HasherBusy, PasswordHasher, password_hasher
+from tests.conftest import TestingSessionLocal
+
+
+@pytest.fixture
+def hasher():
+    hasher = PasswordHasher(workers=1, max_pending=4)
+    yield hasher
+    hasher.shutdown()
+
+
+@pytest.fixture
+def db(client):
+    # Closed after the test so its connection goes back to the pool
+    session = TestingSessionLocal()
+    yield session
+    session.close()
+
+
+def create_user(db, email, role, hashed_password):
+    user = User(email=email, hashed_password=hashed_password, role=role)
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+def test_hash_and_verify_in_pool(hasher):
+    async def round_trip():
+        hashed = await hasher.hash("s3cret")
+        return hashed, await hasher.verify_and_update("s3cret", hashed), await hasher.verify_and_update("wrong", hashed)
+
+    hashed, good, bad = asyncio.run(round_trip())
+
+    assert hashed.startswith(f"$2b${BCRYPT_ROUNDS:02d}$")
+    assert good == (True, None)
+    assert bad == (False, None)
+    assert hasher.stats()["completed"] == 3
+    assert hasher.stats()["pending"] == 0
+
+
+def test_requests_past_max_pending_are_rejected(hasher):
+    async def burst():
+        return await asyncio.gather(*(hasher.hash("pw") for _ in range(6)), return_exceptions=True)
+
+    results = asyncio.run(burst())
+
+    assert sum(isinstance(r, HasherBusy) for r in results) == 2
+    assert hasher.stats()["rejected"] == 2
+    assert hasher.stats()["peak_pending"] == 4
+
+
+def test_register_then_login(client):
+    client.post("/auth/register", json={"email": "pool@test.com", "password": "password123", "role": "student"})
+
+    response = client.post("/auth/login", json={"email": "pool@test.com", "password": "password123"})
+
+    assert response.status_code == 200
+    assert "access_token" in response.json()
+
+
+def test_login_rehashes_outdated_cost(client, db):
+    old_cost = CryptContext(schemes=["bcrypt"], bcrypt__rounds=BCRYPT_ROUNDS + 1)
+    user = create_user(db, "old@test.com", "student", old_cost.hash("password123"))
+
+    response = client.post("/auth/login", json={"email": "old@test.com", "password": "password123"})
+
+    assert response.status_code == 200
+    db.refresh(user)
+    assert user.hashed_password.startswith(f"$2b${BCRYPT_ROUNDS:02d}$")
+    # Still the same password
+    assert client.post("/auth/login", json={"email": "old@test.com", "password": "password123"}).status_code == 200
+
+
+def test_wrong_password_does_not_rehash(client, db):
+    old_cost = CryptContext(schemes=["bcrypt"], bcrypt__rounds=BCRYPT_ROUNDS + 1)
+    stored = old_cost.hash("password123")
+    user = create_user(db, "keep@test.com", "student", stored)
+
+    response = client.post("/auth/login", json={"email": "keep@test.com", "password": "nope"})
+
+    assert response.status_code == 401
+    db.refresh(user)
+    assert user.hashed_password == stored
+
+
+def test_saturated_hasher_answers_503(client, db, monkeypatch):
+    create_user(db, "busy@test.com", "student", hash_password("password123"))
+    monkeypatch.setattr(password_hasher, "max_pending", 0)
+
+    response = client.post("/auth/login", json={"email": "busy@test.com", "password": "password123"})
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_admin_can_read_hasher_metrics(client, db):
+    admin = create_user(db, "hash_admin@test.com", "admin", hash_password("password"))
+    token = create_access_token({"user_id": admin.id})
+
+    response = client.get("/admin/metrics/password-hasher", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 200
+    assert {"workers", "max_pending", "pending", "peak_pending", "completed", "rejected", "avg_ms"} <= set(response.json())
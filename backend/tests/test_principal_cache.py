@@ -0,0 +1,187 @@
+"""
+test_principal_cache.py
+=======================
+Tests for the authenticated-user cache behind get_current_user
+(principal_cache.py).
+
+Covers:
+- Hits, misses, LRU eviction, TTL expiry and stale-stamp puts
+- Repeat authenticated requests not querying the users table
+- Suspension taking effect at once through admin invalidation
+- Admin metrics endpoint
+"""
+
+import time
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.models import User, UserRole
+from app.utils.security import hash_password
+from app.core.auth import create_access_token
+from app.services.principal_cache import Principal, PrincipalCache, principal_cache
+from tests.conftest import TestingSessionLocal
+
+
+def get_auth_headers(user):
+    token = create_access_token({"user_id": user.id})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def db(client):
+    # Closed after the test so its connection goes back to the pool
+    session = TestingSessionLocal()
+    yield session
+    session.close()
+
+
+def create_user(db, email, role):
+    user = User(email=email, hashed_password=hash_password("password"), role=role)
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+class UserSelects:
+    """Counts statements reading the users table, on every engine."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().startswith("SELECT") and "FROM users" in statement:
+            self.count += 1
+
+    def __enter__(self):
+        event.listen(Engine, "before_cursor_execute", self)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(Engine, "before_cursor_execute", self)
+
+
+def principal(user_id, role=UserRole.student, is_active=True):
+    return Principal(id=user_id, role=role, is_active=is_active)
+
+
+# ── Cache unit tests ──────────────────────────────────────────────────────
+
+def test_miss_then_hit():
+    cache = PrincipalCache()
+
+    assert cache.get(1) is None
+    cache.put(principal(1), cache.stamp(1))
+
+    assert cache.get(1) == principal(1)
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_entries_expire_after_ttl():
+    cache = PrincipalCache(ttl_seconds=0.01)
+    cache.put(principal(1), cache.stamp(1))
+
+    time.sleep(0.02)
+
+    assert cache.get(1) is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = PrincipalCache(max_entries=2)
+    cache.put(principal(1), 0)
+    cache.put(principal(2), 0)
+    cache.get(1)
+    cache.put(principal(3), 0)
+
+    assert cache.get(2) is None
+    assert cache.get(1) is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_invalidate_drops_entry_and_rejects_stale_put():
+    cache = PrincipalCache()
+    stamp = cache.stamp(1)
+    cache.put(principal(1), stamp)
+
+    cache.invalidate_user(1)
+    # A lookup that started before the invalidation must not be cached
+    cache.put(principal(1), stamp)
+
+    assert cache.get(1) is None
+    cache.put(principal(1, is_active=False), cache.stamp(1))
+    assert cache.get(1).is_active is False
+
+
+# ── get_current_user ──────────────────────────────────────────────────────
+
+def test_repeat_requests_do_not_query_users(client, db):
+    org = create_user(db, "org@test.com", "organization")
+    headers = get_auth_headers(org)
+
+    with UserSelects() as first:
+        assert client.get("/projects/me", headers=headers).status_code == 200
+    with UserSelects() as repeat:
+        for _ in range(3):
+            assert client.get("/projects/me", headers=headers).status_code == 200
+
+    assert first.count == 1
+    assert repeat.count == 0
+
+
+def test_role_check_rejects_from_cache(client, db):
+    student = create_user(db, "student@test.com", "student")
+    headers = get_auth_headers(student)
+    client.get("/student/profile", headers=headers)
+
+    with UserSelects() as selects:
+        response = client.get("/projects/me", headers=headers)
+
+    assert response.status_code == 403
+    assert selects.count == 0
+
+
+def test_suspension_applies_immediately(client, db):
+    admin = create_user(db, "admin@test.com", "admin")
+    student = create_user(db, "student@test.com", "student")
+    headers = get_auth_headers(student)
+    assert client.get("/auth/protected", headers=headers).status_code == 200
+
+    response = client.put(
+        f"/admin/users/{student.id}/status",
+        params={"is_active": False},
+        headers=get_auth_headers(admin),
+    )
+    assert response.status_code == 200
+
+    response = client.get("/auth/protected", headers=headers)
+    assert response.status_code == 403
+    assert response.json()["detail"] == "Account suspended"
+
+    client.put(
+        f"/admin/users/{student.id}/status",
+        params={"is_active": True},
+        headers=get_auth_headers(admin),
+    )
+    assert client.get("/auth/protected", headers=headers).status_code == 200
+
+
+def test_deleted_user_is_not_found(client, db):
+    user = create_user(db, "gone@test.com", "student")
+    headers = get_auth_headers(user)
+    db.delete(user)
+    db.commit()
+
+    assert client.get("/auth/protected", headers=headers).status_code == 404
+
+
+def test_admin_can_read_principal_cache_metrics(client, db):
+    admin = create_user(db, "metrics_admin@test.com", "admin")
+
+    response = client.get("/admin/metrics/principal-cache", headers=get_auth_headers(admin))
+
+    assert response.status_code == 200
+    assert {"hits", "misses", "hit_rate", "evictions", "entries"} <= set(response.json())
+    assert principal_cache.stats()["entries"] == 1
@@ -0,0 +1,205 @@
+"""
+test_project_candidates.py
+==========================
+Tests for GET /projects/{id}/candidates (reverse matching).
+
+Covers:
+- Applicants ranked by match score, with application fields
+- scope=all ranks every active student with a profile
+- top_n slicing
+- Histories loaded in bulk (statement count independent of candidates)
+- Ownership / role / not-found errors
+"""
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.models import User, StudentProfile, Project, Application
+from app.utils.security import hash_password
+from app.core.auth import create_access_token
+from tests.conftest import TestingSessionLocal
+
+
+def get_auth_headers(user):
+    token = create_access_token({"user_id": user.id})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def db(client):
+    # Closed after the test so its connection goes back to the pool
+    session = TestingSessionLocal()
+    yield session
+    session.close()
+
+
+def create_user(db, email, role, is_active=True):
+    user = User(email=email, hashed_password=hash_password("password"), role=role, is_active=is_active)
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+def create_student(db, email, skills, **kwargs):
+    student = create_user(db, email, "student", **kwargs)
+    db.add(StudentProfile(
+        user_id=student.id,
+        university="Test University",
+        major="Computer Science",
+        graduation_year=2025,
+        skills=skills,
+        bio="Backend APIs",
+    ))
+    db.commit()
+    return student
+
+
+def create_project(db, org):
+    project = Project(
+        organization_id=org.id,
+        title="Backend API",
+        description="A Python and SQL backend project",
+        required_skills="python,sql",
+        duration="1 month",
+    )
+    db.add(project)
+    db.commit()
+    db.refresh(project)
+    return project
+
+
+def apply(db, student, project):
+    application = Application(student_id=student.id, project_id=project.id)
+    db.add(application)
+    db.commit()
+    db.refresh(application)
+    return application
+
+
+def candidates(client, org, project, **params):
+    return client.get(
+        f"/projects/{project.id}/candidates", params=params, headers=get_auth_headers(org)
+    )
+
+
+def test_applicants_ranked_by_match_score(client, db):
+    org = create_user(db, "cand_org@test.com", "organization")
+    project = create_project(db, org)
+    weak = create_student(db, "weak@test.com", "figma")
+    strong = create_student(db, "strong@test.com", "python,sql")
+    create_student(db, "bystander@test.com", "python,sql")
+    weak_app = apply(db, weak, project)
+    strong_app = apply(db, strong, project)
+
+    response = candidates(client, org, project)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [c["student_id"] for c in body] == [strong.id, weak.id]
+    assert [c["rank"] for c in body] == [1, 2]
+    assert body[0]["application_id"] == strong_app.id
+    assert body[1]["application_id"] == weak_app.id
+    assert body[0]["application_status"] == "pending"
+    assert body[0]["email"] == "strong@test.com"
+    assert body[0]["skill_score"] == 100.0
+
+
+def test_scope_all_ranks_every_active_student(client, db):
+    org = create_user(db, "all_org@test.com", "organization")
+    project = create_project(db, org)
+    applicant = create_student(db, "applicant@test.com", "figma")
+    other = create_student(db, "other@test.com", "python,sql")
+    create_student(db, "suspended@test.com", "python,sql", is_active=False)
+    create_user(db, "noprofile@test.com", "student")
+    apply(db, applicant, project)
+
+    body = candidates(client, org, project, scope="all").json()
+
+    assert [c["student_id"] for c in body] == [other.id, applicant.id]
+    assert body[0]["application_id"] is None
+    assert body[1]["application_status"] == "pending"
+
+
+def test_top_n_limits_candidates(client, db):
+    org = create_user(db, "topn_org@test.com", "organization")
+    project = create_project(db, org)
+    for i in range(3):
+        apply(db, create_student(db, f"topn{i}@test.com", "python"), project)
+
+    assert len(candidates(client, org, project, top_n=2).json()) == 2
+
+
+def test_histories_are_loaded_in_bulk(client, db):
+    org = create_user(db, "bulk_org@test.com", "organization")
+    project = create_project(db, org)
+
+    def count_statements():
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        # Every engine: the app's session may come from another conftest instance
+        headers = get_auth_headers(org)
+        url = f"/projects/{project.id}/candidates"
+        event.listen(Engine, "before_cursor_execute", record)
+        try:
+            response = client.get(url, headers=headers)
+            assert response.status_code == 200
+        finally:
+            event.remove(Engine, "before_cursor_execute", record)
+        return len(statements)
+
+    apply(db, create_student(db, "bulk0@test.com", "python"), project)
+    count_statements()  # warm the principal cache so both counts skip the user lookup
+    with_one = count_statements()
+    assert with_one > 0
+    for i in range(1, 6):
+        apply(db, create_student(db, f"bulk{i}@test.com", "python"), project)
+
+    assert count_statements() == with_one
+
+
+def test_no_applicants_returns_empty_list(client, db):
+    org = create_user(db, "empty_org@test.com", "organization")
+    project = create_project(db, org)
+
+    response = candidates(client, org, project)
+
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+def test_other_organization_forbidden(client, db):
+    owner = create_user(db, "owner_org@test.com", "organization")
+    intruder = create_user(db, "intruder_org@test.com", "organization")
+    project = create_project(db, owner)
+
+    assert candidates(client, intruder, project).status_code == 403
+
+
+def test_student_forbidden(client, db):
+    org = create_user(db, "role_org@test.com", "organization")
+    student = create_student(db, "role_student@test.com", "python")
+    project = create_project(db, org)
+
+    response = client.get(f"/projects/{project.id}/candidates", headers=get_auth_headers(student))
+
+    assert response.status_code == 403
+
+
+def test_missing_project_not_found(client, db):
+    org = create_user(db, "missing_org@test.com", "organization")
+
+    response = client.get("/projects/999/candidates", headers=get_auth_headers(org))
+
+    assert response.status_code == 404
+
+
+def test_invalid_scope_rejected(client, db):
+    org = create_user(db, "scope_org@test.com", "organization")
+    project = create_project(db, org)
+
+    assert candidates(client, org, project, scope="everyone").status_code == 422
@@ -0,0 +1,233 @@
+"""
+test_project_index.py
+=====================
+Tests for the in-process project feature index used by GET /recommendations.
+
+Covers:
+- Lazy build from the database (open projects only, ascending id order)
+- Incremental updates from the projects, applications and admin routers
+- Re-encoding only after the feature set changes
+- Age-based rebuild
+"""
+
+from app.models import User, StudentProfile, Project, Application, Deliverable
+from app.utils.security import hash_password
+from app.core.auth import create_access_token
+from app.services.project_index import ProjectFeatureIndex, project_index
+from tests.conftest import TestingSessionLocal
+
+
+def get_auth_headers(user):
+    token = create_access_token({"user_id": user.id})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def create_user(db, email, role):
+    user = User(email=email, hashed_password=hash_password("password"), role=role)
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+def create_profile(db, student):
+    profile = StudentProfile(
+        user_id=student.id,
+        university="Test University",
+        major="Computer Science",
+        graduation_year=2025,
+        skills="python,sql",
+        bio="Backend APIs",
+    )
+    db.add(profile)
+    db.commit()
+    return profile
+
+
+def create_project(db, org, title="Indexed", status="open"):
+    project = Project(
+        organization_id=org.id,
+        title=title,
+        description="A Python and SQL backend project",
+        required_skills="python,sql",
+        duration="1 month",
+        status=status,
+    )
+    db.add(project)
+    db.commit()
+    db.refresh(project)
+    return project
+
+
+def recommended_ids(client, student):
+    response = client.get("/recommendations", headers=get_auth_headers(student))
+    assert response.status_code == 200
+    return [item["project_id"] for item in response.json()]
+
+
+# ---------------------------------------------------------------------------
+# Index unit behaviour
+# ---------------------------------------------------------------------------
+
+def test_index_loads_only_open_projects_in_id_order(client):
+    db = TestingSessionLocal()
+    org = create_user(db, "idx_org@test.com", "organization")
+    p1 = create_project(db, org, title="First")
+    create_project(db, org, title="Closed", status="closed")
+    p3 = create_project(db, org, title="Third")
+
+    matrix = project_index.matrix(db)
+
+    assert matrix.project_ids == [p1.id, p3.id]
+    assert matrix.titles == ["First", "Third"]
+
+
+def test_matrix_is_reused_until_index_changes(client):
+    db = TestingSessionLocal()
+    org = create_user(db, "reuse_org@test.com", "organization")
+    project = create_project(db, org)
+
+    first = project_index.matrix(db)
+    assert project_index.matrix(db) is first
+
+    project_index.remove(project.id)
+    assert project_index.matrix(db) is not first
+    assert len(project_index.matrix(db)) == 0
+
+
+def test_upsert_before_first_build_is_deferred_to_load(client):
+    db = TestingSessionLocal()
+    org = create_user(db, "defer_org@test.com", "organization")
+    project = create_project(db, org)
+
+    project_index.upsert(project)
+
+    assert project_index.matrix(db).project_ids == [project.id]
+
+
+def test_upsert_of_non_open_project_removes_it(client):
+    db = TestingSessionLocal()
+    org = create_user(db, "upsert_org@test.com", "organization")
+    project = create_project(db, org)
+    project_index.matrix(db)
+
+    project.status = "closed"
+    project_index.upsert(project)
+
+    assert project.id not in project_index.matrix(db).project_ids
+
+
+def test_expired_index_reloads_from_database(client):
+    db = TestingSessionLocal()
+    org = create_user(db, "expire_org@test.com", "organization")
+    index = ProjectFeatureIndex(max_age_seconds=0)
+    index.matrix(db)
+
+    # Inserted behind the index's back (e.g. by another worker process)
+    project = create_project(db, org)
+
+    assert index.matrix(db).project_ids == [project.id]
+
+
+def test_added_at_tracks_projects_joining_the_index(client):
+    db = TestingSessionLocal()
+    try:
+        org = create_user(db, "added_org@test.com", "organization")
+        first = create_project(db, org, "First")
+        index = ProjectFeatureIndex(max_age_seconds=0)
+        assert index.added_at is None
+
+        index.matrix(db)
+        # First load: the newest open project's creation time
+        loaded = index.added_at
+        assert loaded.replace(tzinfo=None) == first.created_at.replace(tzinfo=None)
+
+        # Removals don't count; a project found new by a reload does
+        index.remove(first.id)
+        assert index.added_at == loaded
+        create_project(db, org, "Second")
+        index.matrix(db)
+        assert index.added_at > loaded
+    finally:
+        db.close()
+
+
+# ---------------------------------------------------------------------------
+# Router write paths keep the index current
+# ---------------------------------------------------------------------------
+
+def test_created_project_is_recommended(client):
+    db = TestingSessionLocal()
+    student = create_user(db, "idx_student@test.com", "student")
+    org = create_user(db, "idx_create_org@test.com", "organization")
+    create_profile(db, student)
+    create_project(db, org, title="Existing")
+
+    assert len(recommended_ids(client, student)) == 1
+
+    response = client.post(
+        "/projects",
+        json={"title": "New", "description": "Python work", "required_skills": "python"},
+        headers=get_auth_headers(org),
+    )
+    assert response.status_code == 201
+
+    assert response.json()["id"] in recommended_ids(client, student)
+
+
+def test_disabled_project_leaves_index(client):
+    db = TestingSessionLocal()
+    student = create_user(db, "dis_student@test.com", "student")
+    org = create_user(db, "dis_org@test.com", "organization")
+    admin = create_user(db, "dis_admin@test.com", "admin")
+    create_profile(db, student)
+    project = create_project(db, org)
+
+    assert recommended_ids(client, student) == [project.id]
+
+    response = client.delete(f"/admin/listings/{project.id}", headers=get_auth_headers(admin))
+    assert response.status_code == 200
+
+    assert recommended_ids(client, student) == []
+
+
+def test_accepted_application_closes_project_in_index(client):
+    db = TestingSessionLocal()
+    student = create_user(db, "acc_student@test.com", "student")
+    org = create_user(db, "acc_org@test.com", "organization")
+    create_profile(db, student)
+    project = create_project(db, org)
+    application = Application(student_id=student.id, project_id=project.id, status="pending")
+    db.add(application)
+    db.commit()
+
+    assert recommended_ids(client, student) == [project.id]
+
+    response = client.patch(
+        f"/applications/{application.id}/status",
+        json={"status": "accepted"},
+        headers=get_auth_headers(org),
+    )
+    assert response.status_code == 200
+
+    assert recommended_ids(client, student) == []
+
+
+def test_completed_project_leaves_index(client):
+    db = TestingSessionLocal()
+    student = create_user(db, "done_student@test.com", "student")
+    org = create_user(db, "done_org@test.com", "organization")
+    create_profile(db, student)
+    project = create_project(db, org)
+    application = Application(student_id=student.id, project_id=project.id, status="accepted")
+    db.add(application)
+    db.commit()
+    db.add(Deliverable(application_id=application.id, content="done", status="accepted"))
+    db.commit()
+
+    assert recommended_ids(client, student) == [project.id]
+
+    response = client.put(f"/projects/{project.id}/complete", headers=get_auth_headers(org))
+    assert response.status_code == 200
+
+    assert recommended_ids(client, student) == []
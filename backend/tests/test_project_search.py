@@ -0,0 +1,170 @@
+"""
+test_project_search.py
+======================
+Tests for full-text project search (project_search.py, GET /projects?mode=fulltext).
+
+Covers:
+- Matches in title, description and required skills; word prefixes
+- Every search word must match; closed / disabled projects excluded
+- Relevance ordering (title match ranks above description match)
+- Index kept in step with updates and deletes
+- FTS query syntax in user input treated as plain words
+- Keyword mode unchanged; unknown modes rejected
+- install_search_index() idempotent and indexing existing rows
+"""
+
+from sqlalchemy import text
+
+from app.models import Project, User
+from app.schemas.user import UserRole
+from app.services.project_search import install_search_index, search_words
+from tests.conftest import engine
+
+
+def create_org_user(db):
+    org = User(email="search_org@test.com", hashed_password="hashed", role=UserRole.organization)
+    db.add(org)
+    db.commit()
+    db.refresh(org)
+    return org
+
+
+def create_project(db, org, title, description="General work", skills=None, status="open"):
+    project = Project(
+        organization_id=org.id,
+        title=title,
+        description=description,
+        required_skills=skills,
+        status=status,
+    )
+    db.add(project)
+    db.commit()
+    db.refresh(project)
+    return project
+
+
+def fulltext(client, search, **params):
+    response = client.get("/projects", params={"search": search, "mode": "fulltext", **params})
+    assert response.status_code == 200
+    return [p["title"] for p in response.json()]
+
+
+def test_matches_title_description_and_skills(client, db_session):
+    org = create_org_user(db_session)
+    create_project(db_session, org, "Robotics Lab", skills="python,ros")
+    create_project(db_session, org, "Data Pipeline", description="Streaming with Kafka")
+    create_project(db_session, org, "Marketing Plan")
+
+    assert fulltext(client, "robotics") == ["Robotics Lab"]
+    assert fulltext(client, "kafka") == ["Data Pipeline"]
+    assert fulltext(client, "ros") == ["Robotics Lab"]
+
+
+def test_word_prefix_matches(client, db_session):
+    org = create_org_user(db_session)
+    create_project(db_session, org, "Python Tooling")
+
+    assert fulltext(client, "pyth") == ["Python Tooling"]
+
+
+def test_all_words_must_match(client, db_session):
+    org = create_org_user(db_session)
+    create_project(db_session, org, "Python API", skills="python,fastapi")
+    create_project(db_session, org, "Python Scripts", skills="python")
+
+    assert fulltext(client, "python fastapi") == ["Python API"]
+
+
+def test_only_open_projects_are_returned(client, db_session):
+    org = create_org_user(db_session)
+    create_project(db_session, org, "Open Python")
+    create_project(db_session, org, "Closed Python", status="closed")
+    create_project(db_session, org, "Disabled Python", status="disabled")
+
+    assert fulltext(client, "python") == ["Open Python"]
+
+
+def test_title_match_ranks_above_description_match(client, db_session):
+    org = create_org_user(db_session)
+    create_project(db_session, org, "Frontend Work", description="Some react components")
+    create_project(db_session, org, "React Dashboard", description="Charts and tables")
+
+    assert fulltext(client, "react") == ["React Dashboard", "Frontend Work"]
+
+
+def test_pagination_applies_after_ranking(client, db_session):
+    org = create_org_user(db_session)
+    create_project(db_session, org, "Frontend Work", description="Some react components")
+    create_project(db_session, org, "React Dashboard", description="Charts and tables")
+
+    assert fulltext(client, "react", skip=1, limit=1) == ["Frontend Work"]
+
+
+def test_updated_project_is_reindexed(client, db_session):
+    org = create_org_user(db_session)
+    project = create_project(db_session, org, "Golang Service")
+
+    project.title = "Rust Service"
+    db_session.commit()
+
+    assert fulltext(client, "golang") == []
+    assert fulltext(client, "rust") == ["Rust Service"]
+
+
+def test_deleted_project_is_removed_from_index(client, db_session):
+    org = create_org_user(db_session)
+    project = create_project(db_session, org, "Temporary Listing")
+
+    db_session.delete(project)
+    db_session.commit()
+
+    assert fulltext(client, "temporary") == []
+
+
+def test_query_syntax_is_treated_as_words(client, db_session):
+    org = create_org_user(db_session)
+    create_project(db_session, org, "Python OR Java", skills="python")
+
+    assert fulltext(client, 'python OR "java') == ["Python OR Java"]
+    assert fulltext(client, "(python* -java:") == ["Python OR Java"]
+    assert search_words('c++ "data"*') == ["c", "data"]
+
+
+def test_search_without_words_returns_all_open(client, db_session):
+    org = create_org_user(db_session)
+    create_project(db_session, org, "One")
+    create_project(db_session, org, "Two")
+
+    assert len(fulltext(client, "*** ---")) == 2
+
+
+def test_keyword_mode_still_matches_substrings(client, db_session):
+    org = create_org_user(db_session)
+    create_project(db_session, org, "Microservices", skills="python")
+
+    response = client.get("/projects", params={"search": "service"})
+
+    assert [p["title"] for p in response.json()] == ["Microservices"]
+
+
+def test_unknown_mode_rejected(client):
+    response = client.get("/projects", params={"search": "python", "mode": "regex"})
+
+    assert response.status_code == 422
+
+
+def test_install_indexes_existing_projects_and_is_idempotent(client, db_session):
+    org = create_org_user(db_session)
+    create_project(db_session, org, "Legacy Listing")
+
+    # A database created before the index existed
+    with engine.begin() as connection:
+        connection.execute(text("DROP TABLE projects_fts"))
+        for trigger in ("projects_fts_ai", "projects_fts_ad", "projects_fts_au"):
+            connection.execute(text(f"DROP TRIGGER {trigger}"))
+
+    with engine.begin() as connection:
+        install_search_index(connection)
+        install_search_index(connection)
+
+    assert fulltext(client, "legacy") == ["Legacy Listing"]
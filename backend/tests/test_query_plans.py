@@ -0,0 +1,223 @@
+"""
+test_query_plans.py
+===================
+Asserts that the hot router queries are served by indexes.
+
+Each test calls an endpoint, records every statement it sends to the
+database, and runs EXPLAIN QUERY PLAN on them with the same parameters.
+A plan step of the bare form "SCAN <table>" is a full table scan; steps
+that walk an index ("SCAN t USING INDEX ...") or look rows up
+("SEARCH t USING ...") pass. Newest-first listings must also come out
+of the index already ordered, without a temporary sort.
+
+Covers:
+- GET /projects (open listing), /projects/me, /projects/{id}/applications
+- GET /applications/me and the accept-application status update
+- GET /notifications, its unread_only listing and /notifications/unread-count
+- The bulk read / archive / delete notification operations
+- GET /projects/{id}/messages
+- GET /feedback/{project_id}
+- GET /analytics/student (aggregate metrics fallback) and /analytics/organization
+"""
+
+import re
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.models import Application, Feedback, Notification, Project, ProjectMessage, User
+from app.utils.security import hash_password
+from app.core.auth import create_access_token
+from tests.conftest import TestingSessionLocal
+
+
+FULL_SCAN = re.compile(r"^SCAN \S+$")
+SORT = "USE TEMP B-TREE FOR ORDER BY"
+
+
+def get_auth_headers(user):
+    token = create_access_token({"user_id": user.id})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def db(client):
+    # Closed after the test so its connection goes back to the pool
+    session = TestingSessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def world(db):
+    """An organization with two projects, two applicants, messages, feedback and notifications."""
+    org = User(email="plan_org@test.com", hashed_password=hash_password("password"), role="organization")
+    students = [
+        User(email=f"plan_student{i}@test.com", hashed_password=hash_password("password"), role="student")
+        for i in range(2)
+    ]
+    db.add_all([org, *students])
+    db.commit()
+
+    projects = [
+        Project(organization_id=org.id, title=f"Plan {i}", description="Python work", status=status)
+        for i, status in enumerate(["open", "completed"])
+    ]
+    db.add_all(projects)
+    db.commit()
+
+    applications = [Application(student_id=s.id, project_id=projects[0].id) for s in students]
+    applications.append(
+        Application(student_id=students[0].id, project_id=projects[1].id, status="accepted")
+    )
+    db.add_all(applications)
+    db.add_all([
+        ProjectMessage(project_id=projects[1].id, sender_id=org.id, content="Hello"),
+        Feedback(user_id=students[0].id, project_id=projects[1].id, rating=5),
+        Notification(recipient_id=students[0].id, message="Welcome"),
+    ])
+    db.commit()
+
+    return {"org": org, "students": students, "projects": projects, "applications": applications}
+
+
+def query_plan(client, db, method, path, user, **kwargs):
+    """EXPLAIN QUERY PLAN steps of every statement the request ran."""
+    headers = get_auth_headers(user)
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+            statements.append((statement, parameters))
+
+    # Every engine: the app's session may come from another conftest instance
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        response = client.request(method, path, headers=headers, **kwargs)
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+    assert response.status_code == 200, response.text
+    assert statements
+
+    raw = db.get_bind().raw_connection()
+    try:
+        cursor = raw.cursor()
+        return [
+            row[-1]
+            for statement, parameters in statements
+            for row in cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        ]
+    finally:
+        raw.close()
+
+
+def full_scans(steps):
+    return [step for step in steps if FULL_SCAN.match(step)]
+
+
+def test_open_project_listing(client, db, world):
+    steps = query_plan(client, db, "GET", "/projects", world["students"][0])
+
+    assert full_scans(steps) == []
+    assert SORT not in steps
+    assert any("ix_projects_open_created_at_id" in step for step in steps)
+
+
+def test_keyword_search_listing(client, db, world):
+    steps = query_plan(client, db, "GET", "/projects?search=python", world["students"][0])
+
+    assert full_scans(steps) == []
+
+
+def test_my_projects(client, db, world):
+    steps = query_plan(client, db, "GET", "/projects/me?limit=10", world["org"])
+
+    assert full_scans(steps) == []
+    assert SORT not in steps
+
+
+def test_project_applications(client, db, world):
+    project = world["projects"][0]
+
+    steps = query_plan(client, db, "GET", f"/projects/{project.id}/applications", world["org"])
+
+    assert full_scans(steps) == []
+    assert SORT not in steps
+
+
+def test_my_applications(client, db, world):
+    steps = query_plan(client, db, "GET", "/applications/me", world["students"][0])
+
+    assert full_scans(steps) == []
+
+
+def test_accept_application(client, db, world):
+    application = world["applications"][1]
+
+    steps = query_plan(
+        client, db, "PATCH", f"/applications/{application.id}/status",
+        world["org"], json={"status": "accepted"},
+    )
+
+    assert full_scans(steps) == []
+
+
+def test_notifications(client, db, world):
+    steps = query_plan(client, db, "GET", "/notifications", world["students"][0])
+
+    assert full_scans(steps) == []
+    assert SORT not in steps
+
+
+def test_unread_notifications(client, db, world):
+    steps = query_plan(client, db, "GET", "/notifications?unread_only=true&limit=10", world["students"][0])
+
+    assert full_scans(steps) == []
+    assert SORT not in steps
+
+
+def test_unread_count(client, db, world):
+    steps = query_plan(client, db, "GET", "/notifications/unread-count", world["students"][0])
+
+    assert full_scans(steps) == []
+    assert not any("notifications" in step for step in steps)
+
+
+@pytest.mark.parametrize("operation", ["read", "archive", "delete"])
+def test_bulk_notification_watermark(client, db, world, operation):
+    student = world["students"][0]
+    newest = db.query(Notification.id).filter(Notification.recipient_id == student.id).scalar()
+
+    steps = query_plan(client, db, "POST", f"/notifications/{operation}", student, json={"up_to_id": newest})
+
+    assert full_scans(steps) == []
+
+
+def test_project_messages(client, db, world):
+    project = world["projects"][1]
+
+    steps = query_plan(client, db, "GET", f"/projects/{project.id}/messages", world["org"])
+
+    assert full_scans(steps) == []
+    assert SORT not in steps
+
+
+def test_project_feedback(client, db, world):
+    project = world["projects"][1]
+
+    steps = query_plan(client, db, "GET", f"/feedback/{project.id}", world["org"])
+
+    assert full_scans(steps) == []
+
+
+def test_student_analytics(client, db, world):
+    steps = query_plan(client, db, "GET", "/analytics/student", world["students"][0])
+
+    assert full_scans(steps) == []
+
+
+def test_organization_analytics(client, db, world):
+    steps = query_plan(client, db, "GET", "/analytics/organization", world["org"])
+
+    assert full_scans(steps) == []
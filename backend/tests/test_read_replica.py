@@ -0,0 +1,203 @@
+"""
+test_read_replica.py
+====================
+Tests for the connection pool settings and read-replica routing
+(database.py: engine_options, get_read_db).
+
+Covers:
+- Pool and statement-timeout options per backend and driver
+- Read-only endpoints wired to get_read_db, writes to get_db
+- Two SQLite files standing in for primary and replica
+- Recommendations read the student's own data from the primary
+- Writes through a read session rejected
+"""
+
+import pytest
+from fastapi.routing import APIRoute
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import database
+from app.database import ReadSessionLocal, engine_options, get_db, get_read_db
+from app.main import app
+from app.models import Base, Project, StudentProfile, User
+from app.utils.security import hash_password
+from app.core.auth import create_access_token
+from tests.conftest import TestingSessionLocal
+
+
+READ_ENDPOINTS = [
+    ("GET", "/projects"),
+    ("GET", "/projects/{project_id}/candidates"),
+    ("GET", "/recommendations"),
+    ("GET", "/analytics/student"),
+    ("GET", "/analytics/organization"),
+    ("GET", "/admin/projects"),
+    ("GET", "/admin/logs"),
+    ("GET", "/admin/users"),
+]
+
+
+def route_dependencies(method, path):
+    def walk(dependant):
+        for dependency in dependant.dependencies:
+            yield dependency.call
+            yield from walk(dependency)
+
+    for route in app.routes:
+        if isinstance(route, APIRoute) and route.path == path and method in route.methods:
+            return set(walk(route.dependant))
+    raise AssertionError(f"no route {method} {path}")
+
+
+# ── Pool options ──────────────────────────────────────────────────────────
+
+def test_pool_options_from_settings(monkeypatch):
+    monkeypatch.setattr(database, "DB_POOL_SIZE", 20)
+    monkeypatch.setattr(database, "DB_MAX_OVERFLOW", 5)
+    monkeypatch.setattr(database, "DB_POOL_RECYCLE", 600)
+    monkeypatch.setattr(database, "DB_POOL_PRE_PING", False)
+
+    options = engine_options("postgresql+psycopg2://app@db/micromatch")
+
+    assert options["pool_size"] == 20
+    assert options["max_overflow"] == 5
+    assert options["pool_recycle"] == 600
+    assert options["pool_pre_ping"] is False
+    assert "connect_args" not in options
+
+
+def test_statement_timeout_per_driver(monkeypatch):
+    monkeypatch.setattr(database, "DB_STATEMENT_TIMEOUT_MS", 2500)
+
+    sync = engine_options("postgresql+psycopg2://app@db/micromatch")
+    async_ = engine_options("postgresql+asyncpg://app@db/micromatch")
+
+    assert sync["connect_args"] == {"options": "-c statement_timeout=2500"}
+    assert async_["connect_args"] == {"server_settings": {"statement_timeout": "2500"}}
+    assert "connect_args" not in engine_options("sqlite:///./app.db")
+
+
+def test_in_memory_sqlite_gets_no_pool_sizing():
+    assert "pool_size" not in engine_options("sqlite://")
+    # The options are accepted as-is by create_engine
+    create_engine("sqlite://", **engine_options("sqlite://")).dispose()
+    create_engine("sqlite:///./unused.db", **engine_options("sqlite:///./unused.db")).dispose()
+
+
+# ── Routing ───────────────────────────────────────────────────────────────
+
+@pytest.mark.parametrize("method,path", READ_ENDPOINTS)
+def test_read_endpoints_use_read_session(method, path):
+    dependencies = route_dependencies(method, path)
+
+    assert get_read_db in dependencies
+
+
+@pytest.mark.parametrize("method,path", [
+    ("POST", "/projects"),
+    ("GET", "/projects/me"),
+    ("GET", "/notifications"),
+    ("PUT", "/admin/users/{user_id}/status"),
+])
+def test_writes_and_own_listings_stay_on_primary(method, path):
+    # Owners reading back their own writes must not see replica lag
+    dependencies = route_dependencies(method, path)
+
+    assert get_db in dependencies
+    assert get_read_db not in dependencies
+
+
+@pytest.fixture
+def replica(client, tmp_path):
+    """A second SQLite file serving get_read_db, with one project of its own."""
+    replica_engine = create_engine(f"sqlite:///{tmp_path / 'replica.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=replica_engine)
+    ReplicaSession = sessionmaker(bind=replica_engine)
+
+    with ReplicaSession() as db:
+        org = User(email="replica_org@test.com", hashed_password="x", role="organization")
+        db.add(org)
+        db.flush()
+        db.add(Project(organization_id=org.id, title="Replicated", description="d", status="open"))
+        db.commit()
+
+    def replica_db():
+        db = ReplicaSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_read_db] = replica_db
+    yield ReplicaSession
+    replica_engine.dispose()
+
+
+def test_listing_reads_replica_while_writes_go_to_primary(client, replica):
+    db = TestingSessionLocal()
+    try:
+        org = User(email="primary_org@test.com", hashed_password=hash_password("password"), role="organization")
+        db.add(org)
+        db.commit()
+        headers = {"Authorization": f"Bearer {create_access_token({'user_id': org.id})}"}
+    finally:
+        db.close()
+
+    created = client.post("/projects", json={"title": "On primary", "description": "d"}, headers=headers)
+    assert created.status_code == 201
+
+    assert [p["title"] for p in client.get("/projects").json()] == ["Replicated"]
+    assert [p["title"] for p in client.get("/projects/me", headers=headers).json()] == ["On primary"]
+
+
+def test_recommendations_see_the_students_own_profile_edit(client, replica):
+    def profile(user_id, skills):
+        return StudentProfile(
+            user_id=user_id, university="U", major="Computer Science",
+            graduation_year=2025, skills=skills, bio="",
+        )
+
+    db = TestingSessionLocal()
+    try:
+        student = User(email="primary_student@test.com", hashed_password=hash_password("password"), role="student")
+        db.add(student)
+        db.flush()
+        db.add(profile(student.id, "figma"))
+        db.commit()
+        student_id = student.id
+        headers = {"Authorization": f"Bearer {create_access_token({'user_id': student_id})}"}
+    finally:
+        db.close()
+
+    # The replica has the project, and the profile as it was before the edit
+    with replica() as replica_db:
+        replica_db.add(profile(student_id, "figma"))
+        replica_db.add(Project(
+            organization_id=1, title="Backend", description="APIs", required_skills="python,sql", status="open",
+        ))
+        replica_db.commit()
+
+    def skill_score():
+        response = client.get("/recommendations", headers=headers)
+        assert response.status_code == 200
+        return {r["title"]: r["skill_score"] for r in response.json()}["Backend"]
+
+    before = skill_score()
+    edited = client.put("/student/profile", json={"skills": "python,sql"}, headers=headers)
+    assert edited.status_code == 200
+
+    assert skill_score() > before
+    # ...and so is the ranking cached from it
+    assert skill_score() > before
+
+
+def test_read_session_rejects_writes():
+    db = ReadSessionLocal()
+    try:
+        db.add(User(email="nope@test.com", hashed_password="x", role="student"))
+        with pytest.raises(RuntimeError, match="Read-only session"):
+            db.flush()
+    finally:
+        db.rollback()
+        db.close()
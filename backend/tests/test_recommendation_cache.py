@@ -0,0 +1,286 @@
+"""
+test_recommendation_cache.py
+============================
+Tests for the per-student recommendation cache (recommendation_cache.py).
+
+Covers:
+- Hits, misses, LRU eviction and TTL expiry
+- Stamps: profile version and project epoch
+- Repeat GET /recommendations served from the cache
+- Invalidation by profile edits, history changes and project changes
+- Admin metrics endpoint
+"""
+
+import pytest
+
+from app.models import User, StudentProfile, Project, Application
+from app.utils.security import hash_password
+from app.core.auth import create_access_token
+from app.services.batch_scoring import ProjectMatrix
+from app.services.project_index import project_index
+from app.services.recommendation_cache import RecommendationCache, recommendation_cache
+from tests.conftest import TestingSessionLocal
+
+
+def get_auth_headers(user):
+    token = create_access_token({"user_id": user.id})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def db(client):
+    # Closed after the test so its connection goes back to the pool
+    session = TestingSessionLocal()
+    yield session
+    session.close()
+
+
+def create_user(db, email, role):
+    user = User(email=email, hashed_password=hash_password("password"), role=role)
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+def create_profile(db, student, skills="python,sql"):
+    profile = StudentProfile(
+        user_id=student.id,
+        university="Test University",
+        major="Computer Science",
+        graduation_year=2025,
+        skills=skills,
+        bio="Backend APIs",
+    )
+    db.add(profile)
+    db.commit()
+    return profile
+
+
+def create_project(db, org, title="Cached", skills="python,sql"):
+    project = Project(
+        organization_id=org.id,
+        title=title,
+        description="A Python and SQL backend project",
+        required_skills=skills,
+        duration="1 month",
+        status="open",
+    )
+    db.add(project)
+    db.commit()
+    db.refresh(project)
+    return project
+
+
+def setup_student(db, prefix):
+    student = create_user(db, f"{prefix}_student@test.com", "student")
+    org = create_user(db, f"{prefix}_org@test.com", "organization")
+    create_profile(db, student)
+    project = create_project(db, org)
+    return student, org, project
+
+
+def recommend(client, student, **params):
+    response = client.get("/recommendations", params=params, headers=get_auth_headers(student))
+    assert response.status_code == 200
+    return response.json()
+
+
+# ---------------------------------------------------------------------------
+# Cache unit behaviour
+# ---------------------------------------------------------------------------
+
+def test_hit_after_put_and_miss_counters():
+    cache = RecommendationCache(ttl_seconds=60, max_entries=10)
+    stamp = cache.stamp(1, project_epoch=1)
+
+    assert cache.get(1, None, stamp) is None
+    cache.put(1, None, stamp, ["ranked"])
+
+    assert cache.get(1, None, stamp) == ["ranked"]
+    assert cache.get(1, 5, stamp) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_new_project_epoch_is_a_miss():
+    cache = RecommendationCache(ttl_seconds=60, max_entries=10)
+    cache.put(1, None, cache.stamp(1, 1), ["old"])
+
+    assert cache.get(1, None, cache.stamp(1, 2)) is None
+
+
+def test_invalidated_student_is_a_miss():
+    cache = RecommendationCache(ttl_seconds=60, max_entries=10)
+    cache.put(1, None, cache.stamp(1, 1), ["one"])
+    cache.put(2, None, cache.stamp(2, 1), ["two"])
+
+    cache.invalidate_student(1)
+
+    assert cache.get(1, None, cache.stamp(1, 1)) is None
+    assert cache.get(2, None, cache.stamp(2, 1)) == ["two"]
+
+
+def test_put_with_superseded_stamp_is_dropped():
+    cache = RecommendationCache(ttl_seconds=60, max_entries=10)
+    stamp = cache.stamp(1, 1)
+
+    # Profile changed while the ranking was being computed
+    cache.invalidate_student(1)
+    cache.put(1, None, stamp, ["stale"])
+
+    assert cache.stats()["entries"] == 0
+
+
+def test_expired_entry_is_a_miss():
+    cache = RecommendationCache(ttl_seconds=0, max_entries=10)
+    stamp = cache.stamp(1, 1)
+    cache.put(1, None, stamp, ["ranked"])
+
+    assert cache.get(1, None, stamp) is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = RecommendationCache(ttl_seconds=60, max_entries=2)
+    for sid in (1, 2):
+        cache.put(sid, None, cache.stamp(sid, 1), [sid])
+    cache.get(1, None, cache.stamp(1, 1))
+
+    cache.put(3, None, cache.stamp(3, 1), [3])
+
+    assert cache.get(2, None, cache.stamp(2, 1)) is None
+    assert cache.get(1, None, cache.stamp(1, 1)) == [1]
+    assert cache.stats()["evictions"] == 1
+
+
+# ---------------------------------------------------------------------------
+# GET /recommendations integration
+# ---------------------------------------------------------------------------
+
+def test_repeat_request_is_served_from_cache(client, db):
+    student, _, _ = setup_student(db, "repeat")
+
+    first = recommend(client, student)
+    second = recommend(client, student)
+
+    assert first == second
+    assert recommendation_cache.stats()["hits"] == 1
+    assert recommendation_cache.stats()["misses"] == 1
+
+
+def test_profile_update_invalidates(client, db):
+    student, _, _ = setup_student(db, "profile")
+    before = recommend(client, student)[0]["skill_score"]
+
+    response = client.put(
+        "/student/profile", json={"skills": "figma"}, headers=get_auth_headers(student)
+    )
+    assert response.status_code == 200
+
+    assert recommend(client, student)[0]["skill_score"] < before
+
+
+def test_application_invalidates(client, db):
+    student, _, project = setup_student(db, "apply")
+    before = recommend(client, student)[0]["activity_score"]
+
+    response = client.post(
+        "/applications", json={"project_id": project.id}, headers=get_auth_headers(student)
+    )
+    assert response.status_code == 201
+
+    assert recommend(client, student)[0]["activity_score"] > before
+
+
+def test_new_project_invalidates(client, db):
+    student, org, _ = setup_student(db, "newproj")
+    assert len(recommend(client, student)) == 1
+
+    epoch = project_index.epoch
+    response = client.post(
+        "/projects",
+        json={"title": "Another", "description": "Python", "required_skills": "python"},
+        headers=get_auth_headers(org),
+    )
+    assert response.status_code == 201
+    assert project_index.epoch > epoch
+
+    assert len(recommend(client, student)) == 2
+
+
+def test_disabled_project_invalidates(client, db):
+    student, _, project = setup_student(db, "disable")
+    admin = create_user(db, "disable_admin@test.com", "admin")
+    assert len(recommend(client, student)) == 1
+
+    client.delete(f"/admin/listings/{project.id}", headers=get_auth_headers(admin))
+
+    assert recommend(client, student) == []
+
+
+def test_disabled_completed_project_invalidates_its_students(client, db):
+    student, org, _ = setup_student(db, "disable_done")
+    admin = create_user(db, "disable_done_admin@test.com", "admin")
+    completed = create_project(db, org, title="Done")
+    completed.status = "completed"
+    db.add(Application(student_id=student.id, project_id=completed.id, status="accepted"))
+    db.commit()
+    before = recommend(client, student)[0]["success_score"]
+
+    response = client.delete(f"/admin/listings/{completed.id}", headers=get_auth_headers(admin))
+    assert response.status_code == 200
+
+    assert recommend(client, student)[0]["success_score"] < before
+
+
+def test_project_closed_while_ranking_is_not_cached_as_current(client, db, monkeypatch):
+    student, org, project = setup_student(db, "race")
+    create_project(db, org, title="Still open")
+    project_index.clear()
+    length = ProjectMatrix.__len__
+    closed = []
+
+    def close_once(matrix):
+        # The project closes right after the request has read the matrix
+        if not closed:
+            closed.append(project.id)
+            project_index.remove(project.id)
+        return length(matrix)
+
+    monkeypatch.setattr(ProjectMatrix, "__len__", close_once)
+    assert len(recommend(client, student)) == 2
+
+    assert [r["title"] for r in recommend(client, student)] == ["Still open"]
+
+
+def test_top_n_variants_are_cached_separately(client, db):
+    student, org, _ = setup_student(db, "topn")
+    create_project(db, org, title="Second")
+    project_index.clear()
+
+    assert len(recommend(client, student, top_n=1)) == 1
+    assert len(recommend(client, student)) == 2
+    assert recommendation_cache.stats()["entries"] == 2
+
+
+def test_admin_can_read_cache_metrics(client, db):
+    student, _, _ = setup_student(db, "metrics")
+    admin = create_user(db, "metrics_admin@test.com", "admin")
+    recommend(client, student)
+    recommend(client, student)
+
+    response = client.get("/admin/metrics/recommendation-cache", headers=get_auth_headers(admin))
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["hits"] == 1
+    assert body["misses"] == 1
+    assert body["hit_rate"] == 0.5
+
+
+def test_cache_metrics_require_admin(client, db):
+    student, _, _ = setup_student(db, "noadmin")
+
+    response = client.get("/admin/metrics/recommendation-cache", headers=get_auth_headers(student))
+
+    assert response.status_code == 403
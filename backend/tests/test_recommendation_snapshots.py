@@ -0,0 +1,276 @@
+"""
+test_recommendation_snapshots.py
+================================
+Tests for the recommendation precompute job and snapshot serving
+(recommendation_snapshots.py).
+
+Covers:
+- Snapshot rows match live rankings, in-process and with a process pool
+- GET /recommendations serves snapshots only when enabled
+- Closed projects dropped, stale / truncated snapshots fall back
+- Snapshots older than the newest open project fall back, including
+  one opened while the job ran
+- Profile edits and history changes discard the snapshot
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.models import User, StudentProfile, Project, RecommendationSnapshot
+from app.utils.security import hash_password
+from app.core.auth import create_access_token
+from app.services import recommendation_snapshots
+from app.services.project_index import ProjectFeatureIndex
+from app.services.recommendation_snapshots import precompute_recommendations
+from tests.conftest import TestingSessionLocal
+
+
+def get_auth_headers(user):
+    token = create_access_token({"user_id": user.id})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def db(client):
+    # Closed after the test so its connection goes back to the pool
+    session = TestingSessionLocal()
+    yield session
+    session.close()
+
+
+def create_user(db, email, role):
+    user = User(email=email, hashed_password=hash_password("password"), role=role)
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+def create_profile(db, student, skills):
+    db.add(StudentProfile(
+        user_id=student.id,
+        university="Test University",
+        major="Computer Science",
+        graduation_year=2025,
+        skills=skills,
+        bio="I build backend APIs and dashboards",
+    ))
+    db.commit()
+
+
+def create_project(db, org, title, skills, status="open"):
+    project = Project(
+        organization_id=org.id,
+        title=title,
+        description=f"{title} project using {skills}",
+        required_skills=skills,
+        duration="1 month",
+        status=status,
+    )
+    db.add(project)
+    db.commit()
+    db.refresh(project)
+    return project
+
+
+def build_catalog(db):
+    org = create_user(db, "snap_org@test.com", "organization")
+    students = []
+    for i, skills in enumerate(["python,sql", "react,css", "figma", "python,docker", ""]):
+        student = create_user(db, f"snap_student{i}@test.com", "student")
+        create_profile(db, student, skills)
+        students.append(student)
+    projects = [
+        create_project(db, org, "Backend API", "python,sql"),
+        create_project(db, org, "Web Dashboard", "react,css"),
+        create_project(db, org, "Design System", "figma"),
+        create_project(db, org, "Infra", "docker,python"),
+        create_project(db, org, "Archived", "python", status="closed"),
+    ]
+    return students, projects
+
+
+def snapshot(db, student):
+    rows = (
+        db.query(RecommendationSnapshot)
+        .filter_by(student_id=student.id)
+        .order_by(RecommendationSnapshot.rank)
+        .all()
+    )
+    return [(r.project_id, r.match_score, r.rank) for r in rows]
+
+
+def live(client, student, **params):
+    response = client.get("/recommendations", params=params, headers=get_auth_headers(student))
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.fixture
+def snapshots_enabled(monkeypatch):
+    monkeypatch.setattr(recommendation_snapshots, "RECOMMENDATION_SNAPSHOTS_ENABLED", True)
+
+
+# ---------------------------------------------------------------------------
+# Precompute job
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_precompute_matches_live_rankings(client, db, workers):
+    students, _ = build_catalog(db)
+
+    count = precompute_recommendations(db, workers=workers, shard_size=2)
+
+    assert count == len(students)
+    for student in students:
+        expected = [(r["project_id"], r["match_score"], r["rank"]) for r in live(client, student)]
+        assert snapshot(db, student) == expected
+
+
+def test_precompute_replaces_previous_rows(client, db):
+    students, projects = build_catalog(db)
+    precompute_recommendations(db, workers=1)
+
+    projects[0].status = "closed"
+    db.commit()
+    precompute_recommendations(db, workers=1)
+
+    ids = [project_id for project_id, _, _ in snapshot(db, students[0])]
+    assert projects[0].id not in ids
+    assert len(ids) == 3
+
+
+def test_precompute_truncates_to_depth(client, db):
+    students, _ = build_catalog(db)
+
+    precompute_recommendations(db, workers=1, depth=2)
+
+    rows = db.query(RecommendationSnapshot).filter_by(student_id=students[0].id).all()
+    assert len(rows) == 2
+    assert not rows[0].complete
+
+
+# ---------------------------------------------------------------------------
+# Serving
+# ---------------------------------------------------------------------------
+
+def mark_snapshot(db, student, match_score=99.5):
+    db.query(RecommendationSnapshot).filter_by(student_id=student.id, rank=1).update(
+        {"match_score": match_score}
+    )
+    db.commit()
+
+
+def test_snapshot_served_when_enabled(client, db, snapshots_enabled):
+    students, _ = build_catalog(db)
+    precompute_recommendations(db, workers=1)
+    mark_snapshot(db, students[0])
+
+    assert live(client, students[0])[0]["match_score"] == 99.5
+
+
+def test_snapshot_ignored_by_default(client, db):
+    students, _ = build_catalog(db)
+    precompute_recommendations(db, workers=1)
+    mark_snapshot(db, students[0])
+
+    assert live(client, students[0])[0]["match_score"] != 99.5
+
+
+def test_closed_projects_are_dropped_and_reranked(client, db, snapshots_enabled):
+    students, _ = build_catalog(db)
+    precompute_recommendations(db, workers=1)
+    top = snapshot(db, students[0])[0][0]
+    mark_snapshot(db, students[0])
+
+    admin = create_user(db, "snap_admin@test.com", "admin")
+    client.delete(f"/admin/listings/{top}", headers=get_auth_headers(admin))
+
+    result = live(client, students[0])
+    assert top not in [r["project_id"] for r in result]
+    assert [r["rank"] for r in result] == [1, 2, 3]
+
+
+def test_stale_snapshot_falls_back_to_live(client, db, snapshots_enabled):
+    students, _ = build_catalog(db)
+    precompute_recommendations(db, workers=1)
+    mark_snapshot(db, students[0])
+    db.query(RecommendationSnapshot).update(
+        {"generated_at": datetime.now(timezone.utc) - timedelta(days=1)}
+    )
+    db.commit()
+
+    assert live(client, students[0])[0]["match_score"] != 99.5
+
+
+def test_truncated_snapshot_only_serves_covered_top_n(client, db, snapshots_enabled):
+    students, _ = build_catalog(db)
+    precompute_recommendations(db, workers=1, depth=2)
+    mark_snapshot(db, students[0])
+
+    assert live(client, students[0], top_n=2)[0]["match_score"] == 99.5
+    assert len(live(client, students[0], top_n=3)) == 3
+    assert len(live(client, students[0])) == 4
+
+
+def test_profile_update_discards_snapshot(client, db, snapshots_enabled):
+    students, _ = build_catalog(db)
+    precompute_recommendations(db, workers=1)
+
+    response = client.put(
+        "/student/profile", json={"skills": "figma"}, headers=get_auth_headers(students[0])
+    )
+    assert response.status_code == 200
+
+    assert snapshot(db, students[0]) == []
+    assert snapshot(db, students[1]) != []
+
+
+def test_snapshot_older_than_a_new_project_falls_back(client, db, snapshots_enabled):
+    students, _ = build_catalog(db)
+    precompute_recommendations(db, workers=1)
+    mark_snapshot(db, students[0])
+    assert live(client, students[0])[0]["match_score"] == 99.5
+
+    org = db.query(User).filter_by(email="snap_org@test.com").one()
+    response = client.post(
+        "/projects",
+        json={"title": "Data Pipeline", "description": "ETL in python and sql", "required_skills": "python,sql"},
+        headers=get_auth_headers(org),
+    )
+    assert response.status_code == 201
+
+    result = live(client, students[0])
+    assert response.json()["id"] in [r["project_id"] for r in result]
+    assert result[0]["match_score"] != 99.5
+
+
+def test_snapshot_is_dated_before_the_projects_it_ranks(client, db, monkeypatch):
+    students, _ = build_catalog(db)
+    matrix = ProjectFeatureIndex.matrix
+    read_at = []
+
+    def reading(index, session):
+        read_at.append(datetime.now(timezone.utc))
+        return matrix(index, session)
+
+    monkeypatch.setattr(ProjectFeatureIndex, "matrix", reading)
+    precompute_recommendations(db, workers=1)
+
+    # A project opened while the job ran is then newer than the snapshot
+    generated_at = db.query(RecommendationSnapshot.generated_at).filter_by(student_id=students[0].id).first()[0]
+    assert generated_at.replace(tzinfo=timezone.utc) <= read_at[0]
+
+
+def test_history_change_discards_snapshot(client, db, snapshots_enabled):
+    students, projects = build_catalog(db)
+    precompute_recommendations(db, workers=1)
+
+    response = client.post(
+        "/applications", json={"project_id": projects[1].id}, headers=get_auth_headers(students[0])
+    )
+    assert response.status_code == 201
+
+    assert snapshot(db, students[0]) == []
+    assert snapshot(db, students[1]) != []
@@ -0,0 +1,297 @@
+"""
+test_student_metrics.py
+=======================
+Tests for student history metrics (app/utils/student_metrics.py):
+the single-query aggregation and the materialized student_stats table.
+
+Covers:
+- Every counter against a hand-built history
+- Students with no history / no feedback
+- Bulk loading several students
+- Exactly one SQL statement per aggregate
+- student_stats maintained by the write paths (admin disabling a
+  project included), read by primary key; none for organizations
+- Fallback when the recent-application window has moved on, and the
+  row stored again so later reads are a primary-key lookup
+- Backfill via rebuild_student_stats
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event
+
+from app.models import User, Project, Application, Deliverable, Feedback, StudentStats
+from app.utils.security import hash_password
+from app.core.auth import create_access_token
+from app.utils.student_metrics import (
+    compute_student_metrics,
+    get_student_metrics,
+    get_student_metrics_bulk,
+    rebuild_student_stats,
+    refresh_student_stats,
+)
+from tests.conftest import TestingSessionLocal
+
+
+def get_auth_headers(user):
+    token = create_access_token({"user_id": user.id})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def create_user(db, email, role="student"):
+    user = User(email=email, hashed_password=hash_password("password"), role=role)
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+def create_project(db, org, status="open"):
+    project = Project(organization_id=org.id, title="P", description="D", status=status)
+    db.add(project)
+    db.commit()
+    db.refresh(project)
+    return project
+
+
+def apply(db, student, project, status="pending", created_at=None):
+    application = Application(student_id=student.id, project_id=project.id, status=status)
+    if created_at is not None:
+        application.created_at = created_at
+    db.add(application)
+    db.commit()
+    db.refresh(application)
+    return application
+
+
+def build_history(db):
+    student = create_user(db, "metrics@test.com")
+    org = create_user(db, "metrics_org@test.com", "organization")
+
+    done = create_project(db, org, status="completed")
+    in_progress = create_project(db, org, status="closed")
+    pending = create_project(db, org)
+    old = create_project(db, org, status="closed")
+
+    done_app = apply(db, student, done, "accepted")
+    apply(db, student, in_progress, "accepted")
+    apply(db, student, pending, "pending")
+    apply(db, student, old, "rejected",
+          created_at=datetime.now(timezone.utc) - timedelta(days=60))
+
+    db.add(Deliverable(application_id=done_app.id, content="x", status="accepted"))
+    db.add(Feedback(user_id=student.id, project_id=done.id, rating=5))
+    db.add(Feedback(user_id=student.id, project_id=in_progress.id, rating=4))
+    db.commit()
+    return student
+
+
+def test_metrics_match_history(db_session):
+    student = build_history(db_session)
+
+    metrics = get_student_metrics(db_session, student.id)
+
+    assert metrics.applications_submitted == 4
+    assert metrics.accepted_applications == 2
+    assert metrics.completed_projects == 1
+    assert metrics.accepted_deliverables == 1
+    assert metrics.average_rating == 4.5
+    assert metrics.recent_applications == 3
+
+
+def test_metrics_for_student_without_history(db_session):
+    student = create_user(db_session, "fresh@test.com")
+
+    metrics = get_student_metrics(db_session, student.id)
+
+    assert metrics.applications_submitted == 0
+    assert metrics.completed_projects == 0
+    assert metrics.accepted_deliverables == 0
+    assert metrics.average_rating is None
+    assert metrics.recent_applications == 0
+
+
+def test_bulk_metrics_keep_students_separate(db_session):
+    student = build_history(db_session)
+    other = create_user(db_session, "other@test.com")
+    missing_id = other.id + 100
+
+    metrics = get_student_metrics_bulk(db_session, [student.id, other.id, missing_id])
+
+    assert metrics[student.id].applications_submitted == 4
+    assert metrics[other.id].applications_submitted == 0
+    assert metrics[missing_id].average_rating is None
+
+
+def count_statements(db, fn):
+    engine = db.get_bind()
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        result = fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return result, statements
+
+
+def test_aggregate_uses_a_single_statement(db_session):
+    student_id = build_history(db_session).id
+
+    _, statements = count_statements(
+        db_session, lambda: compute_student_metrics(db_session, student_id)
+    )
+
+    assert len(statements) == 1
+
+
+# ---------------------------------------------------------------------------
+# Materialized student_stats
+# ---------------------------------------------------------------------------
+
+def test_refresh_materializes_row_read_by_primary_key(db_session):
+    student_id = build_history(db_session).id
+    refresh_student_stats(db_session, [student_id])
+    db_session.commit()
+    db_session.expire_all()
+
+    metrics, statements = count_statements(
+        db_session, lambda: get_student_metrics(db_session, student_id)
+    )
+
+    assert metrics == compute_student_metrics(db_session, student_id)
+    assert len(statements) == 1
+    assert "FROM student_stats" in statements[0]
+    assert "JOIN" not in statements[0]
+
+
+def test_missing_row_falls_back_to_aggregate(db_session):
+    student = build_history(db_session)
+
+    assert db_session.get(StudentStats, student.id) is None
+    assert get_student_metrics(db_session, student.id).applications_submitted == 4
+
+
+def test_expired_recent_window_falls_back_to_aggregate(db_session):
+    student = build_history(db_session)
+    refresh_student_stats(db_session, [student.id])
+    row = db_session.get(StudentStats, student.id)
+    row.recent_applications = 99
+    row.recent_window_expires_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+    db_session.commit()
+
+    assert get_student_metrics(db_session, student.id).recent_applications == 3
+    assert get_student_metrics_bulk(db_session, [student.id])[student.id].recent_applications == 3
+
+
+@pytest.mark.parametrize("read", [get_student_metrics, lambda db, sid: get_student_metrics_bulk(db, [sid])[sid]])
+def test_expired_row_is_stored_again_so_later_reads_skip_the_aggregate(db_session, read):
+    student = create_user(db_session, "aged@test.com")
+    org = create_user(db_session, "aged_org@test.com", "organization")
+    month_ago = datetime.now(timezone.utc) - timedelta(days=31)
+    apply(db_session, student, create_project(db_session, org), created_at=month_ago)
+    refresh_student_stats(db_session, [student.id])
+    # As stored while the application was recent, and since aged out
+    row = db_session.get(StudentStats, student.id)
+    row.recent_applications = 1
+    row.recent_window_expires_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+    db_session.commit()
+
+    student_id = student.id
+
+    assert read(db_session, student_id).recent_applications == 0
+
+    db_session.expire_all()
+    metrics, statements = count_statements(db_session, lambda: read(db_session, student_id))
+    assert (metrics.recent_applications, metrics.applications_submitted) == (0, 1)
+    assert len(statements) == 1
+    assert "JOIN" not in statements[0]
+
+
+def test_rebuild_backfills_every_student(db_session):
+    student = build_history(db_session)
+    other = create_user(db_session, "backfill@test.com")
+
+    assert rebuild_student_stats(db_session, batch_size=1) == 2
+
+    assert db_session.get(StudentStats, student.id).completed_projects == 1
+    assert db_session.get(StudentStats, other.id).applications_submitted == 0
+
+
+@pytest.fixture
+def db(client):
+    # Closed after the test so its connection goes back to the pool
+    session = TestingSessionLocal()
+    yield session
+    session.close()
+
+
+def test_write_paths_maintain_student_stats(client, db):
+    student = create_user(db, "flow@test.com")
+    org = create_user(db, "flow_org@test.com", "organization")
+    project = create_project(db, org)
+    student_id, org_headers = student.id, get_auth_headers(org)
+
+    def stats():
+        db.expire_all()
+        return db.get(StudentStats, student_id)
+
+    response = client.post("/applications", json={"project_id": project.id},
+                           headers=get_auth_headers(student))
+    assert response.status_code == 201
+    application_id = response.json()["id"]
+    assert stats().applications_submitted == 1
+    assert stats().recent_applications == 1
+
+    client.patch(f"/applications/{application_id}/status",
+                 json={"status": "accepted"}, headers=org_headers)
+    assert stats().accepted_applications == 1
+
+    response = client.post(f"/applications/{application_id}/deliverables",
+                           json={"content": "https://example.com"},
+                           headers=get_auth_headers(student))
+    client.put(f"/deliverables/{response.json()['id']}/review",
+               json={"status": "accepted"}, headers=org_headers)
+    assert stats().accepted_deliverables == 1
+
+    client.put(f"/projects/{project.id}/complete", headers=org_headers)
+    assert stats().completed_projects == 1
+
+    client.post("/feedback", json={"project_id": project.id, "rating": 4},
+                headers=get_auth_headers(student))
+    assert (stats().rating_sum, stats().rating_count) == (4, 1)
+
+    assert get_student_metrics(db, student_id) == compute_student_metrics(db, student_id)
+
+
+def test_disabling_a_completed_project_refreshes_its_students(client, db):
+    student = create_user(db, "disabled@test.com")
+    org = create_user(db, "disabled_org@test.com", "organization")
+    admin = create_user(db, "disabled_admin@test.com", "admin")
+    project = create_project(db, org, status="completed")
+    apply(db, student, project, "accepted")
+    refresh_student_stats(db, [student.id])
+    db.commit()
+    assert db.get(StudentStats, student.id).completed_projects == 1
+
+    response = client.delete(f"/admin/listings/{project.id}", headers=get_auth_headers(admin))
+
+    assert response.status_code == 200
+    db.expire_all()
+    assert db.get(StudentStats, student.id).completed_projects == 0
+    assert get_student_metrics(db, student.id) == compute_student_metrics(db, student.id)
+
+
+def test_organization_feedback_leaves_student_stats_alone(client, db):
+    org = create_user(db, "feedback_org@test.com", "organization")
+    project = create_project(db, org, status="completed")
+
+    response = client.post("/feedback", json={"project_id": project.id, "rating": 3},
+                           headers=get_auth_headers(org))
+
+    assert response.status_code == 201
+    assert db.get(StudentStats, org.id) is None
@@ -0,0 +1,209 @@
+"""
+test_system_log_writer.py
+=========================
+Tests for the batched background SystemLog writer (system_log_writer.py).
+
+Covers:
+- Size-triggered and time-triggered batches, one INSERT per batch
+- flush() and stop() writing everything queued
+- Sampling above the high-water mark (errors always kept)
+- Back-pressure then drop when the queue is full
+- Failed batches counted without killing the flusher
+- Admin metrics endpoint
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base, SystemLog, User
+from app.utils.security import hash_password
+from app.core.auth import create_access_token
+from app.services.system_log_writer import SystemLogWriter
+from tests.conftest import TestingSessionLocal
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'logs.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def make_writer(engine):
+    writers = []
+
+    def make(session_factory=None, **kwargs):
+        writer = SystemLogWriter(session_factory or sessionmaker(bind=engine), **kwargs)
+        writers.append(writer)
+        return writer
+
+    yield make
+    for writer in writers:
+        writer.stop()
+
+
+def entry(status_code=200, endpoint="/health"):
+    return {"user_id": None, "role": None, "endpoint": endpoint, "method": "GET", "status_code": status_code}
+
+
+def row_count(engine):
+    with engine.connect() as connection:
+        return connection.execute(select(func.count()).select_from(SystemLog)).scalar()
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.005)
+
+
+def test_full_batch_is_written_without_waiting(engine, make_writer):
+    writer = make_writer(batch_size=3, flush_interval=60)
+
+    for _ in range(3):
+        writer.offer(entry())
+
+    wait_for(lambda: writer.stats()["written"] == 3)
+    assert writer.stats()["batches"] == 1
+    assert row_count(engine) == 3
+
+
+def test_partial_batch_is_written_after_interval(engine, make_writer):
+    writer = make_writer(batch_size=100, flush_interval=0.05)
+
+    writer.offer(entry())
+    writer.offer(entry())
+
+    wait_for(lambda: writer.stats()["written"] == 2)
+    assert row_count(engine) == 2
+
+
+def test_flush_writes_queue_in_one_statement(engine, make_writer):
+    writer = make_writer(batch_size=100, flush_interval=60)
+    inserts = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO system_logs"):
+            inserts.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        for _ in range(20):
+            writer.offer(entry())
+        assert writer.flush(timeout=2)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert row_count(engine) == 20
+    assert len(inserts) == 1
+
+
+def test_stop_writes_remaining_rows_and_restarts_on_demand(engine, make_writer):
+    writer = make_writer(batch_size=100, flush_interval=60)
+    writer.offer(entry())
+
+    writer.stop()
+
+    assert row_count(engine) == 1
+    writer.offer(entry())
+    writer.flush(timeout=2)
+    assert row_count(engine) == 2
+
+
+def blocked_writer(make_writer, engine, **kwargs):
+    """A writer whose flusher is stuck writing its first row until the gate opens."""
+    gate = threading.Event()
+    factory = sessionmaker(bind=engine)
+
+    def slow_session():
+        gate.wait(5)
+        return factory()
+
+    writer = make_writer(slow_session, batch_size=1, flush_interval=60, **kwargs)
+    writer.offer(entry())
+    wait_for(lambda: writer.stats()["queued"] == 0)
+    return writer, gate
+
+
+def test_successes_are_sampled_above_high_water_mark(engine, make_writer):
+    writer, gate = blocked_writer(make_writer, engine, max_queue=4, sample_above=0.5, sample_every=2)
+
+    results = [writer.offer(entry()) for _ in range(4)]
+    kept_error = writer.offer(entry(status_code=500))
+
+    assert results == [True, True, False, True]
+    assert kept_error is True
+    assert writer.stats()["sampled_out"] == 1
+
+    gate.set()
+    writer.flush(timeout=2)
+    assert row_count(engine) == 5
+
+
+def test_full_queue_applies_back_pressure_then_drops(engine, make_writer):
+    writer, gate = blocked_writer(make_writer, engine, max_queue=2, sample_above=1.0, block_seconds=0.05)
+    writer.offer(entry())
+    writer.offer(entry())
+
+    started = time.monotonic()
+    queued = asyncio.run(writer.submit(entry()))
+
+    assert queued is False
+    assert time.monotonic() - started >= 0.05
+    assert writer.stats()["dropped"] == 1
+
+    gate.set()
+    writer.flush(timeout=2)
+    assert row_count(engine) == 3
+
+
+def test_back_pressure_waits_for_room(engine, make_writer):
+    writer, gate = blocked_writer(make_writer, engine, max_queue=1, sample_above=1.0, block_seconds=2)
+    writer.offer(entry())
+    threading.Timer(0.05, gate.set).start()
+
+    assert asyncio.run(writer.submit(entry())) is True
+    writer.flush(timeout=2)
+    assert row_count(engine) == 3
+
+
+def test_failed_batch_is_counted_and_writer_keeps_going(engine, make_writer, tmp_path):
+    empty = create_engine(f"sqlite:///{tmp_path / 'empty.db'}")
+    factories = iter([sessionmaker(bind=empty), sessionmaker(bind=engine)])
+    writer = make_writer(lambda: next(factories)(), batch_size=100, flush_interval=60)
+
+    writer.offer(entry())
+    writer.flush(timeout=2)
+    writer.offer(entry())
+    writer.flush(timeout=2)
+
+    assert writer.stats()["failed"] == 1
+    assert writer.stats()["written"] == 1
+    assert row_count(engine) == 1
+    empty.dispose()
+
+
+def test_admin_can_read_writer_metrics(client):
+    db = TestingSessionLocal()
+    try:
+        admin = User(email="logs_admin@test.com", hashed_password=hash_password("password"), role="admin")
+        db.add(admin)
+        db.commit()
+        token = create_access_token({"user_id": admin.id})
+    finally:
+        db.close()
+
+    response = client.get(
+        "/admin/metrics/system-log-writer", headers={"Authorization": f"Bearer {token}"}
+    )
+
+    assert response.status_code == 200
+    assert {"queued", "written", "batches", "sampled_out", "dropped", "failed"} <= set(response.json())
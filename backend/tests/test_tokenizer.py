@@ -0,0 +1,81 @@
+"""
+test_tokenizer.py
+=================
+Tests for the memoised keyword tokenizer (tokenizer.py).
+
+Covers:
+- Splitting, lowercasing, stop-word and single-char filtering
+- None / empty input
+- Repeated texts served from the cache as the same frozenset
+- The matching engine delegating to it
+"""
+
+import pytest
+
+from app.services.matching_engine import _extract_keywords, score_student_project, StudentDTO, ProjectDTO
+from app.services.tokenizer import (
+    STOP_WORDS,
+    clear_keyword_cache,
+    extract_keywords,
+    keyword_cache_info,
+    tokenize,
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_keyword_cache()
+    yield
+    clear_keyword_cache()
+
+
+def test_tokenize_splits_on_punctuation_and_lowercases():
+    text = "Build a REST-API (FastAPI/Python): fast, [tested]; {typed}! Really? \"yes\" it's_done"
+
+    assert tokenize(text) == {
+        "build", "rest", "api", "fastapi", "python", "fast", "tested",
+        "typed", "really", "yes", "done",
+    }
+
+
+def test_tokenize_drops_stop_words_and_single_chars():
+    assert tokenize("I am a web developer x") == {"am", "web", "developer"}
+    assert "the" in STOP_WORDS
+    assert isinstance(STOP_WORDS, frozenset)
+
+
+@pytest.mark.parametrize("text", [None, ""])
+def test_empty_text_gives_empty_set(text):
+    assert extract_keywords(text) == frozenset()
+    assert keyword_cache_info().currsize == 0
+
+
+def test_repeated_text_is_tokenised_once():
+    first = extract_keywords("Backend APIs and data pipelines")
+    second = extract_keywords("Backend APIs and data pipelines")
+
+    assert second is first
+    assert isinstance(first, frozenset)
+    info = keyword_cache_info()
+    assert (info.hits, info.misses) == (1, 1)
+
+
+def test_engine_extract_keywords_uses_cache():
+    assert _extract_keywords("Computer Science") == {"computer", "science"}
+    _extract_keywords("Computer Science")
+
+    assert keyword_cache_info().hits == 1
+
+
+def test_scoring_many_projects_tokenises_student_text_once():
+    student = StudentDTO(1, ["python"], "Computer Science", "I like data", 0, 0, 0, 0.0, 0, 2025)
+    projects = [
+        ProjectDTO(i, f"Project {i}", "Data science work", ["python"], "1 month", "open")
+        for i in range(20)
+    ]
+
+    for project in projects:
+        score_student_project(student, project)
+
+    # major + bio + one title/description per project
+    assert keyword_cache_info().misses == 2 + len(projects)